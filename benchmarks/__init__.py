@@ -0,0 +1 @@
+"""性能ベンチマーク"""
@@ -0,0 +1,141 @@
+"""ベンチマークのコマンドラインエントリーポイント
+
+使い方:
+    python -m benchmarks generate --rows 1000000 --output data.csv
+    python -m benchmarks run --rows 1000000 10000000 --cardinality 10 100000 --output latest.json
+    python -m benchmarks schema-report --rows 3000000 --cardinality 200000 --output schema.json
+    python -m benchmarks startup --output startup.json
+    python -m benchmarks compare baseline.json latest.json --threshold 0.1
+"""
+
+import argparse
+import itertools
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.compare import compare_reports, format_comparisons
+from benchmarks.runner import build_report, run_benchmark
+from benchmarks.startup import measure_startup
+from benchmarks.synthetic import SyntheticSpec, write_dataset
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    コマンドを実行する
+
+    Args:
+        argv: コマンドライン引数（Noneの場合はsys.argv）
+
+    Returns:
+        終了コード（compareで劣化を検出した場合は1。schema-reportは比較を表示するだけで常に0）
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate = commands.add_parser("generate", help="write a synthetic dataset")
+    _add_spec_arguments(generate, multiple=False)
+    generate.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    generate.add_argument("--output", type=Path, required=True)
+
+    run = commands.add_parser("run", help="measure each stage and write a JSON report")
+    _add_spec_arguments(run, multiple=True)
+    run.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    run.add_argument("--engine", choices=["streaming", "in-memory"], default="streaming")
+    run.add_argument("--repeat", type=int, default=3)
+    run.add_argument("--http", action="store_true", help="load through a local HTTP server")
+    run.add_argument("--work-dir", type=Path, default=None)
+    run.add_argument("--output", type=Path, required=True)
+
+    schema_report = commands.add_parser(
+        "schema-report", help="compare inferred and pinned dtypes on the same dataset"
+    )
+    _add_spec_arguments(schema_report, multiple=True)
+    schema_report.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    schema_report.add_argument("--engine", choices=["streaming", "in-memory"], default="streaming")
+    schema_report.add_argument("--repeat", type=int, default=3)
+    schema_report.add_argument("--work-dir", type=Path, default=None)
+    schema_report.add_argument("--output", type=Path, required=True)
+
+    startup = commands.add_parser("startup", help="measure import and app start-up time")
+    startup.add_argument("--repeat", type=int, default=5)
+    startup.add_argument("--output", type=Path, required=True)
+
+    compare = commands.add_parser("compare", help="fail when a stage regresses")
+    compare.add_argument("baseline", type=Path)
+    compare.add_argument("current", type=Path)
+    compare.add_argument("--threshold", type=float, default=0.1)
+    compare.add_argument("--memory-threshold", type=float, default=None)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        spec = SyntheticSpec(
+            rows=args.rows, cardinality=args.cardinality, width=args.width, seed=args.seed
+        )
+        print(write_dataset(spec, args.output, args.format))
+        return 0
+
+    if args.command in ("run", "schema-report"):
+        work_dir = args.work_dir or Path(tempfile.gettempdir()) / "open_data_factory" / "bench"
+        # schema-reportは型推論（変更前）と固定したスキーマ（変更後）の両方を計測する
+        variants = (False, True) if args.command == "schema-report" else (False,)
+        runs = []
+        for rows, cardinality, width in itertools.product(args.rows, args.cardinality, args.width):
+            spec = SyntheticSpec(rows=rows, cardinality=cardinality, width=width, seed=args.seed)
+            for pinned in variants:
+                schema = "pinned" if pinned else "inferred"
+                print(
+                    f"benchmarking {spec.name} ({args.format}, {args.engine}, {schema})",
+                    file=sys.stderr,
+                )
+                runs.append(
+                    run_benchmark(
+                        spec,
+                        work_dir,
+                        format=args.format,
+                        engine=args.engine,
+                        repeat=args.repeat,
+                        serve_http=getattr(args, "http", False),
+                        pinned_schema=pinned,
+                    )
+                )
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(build_report(runs), indent=2))
+        if args.command == "schema-report":
+            inferred = [run for run in runs if run["dataset"]["schema"] == "inferred"]
+            pinned_runs = [run for run in runs if run["dataset"]["schema"] == "pinned"]
+            comparisons = compare_reports(build_report(inferred), build_report(pinned_runs))
+            print(format_comparisons(comparisons))
+        print(args.output)
+        return 0
+
+    if args.command == "startup":
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(build_report([measure_startup(args.repeat)]), indent=2))
+        print(args.output)
+        return 0
+
+    comparisons = compare_reports(
+        json.loads(args.baseline.read_text()),
+        json.loads(args.current.read_text()),
+        threshold=args.threshold,
+        memory_threshold=args.memory_threshold,
+    )
+    print(format_comparisons(comparisons))
+    return 1 if any(c.regressed for c in comparisons) else 0
+
+
+def _add_spec_arguments(parser: argparse.ArgumentParser, multiple: bool) -> None:
+    """合成データセットの形を指定する引数を追加する（runでは複数の値の全組み合わせを計測する）"""
+    for name, default in (("rows", 1_000_000), ("cardinality", 1_000), ("width", 0)):
+        if multiple:
+            parser.add_argument(f"--{name}", type=int, nargs="+", default=[default])
+        else:
+            parser.add_argument(f"--{name}", type=int, default=default)
+    parser.add_argument("--seed", type=int, default=0)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
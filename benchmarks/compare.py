@@ -0,0 +1,101 @@
+"""ベンチマーク結果の比較（性能劣化の検出）"""
+
+from dataclasses import dataclass
+from typing import Any
+
+# 比較する指標
+METRICS = ("seconds", "rss_delta_bytes")
+
+
+@dataclass(frozen=True)
+class StageComparison:
+    """1つのステージ・指標の比較結果"""
+
+    dataset: str
+    stage: str
+    metric: str
+    baseline: float
+    current: float
+    regressed: bool
+
+    @property
+    def ratio(self) -> float:
+        """基準値に対する比（基準値が0の場合は無限大）"""
+        if self.baseline == 0:
+            return float("inf") if self.current > 0 else 1.0
+        return self.current / self.baseline
+
+
+def compare_reports(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    threshold: float = 0.1,
+    memory_threshold: float | None = None,
+    min_seconds: float = 0.01,
+    min_bytes: int = 16 * 1024**2,
+) -> list[StageComparison]:
+    """
+    2つのレポートを同じデータセット・ステージ同士で比較する
+
+    ごく短い時間・小さなメモリ量の揺れで失敗しないよう、差がmin_seconds・min_bytes未満の
+    場合は劣化とみなさない。どちらかにしか無いデータセット・ステージは比較しない。
+
+    Args:
+        baseline: 基準のレポート
+        current: 比較するレポート
+        threshold: 実行時間の許容増加率（0.1は10%）
+        memory_threshold: メモリ使用量の許容増加率（Noneの場合はthresholdと同じ）
+        min_seconds: 劣化とみなす実行時間の差の下限
+        min_bytes: 劣化とみなすメモリ使用量の差の下限
+
+    Returns:
+        比較結果のリスト
+    """
+    if memory_threshold is None:
+        memory_threshold = threshold
+    limits = {
+        "seconds": (threshold, min_seconds),
+        "rss_delta_bytes": (memory_threshold, min_bytes),
+    }
+
+    baseline_runs = {_run_key(run): run for run in baseline["runs"]}
+    comparisons = []
+    for run in current["runs"]:
+        base_run = baseline_runs.get(_run_key(run))
+        if base_run is None:
+            continue
+        for stage, stats in run["stages"].items():
+            base_stats = base_run["stages"].get(stage)
+            if base_stats is None:
+                continue
+            for metric in METRICS:
+                allowed, floor = limits[metric]
+                before, after = base_stats[metric], stats[metric]
+                comparisons.append(
+                    StageComparison(
+                        dataset=run["dataset"]["name"],
+                        stage=stage,
+                        metric=metric,
+                        baseline=before,
+                        current=after,
+                        regressed=after - before >= floor and after > before * (1 + allowed),
+                    )
+                )
+    return comparisons
+
+
+def format_comparisons(comparisons: list[StageComparison]) -> str:
+    """比較結果を表形式の文字列にする"""
+    lines = [f"{'dataset':<50} {'stage':<11} {'metric':<16} {'baseline':>14} {'current':>14} ratio"]
+    for c in comparisons:
+        mark = "  REGRESSED" if c.regressed else ""
+        lines.append(
+            f"{c.dataset:<50} {c.stage:<11} {c.metric:<16} "
+            f"{c.baseline:>14.4f} {c.current:>14.4f} {c.ratio:5.2f}{mark}"
+        )
+    return "\n".join(lines)
+
+
+def _run_key(run: dict[str, Any]) -> tuple[str, str, str, str]:
+    dataset = run["dataset"]
+    return dataset["name"], dataset["format"], dataset["engine"], dataset["transport"]
@@ -0,0 +1,211 @@
+"""ステージごとの実行時間とメモリ使用量の計測"""
+
+import functools
+import os
+import platform
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, date, datetime
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, TypeVar
+
+import polars as pl
+
+from app.domain.service.analyze_service import AnalysisEngine, analyze
+from app.domain.value_object.dataset import Dataset
+from app.domain.value_object.target_date import TargetDate
+from app.infrastructure.config.settings import Settings
+from app.infrastructure.repository.s3_result_repository import S3ResultRepository
+from app.usecase.dto.run_analysis_input import RunAnalysisInput
+from app.usecase.interactor.stage_timer import RssSampler
+from app.usecase.ports.output.dataset_loader import DatasetLoader
+from app.wiring import build_loader, build_usecase
+from benchmarks.synthetic import DatasetFormat, SyntheticSpec, write_dataset
+
+T = TypeVar("T")
+
+# 計測するステージ
+# - load: HttpDatasetLoader.loadの計画をcollectして全列を読み込む
+# - analyze: 読み込み済みのデータに対するanalyze()
+# - save: S3ResultRepository.save
+# - end_to_end: RunAnalysisInteractor.run（読み込みから保存まで）
+STAGES = ("load", "analyze", "save", "end_to_end")
+
+REPORT_VERSION = 1
+
+_TARGET_DATE = TargetDate(value=date(2024, 1, 1))
+
+
+@dataclass
+class StageResult:
+    """1つのステージの計測結果"""
+
+    stage: str
+    # 繰り返した各回の実行時間（秒）
+    samples: list[float] = field(default_factory=list)
+    # 繰り返した中で最大のピークRSS（バイト）
+    peak_rss_bytes: int = 0
+    # ステージ開始時からのRSSの最大増加量（バイト）
+    rss_delta_bytes: int = 0
+
+    @property
+    def seconds(self) -> float:
+        """最も速かった回の実行時間（外乱の影響を受けにくい）"""
+        return min(self.samples)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "seconds": self.seconds}
+
+
+def measure(result: StageResult, fn: Callable[[], T]) -> T:
+    """
+    関数を実行し、実行時間とメモリ使用量を計測結果に追加する
+
+    Args:
+        result: 計測結果
+        fn: 計測する関数
+
+    Returns:
+        関数の戻り値
+    """
+    with RssSampler() as sampler:
+        started = time.perf_counter()
+        value = fn()
+        elapsed = time.perf_counter() - started
+    result.samples.append(elapsed)
+    result.peak_rss_bytes = max(result.peak_rss_bytes, sampler.peak)
+    result.rss_delta_bytes = max(result.rss_delta_bytes, sampler.delta)
+    return value
+
+
+def run_benchmark(
+    spec: SyntheticSpec,
+    work_dir: str | Path,
+    format: DatasetFormat = "csv",
+    engine: AnalysisEngine = "streaming",
+    repeat: int = 3,
+    serve_http: bool = False,
+    pinned_schema: bool = False,
+) -> dict[str, Any]:
+    """
+    合成データセットに対して各ステージを計測する
+
+    Args:
+        spec: 合成データセットの形
+        work_dir: データセットと結果の作業ディレクトリ
+        format: 読み込むデータセットの形式（parquetの場合はCSVを列指向ストアで一度変換してから
+            変換済みファイルの読み込みを計測する）
+        engine: collect時に使用するPolarsエンジン
+        repeat: 各ステージを繰り返す回数
+        serve_http: Trueの場合はローカルHTTPサーバー経由で読み込む
+        pinned_schema: Trueの場合はスキーマレジストリで固定した型で読み込む（学習は計測に含めない）
+
+    Returns:
+        データセットの情報とステージごとの計測結果
+    """
+    work_dir = Path(work_dir)
+    csv_path = write_dataset(spec, work_dir / "datasets" / f"{_file_stem(spec)}.csv", "csv")
+
+    settings = Settings(
+        s3_bucket="benchmark",
+        local_result_dir=str(work_dir / "results"),
+        result_memo=False,
+        analysis_engine=engine,
+        columnar_cache_dir=str(work_dir / "columnar") if format == "parquet" else "",
+        # HTTP経由で列指向ストアを使うには、ローカルに取得するキャッシュが必要
+        dataset_cache_dir=str(work_dir / "cache") if serve_http and format == "parquet" else "",
+        schema_registry=pinned_schema,
+    )
+    loader = build_loader(settings)
+    repository = S3ResultRepository(settings)
+    usecase = build_usecase(settings)
+
+    with _serve(csv_path.parent, enabled=serve_http) as base_url:
+        dataset = Dataset(url=f"{base_url}/{csv_path.name}" if base_url else str(csv_path))
+        # 列指向ストアへの変換・キャッシュへの取得・スキーマの学習は計測に含めない
+        loader.load(dataset)
+
+        input_data = RunAnalysisInput(dataset=dataset, target_date=_TARGET_DATE)
+        results = {stage: StageResult(stage=stage) for stage in STAGES}
+        for _ in range(repeat):
+            df = measure(results["load"], functools.partial(_load, loader, dataset, engine))
+            analysis = measure(results["analyze"], functools.partial(analyze, df, engine))
+            measure(results["save"], functools.partial(repository.save, analysis, _TARGET_DATE))
+            del df
+            output = measure(results["end_to_end"], functools.partial(usecase.run, input_data))
+            if not output.success:
+                raise RuntimeError(output.message)
+
+    return {
+        "dataset": {
+            **asdict(spec),
+            "name": spec.name,
+            "format": format,
+            "engine": engine,
+            "transport": "http" if serve_http else "file",
+            # 比較のキーには含めない（schema-reportで同じデータセットの型の違いを比べるため）
+            "schema": "pinned" if pinned_schema else "inferred",
+            "csv_bytes": csv_path.stat().st_size,
+        },
+        "stages": {stage: result.to_dict() for stage, result in results.items()},
+    }
+
+
+def build_report(runs: list[dict[str, Any]]) -> dict[str, Any]:
+    """
+    計測結果を実行環境の情報と合わせてレポートにまとめる
+
+    Args:
+        runs: run_benchmarkの戻り値のリスト
+
+    Returns:
+        JSONに書き出すレポート
+    """
+    return {
+        "version": REPORT_VERSION,
+        "created_at": datetime.now(UTC).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "polars": pl.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "runs": runs,
+    }
+
+
+def _load(loader: DatasetLoader, dataset: Dataset, engine: AnalysisEngine) -> pl.DataFrame:
+    return loader.load(dataset).collect(engine=engine)
+
+
+def _file_stem(spec: SyntheticSpec) -> str:
+    return f"synthetic-{spec.rows}-{spec.cardinality}-{spec.width}-{spec.seed}"
+
+
+@contextmanager
+def _serve(directory: Path, enabled: bool) -> Iterator[str | None]:
+    """ディレクトリをローカルHTTPサーバーで配信し、そのベースURLを返す"""
+    if not enabled:
+        yield None
+        return
+
+    class Handler(SimpleHTTPRequestHandler):
+        def __init__(self, *args: Any, **kwargs: Any):
+            super().__init__(*args, directory=str(directory), **kwargs)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        host, port = server.server_address[:2]
+        yield f"http://{host}:{port}"
+    finally:
+        server.shutdown()
+        server.server_close()
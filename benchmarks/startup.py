@@ -0,0 +1,87 @@
+"""エントリーポイントの読み込み時間・起動時間の計測"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from benchmarks.runner import StageResult
+
+# 計測する起動処理（ステージ名 -> 新しいインタプリタで実行する文）
+STARTUP_TARGETS = {
+    "import_main_job": "import app.main_job",
+    "import_main_api": "import app.main_api",
+    "create_app": "import app.main_api as main_api; main_api.app",
+}
+
+# 子プロセスで計測対象の文を実行し、経過時間・ピークRSS・読み込んだモジュールを出力する
+_PROBE = """
+import json, resource, sys, time
+started = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - started
+max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{
+    "seconds": elapsed,
+    "max_rss": max_rss if sys.platform == "darwin" else max_rss * 1024,
+    "kubernetes": "kubernetes" in sys.modules,
+    "modules": len(sys.modules),
+}}))
+"""
+
+
+def measure_startup(repeat: int = 5) -> dict[str, Any]:
+    """
+    各エントリーポイントを新しいインタプリタで読み込み、起動にかかる時間を計測する
+
+    Args:
+        repeat: 各ステージを繰り返す回数
+
+    Returns:
+        run_benchmarkと同じ形式の計測結果（benchmarks compareで比較できる）
+    """
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(filter(None, [_src_dir(), os.environ.get("PYTHONPATH")])),
+        "S3_BUCKET": os.environ.get("S3_BUCKET", "benchmark"),
+        "LOCAL_RESULT_DIR": tempfile.gettempdir(),
+    }
+
+    stages: dict[str, dict[str, Any]] = {}
+    for stage, statement in STARTUP_TARGETS.items():
+        result = StageResult(stage=stage)
+        probe: dict[str, Any] = {}
+        for _ in range(repeat):
+            completed = subprocess.run(
+                [sys.executable, "-c", _PROBE.format(statement=statement)],
+                env=env,
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            probe = json.loads(completed.stdout.strip().splitlines()[-1])
+            result.samples.append(probe["seconds"])
+            result.peak_rss_bytes = max(result.peak_rss_bytes, probe["max_rss"])
+            result.rss_delta_bytes = result.peak_rss_bytes
+        stages[stage] = {
+            **result.to_dict(),
+            "kubernetes_imported": probe["kubernetes"],
+            "modules": probe["modules"],
+        }
+
+    return {
+        "dataset": {
+            "name": "startup",
+            "format": "python",
+            "engine": "none",
+            "transport": "subprocess",
+        },
+        "stages": stages,
+    }
+
+
+def _src_dir() -> str:
+    return str(Path(__file__).resolve().parent.parent / "src")
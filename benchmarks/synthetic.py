@@ -0,0 +1,121 @@
+"""決定的な合成データセットの生成"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Literal
+
+import polars as pl
+
+DatasetFormat = Literal["csv", "parquet"]
+
+_MASK = 2**64 - 1
+_GOLDEN = 0x9E3779B97F4A7C15
+
+
+@dataclass(frozen=True)
+class SyntheticSpec:
+    """合成データセットの形"""
+
+    # 行数
+    rows: int = 1_000_000
+    # categoryの種類数
+    cardinality: int = 1_000
+    # category, value以外に追加する数値列の数
+    width: int = 0
+    # 乱数の種（同じ種・同じ形からは常に同じデータが生成される）
+    seed: int = 0
+    # 一度に生成する行数（生成時のメモリ使用量の上限になる）
+    chunk_rows: int = 1_000_000
+
+    def __post_init__(self):
+        if self.rows <= 0:
+            raise ValueError(f"rows must be positive: {self.rows}")
+        if self.cardinality <= 0:
+            raise ValueError(f"cardinality must be positive: {self.cardinality}")
+        if self.width < 0:
+            raise ValueError(f"width must not be negative: {self.width}")
+        if self.chunk_rows <= 0:
+            raise ValueError(f"chunk_rows must be positive: {self.chunk_rows}")
+
+    @property
+    def name(self) -> str:
+        """結果の比較に使うデータセットの名前"""
+        return (
+            f"rows={self.rows},cardinality={self.cardinality},width={self.width},seed={self.seed}"
+        )
+
+
+def synthetic_frame(spec: SyntheticSpec) -> pl.LazyFrame:
+    """
+    合成データセットの遅延実行計画を返す
+
+    値は行番号と種から整数演算（splitmix64）だけで求めるため、Polarsのバージョンや
+    スレッド数によらず同じデータになる。chunk_rowsごとに生成してつなげるため、
+    シンクに書き出す場合は全行をメモリ上に展開しない。
+
+    Args:
+        spec: 合成データセットの形
+
+    Returns:
+        category, value, x0…x{width-1}列を持つLazyFrame
+    """
+    chunks = [
+        _chunk(spec, offset, min(spec.chunk_rows, spec.rows - offset))
+        for offset in range(0, spec.rows, spec.chunk_rows)
+    ]
+    return pl.concat(chunks, how="vertical")
+
+
+def write_dataset(spec: SyntheticSpec, path: str | Path, format: DatasetFormat = "csv") -> Path:
+    """
+    合成データセットをファイルに書き出す（同じ内容のファイルが既にあれば再利用する）
+
+    Args:
+        spec: 合成データセットの形
+        path: 出力先
+        format: ファイル形式
+
+    Returns:
+        書き出したファイルのパス
+    """
+    path = Path(path)
+    if path.exists():
+        return path
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    lf = synthetic_frame(spec)
+    if format == "csv":
+        lf.sink_csv(tmp_path, maintain_order=True)
+    elif format == "parquet":
+        lf.sink_parquet(tmp_path, maintain_order=True)
+    else:
+        raise ValueError(f"Unsupported dataset format: {format}")
+    tmp_path.replace(path)
+    return path
+
+
+def _chunk(spec: SyntheticSpec, offset: int, rows: int) -> pl.LazyFrame:
+    index = pl.int_range(offset, offset + rows, dtype=pl.UInt64).alias("_i")
+    columns = [
+        pl.format("c{}", _mix(spec, 0) % spec.cardinality).alias("category"),
+        ((_mix(spec, 1) % 1_000_000).cast(pl.Float64) / 100).alias("value"),
+        *[
+            ((_mix(spec, k + 2) % 1_000_000).cast(pl.Float64) / 100).alias(f"x{k}")
+            for k in range(spec.width)
+        ],
+    ]
+    return pl.LazyFrame().select(index).select(columns)
+
+
+def _mix(spec: SyntheticSpec, stream: int) -> pl.Expr:
+    """行番号・種・列ごとの系列番号から64bitの擬似乱数を求める（splitmix64）"""
+    offset = (spec.seed * _GOLDEN + (stream + 1) * 0xD1B54A32D192ED03) & _MASK
+    z = pl.col("_i") + pl.lit(offset, dtype=pl.UInt64)
+    z = _xor_shift(z, 30) * pl.lit(0xBF58476D1CE4E5B9, dtype=pl.UInt64)
+    z = _xor_shift(z, 27) * pl.lit(0x94D049BB133111EB, dtype=pl.UInt64)
+    return _xor_shift(z, 31)
+
+
+def _xor_shift(z: pl.Expr, bits: int) -> pl.Expr:
+    return z.xor(z // pl.lit(2**bits, dtype=pl.UInt64))
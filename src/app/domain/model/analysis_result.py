@@ -4,13 +4,21 @@ from dataclasses import dataclass
 
 import polars as pl
 
+from app.domain.model.analysis_sketches import AnalysisSketches
+
 
 @dataclass(frozen=True)
 class AnalysisResult:
     """分析結果を表すドメインモデル"""
 
     data: pl.DataFrame
+    # 日付範囲のロールアップに使うマージ可能な部分集計（作成できない場合はNone）
+    partial: pl.DataFrame | None = None
+    # 異なり数・分位数の近似スケッチ（要求されなかった、または作成できない場合はNone）
+    sketches: AnalysisSketches | None = None
 
     def __post_init__(self):
         if not isinstance(self.data, pl.DataFrame):
             raise ValueError("AnalysisResult.data must be a polars DataFrame")
+        if self.partial is not None and not isinstance(self.partial, pl.DataFrame):
+            raise ValueError("AnalysisResult.partial must be a polars DataFrame")
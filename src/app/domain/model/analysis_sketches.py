@@ -0,0 +1,18 @@
+"""近似スケッチのドメインモデル"""
+
+from dataclasses import dataclass
+
+import polars as pl
+
+from app.domain.value_object.sketch_spec import SketchSpec
+
+
+@dataclass(frozen=True)
+class AnalysisSketches:
+    """日付をまたいでマージできるカテゴリごとの近似スケッチ"""
+
+    spec: SketchSpec
+    # HyperLogLogのレジスタ（category, register, rank。異なり数の列が無い場合はNone）
+    distinct: pl.DataFrame | None
+    # 分位数スケッチ（category, sign, bucket, count）
+    quantiles: pl.DataFrame
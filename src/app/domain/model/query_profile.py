@@ -0,0 +1,15 @@
+"""クエリプロファイルのドメインモデル"""
+
+from dataclasses import dataclass
+
+import polars as pl
+
+
+@dataclass(frozen=True)
+class QueryProfile:
+    """分析計画の実行プロファイル"""
+
+    # 最適化後のPolarsの実行計画
+    optimized_plan: str
+    # 計画のノードごとの実行時間（node, start, end列。単位はマイクロ秒）
+    node_timings: pl.DataFrame
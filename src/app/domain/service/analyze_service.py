@@ -1,25 +1,217 @@
 """分析サービスのドメインロジック"""
 
+import time
+from collections.abc import Sequence
+from dataclasses import replace
+from typing import Literal
+
 import polars as pl
 
 from app.domain.model.analysis_result import AnalysisResult
+from app.domain.model.analysis_sketches import AnalysisSketches
+from app.domain.model.query_profile import QueryProfile
+from app.domain.service.aggregation_compiler import compile_aggregation
+from app.domain.service.column_types import categoricals_as_strings
+from app.domain.service.partial_aggregate import (
+    KEY_COLUMN,
+    build_partial_plan,
+    supports_partial,
+)
+from app.domain.service.sketch import build_distinct_sketch_plan, build_quantile_sketch_plan
+from app.domain.value_object.aggregation_spec import AggregationSpec
+from app.domain.value_object.sketch_spec import SketchSpec
+
+# collect時に使用するPolarsエンジン
+# - streaming: チャンク単位で処理し、ピークメモリを抑える
+# - in-memory: 全データをメモリ上に展開して処理する（比較用）
+AnalysisEngine = Literal["streaming", "in-memory"]
+
+# 分析ロジックのバージョン（結果が変わる変更を加えた場合は必ず更新する）
+# 結果のメモ化キーに含まれるため、更新すると過去の結果は再利用されなくなる
+ANALYZER_VERSION = "2"
+
+# 部分集計から分析結果の列を取り出す式
+_RESULT_COLUMNS = (pl.col(KEY_COLUMN), pl.col("sum").alias("total"))
+
+
+def build_analysis_plan(lf: pl.LazyFrame) -> pl.LazyFrame:
+    """
+    分析の遅延実行計画を構築する純粋関数
+
+    必要な列（category, value）のみを参照するため、
+    射影プッシュダウンにより不要な列は読み込まれない。
+
+    Args:
+        lf: 入力LazyFrame
+
+    Returns:
+        分析計画を表すLazyFrame
+    """
+    columns = lf.collect_schema().names()
+
+    # 例: カテゴリごとの合計値を計算
+    if "category" in columns and "value" in columns:
+        return lf.group_by("category").agg(pl.sum("value").alias("total"))
+    return lf
 
 
-def analyze(df: pl.DataFrame) -> AnalysisResult:
+def analyze(
+    df: pl.DataFrame | pl.LazyFrame,
+    engine: AnalysisEngine = "streaming",
+    sketch_spec: SketchSpec | None = None,
+    aggregation: AggregationSpec | None = None,
+) -> AnalysisResult:
     """
     データフレームを分析して結果を返す純粋関数
 
+    スケッチを要求された場合は、集計とスケッチの計画をcollect_allで一度に実行する。
+
+    Args:
+        df: 入力データフレーム（LazyFrameの場合は遅延評価のまま計画を構築する）
+        engine: collect時に使用するPolarsエンジン
+        sketch_spec: 近似スケッチの設定（Noneの場合はスケッチを作らない）
+        aggregation: 集計仕様（Noneの場合はカテゴリごとの合計値を求める）
+
+    Returns:
+        分析結果（既定の集計の場合は日付範囲のロールアップ用の部分集計とスケッチを含む）
+
+    Raises:
+        ValueError: 集計仕様が参照する列が入力に無い場合
+    """
+    lf = df.lazy()
+    plan, has_partial = _build_plan(lf, aggregation)
+    sketch_plans = _build_sketch_plans(lf, sketch_spec) if has_partial else []
+
+    result_df, *sketch_dfs = pl.collect_all([plan, *sketch_plans], engine=engine)
+    result = _to_result(result_df, has_partial)
+    if sketch_dfs:
+        result = replace(result, sketches=_to_sketches(sketch_spec, sketch_dfs))
+    return result
+
+
+def analyze_many(
+    frames: Sequence[pl.DataFrame | pl.LazyFrame],
+    engine: AnalysisEngine = "streaming",
+) -> list[AnalysisResult]:
+    """
+    複数のデータフレームをまとめて分析する純粋関数
+
+    各データフレームの計画をcollect_allで一度に実行するため、Polarsが共通のスレッドプール上で
+    全ての計画をまとめてスケジューリングする。
+
+    Args:
+        frames: 入力データフレームのリスト
+        engine: collect時に使用するPolarsエンジン
+
+    Returns:
+        入力と同じ順序の分析結果のリスト
+    """
+    plans = [_build_plan(frame.lazy()) for frame in frames]
+    collected = pl.collect_all([plan for plan, _ in plans], engine=engine)
+
+    return [
+        _to_result(result_df, has_partial)
+        for result_df, (_, has_partial) in zip(collected, plans, strict=True)
+    ]
+
+
+def profile_analyze(
+    df: pl.DataFrame | pl.LazyFrame,
+    engine: AnalysisEngine = "streaming",
+    sketch_spec: SketchSpec | None = None,
+    aggregation: AggregationSpec | None = None,
+) -> tuple[AnalysisResult, QueryProfile]:
+    """
+    analyzeと同じ分析を、最適化後の計画とノードごとの実行時間を取得しながら実行する
+
+    LazyFrame.profileが無いPolarsでは、計画全体を1つのノードとして計測する。
+    スケッチはプロファイル対象の計画とは別に求める。
+
     Args:
         df: 入力データフレーム
+        engine: collect時に使用するPolarsエンジン
+        sketch_spec: 近似スケッチの設定（Noneの場合はスケッチを作らない）
+        aggregation: 集計仕様（Noneの場合はカテゴリごとの合計値を求める）
 
     Returns:
-        分析結果
+        分析結果と実行プロファイル
     """
-    # 例: カテゴリごとの合計値を計算
-    result_df = (
-        df.group_by("category").agg(pl.sum("value").alias("total"))
-        if "category" in df.columns and "value" in df.columns
-        else df
+    lf = df.lazy()
+    plan, has_partial = _build_plan(lf, aggregation)
+    optimized_plan = plan.explain(optimized=True)
+
+    if hasattr(plan, "profile"):
+        result_df, node_timings = plan.profile(engine=engine)
+    else:
+        started = time.perf_counter()
+        result_df = plan.collect(engine=engine)
+        elapsed_us = int((time.perf_counter() - started) * 1_000_000)
+        node_timings = pl.DataFrame(
+            {"node": ["collect"], "start": [0], "end": [elapsed_us]},
+            schema={"node": pl.String, "start": pl.UInt64, "end": pl.UInt64},
+        )
+
+    profile = QueryProfile(optimized_plan=optimized_plan, node_timings=node_timings)
+    result = _to_result(result_df, has_partial)
+    sketch_plans = _build_sketch_plans(lf, sketch_spec) if has_partial else []
+    if sketch_plans:
+        sketch_dfs = pl.collect_all(sketch_plans, engine=engine)
+        result = replace(result, sketches=_to_sketches(sketch_spec, sketch_dfs))
+    return result, profile
+
+
+def build_result_plan(partial: pl.LazyFrame) -> pl.LazyFrame:
+    """
+    部分集計から分析結果（カテゴリごとの合計値）を求める遅延実行計画を構築する純粋関数
+
+    Args:
+        partial: 部分集計
+
+    Returns:
+        category, total列を持つLazyFrame
+    """
+    return partial.select(_RESULT_COLUMNS)
+
+
+def _build_plan(
+    lf: pl.LazyFrame, aggregation: AggregationSpec | None = None
+) -> tuple[pl.LazyFrame, bool]:
+    """
+    collectする計画と、それが部分集計の計画かを返す
+
+    集計仕様がある場合はそれをコンパイルした計画を使う（部分集計は作らない）。
+    集計できる入力では部分集計を1回のcollectで求め、合計値はその列から取り出す。
+    """
+    if aggregation is not None:
+        return compile_aggregation(aggregation).apply(lf), False
+    if supports_partial(lf):
+        return build_partial_plan(lf), True
+    return categoricals_as_strings(build_analysis_plan(lf)), False
+
+
+def _build_sketch_plans(lf: pl.LazyFrame, spec: SketchSpec | None) -> list[pl.LazyFrame]:
+    """
+    スケッチの計画を返す（分位数、異なり数の順。異なり数の列が無い場合は分位数のみ）
+    """
+    if spec is None:
+        return []
+    plans = [build_quantile_sketch_plan(lf, spec)]
+    if spec.distinct_column and spec.distinct_column in lf.collect_schema().names():
+        plans.append(build_distinct_sketch_plan(lf, spec))
+    return plans
+
+
+def _to_sketches(spec: SketchSpec, dfs: Sequence[pl.DataFrame]) -> AnalysisSketches:
+    """collectしたスケッチの計画の結果をスケッチに変換する"""
+    quantiles, *distinct = dfs
+    return AnalysisSketches(
+        spec=spec, distinct=distinct[0] if distinct else None, quantiles=quantiles
     )
 
-    return AnalysisResult(data=result_df)
+
+def _to_result(df: pl.DataFrame, has_partial: bool) -> AnalysisResult:
+    """collectした計画の結果を分析結果に変換する"""
+    if has_partial:
+        result_df = df.select(_RESULT_COLUMNS)
+        return AnalysisResult(data=result_df, partial=df)
+    return AnalysisResult(data=df)
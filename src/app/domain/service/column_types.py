@@ -0,0 +1,103 @@
+"""列の型（スキーマの学習・縮小した型の扱い）のドメインロジック"""
+
+from collections.abc import Sequence
+
+import polars as pl
+
+from app.domain.value_object.dataset_schema import DatasetSchema
+
+# 集計前に64bitへ広げる整数型（合計・派生列の計算で桁あふれしないようにする）
+_NARROW_INTEGER_DTYPES = (pl.Int8, pl.Int16, pl.Int32, pl.UInt8, pl.UInt16, pl.UInt32)
+
+
+def learn_schema(
+    lf: pl.LazyFrame,
+    categorical_columns: Sequence[str] = (),
+    engine: str = "streaming",
+) -> DatasetSchema:
+    """
+    全列を文字列として読み込む計画から、各列を安全に読み込める型を求める
+
+    全行を1回だけストリーミングで走査し、列ごとに整数・浮動小数点数として解釈できる値の数を
+    求める。先頭の行だけを見る型推論と違い、後ろの行にだけ小数がある列も浮動小数点数と判定する。
+    - 全ての値が整数: Int64（学習したスキーマは同じフィードの以降の日付にも使うため、1日分の
+      値の範囲から縮小しない。より小さな整数型はスキーマの編集で明示的に指定する）
+    - 全ての値が数値: Float64（精度を落とさないためFloat32には縮小しない）
+    - それ以外: categorical_columnsに含まれる列はCategorical、その他はString
+
+    Args:
+        lf: 全列をString型で読み込む計画（scan_csv(infer_schema=False)）
+        categorical_columns: 文字列の場合にCategoricalで読み込む列
+        engine: collect時に使用するPolarsエンジン
+
+    Returns:
+        学習したスキーマ
+    """
+    names = lf.collect_schema().names()
+    exprs = []
+    for index, name in enumerate(names):
+        column = pl.col(name)
+        exprs.extend(
+            [
+                column.count().alias(f"{index}:values"),
+                column.cast(pl.Int64, strict=False).count().alias(f"{index}:integers"),
+                column.cast(pl.Float64, strict=False).count().alias(f"{index}:floats"),
+            ]
+        )
+    stats = lf.select(exprs).collect(engine=engine).row(0, named=True)
+
+    columns = []
+    for index, name in enumerate(names):
+        values = stats[f"{index}:values"]
+        if values and stats[f"{index}:integers"] == values:
+            dtype = "Int64"
+        elif values and stats[f"{index}:floats"] == values:
+            dtype = "Float64"
+        else:
+            dtype = "Categorical" if name in categorical_columns else "String"
+        columns.append((name, dtype))
+    return DatasetSchema(columns=tuple(columns))
+
+
+def widen_integers(lf: pl.LazyFrame) -> pl.LazyFrame:
+    """
+    64bit未満の整数列をInt64に広げる（スキーマで縮小した列の合計が桁あふれしないようにする）
+
+    集計の入力側で行うため、変換はストリーミングのチャンク単位で行われ、全行を広げた列は
+    メモリ上に作られない。
+
+    Args:
+        lf: 入力LazyFrame
+
+    Returns:
+        整数列をInt64にしたLazyFrame（広げる列が無い場合は入力のまま）
+    """
+    narrow = [
+        name for name, dtype in lf.collect_schema().items() if dtype in _NARROW_INTEGER_DTYPES
+    ]
+    if not narrow:
+        return lf
+    return lf.with_columns(pl.col(narrow).cast(pl.Int64))
+
+
+def categoricals_as_strings(lf: pl.LazyFrame) -> pl.LazyFrame:
+    """
+    Categorical列を文字列に戻す
+
+    保存する集計結果・部分集計・スケッチの型を、スキーマを固定したかどうかによらず揃える
+    （Categorical列と文字列の列は縦に連結できないため、日付をまたぐマージが失敗する）。
+
+    Args:
+        lf: 集計結果のLazyFrame
+
+    Returns:
+        Categorical列をStringにしたLazyFrame（該当する列が無い場合は入力のまま）
+    """
+    categorical = [
+        name
+        for name, dtype in lf.collect_schema().items()
+        if isinstance(dtype, pl.Categorical | pl.Enum)
+    ]
+    if not categorical:
+        return lf
+    return lf.with_columns(pl.col(categorical).cast(pl.String))
@@ -0,0 +1,97 @@
+"""日付ごとの部分集計（マージ可能な集計状態）のドメインロジック"""
+
+import polars as pl
+
+from app.domain.service.column_types import categoricals_as_strings, widen_integers
+
+# 部分集計のキー列と集計対象列
+KEY_COLUMN = "category"
+VALUE_COLUMN = "value"
+
+# 部分集計の列（合計・非nullの件数・最小値・最大値。いずれも日付をまたいでマージできる）
+PARTIAL_COLUMNS = ("sum", "count", "min", "max")
+
+
+def supports_partial(lf: pl.LazyFrame) -> bool:
+    """
+    部分集計を作成できる入力かを返す
+
+    Args:
+        lf: 入力LazyFrame
+
+    Returns:
+        キー列と数値の集計対象列（全てnullの列を含む）がある場合True
+    """
+    schema = lf.collect_schema()
+    value_dtype = schema.get(VALUE_COLUMN)
+    return (
+        KEY_COLUMN in schema
+        and value_dtype is not None
+        and (value_dtype.is_numeric() or value_dtype == pl.Null)
+    )
+
+
+def build_partial_plan(lf: pl.LazyFrame) -> pl.LazyFrame:
+    """
+    生データから1日分の部分集計を作る遅延実行計画を構築する純粋関数
+
+    スキーマで縮小した型で読み込んだ入力でも、部分集計の型は推論で読み込んだ場合と同じになる。
+
+    Args:
+        lf: 入力LazyFrame（category, value列を持つ）
+
+    Returns:
+        category, sum, count, min, max列を持つLazyFrame
+    """
+    value = pl.col(VALUE_COLUMN)
+    partial = (
+        widen_integers(lf.select(KEY_COLUMN, VALUE_COLUMN))
+        .group_by(KEY_COLUMN)
+        .agg(
+            value.sum().alias("sum"),
+            value.count().alias("count"),
+            value.min().alias("min"),
+            value.max().alias("max"),
+        )
+    )
+    return categoricals_as_strings(partial)
+
+
+def merge_partials(partials: pl.LazyFrame) -> pl.LazyFrame:
+    """
+    複数日付の部分集計を1つの部分集計にマージする純粋関数
+
+    生データを読まずに、日付数×カテゴリ数の行だけで範囲の集計を求める。
+
+    Args:
+        partials: 部分集計を縦に連結したLazyFrame
+
+    Returns:
+        マージ後の部分集計
+    """
+    return partials.group_by(KEY_COLUMN).agg(
+        pl.col("sum").sum(),
+        pl.col("count").sum(),
+        pl.col("min").min(),
+        pl.col("max").max(),
+    )
+
+
+def finalize_partials(partials: pl.LazyFrame) -> pl.LazyFrame:
+    """
+    部分集計から最終的な集計値を計算する純粋関数
+
+    Args:
+        partials: 部分集計
+
+    Returns:
+        category, total, count, min, max, mean列を持つLazyFrame
+    """
+    return partials.select(
+        KEY_COLUMN,
+        pl.col("sum").alias("total"),
+        "count",
+        "min",
+        "max",
+        (pl.col("sum") / pl.col("count")).alias("mean"),
+    )
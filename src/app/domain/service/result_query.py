@@ -0,0 +1,24 @@
+"""保存済みの分析結果に対する範囲集計のドメインロジック"""
+
+import polars as pl
+
+from app.domain.service.partial_aggregate import KEY_COLUMN
+
+DATE_COLUMN = "date"
+
+
+def build_range_query(results: pl.LazyFrame, daily: bool = False) -> pl.LazyFrame:
+    """
+    日付範囲の分析結果からカテゴリごとの合計を求める遅延実行計画を構築する純粋関数
+
+    必要な列（date, category, total）のみを参照するため、読み込みには射影が渡される。
+
+    Args:
+        results: date, category, total列を持つ分析結果
+        daily: Trueの場合は日付ごと、Falseの場合は範囲全体で集計する
+
+    Returns:
+        （daily=Trueの場合はdate,）category, total列を持つLazyFrame
+    """
+    keys = [DATE_COLUMN, KEY_COLUMN] if daily else [KEY_COLUMN]
+    return results.group_by(keys).agg(pl.col("total").sum()).sort(keys)
@@ -0,0 +1,201 @@
+"""日付をまたいでマージできる近似スケッチ（異なり数・分位数）のドメインロジック"""
+
+import math
+from collections.abc import Sequence
+
+import polars as pl
+
+from app.domain.service.column_types import categoricals_as_strings
+from app.domain.service.partial_aggregate import KEY_COLUMN, VALUE_COLUMN
+from app.domain.value_object.sketch_spec import SketchSpec
+
+# 分位数スケッチで推定するデフォルトの分位点
+DEFAULT_QUANTILES = (0.5, 0.95, 0.99)
+
+# 値がこれより小さい場合は0のバケットに入れる
+_MIN_INDEXABLE = 1e-12
+
+# 異なり数のスケッチのハッシュ方式。整数以外の列のハッシュ（Expr.hash）はPolarsのバージョンで
+# 変わりうるため、保存先をこの値で分けて異なるハッシュ方式のレジスタをマージしないようにする
+DISTINCT_HASH_SCHEME = f"polars{pl.__version__}"
+
+
+def build_distinct_sketch_plan(lf: pl.LazyFrame, spec: SketchSpec) -> pl.LazyFrame:
+    """
+    カテゴリごとのHyperLogLogのレジスタを求める遅延実行計画を構築する純粋関数
+
+    出力はカテゴリ数×2**precision行以下に収まるため、入力の行数・異なり数によらず
+    メモリ使用量は一定になる。整数の列は整数演算（splitmix64）で、それ以外の列はPolarsの
+    hash()でハッシュする。hash()の値はPolarsのバージョンで変わりうるため、レジスタは
+    DISTINCT_HASH_SCHEMEごとに保存し、バージョンをまたいでマージしない。
+
+    Args:
+        lf: 入力LazyFrame（category列とspec.distinct_column列を持つ）
+        spec: スケッチの設定
+
+    Returns:
+        category, register, rank列を持つLazyFrame
+    """
+    column = pl.col(spec.distinct_column)
+    dtype = lf.collect_schema()[spec.distinct_column]
+    if isinstance(dtype, pl.Categorical | pl.Enum):
+        # Categoricalの物理表現（カテゴリ番号）は読み込みごとに変わるため、文字列としてハッシュする
+        column = column.cast(pl.String)
+    hashed = _splitmix64(column.cast(pl.UInt64)) if dtype.is_integer() else column.hash(seed=0)
+
+    p = spec.precision
+    rest = hashed * pl.lit(2**p, dtype=pl.UInt64)  # 上位pビットを捨てた残りのビット
+    rank = pl.min_horizontal(rest.bitwise_leading_zeros() + 1, pl.lit(64 - p + 1)).cast(pl.UInt8)
+
+    return categoricals_as_strings(
+        lf.filter(column.is_not_null())
+        .select(
+            KEY_COLUMN,
+            (hashed // pl.lit(2 ** (64 - p), dtype=pl.UInt64)).cast(pl.UInt32).alias("register"),
+            rank.alias("rank"),
+        )
+        .group_by(KEY_COLUMN, "register")
+        .agg(pl.col("rank").max())
+    )
+
+
+def merge_distinct_sketches(sketches: pl.LazyFrame) -> pl.LazyFrame:
+    """
+    複数日付のHyperLogLogのレジスタをマージする純粋関数（レジスタごとの最大値）
+
+    Args:
+        sketches: レジスタを縦に連結したLazyFrame
+
+    Returns:
+        マージ後のレジスタ
+    """
+    return sketches.group_by(KEY_COLUMN, "register").agg(pl.col("rank").max())
+
+
+def estimate_distinct(sketches: pl.LazyFrame, spec: SketchSpec) -> pl.LazyFrame:
+    """
+    HyperLogLogのレジスタからカテゴリごとの異なり数を推定する純粋関数
+
+    Args:
+        sketches: マージ済みのレジスタ
+        spec: スケッチの設定
+
+    Returns:
+        category, distinct列を持つLazyFrame
+    """
+    m = 2**spec.precision
+    alpha = 0.7213 / (1 + 1.079 / m)
+    # 値が入っていないレジスタは0として扱う（2**-0 = 1）
+    empty = pl.lit(m) - pl.len()
+    harmonic = (pl.lit(2.0) ** -pl.col("rank").cast(pl.Float64)).sum() + empty
+    raw = alpha * m * m / harmonic
+    # 推定値が小さい場合は空のレジスタ数から求める（Linear Counting）
+    estimate = (
+        pl.when((raw <= 2.5 * m) & (empty > 0))
+        .then(m * (pl.lit(float(m)) / empty.cast(pl.Float64)).log())
+        .otherwise(raw)
+    )
+    return sketches.group_by(KEY_COLUMN).agg(estimate.round().cast(pl.UInt64).alias("distinct"))
+
+
+def build_quantile_sketch_plan(lf: pl.LazyFrame, spec: SketchSpec) -> pl.LazyFrame:
+    """
+    カテゴリごとの値の分位数スケッチを求める遅延実行計画を構築する純粋関数
+
+    値を相対誤差relative_accuracyの対数バケット（DDSketch）に振り分けて件数を数える。
+    バケット数は値の範囲の対数に比例するだけで、入力の行数によらない。
+
+    Args:
+        lf: 入力LazyFrame（category, value列を持つ）
+        spec: スケッチの設定
+
+    Returns:
+        category, sign, bucket, count列を持つLazyFrame
+    """
+    value = pl.col(VALUE_COLUMN).cast(pl.Float64)
+    magnitude = value.abs()
+    log_gamma = math.log(_gamma(spec))
+    sign = pl.when(magnitude < _MIN_INDEXABLE).then(0).otherwise(value.sign()).cast(pl.Int8)
+    bucket = (
+        pl.when(magnitude < _MIN_INDEXABLE)
+        .then(0)
+        .otherwise((magnitude.log() / log_gamma).ceil())
+        .cast(pl.Int32)
+    )
+    return categoricals_as_strings(
+        lf.filter(value.is_not_null() & value.is_finite())
+        .select(KEY_COLUMN, sign.alias("sign"), bucket.alias("bucket"))
+        .group_by(KEY_COLUMN, "sign", "bucket")
+        .agg(pl.len().cast(pl.UInt64).alias("count"))
+    )
+
+
+def merge_quantile_sketches(sketches: pl.LazyFrame) -> pl.LazyFrame:
+    """
+    複数日付の分位数スケッチをマージする純粋関数（バケットごとの件数の合計）
+
+    Args:
+        sketches: 分位数スケッチを縦に連結したLazyFrame
+
+    Returns:
+        マージ後の分位数スケッチ
+    """
+    return sketches.group_by(KEY_COLUMN, "sign", "bucket").agg(pl.col("count").sum())
+
+
+def estimate_quantiles(
+    sketches: pl.LazyFrame,
+    spec: SketchSpec,
+    quantiles: Sequence[float] = DEFAULT_QUANTILES,
+) -> pl.LazyFrame:
+    """
+    分位数スケッチからカテゴリごとの分位数を推定する純粋関数
+
+    Args:
+        sketches: マージ済みの分位数スケッチ
+        spec: スケッチの設定
+        quantiles: 推定する分位点（0〜1）
+
+    Returns:
+        category列と分位点ごとの列（例: p50, p95, p99）を持つLazyFrame
+    """
+    gamma = _gamma(spec)
+    # バケットの代表値（バケットの範囲内で相対誤差が最小になる値）
+    representative = pl.col("sign").cast(pl.Float64) * (
+        2 * pl.lit(gamma) ** pl.col("bucket").cast(pl.Float64) / (gamma + 1)
+    )
+    ordered = sketches.sort(
+        KEY_COLUMN, "sign", pl.col("sign").cast(pl.Int32) * pl.col("bucket")
+    ).with_columns(
+        representative.alias("_value"),
+        pl.col("count").cum_sum().over(KEY_COLUMN).alias("_cumulative"),
+        pl.col("count").sum().over(KEY_COLUMN).alias("_total"),
+    )
+    return ordered.group_by(KEY_COLUMN).agg(
+        pl.col("_value")
+        .filter(pl.col("_cumulative") > q * (pl.col("_total") - 1))
+        .first()
+        .alias(quantile_column(q))
+        for q in quantiles
+    )
+
+
+def quantile_column(q: float) -> str:
+    """分位点の列名を返す（0.95 -> p95）"""
+    return f"p{q * 100:g}"
+
+
+def _gamma(spec: SketchSpec) -> float:
+    return (1 + spec.relative_accuracy) / (1 - spec.relative_accuracy)
+
+
+def _splitmix64(z: pl.Expr) -> pl.Expr:
+    """整数演算だけで求める64bitのハッシュ（Polarsのバージョンによらず同じ値になる）"""
+    z = z + pl.lit(0x9E3779B97F4A7C15, dtype=pl.UInt64)
+    z = _xor_shift(z, 30) * pl.lit(0xBF58476D1CE4E5B9, dtype=pl.UInt64)
+    z = _xor_shift(z, 27) * pl.lit(0x94D049BB133111EB, dtype=pl.UInt64)
+    return _xor_shift(z, 31)
+
+
+def _xor_shift(z: pl.Expr, bits: int) -> pl.Expr:
+    return z.xor(z // pl.lit(2**bits, dtype=pl.UInt64))
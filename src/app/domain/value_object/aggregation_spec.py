@@ -0,0 +1,163 @@
+"""集計仕様の値オブジェクト"""
+
+import hashlib
+import json
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+# 指定できる集計関数
+METRIC_FUNCTIONS = ("sum", "mean", "min", "max", "count", "len", "n_unique", "median", "std", "var")
+# 指定できる絞り込みの演算子
+FILTER_OPERATORS = ("eq", "ne", "lt", "le", "gt", "ge", "in", "is_null", "is_not_null")
+# 派生列で指定できる二項演算子
+DERIVED_OPERATORS = ("add", "sub", "mul", "div")
+
+# 絞り込みで比較できる値の型
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+@dataclass(frozen=True)
+class Metric:
+    """集計する指標（列と集計関数）"""
+
+    function: str
+    # 集計対象の列（function="len"の場合は不要）
+    column: str | None = None
+    # 出力列名（省略時は"{column}_{function}"、lenの場合は"len"）
+    alias: str | None = None
+
+    def __post_init__(self):
+        if self.function not in METRIC_FUNCTIONS:
+            raise ValueError(f"Unknown metric function: {self.function}")
+        if self.function != "len" and not self.column:
+            raise ValueError(f"Metric {self.function} requires a column")
+
+    @property
+    def name(self) -> str:
+        """出力列名"""
+        if self.alias:
+            return self.alias
+        return "len" if self.function == "len" else f"{self.column}_{self.function}"
+
+
+@dataclass(frozen=True)
+class Filter:
+    """集計前に適用する行の絞り込み条件"""
+
+    column: str
+    op: str
+    # 比較する値（inの場合はリスト、is_null/is_not_nullの場合は不要）
+    value: Any = None
+
+    def __post_init__(self):
+        if self.op not in FILTER_OPERATORS:
+            raise ValueError(f"Unknown filter operator: {self.op}")
+        if self.op == "in":
+            if not isinstance(self.value, list | tuple):
+                raise ValueError("Filter 'in' requires a list value")
+            # ハッシュ可能にして同じ仕様を同じキーで扱えるようにする
+            object.__setattr__(self, "value", tuple(self.value))
+        values = self.value if self.op == "in" else (self.value,)
+        if not all(isinstance(v, _SCALAR_TYPES) for v in values):
+            raise ValueError(f"Filter {self.op} values must be scalars")
+        if self.op not in ("is_null", "is_not_null") and self.value is None:
+            raise ValueError(f"Filter {self.op} requires a value")
+
+
+@dataclass(frozen=True)
+class DerivedColumn:
+    """集計前に追加する派生列（列同士、または列と数値の二項演算）"""
+
+    name: str
+    op: str
+    left: str
+    # 右辺の列名、または数値
+    right: str | float
+
+    def __post_init__(self):
+        if self.op not in DERIVED_OPERATORS:
+            raise ValueError(f"Unknown derived column operator: {self.op}")
+        if not self.name:
+            raise ValueError("Derived column name must not be empty")
+
+
+@dataclass(frozen=True)
+class AggregationSpec:
+    """
+    グループ化キー・指標・絞り込み・派生列で表す集計仕様の値オブジェクト
+
+    不変でハッシュ可能なため、同じ仕様はコンパイル済みの計画のキャッシュで共有される。
+    """
+
+    group_by: tuple[str, ...]
+    metrics: tuple[Metric, ...]
+    filters: tuple[Filter, ...] = field(default=())
+    derived: tuple[DerivedColumn, ...] = field(default=())
+
+    def __post_init__(self):
+        object.__setattr__(self, "group_by", tuple(self.group_by))
+        object.__setattr__(self, "metrics", tuple(self.metrics))
+        object.__setattr__(self, "filters", tuple(self.filters))
+        object.__setattr__(self, "derived", tuple(self.derived))
+
+        if not self.metrics:
+            raise ValueError("AggregationSpec requires at least one metric")
+        names = [*self.group_by, *(metric.name for metric in self.metrics)]
+        duplicated = sorted({name for name in names if names.count(name) > 1})
+        if duplicated:
+            raise ValueError(f"Duplicated output columns: {', '.join(duplicated)}")
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "AggregationSpec":
+        """
+        辞書（APIのリクエストやJobの環境変数のJSON）から集計仕様を作る
+
+        Args:
+            data: group_by, metrics, filters, derivedを持つ辞書
+
+        Returns:
+            集計仕様
+
+        Raises:
+            ValueError: 仕様が不正な場合
+        """
+        try:
+            return cls(
+                group_by=tuple(data.get("group_by") or ()),
+                metrics=tuple(Metric(**metric) for metric in data.get("metrics") or ()),
+                filters=tuple(Filter(**f) for f in data.get("filters") or ()),
+                derived=tuple(DerivedColumn(**d) for d in data.get("derived") or ()),
+            )
+        except TypeError as e:
+            raise ValueError(f"Invalid aggregation spec: {e}") from e
+
+    @classmethod
+    def from_json(cls, text: str) -> "AggregationSpec":
+        """
+        JSON文字列から集計仕様を作る
+
+        Args:
+            text: to_jsonで書き出したJSON文字列
+
+        Returns:
+            集計仕様
+
+        Raises:
+            ValueError: JSONまたは仕様が不正な場合
+        """
+        return cls.from_dict(json.loads(text))
+
+    def to_json(self) -> str:
+        """キーを並べた正規形のJSON文字列を返す（同じ仕様は同じ文字列になる）"""
+        return json.dumps(asdict(self), sort_keys=True, separators=(",", ":"))
+
+    def fingerprint(self) -> str:
+        """仕様を識別するハッシュ値を返す"""
+        return hashlib.sha256(self.to_json().encode("utf-8")).hexdigest()
+
+    @property
+    def result_partition(self) -> str:
+        """
+        この仕様の結果を既定の集計の結果と区別する名前（specs/と指紋の先頭16文字）
+        """
+        return f"specs/{self.fingerprint()[:16]}"
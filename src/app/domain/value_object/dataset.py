@@ -1,7 +1,12 @@
 """データセットの値オブジェクト"""
 
+import hashlib
+import re
 from dataclasses import dataclass
 
+# URL中の日付（20240101 / 2024-01-01 / 2024_01_01）
+_DATE_PATTERN = re.compile(r"(?<!\d)\d{4}([-_]?)\d{2}\1\d{2}(?!\d)")
+
 
 @dataclass(frozen=True)
 class Dataset:
@@ -12,3 +17,20 @@ class Dataset:
     def __post_init__(self):
         if not self.url:
             raise ValueError("Dataset URL must not be empty")
+
+    @property
+    def result_partition(self) -> str:
+        """
+        バッチ実行の結果をデータセットごとに区別する名前（URLのハッシュの先頭16文字）
+        """
+        return hashlib.sha256(self.url.encode("utf-8")).hexdigest()[:16]
+
+    @property
+    def schema_key(self) -> str:
+        """
+        スキーマの登録に使うキー
+
+        日付ごとに配信される同じフィードのファイルが同じスキーマを共有するよう、
+        URL中の日付を{date}に置き換え、クエリ文字列を除く。
+        """
+        return _DATE_PATTERN.sub("{date}", self.url.split("?", 1)[0])
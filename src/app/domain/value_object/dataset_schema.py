@@ -0,0 +1,100 @@
+"""データセットのスキーマの値オブジェクト"""
+
+import json
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+import polars as pl
+
+# スキーマに指定できる型（Polarsの型名）
+SCHEMA_DTYPES = (
+    "String",
+    "Categorical",
+    "Boolean",
+    "Int8",
+    "Int16",
+    "Int32",
+    "Int64",
+    "UInt8",
+    "UInt16",
+    "UInt32",
+    "UInt64",
+    "Float32",
+    "Float64",
+)
+
+
+@dataclass(frozen=True)
+class DatasetSchema:
+    """
+    CSVを読み込むときに固定する列の型
+
+    指定した列は型推論を行わずにこの型で読み込む。値が型に収まらない場合は読み込みが失敗する
+    （値が丸められたり桁あふれしたりすることは無い）。
+    """
+
+    # (列名, 型名)のタプル（CSVの列順）
+    columns: tuple[tuple[str, str], ...]
+
+    def __post_init__(self):
+        if not self.columns:
+            raise ValueError("DatasetSchema must have at least one column")
+        names = [name for name, _ in self.columns]
+        if len(set(names)) != len(names):
+            raise ValueError("DatasetSchema column names must be unique")
+        for name, dtype in self.columns:
+            if dtype not in SCHEMA_DTYPES:
+                raise ValueError(
+                    f"Unsupported dtype for column {name}: {dtype} "
+                    f"(expected one of {', '.join(SCHEMA_DTYPES)})"
+                )
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "DatasetSchema":
+        """
+        {"columns": {列名: 型名}}形式の辞書からスキーマを作る
+
+        Args:
+            data: スキーマの辞書
+
+        Returns:
+            スキーマ
+
+        Raises:
+            ValueError: 形式や型名が不正な場合
+        """
+        columns = data.get("columns")
+        if not isinstance(columns, Mapping):
+            raise ValueError("DatasetSchema requires a 'columns' mapping")
+        return cls(columns=tuple((str(name), str(dtype)) for name, dtype in columns.items()))
+
+    @classmethod
+    def from_json(cls, text: str) -> "DatasetSchema":
+        """
+        JSONからスキーマを作る
+
+        Args:
+            text: to_jsonで書き出したJSON
+
+        Returns:
+            スキーマ
+        """
+        return cls.from_dict(json.loads(text))
+
+    def to_dict(self) -> dict[str, Any]:
+        """{"columns": {列名: 型名}}形式の辞書を返す"""
+        return {"columns": dict(self.columns)}
+
+    def to_json(self) -> str:
+        """人が編集しやすいよう、列順を保ったまま整形したJSONを返す"""
+        return json.dumps(self.to_dict(), indent=2)
+
+    def polars_schema(self) -> dict[str, pl.DataType]:
+        """
+        scan_csvのschema_overridesに渡す型の辞書を返す
+
+        Returns:
+            列名 → Polarsの型
+        """
+        return {name: getattr(pl, dtype)() for name, dtype in self.columns}
@@ -0,0 +1,41 @@
+"""日付範囲の値オブジェクト"""
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+
+@dataclass(frozen=True)
+class DateRange:
+    """開始日と終了日（いずれも含む）で表す日付範囲の値オブジェクト"""
+
+    start: date
+    end: date
+
+    def __post_init__(self):
+        if not isinstance(self.start, date) or not isinstance(self.end, date):
+            raise ValueError("DateRange bounds must be date objects")
+        if self.end < self.start:
+            raise ValueError("DateRange end must not be before start")
+
+    def __len__(self) -> int:
+        return (self.end - self.start).days + 1
+
+    def date_at(self, index: int) -> date:
+        """
+        開始日からindex日後の日付を返す
+
+        Args:
+            index: 開始日からの日数（0始まり）
+
+        Returns:
+            日付
+
+        Raises:
+            IndexError: 範囲外の場合
+        """
+        if not 0 <= index < len(self):
+            raise IndexError(f"Index {index} is out of range for {len(self)} days")
+        return self.start + timedelta(days=index)
+
+    def __str__(self) -> str:
+        return f"{self.start.isoformat()}..{self.end.isoformat()}"
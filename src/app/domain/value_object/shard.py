@@ -0,0 +1,32 @@
+"""シャードの値オブジェクト"""
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Shard:
+    """1つの入力をcount個に分割したうちのindex番目（0始まり）を表す値オブジェクト"""
+
+    index: int
+    count: int
+
+    def __post_init__(self):
+        if self.count < 1:
+            raise ValueError("Shard count must be at least 1")
+        if not 0 <= self.index < self.count:
+            raise ValueError(f"Shard index {self.index} is out of range for {self.count} shards")
+
+    def byte_range(self, size: int) -> tuple[int, int]:
+        """
+        サイズsizeの入力をほぼ均等に分割したときの、このシャードのバイト範囲を返す
+
+        Args:
+            size: 入力のバイト数
+
+        Returns:
+            開始オフセットと終了オフセット（終了は含まない）
+        """
+        return size * self.index // self.count, size * (self.index + 1) // self.count
+
+    def __str__(self) -> str:
+        return f"{self.index + 1}/{self.count}"
@@ -0,0 +1,26 @@
+"""近似スケッチの設定の値オブジェクト"""
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class SketchSpec:
+    """
+    分析時に作成する近似スケッチの設定
+
+    保存済みのスケッチと同じ設定でなければマージできないため、変更した場合は対象期間を
+    再計算する。
+    """
+
+    # 異なり数を数える列（Noneの場合は異なり数のスケッチを作らない）
+    distinct_column: str | None = None
+    # HyperLogLogのレジスタ数の指数（レジスタ数は2**precision、標準誤差は約1.04/sqrt(2**precision)）
+    precision: int = 12
+    # 分位数スケッチの相対誤差（0.01の場合、推定値は真の値の±1%以内）
+    relative_accuracy: float = 0.01
+
+    def __post_init__(self):
+        if not 4 <= self.precision <= 18:
+            raise ValueError(f"precision must be between 4 and 18: {self.precision}")
+        if not 0 < self.relative_accuracy < 1:
+            raise ValueError(f"relative_accuracy must be between 0 and 1: {self.relative_accuracy}")
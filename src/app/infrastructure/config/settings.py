@@ -12,6 +12,119 @@ class Settings:
     s3_prefix: str = "analysis-results/daily"
     dataset_url: str = ""
     target_date: str = ""
+    # 結果の保存先（local: LOCAL_RESULT_DIR配下 / s3: S3_BUCKETのS3_PREFIX配下）
+    result_store: str = "local"
+    # RESULT_STORE=localの場合の結果の保存先ディレクトリ
+    local_result_dir: str = "/tmp"
+    # S3互換ストレージ（MinIOなど）のエンドポイント（空の場合はAWS S3）
+    s3_endpoint_url: str = ""
+    # マルチパートアップロードの1パートあたりのバイト数（デフォルト: 8MiB）
+    s3_multipart_part_size: int = 8 * 1024**2
+    # マルチパートアップロードで並行に送信するパート数
+    s3_upload_concurrency: int = 4
+    # APIで読み込んだ結果をメモリ上に保持するバイト数の上限（デフォルト: 256MiB）
+    result_cache_max_bytes: int = 256 * 1024**2
+    # APIで読み込んだ結果を再利用する秒数
+    result_cache_ttl_seconds: float = 300.0
+    # 結果の配置（single: 日付ごとに1ファイル / hive: date=…/category_bucket=…に分割）
+    result_layout: str = "single"
+    # hive配置でカテゴリを振り分けるバケット数
+    result_category_buckets: int = 16
+    # 結果のParquetの圧縮方式・圧縮レベル・行グループの行数（未指定の場合はPolarsの既定値）
+    parquet_compression: str = "zstd"
+    parquet_compression_level: int | None = None
+    parquet_row_group_size: int | None = None
+    # 同一入力・同一日付・同一分析バージョンの結果を再利用するか
+    result_memo: bool = True
+    # メモ化を無視して再計算するか（Job用）
+    force: bool = False
+    # サンプリングプロファイラーとPolarsの計画のプロファイルを取得して結果の横に保存するか（Job用）
+    analysis_profile: bool = False
+    # 集計仕様のJSON（空の場合はカテゴリごとの合計値を求める。Job用）
+    analysis_aggregation: str = ""
+    # カテゴリごとの異なり数・分位数の近似スケッチを結果と並べて保存するか
+    analysis_sketches: bool = False
+    # 異なり数を数える列（空の場合は分位数のスケッチのみ作る）
+    sketch_distinct_column: str = ""
+    # HyperLogLogのレジスタ数の指数（標準誤差は約1.04/sqrt(2**精度)）
+    sketch_hll_precision: int = 12
+    # 分位数スケッチの相対誤差
+    sketch_relative_accuracy: float = 0.01
+    # APIで同時に実行する分析の最大数
+    run_max_concurrency: int = 2
+    # APIで実行待ちにできる分析の最大数（超過時は429を返す）
+    run_max_queue: int = 8
+    # ローカルJobキューのSQLiteファイル（空の場合は全てK8s Jobで実行する）
+    local_job_db: str = ""
+    # ローカルJobのワーカープロセス数
+    local_job_workers: int = 2
+    # ローカルJobで実行するデータセットの最大バイト数（デフォルト: 256MiB）
+    local_job_max_bytes: int = 256 * 1024**2
+    # ローカルジョブのリースの長さ（秒。延長されずに期限が切れたジョブは他のワーカーが再実行する）
+    local_job_lease_seconds: float = 60.0
+    # Job一覧・状態をWatchで更新するインメモリインデックスから返すか
+    job_informer: bool = False
+    # Jobインデックスの一覧を取り直す間隔（秒）
+    job_informer_resync_seconds: float = 300.0
+    # データセットの読み込みモード（lazy: scan_csv / eager: read_csv）
+    load_mode: str = "lazy"
+    # 分析計画をcollectするPolarsエンジン（streaming / in-memory）
+    analysis_engine: str = "streaming"
+    # 分析のメモリの上限（バイト）
+    # 0より大きい場合は入力をチャンク単位で集計し、上限を超えた部分集計をディスクに退避する
+    analysis_memory_budget_bytes: int = 0
+    # チャンク単位で集計する場合に1回に読み込む行数
+    analysis_chunk_rows: int = 1_000_000
+    # チャンク単位の集計で部分集計を退避するディレクトリ（空の場合はシステムの一時ディレクトリ）
+    analysis_spill_dir: str = ""
+    # 1つのデータセットを分割して集計するシャード数（2以上の場合、JobはIndexed Jobのマッパー）
+    analysis_shards: int = 1
+    # 分割実行を識別するID（同じ実行のマッパーで共通。シャードの部分集計の保存先に使う）
+    analysis_shard_run_id: str = ""
+    # シャードの行を取得する一時ファイルのディレクトリ（空の場合はシステムの一時ディレクトリ）
+    shard_work_dir: str = ""
+    # データセットごとに学習・登録したスキーマ（Categorical・縮小した数値型）でCSVを読み込むか
+    schema_registry: bool = False
+    # スキーマの学習時にCategoricalで読み込む列（カンマ区切り。空の場合は文字列のまま。
+    # 種類数が多い列はCategoricalにするとメモリは減るが、読み込みは遅くなる）
+    schema_categorical_columns: str = "category"
+    # データセットキャッシュのディレクトリ（空の場合はキャッシュしない）
+    dataset_cache_dir: str = ""
+    # データセットキャッシュのバイト数上限（デフォルト: 10GiB）
+    dataset_cache_max_bytes: int = 10 * 1024**3
+    # 並列ダウンロードのワーカー数（1の場合は単一ストリーム）
+    download_workers: int = 1
+    # 並列ダウンロードの1パートあたりのバイト数（デフォルト: 64MiB）
+    download_part_size: int = 64 * 1024**2
+    # キャッシュ無しで並列ダウンロードする場合のダウンロード先（空の場合は一時ディレクトリ）
+    download_dir: str = ""
+    # 列指向変換の保存先（空の場合は変換しない）
+    columnar_cache_dir: str = ""
+    # 列指向変換のフォーマット（parquet / ipc）
+    columnar_format: str = "parquet"
+    # 列指向変換の保存先のバイト数上限（デフォルト: 10GiB。0の場合は無制限）
+    columnar_store_max_bytes: int = 10 * 1024**3
+    # バックフィルJobのデータセットURLテンプレート（{date}を対象日付に置き換える）
+    dataset_url_template: str = ""
+    # バックフィルJobの開始日・終了日（空の場合は単一日付のJob）
+    backfill_start_date: str = ""
+    backfill_end_date: str = ""
+    # バッチ分析でデータセットの読み込み・保存を並行に行うスレッド数
+    batch_max_workers: int = 8
+    # Indexed JobでPodに割り当てられるインデックス
+    job_completion_index: int = 0
+    # データセットのサイズと過去のピークメモリからJobのリソースを見積もるか
+    job_adaptive_resources: bool = True
+    # Jobのピークメモリ使用量を結果の保存先へ記録し、次回のJobの見積もりに使うか
+    job_resource_history: bool = False
+    # 見積もったメモリに掛ける余裕率
+    job_memory_headroom: float = 1.5
+    # Jobのメモリ上限値（デフォルト: 16GiB）
+    job_memory_max_bytes: int = 16 * 1024**3
+    # JobのCPU上限値（ミリコア）
+    job_cpu_max_millis: int = 4000
+    # Jobのメモリ上限値のうち分析のメモリの上限としてJobに渡す割合（0の場合は渡さない）
+    job_memory_budget_fraction: float = 0.0
 
     @classmethod
     def from_env(cls) -> "Settings":
@@ -21,4 +134,69 @@ class Settings:
             s3_prefix=os.getenv("S3_PREFIX", "analysis-results/daily"),
             dataset_url=os.getenv("DATASET_URL", ""),
             target_date=os.getenv("TARGET_DATE", ""),
+            result_store=os.getenv("RESULT_STORE", "local"),
+            local_result_dir=os.getenv("LOCAL_RESULT_DIR", "/tmp"),
+            s3_endpoint_url=os.getenv("S3_ENDPOINT_URL", ""),
+            s3_multipart_part_size=int(os.getenv("S3_MULTIPART_PART_SIZE", str(8 * 1024**2))),
+            s3_upload_concurrency=int(os.getenv("S3_UPLOAD_CONCURRENCY", "4")),
+            result_cache_max_bytes=int(os.getenv("RESULT_CACHE_MAX_BYTES", str(256 * 1024**2))),
+            result_cache_ttl_seconds=float(os.getenv("RESULT_CACHE_TTL_SECONDS", "300")),
+            result_layout=os.getenv("RESULT_LAYOUT", "single"),
+            result_category_buckets=int(os.getenv("RESULT_CATEGORY_BUCKETS", "16")),
+            parquet_compression=os.getenv("PARQUET_COMPRESSION", "zstd"),
+            parquet_compression_level=_optional_int(os.getenv("PARQUET_COMPRESSION_LEVEL", "")),
+            parquet_row_group_size=_optional_int(os.getenv("PARQUET_ROW_GROUP_SIZE", "")),
+            result_memo=os.getenv("RESULT_MEMO", "true").lower() in ("1", "true", "yes"),
+            force=os.getenv("FORCE", "false").lower() in ("1", "true", "yes"),
+            analysis_profile=os.getenv("ANALYSIS_PROFILE", "false").lower() in ("1", "true", "yes"),
+            analysis_aggregation=os.getenv("ANALYSIS_AGGREGATION", ""),
+            analysis_sketches=os.getenv("ANALYSIS_SKETCHES", "false").lower()
+            in ("1", "true", "yes"),
+            sketch_distinct_column=os.getenv("SKETCH_DISTINCT_COLUMN", ""),
+            sketch_hll_precision=int(os.getenv("SKETCH_HLL_PRECISION", "12")),
+            sketch_relative_accuracy=float(os.getenv("SKETCH_RELATIVE_ACCURACY", "0.01")),
+            run_max_concurrency=int(os.getenv("RUN_MAX_CONCURRENCY", "2")),
+            run_max_queue=int(os.getenv("RUN_MAX_QUEUE", "8")),
+            local_job_db=os.getenv("LOCAL_JOB_DB", ""),
+            local_job_workers=int(os.getenv("LOCAL_JOB_WORKERS", "2")),
+            local_job_max_bytes=int(os.getenv("LOCAL_JOB_MAX_BYTES", str(256 * 1024**2))),
+            local_job_lease_seconds=float(os.getenv("LOCAL_JOB_LEASE_SECONDS", "60")),
+            job_informer=os.getenv("JOB_INFORMER", "false").lower() in ("1", "true", "yes"),
+            job_informer_resync_seconds=float(os.getenv("JOB_INFORMER_RESYNC_SECONDS", "300")),
+            load_mode=os.getenv("LOAD_MODE", "lazy"),
+            analysis_engine=os.getenv("ANALYSIS_ENGINE", "streaming"),
+            analysis_memory_budget_bytes=int(os.getenv("ANALYSIS_MEMORY_BUDGET_BYTES", "0")),
+            analysis_chunk_rows=int(os.getenv("ANALYSIS_CHUNK_ROWS", "1000000")),
+            analysis_spill_dir=os.getenv("ANALYSIS_SPILL_DIR", ""),
+            analysis_shards=int(os.getenv("ANALYSIS_SHARDS", "1")),
+            analysis_shard_run_id=os.getenv("ANALYSIS_SHARD_RUN_ID", ""),
+            shard_work_dir=os.getenv("SHARD_WORK_DIR", ""),
+            schema_registry=os.getenv("SCHEMA_REGISTRY", "false").lower() in ("1", "true", "yes"),
+            schema_categorical_columns=os.getenv("SCHEMA_CATEGORICAL_COLUMNS", "category"),
+            dataset_cache_dir=os.getenv("DATASET_CACHE_DIR", ""),
+            dataset_cache_max_bytes=int(os.getenv("DATASET_CACHE_MAX_BYTES", str(10 * 1024**3))),
+            download_workers=int(os.getenv("DOWNLOAD_WORKERS", "1")),
+            download_part_size=int(os.getenv("DOWNLOAD_PART_SIZE", str(64 * 1024**2))),
+            download_dir=os.getenv("DOWNLOAD_DIR", ""),
+            columnar_cache_dir=os.getenv("COLUMNAR_CACHE_DIR", ""),
+            columnar_format=os.getenv("COLUMNAR_FORMAT", "parquet"),
+            columnar_store_max_bytes=int(os.getenv("COLUMNAR_STORE_MAX_BYTES", str(10 * 1024**3))),
+            dataset_url_template=os.getenv("DATASET_URL_TEMPLATE", ""),
+            backfill_start_date=os.getenv("BACKFILL_START_DATE", ""),
+            backfill_end_date=os.getenv("BACKFILL_END_DATE", ""),
+            batch_max_workers=int(os.getenv("BATCH_MAX_WORKERS", "8")),
+            job_completion_index=int(os.getenv("JOB_COMPLETION_INDEX", "0")),
+            job_adaptive_resources=os.getenv("JOB_ADAPTIVE_RESOURCES", "true").lower()
+            in ("1", "true", "yes"),
+            job_resource_history=os.getenv("JOB_RESOURCE_HISTORY", "false").lower()
+            in ("1", "true", "yes"),
+            job_memory_headroom=float(os.getenv("JOB_MEMORY_HEADROOM", "1.5")),
+            job_memory_max_bytes=int(os.getenv("JOB_MEMORY_MAX_BYTES", str(16 * 1024**3))),
+            job_cpu_max_millis=int(os.getenv("JOB_CPU_MAX_MILLIS", "4000")),
+            job_memory_budget_fraction=float(os.getenv("JOB_MEMORY_BUDGET_FRACTION", "0")),
         )
+
+
+def _optional_int(value: str) -> int | None:
+    """空文字の場合はNone、それ以外は整数に変換する"""
+    return int(value) if value else None
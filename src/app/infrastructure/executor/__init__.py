@@ -0,0 +1 @@
+"""Executor"""
@@ -0,0 +1,112 @@
+"""分割実行のマッパーをローカルのワーカープロセスで実行する実装"""
+
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from app.usecase.dto.run_analysis_output import RunAnalysisOutput
+from app.usecase.dto.sharded_analysis_input import ShardedAnalysisInput
+from app.usecase.ports.input.sharded_analysis_usecase import ShardedAnalysisUseCase
+
+logger = logging.getLogger(__name__)
+
+
+def _run_mapper(
+    dataset_url: str, target_date: str, run_id: str, shard_count: int, shard_index: int
+) -> tuple[bool, str, str]:
+    """
+    ワーカープロセスで1つのシャードを集計する（K8sのマッパーPodに相当）
+
+    Args:
+        dataset_url: データセットURL
+        target_date: 対象日付
+        run_id: 分割実行を識別するID
+        shard_count: シャード数
+        shard_index: シャードのインデックス
+
+    Returns:
+        成功したか・シャードの部分集計の保存先・メッセージ
+    """
+    from datetime import date
+
+    from app.domain.value_object.dataset import Dataset
+    from app.domain.value_object.target_date import TargetDate
+    from app.wiring import build_sharded_usecase
+
+    output = build_sharded_usecase().map_shard(
+        ShardedAnalysisInput(
+            dataset=Dataset(url=dataset_url),
+            target_date=TargetDate(value=date.fromisoformat(target_date)),
+            run_id=run_id,
+            shard_count=shard_count,
+        ),
+        shard_index,
+    )
+    return output.success, output.result_path, output.message
+
+
+class LocalShardExecutor:
+    """
+    K8sのマッパーPodの代わりにローカルのワーカープロセスで全シャードを集計し、
+    最後にこのプロセスでマージする
+
+    マッパーとリデューサーはK8sで実行する場合と同じユースケースを使うため、
+    クラスター無しで分割実行を確認できる。ワーカーはK8sのマッパーPodと同様に
+    環境変数の設定からユースケースを構築する。
+    """
+
+    def __init__(self, usecase: ShardedAnalysisUseCase, max_workers: int = 2):
+        """
+        初期化
+
+        Args:
+            usecase: マージに使う分割実行ユースケース
+            max_workers: ワーカープロセス数
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.usecase = usecase
+        self.max_workers = max_workers
+
+    def run(self, input: ShardedAnalysisInput) -> RunAnalysisOutput:
+        """
+        全シャードをワーカープロセスで集計し、部分集計をマージして結果を保存する
+
+        Args:
+            input: 分割実行の入力
+
+        Returns:
+            分析実行の出力（失敗したシャードがある場合はマージせずに失敗を返す）
+        """
+        failures: list[str] = []
+        # Polarsのスレッドプールをfork後に使うとデッドロックし得るためspawnを使う
+        with ProcessPoolExecutor(
+            max_workers=min(self.max_workers, input.shard_count),
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            futures = [
+                executor.submit(
+                    _run_mapper,
+                    input.dataset.url,
+                    str(input.target_date),
+                    input.run_id,
+                    input.shard_count,
+                    index,
+                )
+                for index in range(input.shard_count)
+            ]
+            for index, future in enumerate(futures):
+                try:
+                    success, _, message = future.result()
+                except Exception as e:
+                    success, message = False, f"Worker failed: {e}"
+                if not success:
+                    failures.append(f"shard {index + 1}/{input.shard_count}: {message}")
+
+        if failures:
+            return RunAnalysisOutput(
+                result_path="", success=False, message=f"Mappers failed: {'; '.join(failures)}"
+            )
+
+        logger.info(f"Mapped {input.shard_count} shards of {input.dataset.url}, reducing")
+        return self.usecase.reduce(input)
@@ -0,0 +1,137 @@
+"""メモリの上限を超えた部分集計をローカルディスクに退避しながら集計する実装"""
+
+import logging
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+import polars as pl
+
+from app.domain.service.partial_aggregate import (
+    KEY_COLUMN,
+    VALUE_COLUMN,
+    build_partial_plan,
+    merge_partials,
+)
+from app.usecase.dto.chunked_partial import ChunkedPartial
+from app.usecase.ports.output.chunked_aggregator import ChunkedAggregator
+
+logger = logging.getLogger(__name__)
+
+
+class SpillingAggregator(ChunkedAggregator):
+    """
+    入力をチャンク単位で読み込み、部分集計の状態をメモリの上限内に保つ実装
+
+    各チャンクの部分集計をメモリ上の状態にマージし、状態が上限の半分を超えたら
+    Parquetとして退避して空にする（残りの半分は読み込み中のチャンクとマージに使う）。
+    最後に退避したファイルをストリーミングでマージするため、入力全体をメモリに載せない。
+    """
+
+    def __init__(
+        self,
+        memory_budget: int,
+        chunk_rows: int = 1_000_000,
+        spill_dir: str | None = None,
+    ):
+        """
+        初期化
+
+        Args:
+            memory_budget: 部分集計の状態とチャンクに使うメモリの上限（バイト）
+            chunk_rows: 1回に読み込む行数
+            spill_dir: 退避先のディレクトリ（Noneの場合はシステムの一時ディレクトリ）
+        """
+        if memory_budget <= 0:
+            raise ValueError("memory_budget must be positive")
+        if chunk_rows <= 0:
+            raise ValueError("chunk_rows must be positive")
+        self.memory_budget = memory_budget
+        self.chunk_rows = chunk_rows
+        self.spill_dir = spill_dir
+
+    @contextmanager
+    def aggregate(self, lf: pl.LazyFrame) -> Iterator[ChunkedPartial]:
+        """
+        入力の部分集計をメモリの上限内で求める
+
+        Args:
+            lf: 入力LazyFrame（category, value列を持つ）
+
+        Yields:
+            マージ後の部分集計を読み込む計画と入力の行数（コンテキストを抜けると一時ファイルを
+            削除する）
+        """
+        if self.spill_dir:
+            Path(self.spill_dir).mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory(prefix="odf-spill-", dir=self.spill_dir) as tmp_dir:
+            spills, rows_in, chunks = self._spill_partials(
+                lf.select(KEY_COLUMN, VALUE_COLUMN), Path(tmp_dir)
+            )
+            if len(spills) == 1:
+                yield ChunkedPartial(pl.scan_parquet(spills[0]), rows_in, chunks)
+                return
+
+            # 退避したファイル同士をストリーミングでマージする
+            merged = Path(tmp_dir) / "partial.parquet"
+            merge_partials(pl.scan_parquet(spills)).sink_parquet(merged)
+            yield ChunkedPartial(pl.scan_parquet(merged), rows_in, chunks)
+
+    def _spill_partials(self, lf: pl.LazyFrame, spill_dir: Path) -> tuple[list[Path], int, int]:
+        """
+        チャンクごとの部分集計をマージし、上限を超えるたびに退避したファイルを返す
+
+        Returns:
+            退避したファイル・読み込んだ行数・チャンク数
+        """
+        spills: list[Path] = []
+        state: pl.DataFrame | None = None
+        chunks = 0
+        rows = 0
+
+        for chunk in self._iter_chunks(lf):
+            chunks += 1
+            rows += chunk.height
+            partial = build_partial_plan(chunk.lazy()).collect()
+            if state is not None:
+                partial = merge_partials(pl.concat([state, partial]).lazy()).collect()
+            state = partial
+
+            if state.estimated_size() > self.memory_budget // 2:
+                spills.append(self._write(state, spill_dir, len(spills)))
+                state = None
+
+        # 最後の状態も退避して、マージ時にメモリ上の状態を持たないようにする
+        if state is None and not spills:
+            state = pl.DataFrame(schema=build_partial_plan(lf).collect_schema())
+        if state is not None:
+            spills.append(self._write(state, spill_dir, len(spills)))
+
+        logger.info(f"Aggregated {chunks} chunks into {len(spills)} spill files")
+        return spills, rows, chunks
+
+    def _iter_chunks(self, lf: pl.LazyFrame) -> Iterator[pl.DataFrame]:
+        """
+        入力をchunk_rows行ずつ読み込む
+
+        LazyFrame.collect_batchesが無いPolarsでは、行の範囲を指定して順に読み込む。
+        """
+        if hasattr(lf, "collect_batches"):
+            yield from lf.collect_batches(chunk_size=self.chunk_rows, engine="streaming")
+            return
+
+        offset = 0
+        while True:
+            chunk = lf.slice(offset, self.chunk_rows).collect(engine="streaming")
+            if chunk.height:
+                yield chunk
+            if chunk.height < self.chunk_rows:
+                return
+            offset += self.chunk_rows
+
+    @staticmethod
+    def _write(state: pl.DataFrame, spill_dir: Path, index: int) -> Path:
+        path = spill_dir / f"spill-{index:05d}.parquet"
+        state.write_parquet(path)
+        return path
@@ -0,0 +1,215 @@
+"""Watchで更新し続けるJobのインメモリインデックス（Informer）"""
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Jobの一覧を取得する関数（V1JobList相当: items, metadata.resource_versionを持つ）
+ListFunc = Callable[[], Any]
+# resourceVersionとタイムアウト秒数を受け取り、Watchイベント（type, object）を返す関数
+WatchFunc = Callable[[str, int], Iterable[dict[str, Any]]]
+
+
+class ResourceVersionExpiredError(Exception):
+    """Watchの再開に使うresourceVersionが古くなった（410 Gone）場合の例外"""
+
+
+class JobInformer:
+    """
+    1回の一覧取得とWatchストリームで最新に保つJobのインデックス
+
+    - 起動時に一覧を取得し、その時点のresourceVersionからWatchを開始する
+    - Watchが切れた場合は最後に受け取ったresourceVersionから再開する
+    - resourceVersionが古くなった場合（410 Gone）と、resync_periodごとに一覧を取り直す
+
+    一覧・状態照会はAPIサーバーへ問い合わせずにこのインデックスから返す。
+    """
+
+    def __init__(
+        self,
+        list_func: ListFunc,
+        watch_func: WatchFunc,
+        resync_period: float = 300.0,
+        watch_timeout: int = 60,
+        retry_interval: float = 1.0,
+    ):
+        """
+        初期化
+
+        Args:
+            list_func: Jobの一覧を取得する関数
+            watch_func: Watchイベントを返す関数
+            resync_period: 一覧を取り直す間隔（秒）
+            watch_timeout: 1回のWatchのタイムアウト（秒）
+            retry_interval: エラー発生時に再試行するまでの待ち時間（秒）
+        """
+        self.list_func = list_func
+        self.watch_func = watch_func
+        self.resync_period = resync_period
+        self.watch_timeout = watch_timeout
+        self.retry_interval = retry_interval
+
+        self._index: dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._synced = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._resource_version = ""
+        self._last_sync = 0.0
+
+    @property
+    def has_synced(self) -> bool:
+        """初回の一覧取得が完了しているかを返す"""
+        return self._synced.is_set()
+
+    @property
+    def resource_version(self) -> str:
+        """最後に反映したresourceVersionを返す"""
+        return self._resource_version
+
+    def start(self) -> "JobInformer":
+        """
+        バックグラウンドスレッドで一覧取得とWatchを開始する
+
+        Returns:
+            自身
+        """
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="job-informer", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Watchを停止する（実行中のWatchはタイムアウトまでに終了する）"""
+        self._stop.set()
+        self._thread = None
+
+    def wait_for_sync(self, timeout: float | None = None) -> bool:
+        """
+        初回の一覧取得の完了を待つ
+
+        Args:
+            timeout: 待ち時間の上限（秒）
+
+        Returns:
+            同期済みの場合True
+        """
+        return self._synced.wait(timeout)
+
+    def list(self) -> list[Any]:
+        """インデックス上の全Jobを返す"""
+        with self._lock:
+            return list(self._index.values())
+
+    def get(self, name: str) -> Any | None:
+        """
+        インデックスからJobを取得する
+
+        Args:
+            name: Job名
+
+        Returns:
+            Jobオブジェクト（存在しない場合はNone）
+        """
+        with self._lock:
+            return self._index.get(name)
+
+    def upsert(self, job: Any) -> None:
+        """
+        Jobをインデックスに反映する（作成直後のJobをWatchの到着前に見えるようにする）
+
+        Args:
+            job: Jobオブジェクト
+        """
+        with self._lock:
+            current = self._index.get(job.metadata.name)
+            if current is None or self._is_newer(job, current):
+                self._index[job.metadata.name] = job
+
+    def remove(self, name: str) -> None:
+        """
+        Jobをインデックスから削除する
+
+        Args:
+            name: Job名
+        """
+        with self._lock:
+            self._index.pop(name, None)
+
+    def relist(self) -> None:
+        """一覧を取り直してインデックスを置き換える"""
+        job_list = self.list_func()
+        with self._lock:
+            self._index = {job.metadata.name: job for job in job_list.items}
+            self._resource_version = job_list.metadata.resource_version or ""
+        self._last_sync = time.monotonic()
+        self._synced.set()
+        logger.info(
+            f"Job informer synced {len(job_list.items)} jobs "
+            f"(resourceVersion={self._resource_version})"
+        )
+
+    def handle_event(self, event: dict[str, Any]) -> None:
+        """
+        Watchイベントをインデックスに反映する
+
+        Args:
+            event: Watchイベント（type, object）
+
+        Raises:
+            ResourceVersionExpiredError: resourceVersionが古くなった場合
+        """
+        event_type = event.get("type")
+        obj = event.get("object")
+
+        if event_type == "ERROR":
+            code = obj.get("code") if isinstance(obj, dict) else getattr(obj, "code", None)
+            if code == 410:
+                raise ResourceVersionExpiredError(str(obj))
+            logger.warning(f"Job informer received error event: {obj}")
+            return
+
+        resource_version = obj.metadata.resource_version
+        with self._lock:
+            if event_type in ("ADDED", "MODIFIED"):
+                self._index[obj.metadata.name] = obj
+            elif event_type == "DELETED":
+                self._index.pop(obj.metadata.name, None)
+            # BOOKMARKはresourceVersionの更新のみ
+            if resource_version:
+                self._resource_version = resource_version
+
+    def _run(self) -> None:
+        """一覧取得とWatchを停止されるまで繰り返す"""
+        need_relist = True
+        while not self._stop.is_set():
+            try:
+                resync_due = time.monotonic() - self._last_sync >= self.resync_period
+                if need_relist or resync_due:
+                    self.relist()
+                    need_relist = False
+
+                for event in self.watch_func(self._resource_version, self.watch_timeout):
+                    if self._stop.is_set():
+                        return
+                    self.handle_event(event)
+            except ResourceVersionExpiredError:
+                logger.info("Job informer resourceVersion expired, relisting")
+                need_relist = True
+            except Exception as e:
+                if getattr(e, "status", None) == 410:
+                    need_relist = True
+                logger.warning(f"Job informer watch failed: {e}")
+                self._stop.wait(self.retry_interval)
+
+    @staticmethod
+    def _is_newer(job: Any, current: Any) -> bool:
+        try:
+            return int(job.metadata.resource_version) >= int(current.metadata.resource_version)
+        except (TypeError, ValueError):
+            return True
@@ -2,12 +2,19 @@
 
 import logging
 import sys
+import threading
 from typing import Any
 
-from kubernetes import client, config
-from kubernetes.client.rest import ApiException
-
+from app.domain.value_object.aggregation_spec import AggregationSpec
+from app.domain.value_object.date_range import DateRange
 from app.infrastructure.config.settings import Settings
+from app.infrastructure.k8s.job_informer import JobInformer
+from app.infrastructure.k8s.resource_estimator import (
+    DEFAULT_JOB_RESOURCES,
+    JobResources,
+    ResourceEstimator,
+)
+from app.usecase.dto.dataset_probe import DatasetProbe
 
 # ロガーを設定
 logging.basicConfig(
@@ -21,40 +28,101 @@ logger = logging.getLogger(__name__)
 class JobLauncher:
     """Kubernetes Jobを起動する実装"""
 
-    def __init__(self, settings: Settings | None = None, namespace: str = "default"):
+    # このサービスが作成するJobに付与するラベル
+    LABEL_SELECTOR = "app=polars-analysis"
+
+    def __init__(
+        self,
+        settings: Settings | None = None,
+        namespace: str = "default",
+        use_informer: bool = False,
+        resync_period: float = 300.0,
+        resource_estimator: ResourceEstimator | None = None,
+    ):
         """
         初期化
 
         Args:
             settings: アプリケーション設定（オプション）
             namespace: Kubernetes namespace（デフォルト: default）
+            use_informer: Watchで更新するインメモリインデックスから一覧・状態を返すか
+            resync_period: インデックスの一覧を取り直す間隔（秒）
+            resource_estimator: Jobのリソース見積もり（Noneの場合は固定値）
         """
         self.settings = settings
         self.namespace = namespace
+        self.resource_estimator = resource_estimator
+        self._use_informer = use_informer
+        self._resync_period = resync_period
         self._api_client = None
-        self._batch_api = None
-        self._init_client()
+        self._batch_client = None
+        self._client_loaded = False
+        self._client_lock = threading.Lock()
+        self._informer: JobInformer | None = None
+
+    @property
+    def _batch_api(self) -> Any:
+        """
+        BatchV1Api（Noneの場合はモックモード）
+
+        起動を速くするため、kubernetesパッケージの読み込みと設定の読み込みは初回の利用時に行う。
+        Informerを使う場合もこの時点で開始する。
+        """
+        if not self._client_loaded:
+            with self._client_lock:
+                if not self._client_loaded:
+                    self._init_client()
+                    self._client_loaded = True
+                    if self._use_informer and self._batch_client is not None:
+                        self._informer = JobInformer(
+                            list_func=self._list_labeled_jobs,
+                            watch_func=self._watch_labeled_jobs,
+                            resync_period=self._resync_period,
+                        ).start()
+        return self._batch_client
+
+    def _list_labeled_jobs(self) -> Any:
+        """このサービスのJob一覧をAPIサーバーから取得する（Informerの一覧取得用）"""
+        return self._batch_api.list_namespaced_job(
+            namespace=self.namespace,
+            label_selector=self.LABEL_SELECTOR,
+        )
+
+    def _watch_labeled_jobs(self, resource_version: str, timeout_seconds: int) -> Any:
+        """このサービスのJobの変更をWatchする（Informerのイベント取得用）"""
+        from kubernetes import watch
+
+        return watch.Watch().stream(
+            self._batch_api.list_namespaced_job,
+            namespace=self.namespace,
+            label_selector=self.LABEL_SELECTOR,
+            resource_version=resource_version,
+            timeout_seconds=timeout_seconds,
+            allow_watch_bookmarks=True,
+        )
 
     def _init_client(self) -> None:
         """Kubernetes APIクライアントを初期化"""
+        from kubernetes import client, config
+
         try:
             # クラスター内から実行される場合（Pod内）
             config.load_incluster_config()
             logger.info("Loaded in-cluster config")
             self._api_client = client.ApiClient()
-            self._batch_api = client.BatchV1Api(self._api_client)
+            self._batch_client = client.BatchV1Api(self._api_client)
         except config.ConfigException:
             try:
                 # クラスター外から実行される場合（ローカル開発など）
                 config.load_kube_config()
                 logger.info("Loaded kube config from ~/.kube/config")
                 self._api_client = client.ApiClient()
-                self._batch_api = client.BatchV1Api(self._api_client)
+                self._batch_client = client.BatchV1Api(self._api_client)
             except config.ConfigException as e:
                 logger.warning(f"Failed to load Kubernetes config: {e}")
                 logger.warning("Kubernetes API client not initialized. Using mock mode.")
                 self._api_client = None
-                self._batch_api = None
+                self._batch_client = None
 
     def launch_job(
         self,
@@ -62,6 +130,9 @@ class JobLauncher:
         dataset_url: str,
         target_date: str,
         image: str = "polars-service:latest",
+        force: bool = False,
+        aggregation: AggregationSpec | None = None,
+        probe: DatasetProbe | None = None,
     ) -> str:
         """
         Kubernetes Jobを起動する
@@ -71,6 +142,9 @@ class JobLauncher:
             dataset_url: データセットURL
             target_date: 対象日付
             image: コンテナイメージ
+            force: 保存済み結果があっても再計算するか
+            aggregation: 集計仕様（環境変数ANALYSIS_AGGREGATIONでJobに渡す）
+            probe: 取得済みのデータセットのメタ情報（リソースの見積もりでHEADし直さない）
 
         Returns:
             Job名（実際にはKubernetesのJob名）
@@ -88,8 +162,144 @@ class JobLauncher:
             dataset_url=dataset_url,
             target_date=target_date,
             image=image,
+            force=force,
+            aggregation=aggregation,
+            resources=self._estimate_resources(dataset_url, probe),
+        )
+
+        return self._submit_job(job_name, job_manifest)
+
+    def launch_backfill_job(
+        self,
+        job_name: str,
+        date_range: DateRange,
+        dataset_url_template: str,
+        parallelism: int = 4,
+        image: str = "polars-service:latest",
+        force: bool = False,
+    ) -> str:
+        """
+        日付範囲をまとめて分析するIndexed Jobを起動する
+
+        各PodはJOB_COMPLETION_INDEXを開始日からの日数として対象日付に変換する。
+
+        Args:
+            job_name: Job名
+            date_range: 対象日付の範囲
+            dataset_url_template: データセットURLのテンプレート（例: "https://.../{date:%Y%m%d}.csv"）
+            parallelism: 同時に実行するPod数
+            image: コンテナイメージ
+            force: 保存済み結果があっても再計算するか
+
+        Returns:
+            Job名
+
+        Raises:
+            ValueError: 並列数が不正な場合
+        """
+        if parallelism < 1:
+            raise ValueError("parallelism must be at least 1")
+
+        if self._batch_api is None:
+            logger.warning("Kubernetes API not available. Returning job name as mock.")
+            return job_name
+
+        job_manifest = self._create_backfill_job_manifest(
+            job_name=job_name,
+            date_range=date_range,
+            dataset_url_template=dataset_url_template,
+            parallelism=parallelism,
+            image=image,
+            force=force,
+            # 各日付のデータセットは同程度の規模とみなし、開始日のデータセットで見積もる
+            resources=self._estimate_resources(dataset_url_template.format(date=date_range.start)),
         )
 
+        return self._submit_job(job_name, job_manifest)
+
+    def launch_sharded_job(
+        self,
+        job_name: str,
+        dataset_url: str,
+        target_date: str,
+        shards: int,
+        parallelism: int | None = None,
+        image: str = "polars-service:latest",
+    ) -> str:
+        """
+        1つのデータセットをシャードに分けて集計するIndexed Jobを起動する
+
+        各Pod（マッパー）はJOB_COMPLETION_INDEX番目のバイト範囲の部分集計を保存し、
+        最後に部分集計を保存したPodが全シャードをマージして結果を保存する（リデューサー）。
+
+        Args:
+            job_name: Job名（シャードの部分集計の保存先を分ける実行IDにも使う）
+            dataset_url: データセットURL
+            target_date: 対象日付
+            shards: シャード数（マッパーPodの数）
+            parallelism: 同時に実行するPod数（Noneの場合は全シャードを同時に実行する）
+            image: コンテナイメージ
+
+        Returns:
+            Job名
+
+        Raises:
+            ValueError: シャード数・並列数が不正な場合
+        """
+        if shards < 2:
+            raise ValueError("shards must be at least 2")
+        if parallelism is not None and parallelism < 1:
+            raise ValueError("parallelism must be at least 1")
+
+        if self._batch_api is None:
+            logger.warning("Kubernetes API not available. Returning job name as mock.")
+            return job_name
+
+        job_manifest = self._create_sharded_job_manifest(
+            job_name=job_name,
+            dataset_url=dataset_url,
+            target_date=target_date,
+            shards=shards,
+            parallelism=parallelism or shards,
+            image=image,
+        )
+
+        return self._submit_job(job_name, job_manifest)
+
+    def _estimate_resources(
+        self, dataset_url: str, probe: DatasetProbe | None = None
+    ) -> JobResources:
+        """
+        データセットを分析するJobのリソースを見積もる（失敗した場合は固定値）
+
+        Args:
+            dataset_url: データセットURL
+            probe: 取得済みのデータセットのメタ情報（Noneの場合は見積もり時に取得する）
+
+        Returns:
+            Jobのリソース
+        """
+        if self.resource_estimator is None:
+            return DEFAULT_JOB_RESOURCES
+        try:
+            resources = self.resource_estimator.estimate(dataset_url, probe)
+        except Exception as e:
+            logger.warning(f"Failed to estimate resources for {dataset_url}: {e}")
+            return DEFAULT_JOB_RESOURCES
+        logger.info(f"Estimated resources for {dataset_url}: {resources.to_manifest()}")
+        return resources
+
+    def _submit_job(self, job_name: str, job_manifest: dict[str, Any]) -> str:
+        """
+        Jobを作成する（失敗した場合はモックモードにフォールバックする）
+
+        Args:
+            job_name: Job名
+            job_manifest: Jobマニフェスト
+
+        Returns:
+            Job名
+        """
         try:
             # Jobを作成
             api_response = self._batch_api.create_namespaced_job(
@@ -97,10 +307,12 @@ class JobLauncher:
                 body=job_manifest,
             )
             logger.info(f"Job {job_name} created successfully in namespace {self.namespace}")
+            if self._informer is not None:
+                self._informer.upsert(api_response)
             return api_response.metadata.name
-        except (ApiException, Exception) as e:
+        except Exception as e:
             # 接続エラーなどの場合はモックモードにフォールバック
-            if isinstance(e, ApiException):
+            if isinstance(e, _api_exception()):
                 error_msg = f"Failed to create Job {job_name}: {e.reason} - {e.body}"
             else:
                 error_msg = f"Failed to create Job {job_name}: {str(e)}"
@@ -114,6 +326,9 @@ class JobLauncher:
         dataset_url: str,
         target_date: str,
         image: str,
+        force: bool = False,
+        resources: JobResources = DEFAULT_JOB_RESOURCES,
+        aggregation: AggregationSpec | None = None,
     ) -> dict[str, Any]:
         """
         Jobマニフェストを作成する
@@ -123,6 +338,9 @@ class JobLauncher:
             dataset_url: データセットURL
             target_date: 対象日付
             image: コンテナイメージ
+            force: 保存済み結果があっても再計算するか
+            resources: コンテナのリソース
+            aggregation: 集計仕様
 
         Returns:
             Jobマニフェスト（dict）
@@ -132,12 +350,231 @@ class JobLauncher:
             {"name": "DATASET_URL", "value": dataset_url},
             {"name": "TARGET_DATE", "value": target_date},
         ]
+        if aggregation is not None:
+            env_vars.append({"name": "ANALYSIS_AGGREGATION", "value": aggregation.to_json()})
+
+        return self._build_job_manifest(
+            job_name=job_name,
+            labels={"target-date": target_date},
+            env_vars=env_vars,
+            image=image,
+            force=force,
+            resources=resources,
+            spec={
+                "backoffLimit": 3,  # 最大3回までリトライ
+                # メモリ不足で強制終了された場合は、同じ上限で再試行しても失敗するためリトライしない
+                "podFailurePolicy": _oom_failure_policy("FailJob"),
+            },
+        )
+
+    def _create_backfill_job_manifest(
+        self,
+        job_name: str,
+        date_range: DateRange,
+        dataset_url_template: str,
+        parallelism: int,
+        image: str,
+        force: bool = False,
+        resources: JobResources = DEFAULT_JOB_RESOURCES,
+    ) -> dict[str, Any]:
+        """
+        日付範囲を分析するIndexed Jobのマニフェストを作成する
+
+        Args:
+            job_name: Job名
+            date_range: 対象日付の範囲
+            dataset_url_template: データセットURLのテンプレート
+            parallelism: 同時に実行するPod数
+            image: コンテナイメージ
+            force: 保存済み結果があっても再計算するか
+            resources: 各Podのコンテナのリソース
+
+        Returns:
+            Jobマニフェスト（dict）
+        """
+        completions = len(date_range)
+        env_vars = [
+            {"name": "DATASET_URL_TEMPLATE", "value": dataset_url_template},
+            {"name": "BACKFILL_START_DATE", "value": date_range.start.isoformat()},
+            {"name": "BACKFILL_END_DATE", "value": date_range.end.isoformat()},
+        ]
+
+        return self._build_job_manifest(
+            job_name=job_name,
+            labels={
+                "backfill-start": date_range.start.isoformat(),
+                "backfill-end": date_range.end.isoformat(),
+            },
+            env_vars=env_vars,
+            image=image,
+            force=force,
+            resources=resources,
+            spec={
+                # 各PodにJOB_COMPLETION_INDEX（0..completions-1）が割り当てられる
+                "completionMode": "Indexed",
+                "completions": completions,
+                "parallelism": min(parallelism, completions),
+                # 日付ごとに最大3回までリトライし、他の日付の実行は止めない
+                "backoffLimitPerIndex": 3,
+                # メモリ不足で強制終了された日付はリトライしない
+                "podFailurePolicy": _oom_failure_policy("FailIndex"),
+            },
+        )
+
+    def _create_sharded_job_manifest(
+        self,
+        job_name: str,
+        dataset_url: str,
+        target_date: str,
+        shards: int,
+        parallelism: int,
+        image: str,
+        resources: JobResources = DEFAULT_JOB_RESOURCES,
+    ) -> dict[str, Any]:
+        """
+        データセットをシャードに分けて集計するIndexed Jobのマニフェストを作成する
+
+        Args:
+            job_name: Job名
+            dataset_url: データセットURL
+            target_date: 対象日付
+            shards: シャード数
+            parallelism: 同時に実行するPod数
+            image: コンテナイメージ
+            resources: 各Podのコンテナのリソース
+
+        Returns:
+            Jobマニフェスト（dict）
+        """
+        env_vars = [
+            {"name": "DATASET_URL", "value": dataset_url},
+            {"name": "TARGET_DATE", "value": target_date},
+            {"name": "ANALYSIS_SHARDS", "value": str(shards)},
+            {"name": "ANALYSIS_SHARD_RUN_ID", "value": job_name},
+        ]
+
+        return self._build_job_manifest(
+            job_name=job_name,
+            labels={"target-date": target_date, "shards": str(shards)},
+            env_vars=env_vars,
+            image=image,
+            force=False,
+            resources=resources,
+            spec={
+                # 各PodにJOB_COMPLETION_INDEX（0..shards-1）がシャードとして割り当てられる
+                "completionMode": "Indexed",
+                "completions": shards,
+                "parallelism": min(parallelism, shards),
+                # シャードごとに最大3回までリトライする
+                "backoffLimitPerIndex": 3,
+                # メモリ不足で強制終了されたシャードはリトライしない
+                "podFailurePolicy": _oom_failure_policy("FailIndex"),
+            },
+        )
+
+    def _build_job_manifest(
+        self,
+        job_name: str,
+        labels: dict[str, str],
+        env_vars: list[dict[str, str]],
+        image: str,
+        force: bool,
+        resources: JobResources,
+        spec: dict[str, Any],
+    ) -> dict[str, Any]:
+        """
+        Jobマニフェストの共通部分を組み立てる
+
+        Args:
+            job_name: Job名
+            labels: Jobに追加するラベル
+            env_vars: コンテナの環境変数
+            image: コンテナイメージ
+            force: 保存済み結果があっても再計算するか
+            resources: コンテナのリソース
+            spec: Job specに追加する項目
+
+        Returns:
+            Jobマニフェスト（dict）
+        """
+        env_vars = list(env_vars)
+        if force:
+            env_vars.append({"name": "FORCE", "value": "true"})
 
         if self.settings:
             if self.settings.s3_bucket:
                 env_vars.append({"name": "S3_BUCKET", "value": self.settings.s3_bucket})
             if self.settings.s3_prefix:
                 env_vars.append({"name": "S3_PREFIX", "value": self.settings.s3_prefix})
+            if self.settings.result_store != "local":
+                env_vars.append({"name": "RESULT_STORE", "value": self.settings.result_store})
+            else:
+                # 結果を共有ボリュームへ保存する構成では、Podにも同じ保存先を使わせる
+                env_vars.append(
+                    {"name": "LOCAL_RESULT_DIR", "value": self.settings.local_result_dir}
+                )
+            if self.settings.s3_endpoint_url:
+                env_vars.append({"name": "S3_ENDPOINT_URL", "value": self.settings.s3_endpoint_url})
+            env_vars.append(
+                {"name": "PARQUET_COMPRESSION", "value": self.settings.parquet_compression}
+            )
+            if self.settings.parquet_compression_level is not None:
+                env_vars.append(
+                    {
+                        "name": "PARQUET_COMPRESSION_LEVEL",
+                        "value": str(self.settings.parquet_compression_level),
+                    }
+                )
+            if self.settings.parquet_row_group_size is not None:
+                env_vars.append(
+                    {
+                        "name": "PARQUET_ROW_GROUP_SIZE",
+                        "value": str(self.settings.parquet_row_group_size),
+                    }
+                )
+            if self.settings.result_layout != "single":
+                env_vars.append({"name": "RESULT_LAYOUT", "value": self.settings.result_layout})
+                env_vars.append(
+                    {
+                        "name": "RESULT_CATEGORY_BUCKETS",
+                        "value": str(self.settings.result_category_buckets),
+                    }
+                )
+            if self.settings.analysis_sketches:
+                env_vars.append({"name": "ANALYSIS_SKETCHES", "value": "true"})
+                if self.settings.sketch_distinct_column:
+                    env_vars.append(
+                        {
+                            "name": "SKETCH_DISTINCT_COLUMN",
+                            "value": self.settings.sketch_distinct_column,
+                        }
+                    )
+                env_vars.append(
+                    {
+                        "name": "SKETCH_HLL_PRECISION",
+                        "value": str(self.settings.sketch_hll_precision),
+                    }
+                )
+                env_vars.append(
+                    {
+                        "name": "SKETCH_RELATIVE_ACCURACY",
+                        "value": str(self.settings.sketch_relative_accuracy),
+                    }
+                )
+            if self.settings.schema_registry:
+                env_vars.append({"name": "SCHEMA_REGISTRY", "value": "true"})
+                env_vars.append(
+                    {
+                        "name": "SCHEMA_CATEGORICAL_COLUMNS",
+                        "value": self.settings.schema_categorical_columns,
+                    }
+                )
+            if self.settings.job_resource_history:
+                env_vars.append({"name": "JOB_RESOURCE_HISTORY", "value": "true"})
+            # コンテナのメモリ上限値の一部を分析のメモリの上限とし、入力をチャンク単位で集計させる
+            if self.settings.job_memory_budget_fraction > 0:
+                budget = int(resources.memory_limit * self.settings.job_memory_budget_fraction)
+                env_vars.append({"name": "ANALYSIS_MEMORY_BUDGET_BYTES", "value": str(budget)})
 
         return {
             "apiVersion": "batch/v1",
@@ -146,12 +583,12 @@ class JobLauncher:
                 "name": job_name,
                 "labels": {
                     "app": "polars-analysis",
-                    "target-date": target_date,
+                    **labels,
                 },
             },
             "spec": {
                 "ttlSecondsAfterFinished": 3600,  # Job完了後1時間で削除
-                "backoffLimit": 3,  # 最大3回までリトライ
+                **spec,
                 "template": {
                     "metadata": {
                         "labels": {
@@ -173,16 +610,7 @@ class JobLauncher:
                                     "&& python -m app.main_job",
                                 ],
                                 "env": env_vars,
-                                "resources": {
-                                    "requests": {
-                                        "memory": "512Mi",
-                                        "cpu": "500m",
-                                    },
-                                    "limits": {
-                                        "memory": "2Gi",
-                                        "cpu": "2000m",
-                                    },
-                                },
+                                "resources": resources.to_manifest(),
                             },
                         ],
                     },
@@ -200,19 +628,19 @@ class JobLauncher:
         Returns:
             状態文字列（completed, failed, running, unknown）
         """
-        if job.status.succeeded:
+        # 終了条件を優先する（Indexed Jobは一部のPodが成功しても実行中の場合がある）
+        for condition in job.status.conditions or []:
+            if condition.type == "Complete" and condition.status == "True":
+                return "completed"
+            elif condition.type == "Failed" and condition.status == "True":
+                return "failed"
+
+        if job.status.active:
+            return "running"
+        elif job.status.succeeded:
             return "completed"
         elif job.status.failed:
             return "failed"
-        elif job.status.active:
-            return "running"
-        elif job.status.conditions:
-            # 条件から状態を判定
-            for condition in job.status.conditions:
-                if condition.type == "Complete" and condition.status == "True":
-                    return "completed"
-                elif condition.type == "Failed" and condition.status == "True":
-                    return "failed"
         return "unknown"
 
     def list_jobs(self, label_selector: str | None = None) -> list[dict[str, Any]]:
@@ -225,6 +653,19 @@ class JobLauncher:
         Returns:
             Jobの状態を含む辞書のリスト
         """
+        if self._informer is not None and self._informer.has_synced:
+            selector = self._parse_label_selector(label_selector)
+            if selector is not None:
+                jobs = [
+                    job
+                    for job in self._informer.list()
+                    if all(
+                        (job.metadata.labels or {}).get(key) == value
+                        for key, value in selector.items()
+                    )
+                ]
+                return self._to_job_list(jobs)
+
         if self._batch_api is None:
             logger.warning("Kubernetes API not available. Returning empty list.")
             return []
@@ -239,44 +680,8 @@ class JobLauncher:
             else:
                 jobs = self._batch_api.list_namespaced_job(namespace=self.namespace)
 
-            result = []
-            for job in jobs.items:
-                # app=polars-analysisラベルのJobのみを対象とする
-                if job.metadata.labels and job.metadata.labels.get("app") == "polars-analysis":
-                    status = self._determine_job_status(job)
-
-                    creation_timestamp = (
-                        job.metadata.creation_timestamp.isoformat()
-                        if job.metadata.creation_timestamp
-                        else None
-                    )
-                    completion_time = (
-                        job.status.completion_time.isoformat()
-                        if job.status.completion_time
-                        else None
-                    )
-
-                    result.append(
-                        {
-                            "job_id": job.metadata.name,
-                            "status": status,
-                            "namespace": self.namespace,
-                            "creation_timestamp": creation_timestamp,
-                            "completion_time": completion_time,
-                            "succeeded": job.status.succeeded or 0,
-                            "failed": job.status.failed or 0,
-                            "active": job.status.active or 0,
-                        }
-                    )
-
-            # 作成日時の降順でソート（新しいものから）
-            result.sort(
-                key=lambda x: x["creation_timestamp"] or "",
-                reverse=True,
-            )
-
-            return result
-        except ApiException as e:
+            return self._to_job_list(jobs.items)
+        except _api_exception() as e:
             error_msg = f"Failed to list Jobs: {e.reason} - {e.body}"
             logger.error(error_msg)
             return []
@@ -285,6 +690,77 @@ class JobLauncher:
             logger.error(error_msg)
             return []
 
+    def _to_job_list(self, jobs: list[Any]) -> list[dict[str, Any]]:
+        """
+        Jobオブジェクトを状態辞書のリストに変換する
+
+        Args:
+            jobs: Kubernetes Jobオブジェクトのリスト
+
+        Returns:
+            作成日時の降順に並べた状態辞書のリスト
+        """
+        result = [
+            self._to_job_dict(job)
+            for job in jobs
+            # app=polars-analysisラベルのJobのみを対象とする
+            if job.metadata.labels and job.metadata.labels.get("app") == "polars-analysis"
+        ]
+
+        # 作成日時の降順でソート（新しいものから）
+        result.sort(
+            key=lambda x: x["creation_timestamp"] or "",
+            reverse=True,
+        )
+        return result
+
+    def _to_job_dict(self, job: Any) -> dict[str, Any]:
+        """
+        Jobオブジェクトを状態辞書に変換する
+
+        Args:
+            job: Kubernetes Jobオブジェクト
+
+        Returns:
+            Jobの状態を含む辞書
+        """
+        creation_timestamp = (
+            job.metadata.creation_timestamp.isoformat() if job.metadata.creation_timestamp else None
+        )
+        completion_time = (
+            job.status.completion_time.isoformat() if job.status.completion_time else None
+        )
+
+        return {
+            "job_id": job.metadata.name,
+            "status": self._determine_job_status(job),
+            "namespace": self.namespace,
+            "creation_timestamp": creation_timestamp,
+            "completion_time": completion_time,
+            "succeeded": job.status.succeeded or 0,
+            "failed": job.status.failed or 0,
+            "active": job.status.active or 0,
+        }
+
+    @staticmethod
+    def _parse_label_selector(label_selector: str | None) -> dict[str, str] | None:
+        """
+        等価条件のみのラベルセレクターを辞書に変換する
+
+        Args:
+            label_selector: ラベルセレクター（例: "app=polars-analysis,target-date=2024-01-01"）
+
+        Returns:
+            ラベル名 → 値の辞書（集合条件などインデックスで評価できない場合はNone）
+        """
+        selector: dict[str, str] = {}
+        for term in filter(None, (label_selector or "").split(",")):
+            key, sep, value = term.strip().partition("=")
+            if not sep or value.startswith("=") or key.endswith("!"):
+                return None
+            selector[key.strip()] = value.strip()
+        return selector
+
     def get_job_status(self, job_id: str) -> dict[str, Any]:
         """
         Jobの状態を取得する
@@ -295,6 +771,16 @@ class JobLauncher:
         Returns:
             Jobの状態を含む辞書
         """
+        if self._informer is not None and self._informer.has_synced:
+            job = self._informer.get(job_id)
+            if job is None:
+                return {
+                    "job_id": job_id,
+                    "status": "not_found",
+                    "message": f"Job {job_id} not found in namespace {self.namespace}",
+                }
+            return self._to_job_dict(job)
+
         if self._batch_api is None:
             logger.warning("Kubernetes API not available. Returning mock status.")
             return {
@@ -309,28 +795,8 @@ class JobLauncher:
                 namespace=self.namespace,
             )
 
-            status = self._determine_job_status(job)
-
-            creation_timestamp = (
-                job.metadata.creation_timestamp.isoformat()
-                if job.metadata.creation_timestamp
-                else None
-            )
-            completion_time = (
-                job.status.completion_time.isoformat() if job.status.completion_time else None
-            )
-
-            return {
-                "job_id": job_id,
-                "status": status,
-                "namespace": self.namespace,
-                "creation_timestamp": creation_timestamp,
-                "completion_time": completion_time,
-                "succeeded": job.status.succeeded or 0,
-                "failed": job.status.failed or 0,
-                "active": job.status.active or 0,
-            }
-        except ApiException as e:
+            return self._to_job_dict(job)
+        except _api_exception() as e:
             if e.status == 404:
                 return {
                     "job_id": job_id,
@@ -366,11 +832,49 @@ class JobLauncher:
                 propagation_policy="Background",
             )
             logger.info(f"Job {job_id} deleted successfully")
+            if self._informer is not None:
+                self._informer.remove(job_id)
             return True
-        except ApiException as e:
+        except _api_exception() as e:
             if e.status == 404:
                 logger.warning(f"Job {job_id} not found. Already deleted?")
                 return True  # 既に削除されている場合は成功とみなす
             error_msg = f"Failed to delete Job {job_id}: {e.reason} - {e.body}"
             logger.error(error_msg)
             return False
+
+
+def _api_exception() -> type[Exception]:
+    """
+    kubernetesのApiExceptionを返す
+
+    except節の式は例外の発生時にのみ評価されるため、モジュールの読み込み時にkubernetesを
+    読み込まずに済む。
+    """
+    from kubernetes.client.rest import ApiException
+
+    return ApiException
+
+
+def _oom_failure_policy(action: str) -> dict[str, Any]:
+    """
+    OOMKilled（終了コード137）で終了したPodをリトライしないpodFailurePolicyを返す
+
+    Args:
+        action: 該当した場合の動作（FailJob / FailIndex）
+
+    Returns:
+        Job specのpodFailurePolicy
+    """
+    return {
+        "rules": [
+            {
+                "action": action,
+                "onExitCodes": {
+                    "containerName": "polars-service",
+                    "operator": "In",
+                    "values": [137],
+                },
+            }
+        ]
+    }
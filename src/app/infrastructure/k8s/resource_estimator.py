@@ -0,0 +1,142 @@
+"""分析Jobのリソース要求量の見積もり"""
+
+import math
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from app.infrastructure.k8s.resource_usage_history import ResourceUsageHistory
+from app.infrastructure.loader.dataset_probe import probe_dataset_size
+from app.usecase.dto.dataset_probe import DatasetProbe
+
+MiB = 1024**2
+GiB = 1024**3
+
+
+@dataclass(frozen=True)
+class JobResources:
+    """JobのコンテナのリソースRequests/Limits"""
+
+    memory_request: int
+    memory_limit: int
+    cpu_request_millis: int
+    cpu_limit_millis: int
+
+    def to_manifest(self) -> dict[str, dict[str, str]]:
+        """Kubernetesのresources形式に変換する"""
+        return {
+            "requests": {
+                "memory": f"{math.ceil(self.memory_request / MiB)}Mi",
+                "cpu": f"{self.cpu_request_millis}m",
+            },
+            "limits": {
+                "memory": f"{math.ceil(self.memory_limit / MiB)}Mi",
+                "cpu": f"{self.cpu_limit_millis}m",
+            },
+        }
+
+
+# 見積もりに必要な情報が無い場合のリソース
+DEFAULT_JOB_RESOURCES = JobResources(
+    memory_request=512 * MiB,
+    memory_limit=2 * GiB,
+    cpu_request_millis=500,
+    cpu_limit_millis=2000,
+)
+
+
+class ResourceEstimator:
+    """
+    データセットのサイズと過去のピークメモリ使用量からJobのリソースを見積もる
+
+    - 同じデータセットの実績がある場合は、そのピーク値に余裕率を掛けてメモリを要求する
+    - 実績が無い場合は、CSVのバイト数に展開倍率と余裕率を掛けてメモリを要求する
+    - どちらも無い場合は従来の固定値（DEFAULT_JOB_RESOURCES）を使う
+
+    メモリ・CPUとも上限値で頭打ちにする。
+    """
+
+    def __init__(
+        self,
+        size_probe: Callable[[str], int | None] = probe_dataset_size,
+        history: ResourceUsageHistory | None = None,
+        headroom: float = 1.5,
+        bytes_multiplier: float = 2.0,
+        min_memory: int = 256 * MiB,
+        max_memory: int = 16 * GiB,
+        bytes_per_cpu: int = 1 * GiB,
+        max_cpu_millis: int = 4000,
+    ):
+        """
+        初期化
+
+        Args:
+            size_probe: データセットのバイト数を取得する関数
+            history: ピークメモリ使用量の履歴
+            headroom: 見積もったメモリに掛ける余裕率
+            bytes_multiplier: 実績が無い場合にCSVのバイト数から必要メモリを見積もる倍率
+            min_memory: メモリ要求量の下限（バイト）
+            max_memory: メモリ上限値（バイト）
+            bytes_per_cpu: CPU 1コアあたりに割り当てるデータセットのバイト数
+            max_cpu_millis: CPU上限値（ミリコア）
+        """
+        if headroom < 1.0:
+            raise ValueError("headroom must be at least 1.0")
+        self.size_probe = size_probe
+        self.history = history
+        self.headroom = headroom
+        self.bytes_multiplier = bytes_multiplier
+        self.min_memory = min_memory
+        self.max_memory = max_memory
+        self.bytes_per_cpu = bytes_per_cpu
+        self.max_cpu_millis = max_cpu_millis
+
+    def estimate(self, dataset_url: str, probe: DatasetProbe | None = None) -> JobResources:
+        """
+        データセットを分析するJobのリソースを見積もる
+
+        Args:
+            dataset_url: データセットURL
+            probe: 取得済みのメタ情報（Noneの場合はsize_probeでサイズを取得する）
+
+        Returns:
+            Jobのリソース
+        """
+        peak = self.history.peak_bytes(dataset_url) if self.history else None
+        size = probe.size if probe is not None else self.size_probe(dataset_url)
+
+        if peak is not None:
+            needed = peak
+        elif size is not None:
+            needed = size * self.bytes_multiplier
+        else:
+            return self._clamp(DEFAULT_JOB_RESOURCES)
+
+        memory_request = self._clamp_memory(needed * self.headroom)
+        # 見積もりが外れてもOOMで落ちにくいよう、上限はさらに余裕率を掛ける
+        memory_limit = self._clamp_memory(memory_request * self.headroom)
+
+        # Polarsはコア数に応じて並列化するため、データが大きいほどCPUを多く割り当てる
+        cores = (size or 0) / self.bytes_per_cpu
+        cpu_request = self._clamp_cpu(max(250, math.ceil(cores * 500)))
+        cpu_limit = self._clamp_cpu(max(1000, math.ceil(cores * 1000)))
+
+        return JobResources(
+            memory_request=memory_request,
+            memory_limit=max(memory_limit, memory_request),
+            cpu_request_millis=cpu_request,
+            cpu_limit_millis=max(cpu_limit, cpu_request),
+        )
+
+    def _clamp(self, resources: JobResources) -> JobResources:
+        return JobResources(
+            memory_request=self._clamp_memory(resources.memory_request),
+            memory_limit=self._clamp_memory(resources.memory_limit),
+            cpu_request_millis=self._clamp_cpu(resources.cpu_request_millis),
+            cpu_limit_millis=self._clamp_cpu(resources.cpu_limit_millis),
+        )
+
+    def _clamp_memory(self, value: float) -> int:
+        return int(min(max(math.ceil(value), self.min_memory), self.max_memory))
+
+    def _clamp_cpu(self, value: int) -> int:
+        return min(value, self.max_cpu_millis)
@@ -0,0 +1,67 @@
+"""分析Jobのピークメモリ使用量の履歴"""
+
+import hashlib
+import json
+import logging
+
+from app.infrastructure.config.settings import Settings
+from app.infrastructure.storage.factory import object_store_from_settings
+from app.infrastructure.storage.object_store import ObjectStore
+
+logger = logging.getLogger(__name__)
+
+
+class ResourceUsageHistory:
+    """
+    データセットURLごとに直近のピークメモリ使用量を結果の保存先へ記録する履歴
+
+    Job Podが記録し、APIがJobの起動時にリソース見積もりへ使う。結果と同じオブジェクトストアの
+    resource-history/配下にデータセットごとのJSONとして保存するため、共有ボリュームの無い
+    Pod間でも同じ履歴を参照でき、複数のPodが同時に記録しても互いの記録を上書きしない。
+    """
+
+    PREFIX = "resource-history"
+
+    def __init__(self, settings: Settings, store: ObjectStore | None = None):
+        """
+        初期化
+
+        Args:
+            settings: アプリケーション設定
+            store: 保存先のオブジェクトストア（Noneの場合は設定から構築する）
+        """
+        self.settings = settings
+        self.store = store or object_store_from_settings(settings)
+
+    def peak_bytes(self, dataset_url: str) -> int | None:
+        """
+        データセットの直近のピークメモリ使用量を返す
+
+        Args:
+            dataset_url: データセットURL
+
+        Returns:
+            バイト数（記録が無い・読み込めない場合はNone）
+        """
+        try:
+            data = self.store.get_bytes(self._key(dataset_url))
+            return int(json.loads(data)["peak_bytes"]) if data is not None else None
+        except Exception as e:
+            # 見積もりは既定値へフォールバックできるため、履歴の読み込み失敗でJobを止めない
+            logger.warning(f"Failed to read resource usage history for {dataset_url}: {e}")
+            return None
+
+    def record(self, dataset_url: str, peak_bytes: int) -> None:
+        """
+        データセットのピークメモリ使用量を記録する
+
+        Args:
+            dataset_url: データセットURL
+            peak_bytes: ピークメモリ使用量（バイト）
+        """
+        body = json.dumps({"dataset_url": dataset_url, "peak_bytes": int(peak_bytes)})
+        self.store.put_bytes(self._key(dataset_url), body.encode("utf-8"))
+
+    @classmethod
+    def _key(cls, dataset_url: str) -> str:
+        return f"{cls.PREFIX}/{hashlib.sha256(dataset_url.encode()).hexdigest()}.json"
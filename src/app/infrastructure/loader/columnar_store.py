@@ -0,0 +1,201 @@
+"""取り込み時にCSVを列指向フォーマットへ変換して保持するストア"""
+
+import fcntl
+import json
+import logging
+import os
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Literal
+
+import polars as pl
+
+logger = logging.getLogger(__name__)
+
+ColumnarFormat = Literal["parquet", "ipc"]
+
+_EXTENSIONS: dict[str, str] = {"parquet": "parquet", "ipc": "arrow"}
+
+
+class ColumnarStore:
+    """
+    CSVを一度だけParquet/Arrow IPCに変換し、以降は変換済みファイルをscanするストア
+
+    変換済みファイルは入力内容のキー（コンテンツハッシュ等）で管理するため、
+    同じ内容のCSVに対するCSVパースとスキーマ推論は初回の1回だけになる。
+    スキーマは先頭のinfer_schema_length行から推論し、それ以降の行が推論した型に収まらずに
+    変換が失敗した場合だけ、全行から推論し直して変換する。
+    - parquet: 列統計付きで書き出し、述語・射影プッシュダウンで読み飛ばせる
+    - ipc: 非圧縮で書き出し、scan時にメモリマップで読み込める
+    """
+
+    def __init__(
+        self,
+        store_dir: str | Path,
+        format: ColumnarFormat = "parquet",
+        max_bytes: int | None = None,
+        infer_schema_length: int | None = 10000,
+        min_retention_seconds: float = 300.0,
+    ):
+        """
+        初期化
+
+        Args:
+            store_dir: 変換済みファイルの保存ディレクトリ
+            format: 変換先フォーマット（parquet / ipc）
+            max_bytes: 変換済みファイルの合計バイト数上限（Noneの場合は無制限）
+            infer_schema_length: 最初のスキーマ推論に使う行数（Noneの場合は全行）
+            min_retention_seconds: 直近に使われた変換済みファイルを退避対象から外す猶予秒数
+                （scanが返した未実行の計画や、他プロセスが読み込み中のファイルを消さないため）
+        """
+        if format not in _EXTENSIONS:
+            raise ValueError(f"Unsupported columnar format: {format}")
+        self.store_dir = Path(store_dir)
+        self.format = format
+        self.max_bytes = max_bytes
+        self.infer_schema_length = infer_schema_length
+        self.min_retention_seconds = min_retention_seconds
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+
+    def scan(
+        self,
+        csv_path: str | Path,
+        key: str,
+        schema: dict[str, pl.DataType] | None = None,
+    ) -> pl.LazyFrame:
+        """
+        変換済みファイルをscanする（未変換の場合は変換してから）
+
+        Args:
+            csv_path: 入力CSVのローカルパス
+            key: 入力内容を識別するキー
+            schema: 変換時に固定する列の型（Noneの場合は推論する。変換済みの場合は使わない）
+
+        Returns:
+            変換済みファイルを読み込むLazyFrame
+        """
+        path = self.path_for(key)
+        if not path.exists():
+            self._convert(Path(csv_path), key, schema)
+        else:
+            # 最終利用時刻を更新する（退避順序に使う）
+            os.utime(path)
+
+        if self.format == "ipc":
+            return pl.scan_ipc(path)
+        return pl.scan_parquet(path)
+
+    def path_for(self, key: str) -> Path:
+        """キーに対応する変換済みファイルのパスを返す"""
+        return self.store_dir / f"{key}.{_EXTENSIONS[self.format]}"
+
+    def schema_for(self, key: str) -> dict[str, str] | None:
+        """
+        変換時に固定したスキーマを返す
+
+        Args:
+            key: 入力内容を識別するキー
+
+        Returns:
+            列名 → dtype文字列の辞書（未変換の場合はNone）
+        """
+        try:
+            return json.loads(self._schema_path(key).read_text())
+        except FileNotFoundError:
+            return None
+
+    def _schema_path(self, key: str) -> Path:
+        return self.store_dir / f"{key}.schema.json"
+
+    def _convert(
+        self, csv_path: Path, key: str, pinned: dict[str, pl.DataType] | None = None
+    ) -> None:
+        """CSVを変換して原子的に配置する（同じキーの同時変換はロックで直列化する）"""
+        path = self.path_for(key)
+        with self._file_lock(self.store_dir / f"{key}.lock"):
+            if path.exists():
+                return
+
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            if pinned is not None:
+                lf = pl.scan_csv(csv_path, schema_overrides=pinned, infer_schema=False)
+                schema = lf.collect_schema()
+                self._sink(lf, tmp_path)
+            else:
+                # スキーマを一度だけ推論し、以降の読み込みでは固定スキーマを使う
+                schema = self._infer_schema(csv_path, self.infer_schema_length)
+                try:
+                    self._sink(pl.scan_csv(csv_path, schema=schema), tmp_path)
+                except pl.exceptions.ComputeError:
+                    if self.infer_schema_length is None:
+                        raise
+                    # 推論に使った行より後ろに型の合わない値がある（整数列の途中の小数など）
+                    logger.info(f"Re-inferring schema of {csv_path} from all rows")
+                    schema = self._infer_schema(csv_path, None)
+                    self._sink(pl.scan_csv(csv_path, schema=schema), tmp_path)
+
+            self._schema_path(key).write_text(
+                json.dumps({name: str(dtype) for name, dtype in schema.items()})
+            )
+            os.replace(tmp_path, path)
+            logger.info(f"Converted {csv_path} to {self.format}: {path}")
+
+        self._evict(protected=path)
+
+    @staticmethod
+    def _infer_schema(csv_path: Path, infer_schema_length: int | None) -> pl.Schema:
+        """先頭のinfer_schema_length行（Noneの場合は全行）からCSVのスキーマを推論する"""
+        return pl.scan_csv(csv_path, infer_schema_length=infer_schema_length).collect_schema()
+
+    def _sink(self, lf: pl.LazyFrame, tmp_path: Path) -> None:
+        """変換先フォーマットで一時ファイルに書き出す（失敗した場合は一時ファイルを消す）"""
+        try:
+            if self.format == "ipc":
+                lf.sink_ipc(tmp_path, compression="uncompressed")
+            else:
+                lf.sink_parquet(tmp_path, statistics=True)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    def _evict(self, protected: Path) -> None:
+        """
+        合計サイズが上限を超えている間、最終利用が古い変換済みファイルを削除する
+
+        ロックファイルは削除しない（削除すると次に開いたプロセスが別のinodeをロックし、
+        同じキーの変換を直列化できなくなる）。
+        """
+        if self.max_bytes is None:
+            return
+
+        files = [p for p in self.store_dir.glob(f"*.{_EXTENSIONS[self.format]}") if p.is_file()]
+        total = sum(p.stat().st_size for p in files)
+        now = time.time()
+        for p in sorted(files, key=lambda p: p.stat().st_mtime):
+            if total <= self.max_bytes:
+                break
+            if p == protected:
+                continue
+            if now - p.stat().st_mtime < self.min_retention_seconds:
+                continue
+            total -= p.stat().st_size
+            p.unlink(missing_ok=True)
+            self._schema_path(p.stem).unlink(missing_ok=True)
+
+        if total > self.max_bytes:
+            logger.warning(
+                f"Columnar store exceeds budget ({total} > {self.max_bytes} bytes) "
+                "but remaining files are in use"
+            )
+
+    @staticmethod
+    @contextmanager
+    def _file_lock(path: Path) -> Iterator[None]:
+        with open(path, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
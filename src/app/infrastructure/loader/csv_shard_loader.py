@@ -0,0 +1,166 @@
+"""CSVをバイト範囲のシャードに分けて読み込む実装"""
+
+import logging
+import tempfile
+import urllib.request
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+import polars as pl
+
+from app.domain.value_object.dataset import Dataset
+from app.domain.value_object.shard import Shard
+from app.infrastructure.loader.dataset_probe import probe_dataset_size
+from app.infrastructure.loader.ranged_downloader import RangeNotSatisfiedError
+from app.usecase.ports.output.schema_registry import SchemaRegistry
+from app.usecase.ports.output.shard_loader import ShardLoader
+
+logger = logging.getLogger(__name__)
+
+# 範囲読み込み時の読み込み単位
+_CHUNK_SIZE = 1024 * 1024
+# 行の境界（改行）を探すときの読み込み単位
+_SCAN_SIZE = 64 * 1024
+
+
+class CsvShardLoader(ShardLoader):
+    """
+    CSVをバイト範囲で分割し、シャードの行だけを一時ファイルに取得して読み込む実装
+
+    各行は開始位置を含むシャードに属する。シャードの開始位置が行の途中の場合は次の行から読み、
+    終了位置をまたぐ行は最後まで読むため、全シャードで各行をちょうど1回ずつ読む。
+    HTTP(S)のURLはRangeリクエスト、ローカルファイルはシークで該当範囲だけを読む。
+    ヘッダー行は各シャードの一時ファイルの先頭に付ける。
+    引用符で囲んだ値の中の改行には対応しない（行の境界を改行だけで判定するため）。
+    スキーマが登録済みのデータセットは、全シャードを同じ型で読み込む。
+    """
+
+    def __init__(
+        self,
+        work_dir: str | Path | None = None,
+        timeout: float = 60.0,
+        schema_registry: SchemaRegistry | None = None,
+    ):
+        """
+        初期化
+
+        Args:
+            work_dir: シャードの一時ファイルを作るディレクトリ（Noneの場合はシステムの一時領域）
+            timeout: HTTPリクエストのタイムアウト秒数
+            schema_registry: スキーマレジストリ（シャードからは学習せず、登録済みの場合のみ使う）
+        """
+        self.work_dir = Path(work_dir) if work_dir else None
+        self.timeout = timeout
+        self.schema_registry = schema_registry
+
+    @contextmanager
+    def load_shard(self, dataset: Dataset, shard: Shard) -> Iterator[pl.LazyFrame]:
+        """
+        シャードを一時ファイルに取得し、その読み込み計画を返す
+
+        Args:
+            dataset: データセットの値オブジェクト
+            shard: 読み込むシャード
+
+        Yields:
+            シャードの読み込み計画（シャードに行が無い場合は全列がNull型の空のLazyFrame）
+
+        Raises:
+            ValueError: データセットのサイズを取得できない場合
+        """
+        size = probe_dataset_size(dataset.url, timeout=self.timeout)
+        if size is None:
+            raise ValueError(f"Cannot shard {dataset.url}: dataset size is unknown")
+
+        header_end = self._line_end(dataset.url, 0, size)
+        start, end = shard.byte_range(size)
+        body_start = max(self._line_end(dataset.url, start - 1, size) if start else 0, header_end)
+        body_end = self._line_end(dataset.url, end - 1, size) if end < size else size
+
+        if body_start >= body_end:
+            header = b"".join(self._read_range(dataset.url, 0, header_end))
+            columns = header.decode("utf-8").rstrip("\r\n").split(",")
+            yield pl.LazyFrame(schema=dict.fromkeys(columns, pl.Null))
+            return
+
+        if self.work_dir is not None:
+            self.work_dir.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory(prefix="odf-shard-", dir=self.work_dir) as tmp_dir:
+            path = Path(tmp_dir) / f"shard-{shard.index}.csv"
+            with open(path, "wb") as f:
+                for chunk in self._read_range(dataset.url, 0, header_end):
+                    f.write(chunk)
+                for chunk in self._read_range(dataset.url, body_start, body_end):
+                    f.write(chunk)
+            logger.info(
+                f"Fetched shard {shard} of {dataset.url}: bytes {body_start}-{body_end} of {size}"
+            )
+            schema = (
+                self.schema_registry.get(dataset.schema_key)
+                if self.schema_registry is not None
+                else None
+            )
+            if schema is None:
+                yield pl.scan_csv(path)
+            else:
+                yield pl.scan_csv(path, schema_overrides=schema.polars_schema(), infer_schema=False)
+
+    def _line_end(self, url: str, position: int, size: int) -> int:
+        """
+        position以降で最初の改行の直後のオフセットを返す（改行が無い場合はsize）
+
+        Args:
+            url: データセットURLまたはローカルファイルパス
+            position: 探索を始めるオフセット
+            size: データセットのバイト数
+
+        Returns:
+            次の行の開始オフセット
+        """
+        offset = position
+        while offset < size:
+            end = min(offset + _SCAN_SIZE, size)
+            block = b"".join(self._read_range(url, offset, end))
+            newline = block.find(b"\n")
+            if newline >= 0:
+                return offset + newline + 1
+            offset = end
+        return size
+
+    def _read_range(self, url: str, start: int, end: int) -> Iterator[bytes]:
+        """
+        [start, end)のバイト範囲を順に読み込む
+
+        Args:
+            url: データセットURLまたはローカルファイルパス
+            start: 開始オフセット
+            end: 終了オフセット（含まない）
+
+        Yields:
+            読み込んだバイト列
+
+        Raises:
+            RangeNotSatisfiedError: サーバーが部分応答（206）を返さなかった場合
+        """
+        if start >= end:
+            return
+
+        if not url.startswith(("http://", "https://")):
+            with open(url, "rb") as f:
+                f.seek(start)
+                remaining = end - start
+                while remaining and (chunk := f.read(min(_CHUNK_SIZE, remaining))):
+                    remaining -= len(chunk)
+                    yield chunk
+            return
+
+        request = urllib.request.Request(url, headers={"Range": f"bytes={start}-{end - 1}"})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            # 200の場合は全体が返るため、シャードに分ける意味が無い
+            if response.status != 206:
+                raise RangeNotSatisfiedError(
+                    f"Range request for {url} returned status {response.status}"
+                )
+            while chunk := response.read(_CHUNK_SIZE):
+                yield chunk
@@ -0,0 +1,274 @@
+"""HTTP再検証付きのデータセットディスクキャッシュ"""
+
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from app.infrastructure.loader.ranged_downloader import RangedDownloader
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedDataset:
+    """キャッシュ済みデータセットのエントリ"""
+
+    url: str
+    path: Path
+    digest: str
+    size: int
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+class DatasetCache:
+    """
+    URLをキーとしたコンテンツアドレス方式のディスクキャッシュ
+
+    ディレクトリ構成:
+        objects/<sha256[:2]>/<sha256>  データ本体（内容のハッシュで格納）
+        entries/<sha256(url)>.json     URL → 本体・ETag・Last-Modified・最終アクセス時刻
+        locks/<sha256(url)>.lock       同一URLの同時ダウンロードを抑止するロック
+        tmp/                           ダウンロード途中のファイル
+
+    複数プロセスが同じディレクトリを共有しても安全なように、
+    インデックスの更新と退避はディレクトリ全体のflockで直列化し、
+    ファイルは一時ファイルからos.replaceで原子的に配置する。
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        max_bytes: int,
+        downloader: RangedDownloader | None = None,
+        min_retention_seconds: float = 300.0,
+    ):
+        """
+        初期化
+
+        Args:
+            cache_dir: キャッシュディレクトリ
+            max_bytes: キャッシュ全体のバイト数上限（超過時はLRUで退避）
+            downloader: ダウンローダー（Noneの場合は単一ストリームで取得する）
+            min_retention_seconds: 直近に使われたエントリを退避対象から外す猶予秒数
+                （他プロセスがscan中のファイルを消さないため）
+        """
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.downloader = downloader or RangedDownloader(max_workers=1)
+        self.min_retention_seconds = min_retention_seconds
+
+        for name in ("objects", "entries", "locks", "tmp"):
+            (self.cache_dir / name).mkdir(parents=True, exist_ok=True)
+
+    def fetch(self, url: str) -> CachedDataset:
+        """
+        URLの内容をキャッシュから取得する（必要に応じて条件付きリクエストで再検証）
+
+        Args:
+            url: データセットURL
+
+        Returns:
+            キャッシュ済みデータセット
+        """
+        key = self._url_key(url)
+        with self._file_lock(self.cache_dir / "locks" / f"{key}.lock"):
+            entry = self._read_entry(key)
+            if entry is not None and not self._object_path(entry.digest).exists():
+                entry = None
+
+            tmp_path = self.cache_dir / "tmp" / f"{os.getpid()}-{time.time_ns()}.part"
+            try:
+                result = self.downloader.download(
+                    url, tmp_path, headers=self._conditional_headers(entry)
+                )
+            except BaseException:
+                tmp_path.unlink(missing_ok=True)
+                raise
+
+            if result.not_modified and entry is not None:
+                logger.info(f"Dataset not modified, reusing cache: {url}")
+                return self._touch(key, entry)
+
+            previous = entry
+            entry = CachedDataset(
+                url=url,
+                path=self._object_path(result.digest),
+                digest=result.digest,
+                size=result.size,
+                etag=result.etag,
+                last_modified=result.last_modified,
+            )
+
+            with self._index_lock():
+                self._store_object(tmp_path, entry.path)
+                self._write_entry(key, entry, last_access=time.time())
+                if previous is not None and previous.digest != entry.digest:
+                    # 上流の内容が更新された場合は旧内容を回収する
+                    self._collect_garbage()
+                self._evict(protected_key=key)
+
+            logger.info(f"Dataset cached: {url} ({result.size} bytes)")
+            return entry
+
+    def get(self, url: str) -> CachedDataset | None:
+        """
+        ネットワークにアクセスせずキャッシュ済みのエントリを取得する
+
+        Args:
+            url: データセットURL
+
+        Returns:
+            キャッシュ済みデータセット（存在しない場合はNone）
+        """
+        entry = self._read_entry(self._url_key(url))
+        if entry is None or not entry.path.exists():
+            return None
+        return entry
+
+    def invalidate(self, url: str) -> None:
+        """
+        URLのエントリを削除する
+
+        Args:
+            url: データセットURL
+        """
+        with self._index_lock():
+            (self.cache_dir / "entries" / f"{self._url_key(url)}.json").unlink(missing_ok=True)
+            self._collect_garbage()
+
+    def clear(self) -> None:
+        """キャッシュを全て削除する"""
+        with self._index_lock():
+            for name in ("objects", "entries"):
+                shutil.rmtree(self.cache_dir / name, ignore_errors=True)
+                (self.cache_dir / name).mkdir(parents=True, exist_ok=True)
+
+    def total_bytes(self) -> int:
+        """キャッシュ本体の合計バイト数を返す"""
+        return sum(path.stat().st_size for path in self._object_files())
+
+    # --- 内部処理 ---
+
+    @staticmethod
+    def _url_key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _object_path(self, digest: str) -> Path:
+        return self.cache_dir / "objects" / digest[:2] / digest
+
+    def _object_files(self) -> Iterator[Path]:
+        return (path for path in (self.cache_dir / "objects").glob("*/*") if path.is_file())
+
+    @staticmethod
+    def _conditional_headers(entry: CachedDataset | None) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if entry is None:
+            return headers
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    @staticmethod
+    def _store_object(tmp_path: Path, object_path: Path) -> None:
+        object_path.parent.mkdir(parents=True, exist_ok=True)
+        if object_path.exists():
+            # 同一内容が既に存在する場合は再利用する
+            tmp_path.unlink(missing_ok=True)
+        else:
+            os.replace(tmp_path, object_path)
+
+    def _read_entry(self, key: str) -> CachedDataset | None:
+        entry_path = self.cache_dir / "entries" / f"{key}.json"
+        try:
+            data = json.loads(entry_path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        data.pop("last_access", None)
+        data["path"] = Path(data["path"])
+        return CachedDataset(**data)
+
+    def _write_entry(self, key: str, entry: CachedDataset, last_access: float) -> None:
+        data = asdict(entry)
+        data["path"] = str(entry.path)
+        data["last_access"] = last_access
+        entry_path = self.cache_dir / "entries" / f"{key}.json"
+        tmp_path = entry_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(data))
+        os.replace(tmp_path, entry_path)
+
+    def _touch(self, key: str, entry: CachedDataset) -> CachedDataset:
+        with self._index_lock():
+            self._write_entry(key, entry, last_access=time.time())
+        return entry
+
+    def _evict(self, protected_key: str) -> None:
+        """バイト数上限を超えている間、最終アクセスが古いエントリから退避する"""
+        entries = []
+        for entry_path in (self.cache_dir / "entries").glob("*.json"):
+            try:
+                data = json.loads(entry_path.read_text())
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue
+            entries.append((data.get("last_access", 0.0), entry_path))
+
+        total = self.total_bytes()
+        now = time.time()
+        for last_access, entry_path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if entry_path.stem == protected_key:
+                continue
+            if now - last_access < self.min_retention_seconds:
+                continue
+            entry_path.unlink(missing_ok=True)
+            total -= self._collect_garbage()
+
+        if total > self.max_bytes:
+            logger.warning(
+                f"Dataset cache exceeds budget ({total} > {self.max_bytes} bytes) "
+                "but remaining entries are in use"
+            )
+
+    def _collect_garbage(self) -> int:
+        """どのエントリからも参照されない本体を削除し、解放したバイト数を返す"""
+        referenced = set()
+        for entry_path in (self.cache_dir / "entries").glob("*.json"):
+            try:
+                referenced.add(json.loads(entry_path.read_text())["digest"])
+            except (FileNotFoundError, json.JSONDecodeError, KeyError):
+                continue
+
+        freed = 0
+        for path in list(self._object_files()):
+            if path.name not in referenced:
+                freed += path.stat().st_size
+                path.unlink(missing_ok=True)
+        return freed
+
+    @contextmanager
+    def _index_lock(self) -> Iterator[None]:
+        with self._file_lock(self.cache_dir / ".lock"):
+            yield
+
+    @staticmethod
+    @contextmanager
+    def _file_lock(path: Path) -> Iterator[None]:
+        with open(path, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
@@ -0,0 +1,38 @@
+"""データセットを読み込まずにメタ情報を取得する処理"""
+
+import logging
+import os
+import urllib.error
+import urllib.request
+
+logger = logging.getLogger(__name__)
+
+
+def probe_dataset_size(url: str, timeout: float = 10.0) -> int | None:
+    """
+    データセットのバイト数を本体を読み込まずに取得する
+
+    HTTP(S)の場合はHEADリクエストのContent-Length、ローカルファイルの場合はファイルサイズを返す。
+
+    Args:
+        url: データセットURL
+        timeout: HTTPリクエストのタイムアウト秒数
+
+    Returns:
+        バイト数（取得できない場合はNone）
+    """
+    if not url.startswith(("http://", "https://")):
+        try:
+            return os.path.getsize(url)
+        except OSError:
+            return None
+
+    try:
+        request = urllib.request.Request(url, method="HEAD")
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            length = response.headers.get("Content-Length")
+    except (urllib.error.URLError, OSError) as e:
+        logger.warning(f"Failed to probe dataset size {url}: {e}")
+        return None
+
+    return int(length) if length and length.isdigit() else None
@@ -1,15 +1,78 @@
 """HTTP経由でデータセットを読み込む実装"""
 
+import hashlib
+import logging
+import os
+import tempfile
+import urllib.error
+import urllib.request
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, Literal
+
 import polars as pl
 
+from app.domain.service.column_types import learn_schema
+from app.domain.service.partial_aggregate import KEY_COLUMN
 from app.domain.value_object.dataset import Dataset
+from app.domain.value_object.dataset_schema import DatasetSchema
+from app.infrastructure.loader.columnar_store import ColumnarStore
+from app.infrastructure.loader.dataset_cache import DatasetCache
+from app.infrastructure.loader.dataset_probe import probe_dataset_size
+from app.infrastructure.loader.ranged_downloader import RangedDownloader
+from app.usecase.dto.dataset_probe import DatasetProbe
 from app.usecase.ports.output.dataset_loader import DatasetLoader
+from app.usecase.ports.output.schema_registry import SchemaRegistry
+
+logger = logging.getLogger(__name__)
+
+LoadMode = Literal["lazy", "eager"]
 
 
 class HttpDatasetLoader(DatasetLoader):
     """HTTP経由でデータセットを読み込む実装"""
 
-    def load(self, dataset: Dataset) -> pl.DataFrame:
+    def __init__(
+        self,
+        mode: LoadMode = "lazy",
+        cache: DatasetCache | None = None,
+        downloader: RangedDownloader | None = None,
+        download_dir: str | Path | None = None,
+        columnar_store: ColumnarStore | None = None,
+        schema_registry: SchemaRegistry | None = None,
+        categorical_columns: Sequence[str] = (KEY_COLUMN,),
+    ):
+        """
+        初期化
+
+        Args:
+            mode: 読み込みモード
+                - lazy: scan_csvでLazyFrameを構築する（射影プッシュダウン・ストリーミング可）
+                - eager: read_csvで全列を読み込んでからLazyFrameに包む（ベンチマーク比較用）
+            cache: データセットキャッシュ（Noneの場合は毎回URLから直接読み込む）
+            downloader: 並列ダウンローダー（キャッシュ無しでもローカルへ取得してから読み込む）
+            download_dir: キャッシュ無しでdownloaderを使う場合のダウンロード先ディレクトリ
+                （eagerモード・列指向ストア使用時は読み込み後に削除する。lazyモードでは計画の
+                実行時に読むため残し、URLごとに1ファイルを次回のダウンロードで置き換える）
+            columnar_store: 列指向ストア（指定時はローカルに取得したCSVを一度だけ
+                Parquet/Arrow IPCへ変換し、以降は変換済みファイルをscanする）
+            schema_registry: スキーマレジストリ（指定時は登録済みのスキーマで型推論せずに読み込み、
+                未登録のデータセットは初回の読み込み時にローカルへ取得したCSVの全行から学習して登録する）
+            categorical_columns: スキーマを学習するときにCategoricalで読み込む文字列の列
+        """
+        if mode not in ("lazy", "eager"):
+            raise ValueError(f"Unsupported load mode: {mode}")
+        self.mode = mode
+        self.cache = cache
+        self.downloader = downloader
+        self.download_dir = Path(
+            download_dir or Path(tempfile.gettempdir()) / "open_data_factory" / "downloads"
+        )
+        self.columnar_store = columnar_store
+        self.schema_registry = schema_registry
+        self.categorical_columns = tuple(categorical_columns)
+
+    def load(self, dataset: Dataset) -> pl.LazyFrame:
         """
         データセットをHTTP経由で読み込む
 
@@ -17,9 +80,208 @@ class HttpDatasetLoader(DatasetLoader):
             dataset: データセットの値オブジェクト
 
         Returns:
-            読み込んだデータフレーム
+            読み込み計画を表すLazyFrame
         """
-        # HTTP経由でCSVを読み込む
+        schema = self._registered_schema(dataset)
+        # 未登録のスキーマは全行から学習するため、読み込みと合わせて2回取得しないよう
+        # HTTP(S)のURLもローカルへ取得してから学習・読み込みを行う
+        learning = self.schema_registry is not None and schema is None
+        source, key = self._resolve_source(dataset, download=learning)
+        # キャッシュを使わずにダウンロードしたファイル（読み終えたら削除する）
+        downloaded = Path(source) if self._downloads(dataset, download=learning) else None
+        if learning:
+            schema = self._learn_schema(dataset, source)
+
+        if self.columnar_store is not None and key is not None:
+            if schema is not None:
+                # スキーマを編集した場合は変換し直す（変換済みファイルは型が固定されているため）
+                key = f"{key}-{hashlib.sha256(schema.to_json().encode('utf-8')).hexdigest()[:16]}"
+            lf = self.columnar_store.scan(
+                source, key, schema=schema.polars_schema() if schema is not None else None
+            )
+            # 変換済みファイルを読むため、ダウンロードしたCSVは不要になる
+            self._discard(downloaded)
+            return lf.collect().lazy() if self.mode == "eager" else lf
+
         # 実際の実装では、認証やリトライロジックを追加
-        df = pl.read_csv(dataset.url)
-        return df
+        options = self._csv_options(schema)
+        if self.mode == "eager":
+            df = pl.read_csv(source, **options)
+            self._discard(downloaded)
+            return df.lazy()
+        return pl.scan_csv(source, **options)
+
+    def _downloads(self, dataset: Dataset, download: bool = False) -> bool:
+        """キャッシュを使わずにローカルへ取得するデータセットか（downloadの場合はdownloader無しでも取得）"""
+        return (
+            self.cache is None
+            and (self.downloader is not None or download)
+            and dataset.url.startswith(("http://", "https://"))
+        )
+
+    @staticmethod
+    def _discard(path: Path | None) -> None:
+        """読み終えたダウンロードファイルを削除する"""
+        if path is not None:
+            path.unlink(missing_ok=True)
+
+    def _registered_schema(self, dataset: Dataset) -> DatasetSchema | None:
+        """
+        データセットの登録済みの固定スキーマを返す
+
+        Args:
+            dataset: データセットの値オブジェクト
+
+        Returns:
+            スキーマ（スキーマレジストリが無い・未登録の場合はNone）
+        """
+        if self.schema_registry is None:
+            return None
+        return self.schema_registry.get(dataset.schema_key)
+
+    def _learn_schema(self, dataset: Dataset, source: str) -> DatasetSchema:
+        """
+        未登録のデータセットのスキーマを全行から学習して登録する
+
+        Args:
+            dataset: データセットの値オブジェクト
+            source: 解決済みのローカルの読み込み元
+
+        Returns:
+            学習したスキーマ
+        """
+        schema_key = dataset.schema_key
+        schema = learn_schema(
+            pl.scan_csv(source, infer_schema=False),
+            categorical_columns=self.categorical_columns,
+        )
+        self.schema_registry.put(schema_key, schema)
+        logger.info(f"Learned schema for {schema_key}: {schema.to_dict()['columns']}")
+        return schema
+
+    @staticmethod
+    def _csv_options(schema: DatasetSchema | None) -> dict[str, Any]:
+        """固定スキーマがある場合に型推論を行わないCSVの読み込みオプションを返す"""
+        if schema is None:
+            return {}
+        # スキーマに無い列（後から追加された列）は推論せずに文字列として読み込む
+        return {"schema_overrides": schema.polars_schema(), "infer_schema": False}
+
+    def fingerprint(self, dataset: Dataset) -> str | None:
+        """
+        データセットの内容を識別する指紋を、本体をダウンロードせずに取得する
+
+        HTTP(S)の場合はHEADリクエストのETag（無ければLast-ModifiedとContent-Length）、
+        ローカルファイルの場合はパス・サイズ・更新時刻から作る。
+
+        Args:
+            dataset: データセットの値オブジェクト
+
+        Returns:
+            指紋（検証子を返さない・HEADに失敗したサーバーの場合はNone）
+        """
+        return self.probe(dataset).fingerprint
+
+    def size(self, dataset: Dataset) -> int | None:
+        """
+        データセットのバイト数を本体を読み込まずに取得する
+
+        Args:
+            dataset: データセットの値オブジェクト
+
+        Returns:
+            HEADのContent-Lengthまたはローカルファイルのサイズ（取得できない場合はNone）
+        """
+        return probe_dataset_size(dataset.url)
+
+    def probe(self, dataset: Dataset) -> DatasetProbe:
+        """
+        データセットの指紋とバイト数を1回のHEADリクエスト（ローカルファイルはstat）で取得する
+
+        Args:
+            dataset: データセットの値オブジェクト
+
+        Returns:
+            データセットのメタ情報（HEADに失敗した場合は指紋・バイト数ともNone）
+        """
+        if not dataset.url.startswith(("http://", "https://")):
+            return DatasetProbe(
+                fingerprint=self._local_file_key(dataset.url),
+                size=probe_dataset_size(dataset.url),
+            )
+
+        try:
+            request = urllib.request.Request(dataset.url, method="HEAD")
+            with urllib.request.urlopen(request, timeout=60) as response:
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+                length = response.headers.get("Content-Length")
+        except (urllib.error.URLError, OSError) as e:
+            # メモ化は最適化にすぎないため、HEADを拒否するサーバーでも分析は続ける
+            logger.warning(f"Failed to fingerprint dataset {dataset.url}: {e}")
+            return DatasetProbe()
+
+        size = int(length) if length and length.isdigit() else None
+        if etag and not etag.startswith("W/"):
+            return DatasetProbe(fingerprint=f"etag:{etag}", size=size)
+        if last_modified:
+            return DatasetProbe(fingerprint=f"last-modified:{last_modified}:{length}", size=size)
+        return DatasetProbe(size=size)
+
+    def _resolve_source(self, dataset: Dataset, download: bool = False) -> tuple[str, str | None]:
+        """
+        読み込み元を決定する（キャッシュやdownloaderが有効なHTTP(S)のURLはローカルファイルに解決する）
+
+        Args:
+            dataset: データセットの値オブジェクト
+            download: キャッシュもdownloaderも無い場合もローカルへ取得するか
+
+        Returns:
+            URLまたはローカルファイルパスと、ローカルファイルの場合はその内容を識別するキー
+        """
+        if not dataset.url.startswith(("http://", "https://")):
+            return dataset.url, self._local_file_key(dataset.url)
+        if self.cache is not None:
+            entry = self.cache.fetch(dataset.url)
+            return str(entry.path), entry.digest
+        if self.downloader is not None or download:
+            return self._download(dataset.url)
+        return dataset.url, None
+
+    def _download(self, url: str) -> tuple[str, str]:
+        """
+        downloaderでローカルファイルへ取得する（Polarsはこのファイルをmmapで読む）
+
+        Args:
+            url: データセットURL
+
+        Returns:
+            ダウンロードしたファイルのパスと内容のハッシュ
+        """
+        self.download_dir.mkdir(parents=True, exist_ok=True)
+        dest = self.download_dir / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.csv"
+        # 同じURLを別のスレッド・プロセスが同時に取得しても互いに上書きしない一時ファイル
+        fd, tmp_name = tempfile.mkstemp(
+            dir=self.download_dir, prefix=f"{dest.stem}.", suffix=".part"
+        )
+        os.close(fd)
+        tmp_path = Path(tmp_name)
+        try:
+            # downloaderが無い場合（スキーマの学習時）は単一ストリームで取得する
+            downloader = self.downloader or RangedDownloader(max_workers=1)
+            result = downloader.download(url, tmp_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        os.replace(tmp_path, dest)
+        return str(dest), result.digest
+
+    @staticmethod
+    def _local_file_key(path: str) -> str | None:
+        """ローカルファイルのパス・サイズ・更新時刻から内容を識別するキーを作る"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        identity = f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+        return hashlib.sha256(identity.encode("utf-8")).hexdigest()
@@ -0,0 +1,161 @@
+"""Prometheusのテキスト形式で公開するメトリクスの実装"""
+
+import bisect
+import threading
+from collections import defaultdict
+from collections.abc import Sequence
+
+from app.usecase.dto.run_analysis_output import RunAnalysisOutput
+from app.usecase.ports.output.metrics_recorder import MetricsRecorder
+
+# Prometheusのテキスト形式のContent-Type
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# ヒストグラムのバケット（上限値）
+DURATION_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0)
+MEMORY_BUCKETS = tuple(float(2**n) for n in range(24, 37, 2))  # 16MiB〜64GiB
+
+
+class _Histogram:
+    """ラベルごとの累積ヒストグラム"""
+
+    def __init__(self, name: str, help: str, label: str, buckets: Sequence[float]):
+        self.name = name
+        self.help = help
+        self.label = label
+        self.buckets = tuple(buckets)
+        # ラベル値 -> (各バケットの件数, 合計, 件数)
+        self._series: dict[str, tuple[list[int], float, int]] = {}
+
+    def observe(self, label_value: str, value: float) -> None:
+        counts, total, count = self._series.get(label_value, ([0] * len(self.buckets), 0.0, 0))
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(counts):
+            counts[index] += 1
+        self._series[label_value] = (counts, total + value, count + 1)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for label_value, (counts, total, count) in sorted(self._series.items()):
+            cumulative = 0
+            for upper, bucket_count in zip(self.buckets, counts, strict=True):
+                cumulative += bucket_count
+                lines.append(
+                    f'{self.name}_bucket{{{self.label}="{label_value}",le="{_format(upper)}"}} '
+                    f"{cumulative}"
+                )
+            lines.append(f'{self.name}_bucket{{{self.label}="{label_value}",le="+Inf"}} {count}')
+            lines.append(f'{self.name}_sum{{{self.label}="{label_value}"}} {_format(total)}')
+            lines.append(f'{self.name}_count{{{self.label}="{label_value}"}} {count}')
+        return lines
+
+
+class _Counter:
+    """ラベルごとのカウンター"""
+
+    def __init__(self, name: str, help: str, label: str):
+        self.name = name
+        self.help = help
+        self.label = label
+        self._values: dict[str, float] = defaultdict(float)
+
+    def inc(self, label_value: str, amount: float = 1.0) -> None:
+        self._values[label_value] += amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for label_value, value in sorted(self._values.items()):
+            lines.append(f'{self.name}{{{self.label}="{label_value}"}} {_format(value)}')
+        return lines
+
+
+class PrometheusMetrics(MetricsRecorder):
+    """
+    分析実行の計測値をプロセス内に集計し、Prometheusのテキスト形式で返す
+
+    prometheus_clientには依存せず、/metricsで公開する少数の系列だけを持つ。
+    """
+
+    def __init__(self, namespace: str = "odf"):
+        """
+        初期化
+
+        Args:
+            namespace: メトリクス名の接頭辞
+        """
+        prefix = f"{namespace}_analysis"
+        self._lock = threading.Lock()
+        self._runs = _Counter(f"{prefix}_runs_total", "Analysis runs by outcome.", "outcome")
+        self._wall = _Histogram(
+            f"{prefix}_stage_duration_seconds",
+            "Wall time spent in each analysis stage.",
+            "stage",
+            DURATION_BUCKETS,
+        )
+        self._cpu = _Histogram(
+            f"{prefix}_stage_cpu_seconds",
+            "Process CPU time spent in each analysis stage.",
+            "stage",
+            DURATION_BUCKETS,
+        )
+        self._rss = _Histogram(
+            f"{prefix}_stage_peak_rss_bytes",
+            "Peak process RSS observed during each analysis stage.",
+            "stage",
+            MEMORY_BUCKETS,
+        )
+        self._input_bytes = _Counter(
+            f"{prefix}_input_bytes_total",
+            "Dataset bytes read by each run, recorded on the load stage.",
+            "stage",
+        )
+        self._rows_in = _Counter(f"{prefix}_rows_in_total", "Rows read by each stage.", "stage")
+        self._rows_out = _Counter(
+            f"{prefix}_rows_out_total", "Rows produced by each stage.", "stage"
+        )
+
+    def record(self, output: RunAnalysisOutput) -> None:
+        """
+        分析実行1回分の結果と計測値を集計に加える
+
+        Args:
+            output: 分析実行の出力
+        """
+        outcome = "reused" if output.reused else "success" if output.success else "failure"
+        with self._lock:
+            self._runs.inc(outcome)
+            for m in output.metrics:
+                self._wall.observe(m.stage, m.wall_seconds)
+                self._cpu.observe(m.stage, m.cpu_seconds)
+                self._rss.observe(m.stage, m.peak_rss_bytes)
+                if m.input_bytes is not None:
+                    self._input_bytes.inc(m.stage, m.input_bytes)
+                if m.rows_in is not None:
+                    self._rows_in.inc(m.stage, m.rows_in)
+                if m.rows_out is not None:
+                    self._rows_out.inc(m.stage, m.rows_out)
+
+    def render(self) -> str:
+        """
+        集計したメトリクスをPrometheusのテキスト形式で返す
+
+        Returns:
+            テキスト形式のメトリクス
+        """
+        with self._lock:
+            series = (
+                self._runs,
+                self._wall,
+                self._cpu,
+                self._rss,
+                self._input_bytes,
+                self._rows_in,
+                self._rows_out,
+            )
+            lines = [line for s in series for line in s.render()]
+        return "\n".join(lines) + "\n"
+
+
+def _format(value: float) -> str:
+    """値を精度を落とさずにテキスト形式へ書き出す"""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
@@ -0,0 +1,54 @@
+"""Job実行バックエンドの共通インターフェース"""
+
+from typing import Any, Protocol
+
+from app.domain.value_object.aggregation_spec import AggregationSpec
+from app.domain.value_object.date_range import DateRange
+
+
+class JobAlreadyExistsError(Exception):
+    """同じ名前のJobが未完了のため起動しなかった場合の例外"""
+
+    def __init__(self, job_name: str):
+        super().__init__(f"Job {job_name} is already queued or running")
+        self.job_name = job_name
+
+
+class JobBackend(Protocol):
+    """JobLauncherと同じ起動・照会・一覧・削除の操作を持つJob実行バックエンド"""
+
+    def launch_job(
+        self,
+        job_name: str,
+        dataset_url: str,
+        target_date: str,
+        image: str = "polars-service:latest",
+        force: bool = False,
+        aggregation: AggregationSpec | None = None,
+    ) -> str: ...
+
+    def launch_backfill_job(
+        self,
+        job_name: str,
+        date_range: DateRange,
+        dataset_url_template: str,
+        parallelism: int = 4,
+        image: str = "polars-service:latest",
+        force: bool = False,
+    ) -> str: ...
+
+    def launch_sharded_job(
+        self,
+        job_name: str,
+        dataset_url: str,
+        target_date: str,
+        shards: int,
+        parallelism: int | None = None,
+        image: str = "polars-service:latest",
+    ) -> str: ...
+
+    def list_jobs(self, label_selector: str | None = None) -> list[dict[str, Any]]: ...
+
+    def get_job_status(self, job_id: str) -> dict[str, Any]: ...
+
+    def delete_job(self, job_id: str) -> bool: ...
@@ -0,0 +1,210 @@
+"""データセットの規模に応じてJob実行バックエンドを振り分ける実装"""
+
+import logging
+from collections.abc import Callable
+from typing import Any
+
+from app.domain.value_object.aggregation_spec import AggregationSpec
+from app.domain.value_object.date_range import DateRange
+from app.infrastructure.k8s.job_launcher import JobLauncher
+from app.infrastructure.loader.dataset_probe import probe_dataset_size
+from app.infrastructure.queue.local_job_launcher import LocalJobLauncher
+from app.usecase.dto.dataset_probe import DatasetProbe
+
+logger = logging.getLogger(__name__)
+
+
+class JobDispatcher:
+    """
+    小さなデータセットはローカルのワーカープロセスへ、大きなデータセットはK8s Jobへ振り分ける
+
+    サイズはHEADのContent-Lengthで判定し、取得できない場合は安全側に倒してK8s Jobで実行する。
+    JobLauncherと同じ操作（launch_job / get_job_status / list_jobs / delete_job）を持つ。
+    """
+
+    def __init__(
+        self,
+        k8s_launcher: JobLauncher,
+        local_launcher: LocalJobLauncher,
+        local_max_bytes: int,
+        size_probe: Callable[[str], int | None] = probe_dataset_size,
+    ):
+        """
+        初期化
+
+        Args:
+            k8s_launcher: K8s Job起動器
+            local_launcher: ローカルJob起動器
+            local_max_bytes: ローカルで実行するデータセットの最大バイト数
+            size_probe: データセットのバイト数を取得する関数
+        """
+        self.k8s_launcher = k8s_launcher
+        self.local_launcher = local_launcher
+        self.local_max_bytes = local_max_bytes
+        self.size_probe = size_probe
+
+    def launch_job(
+        self,
+        job_name: str,
+        dataset_url: str,
+        target_date: str,
+        image: str = "polars-service:latest",
+        force: bool = False,
+        aggregation: AggregationSpec | None = None,
+    ) -> str:
+        """
+        データセットの規模に応じたバックエンドでJobを起動する
+
+        Args:
+            job_name: Job名
+            dataset_url: データセットURL
+            target_date: 対象日付
+            image: コンテナイメージ
+            force: 保存済み結果があっても再計算するか
+            aggregation: 集計仕様
+
+        Returns:
+            Job名
+        """
+        size = self.size_probe(dataset_url)
+        if size is not None and size <= self.local_max_bytes:
+            logger.info(f"Dispatching {job_name} to local backend ({size} bytes)")
+            return self.local_launcher.launch_job(
+                job_name,
+                dataset_url,
+                target_date,
+                image=image,
+                force=force,
+                aggregation=aggregation,
+            )
+
+        logger.info(f"Dispatching {job_name} to Kubernetes ({size} bytes)")
+        # 判定に使ったサイズをリソースの見積もりにも使い、データセットをHEADし直さない
+        return self.k8s_launcher.launch_job(
+            job_name,
+            dataset_url,
+            target_date,
+            image=image,
+            force=force,
+            aggregation=aggregation,
+            probe=DatasetProbe(size=size),
+        )
+
+    def launch_backfill_job(
+        self,
+        job_name: str,
+        date_range: DateRange,
+        dataset_url_template: str,
+        parallelism: int = 4,
+        image: str = "polars-service:latest",
+        force: bool = False,
+    ) -> str:
+        """
+        日付範囲のバックフィルを1つのIndexed Jobとして起動する
+
+        並列数をK8s側でまとめて制御するため、データセットの規模に関わらずK8s Jobで実行する。
+
+        Args:
+            job_name: Job名
+            date_range: 対象日付の範囲
+            dataset_url_template: データセットURLのテンプレート
+            parallelism: 同時に実行するPod数
+            image: コンテナイメージ
+            force: 保存済み結果があっても再計算するか
+
+        Returns:
+            Job名
+        """
+        return self.k8s_launcher.launch_backfill_job(
+            job_name,
+            date_range,
+            dataset_url_template,
+            parallelism=parallelism,
+            image=image,
+            force=force,
+        )
+
+    def launch_sharded_job(
+        self,
+        job_name: str,
+        dataset_url: str,
+        target_date: str,
+        shards: int,
+        parallelism: int | None = None,
+        image: str = "polars-service:latest",
+    ) -> str:
+        """
+        1つのデータセットをシャードに分けて集計するJobを起動する
+
+        小さなデータセットはローカルのワーカープロセスで（マッパーはLocalShardExecutorの
+        プロセスで並列に）、それ以外はIndexed JobとしてK8sで実行する。
+
+        Args:
+            job_name: Job名
+            dataset_url: データセットURL
+            target_date: 対象日付
+            shards: シャード数
+            parallelism: 同時に実行するPod数
+            image: コンテナイメージ
+
+        Returns:
+            Job名
+        """
+        size = self.size_probe(dataset_url)
+        if size is not None and size <= self.local_max_bytes:
+            logger.info(f"Dispatching sharded {job_name} to local backend ({size} bytes)")
+            return self.local_launcher.launch_sharded_job(
+                job_name, dataset_url, target_date, shards, parallelism=parallelism, image=image
+            )
+
+        logger.info(f"Dispatching sharded {job_name} to Kubernetes ({size} bytes)")
+        return self.k8s_launcher.launch_sharded_job(
+            job_name,
+            dataset_url,
+            target_date,
+            shards,
+            parallelism=parallelism,
+            image=image,
+        )
+
+    def list_jobs(self, label_selector: str | None = None) -> list[dict[str, Any]]:
+        """
+        両バックエンドのJob一覧を作成日時の降順で取得する
+
+        Args:
+            label_selector: ラベルセレクター（K8s Jobにのみ適用）
+
+        Returns:
+            Jobの状態を含む辞書のリスト
+        """
+        jobs = self.local_launcher.list_jobs() + self.k8s_launcher.list_jobs(label_selector)
+        jobs.sort(key=lambda x: x.get("creation_timestamp") or "", reverse=True)
+        return jobs
+
+    def get_job_status(self, job_id: str) -> dict[str, Any]:
+        """
+        Jobの状態を取得する
+
+        Args:
+            job_id: Job名
+
+        Returns:
+            Jobの状態を含む辞書
+        """
+        if self.local_launcher.has_job(job_id):
+            return self.local_launcher.get_job_status(job_id)
+        return self.k8s_launcher.get_job_status(job_id)
+
+    def delete_job(self, job_id: str) -> bool:
+        """
+        Jobを削除する
+
+        Args:
+            job_id: Job名
+
+        Returns:
+            削除に成功した場合True
+        """
+        if self.local_launcher.has_job(job_id):
+            return self.local_launcher.delete_job(job_id)
+        return self.k8s_launcher.delete_job(job_id)
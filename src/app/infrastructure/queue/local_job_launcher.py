@@ -0,0 +1,345 @@
+"""ワーカープロセスプールで分析Jobを実行するローカルバックエンド"""
+
+import logging
+import multiprocessing
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from app.domain.value_object.aggregation_spec import AggregationSpec
+from app.infrastructure.queue.job_backend import JobAlreadyExistsError
+from app.infrastructure.queue.sqlite_job_queue import QueuedJob, SqliteJobQueue
+
+logger = logging.getLogger(__name__)
+
+
+def _execute_job(
+    dataset_url: str,
+    target_date: str,
+    force: bool,
+    aggregation: str | None = None,
+    shards: int = 0,
+    job_id: str = "",
+) -> tuple[bool, str, str]:
+    """
+    ワーカープロセスで分析を実行する（K8s Jobのmain_jobに相当）
+
+    Args:
+        dataset_url: データセットURL
+        target_date: 対象日付
+        force: 保存済み結果があっても再計算するか
+        aggregation: 集計仕様のJSON（Noneの場合は既定の集計）
+        shards: 分割実行のシャード数（0の場合は分割しない）
+        job_id: ジョブID（分割実行を識別するIDに使う）
+
+    Returns:
+        成功したか・結果の保存先・メッセージ
+    """
+    from datetime import date
+
+    from app.domain.value_object.dataset import Dataset
+    from app.domain.value_object.target_date import TargetDate
+    from app.usecase.dto.run_analysis_input import RunAnalysisInput
+    from app.wiring import build_local_shard_executor, build_usecase
+
+    if shards:
+        from app.usecase.dto.sharded_analysis_input import ShardedAnalysisInput
+
+        output = build_local_shard_executor().run(
+            ShardedAnalysisInput(
+                dataset=Dataset(url=dataset_url),
+                target_date=TargetDate(value=date.fromisoformat(target_date)),
+                run_id=job_id,
+                shard_count=shards,
+            )
+        )
+        return output.success, output.result_path, output.message
+
+    output = build_usecase().run(
+        RunAnalysisInput(
+            dataset=Dataset(url=dataset_url),
+            target_date=TargetDate(value=date.fromisoformat(target_date)),
+            force=force,
+            aggregation=AggregationSpec.from_json(aggregation) if aggregation else None,
+        )
+    )
+    return output.success, output.result_path, output.message
+
+
+class LocalJobLauncher:
+    """
+    K8s Jobの代わりにローカルのワーカープロセスで分析を実行するバックエンド
+
+    ジョブはSQLiteの永続キューに投入され、ディスパッチャースレッドが空きワーカー分だけ
+    取り出してプロセスプールへ渡す。Podの起動コストが無いため、中規模のデータセットを
+    低レイテンシで非同期実行できる。JobLauncherと同じ操作（launch_job / get_job_status /
+    list_jobs / delete_job）を持つ。
+    複数のAPIワーカーが同じキューを共有できるよう、取り出したジョブのリースをディスパッチャーが
+    延長し続け、期限が切れたジョブ（停止したプロセスのジョブ）だけを待機中に戻して再実行する。
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        max_workers: int = 2,
+        poll_interval: float = 0.5,
+        lease_seconds: float = 60.0,
+    ):
+        """
+        初期化
+
+        Args:
+            db_path: ジョブキューのSQLiteファイルのパス
+            max_workers: ワーカープロセス数
+            poll_interval: キューをポーリングする間隔（秒）
+            lease_seconds: 実行中のジョブのリースの長さ（秒。その3分の1ごとに延長する）
+        """
+        self.queue = SqliteJobQueue(db_path)
+        self.max_workers = max_workers
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        # リースの所有者としてこのプロセス（ランチャー）を識別するID
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._renewed_at = 0.0
+
+        self._executor: ProcessPoolExecutor | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+        self._slots = threading.Semaphore(max_workers)
+
+    def start(self) -> "LocalJobLauncher":
+        """
+        ワーカープロセスプールとディスパッチャーを起動する
+
+        リースの期限が切れた（停止したプロセスが実行していた）ジョブは待機中に戻して再実行する。
+
+        Returns:
+            自身
+        """
+        if self._thread is not None:
+            return self
+
+        self._heartbeat()
+
+        # Polarsのスレッドプールをfork後に使うとデッドロックし得るためspawnを使う
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._dispatch_loop, name="local-job-dispatcher", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """ディスパッチャーを停止し、実行中のジョブの完了を待つ"""
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def launch_job(
+        self,
+        job_name: str,
+        dataset_url: str,
+        target_date: str,
+        image: str = "polars-service:latest",
+        force: bool = False,
+        aggregation: AggregationSpec | None = None,
+    ) -> str:
+        """
+        ジョブをキューに投入する
+
+        Args:
+            job_name: Job名
+            dataset_url: データセットURL
+            target_date: 対象日付
+            image: コンテナイメージ（ローカル実行では使用しない）
+            force: 保存済み結果があっても再計算するか
+            aggregation: 集計仕様（JSONとしてキューに保存する）
+
+        Returns:
+            Job名
+
+        Raises:
+            JobAlreadyExistsError: 同じ名前のジョブが未完了の場合
+        """
+        if not self.queue.enqueue(
+            job_name,
+            dataset_url,
+            target_date,
+            force=force,
+            aggregation=aggregation.to_json() if aggregation is not None else None,
+        ):
+            raise JobAlreadyExistsError(job_name)
+        logger.info(f"Local job {job_name} queued")
+        self._wakeup.set()
+        return job_name
+
+    def launch_sharded_job(
+        self,
+        job_name: str,
+        dataset_url: str,
+        target_date: str,
+        shards: int,
+        parallelism: int | None = None,
+        image: str = "polars-service:latest",
+    ) -> str:
+        """
+        分割実行のジョブをキューに投入する
+
+        ワーカープロセスがLocalShardExecutorでマッパーを並列に実行し、最後にマージする。
+
+        Args:
+            job_name: Job名（分割実行を識別するIDにも使う）
+            dataset_url: データセットURL
+            target_date: 対象日付
+            shards: シャード数
+            parallelism: 同時に実行するマッパー数（ローカル実行ではLOCAL_JOB_WORKERSに従う）
+            image: コンテナイメージ（ローカル実行では使用しない）
+
+        Returns:
+            Job名
+
+        Raises:
+            ValueError: シャード数・並列数が不正な場合
+            JobAlreadyExistsError: 同じ名前のジョブが未完了の場合
+        """
+        # K8sのIndexed Jobと同じ入力だけを受け付ける（振り分け先によって検証が変わらないように）
+        if shards < 2:
+            raise ValueError("shards must be at least 2")
+        if parallelism is not None and parallelism < 1:
+            raise ValueError("parallelism must be at least 1")
+        if not self.queue.enqueue(job_name, dataset_url, target_date, shards=shards):
+            raise JobAlreadyExistsError(job_name)
+        logger.info(f"Local sharded job {job_name} queued ({shards} shards)")
+        self._wakeup.set()
+        return job_name
+
+    def list_jobs(self, label_selector: str | None = None) -> list[dict[str, Any]]:
+        """
+        ジョブの一覧を取得する
+
+        Args:
+            label_selector: ラベルセレクター（ローカル実行では使用しない）
+
+        Returns:
+            ジョブの状態を含む辞書のリスト（作成日時の降順）
+        """
+        return [self._to_status(job) for job in self.queue.list_jobs()]
+
+    def get_job_status(self, job_id: str) -> dict[str, Any]:
+        """
+        ジョブの状態を取得する
+
+        Args:
+            job_id: Job名
+
+        Returns:
+            ジョブの状態を含む辞書
+        """
+        job = self.queue.get(job_id)
+        if job is None:
+            return {
+                "job_id": job_id,
+                "status": "not_found",
+                "message": f"Job {job_id} not found in local queue",
+            }
+        return self._to_status(job)
+
+    def has_job(self, job_id: str) -> bool:
+        """ジョブがローカルキューに存在するかを返す"""
+        return self.queue.get(job_id) is not None
+
+    def delete_job(self, job_id: str) -> bool:
+        """
+        ジョブを削除する（実行中のジョブは結果を記録しなくなる）
+
+        Args:
+            job_id: Job名
+
+        Returns:
+            ジョブが存在して削除（取り消し）した場合True
+        """
+        return self.queue.delete(job_id)
+
+    def _dispatch_loop(self) -> None:
+        """空きワーカーがある間、キューからジョブを取り出して実行する"""
+        while not self._stop.is_set():
+            if time.monotonic() - self._renewed_at >= self.lease_seconds / 3:
+                self._heartbeat()
+            if not self._slots.acquire(timeout=self.poll_interval):
+                continue
+
+            job = self.queue.claim(owner=self.owner, lease_seconds=self.lease_seconds)
+            if job is None:
+                self._slots.release()
+                self._wakeup.wait(timeout=self.poll_interval)
+                self._wakeup.clear()
+                continue
+
+            logger.info(f"Running local job {job.job_id}")
+            future = self._executor.submit(
+                _execute_job,
+                job.dataset_url,
+                job.target_date,
+                job.force,
+                job.aggregation,
+                job.shards,
+                job.job_id,
+            )
+            future.add_done_callback(lambda f, job=job: self._on_done(job, f))
+
+    def _heartbeat(self) -> None:
+        """実行中のジョブのリースを延長し、期限切れのジョブを待機中に戻す"""
+        self._renewed_at = time.monotonic()
+        self.queue.renew(self.owner, self.lease_seconds)
+        requeued = self.queue.requeue_expired()
+        if requeued:
+            logger.info(f"Requeued {requeued} local jobs whose lease expired")
+
+    def _on_done(self, job: QueuedJob, future: Future) -> None:
+        """ジョブの完了を記録する"""
+        try:
+            success, result_path, message = future.result()
+        except Exception as e:
+            success, result_path, message = False, None, f"Worker failed: {e}"
+        finally:
+            self._slots.release()
+
+        if self.queue.complete(
+            job.job_id, success, result_path=result_path, message=message, owner=self.owner
+        ):
+            logger.info(f"Local job {job.job_id} finished: success={success}")
+        else:
+            # 取り消された、またはリースが切れて他のプロセスが実行し直しているジョブ
+            logger.warning(f"Local job {job.job_id} finished but is no longer owned by this worker")
+        self._wakeup.set()
+
+    @staticmethod
+    def _to_status(job: QueuedJob) -> dict[str, Any]:
+        """JobLauncherと同じ形式の状態辞書に変換する"""
+        return {
+            "job_id": job.job_id,
+            "status": job.status,
+            "backend": "local",
+            "creation_timestamp": job.creation_timestamp,
+            "completion_time": job.completion_time,
+            "succeeded": int(job.status == "completed"),
+            "failed": int(job.status == "failed"),
+            "active": int(job.status == "running"),
+            "result_path": job.result_path,
+            "message": job.message,
+        }
@@ -0,0 +1,315 @@
+"""SQLiteによる永続ジョブキューの実装"""
+
+import sqlite3
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+# 終了済み（再投入可能）の状態
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    dataset_url TEXT NOT NULL,
+    target_date TEXT NOT NULL,
+    force INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    creation_timestamp TEXT NOT NULL,
+    start_time TEXT,
+    completion_time TEXT,
+    result_path TEXT,
+    message TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    aggregation TEXT,
+    owner TEXT,
+    lease_expires REAL,
+    shards INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+# 既存のキューのファイルに後から追加した列（列名, 定義）
+_ADDED_COLUMNS = (
+    ("aggregation", "TEXT"),
+    ("owner", "TEXT"),
+    ("lease_expires", "REAL"),
+    ("shards", "INTEGER NOT NULL DEFAULT 0"),
+)
+
+
+@dataclass(frozen=True)
+class QueuedJob:
+    """キュー上のジョブ"""
+
+    job_id: str
+    dataset_url: str
+    target_date: str
+    force: bool
+    status: str
+    creation_timestamp: str
+    start_time: str | None = None
+    completion_time: str | None = None
+    result_path: str | None = None
+    message: str | None = None
+    attempts: int = 0
+    # 集計仕様のJSON（Noneの場合は既定の集計）
+    aggregation: str | None = None
+    # 実行中のジョブを取り出したプロセスの識別子
+    owner: str | None = None
+    # 実行中のジョブのリース期限（UNIX時刻。期限切れのジョブは他のプロセスが待機中に戻す）
+    lease_expires: float | None = None
+    # 分割実行のシャード数（0の場合は分割しない）
+    shards: int = 0
+
+
+class SqliteJobQueue:
+    """
+    SQLiteファイルに状態を保持するジョブキュー
+
+    取り出し（claim）はBEGIN IMMEDIATEのトランザクションで行うため、
+    複数スレッド・複数プロセスから同じファイルを使っても同じジョブを二重に取り出さない。
+    取り出したジョブには取り出したプロセスのリースを付け、プロセスは実行中の間リースを
+    延長し続ける。延長されずに期限が切れたジョブだけを、停止したプロセスのジョブとして
+    待機中に戻す。
+    """
+
+    def __init__(self, db_path: str | Path):
+        """
+        初期化
+
+        Args:
+            db_path: SQLiteファイルのパス
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for name, definition in _ADDED_COLUMNS:
+                if name not in columns:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {name} {definition}")
+
+    def enqueue(
+        self,
+        job_id: str,
+        dataset_url: str,
+        target_date: str,
+        force: bool = False,
+        aggregation: str | None = None,
+        shards: int = 0,
+    ) -> bool:
+        """
+        ジョブを投入する
+
+        Args:
+            job_id: ジョブID
+            dataset_url: データセットURL
+            target_date: 対象日付
+            force: 保存済み結果があっても再計算するか
+            aggregation: 集計仕様のJSON
+            shards: 分割実行のシャード数（0の場合は分割しない）
+
+        Returns:
+            投入した場合True（同じIDのジョブが未完了の場合は投入せずFalse）
+        """
+        with self._transaction() as conn:
+            row = conn.execute("SELECT status FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if row is not None and row["status"] not in TERMINAL_STATUSES:
+                return False
+            conn.execute(
+                "INSERT OR REPLACE INTO jobs "
+                "(job_id, dataset_url, target_date, force, aggregation, shards, status, "
+                "creation_timestamp) "
+                "VALUES (?, ?, ?, ?, ?, ?, 'pending', ?)",
+                (job_id, dataset_url, target_date, int(force), aggregation, shards, _now()),
+            )
+            return True
+
+    def claim(self, owner: str = "", lease_seconds: float = 60.0) -> QueuedJob | None:
+        """
+        最も古い待機中のジョブを取り出して実行中にする
+
+        Args:
+            owner: 取り出すプロセスの識別子
+            lease_seconds: リースの長さ（秒。この間にrenewされないジョブは再投入の対象になる）
+
+        Returns:
+            取り出したジョブ（待機中のジョブが無い場合はNone）
+        """
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT job_id FROM jobs WHERE status = 'pending' "
+                "ORDER BY creation_timestamp LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', start_time = ?, attempts = attempts + 1, "
+                "owner = ?, lease_expires = ? WHERE job_id = ?",
+                (_now(), owner, time.time() + lease_seconds, row["job_id"]),
+            )
+            return self._get(conn, row["job_id"])
+
+    def complete(
+        self,
+        job_id: str,
+        success: bool,
+        result_path: str | None = None,
+        message: str = "",
+        owner: str = "",
+    ) -> bool:
+        """
+        ジョブを完了状態にする
+
+        取り消し済みのジョブと、リースが切れて他のプロセスが取り出し直したジョブは状態を変更しない
+        （古い実行の結果で新しい実行の状態を上書きしない）。
+
+        Args:
+            job_id: ジョブID
+            success: 成功したか
+            result_path: 結果の保存先
+            message: メッセージ
+            owner: ジョブを取り出したプロセスの識別子
+
+        Returns:
+            状態を変更した場合True
+        """
+        with self._transaction() as conn:
+            return (
+                conn.execute(
+                    "UPDATE jobs SET status = ?, completion_time = ?, result_path = ?, "
+                    "message = ? WHERE job_id = ? AND status = 'running' AND owner = ?",
+                    (
+                        "completed" if success else "failed",
+                        _now(),
+                        result_path,
+                        message,
+                        job_id,
+                        owner,
+                    ),
+                ).rowcount
+                > 0
+            )
+
+    def get(self, job_id: str) -> QueuedJob | None:
+        """
+        ジョブを取得する
+
+        Args:
+            job_id: ジョブID
+
+        Returns:
+            ジョブ（存在しない場合はNone）
+        """
+        with self._connect() as conn:
+            return self._get(conn, job_id)
+
+    def list_jobs(self) -> list[QueuedJob]:
+        """作成日時の降順でジョブの一覧を返す"""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT * FROM jobs ORDER BY creation_timestamp DESC").fetchall()
+            return [self._to_job(row) for row in rows]
+
+    def delete(self, job_id: str) -> bool:
+        """
+        ジョブを削除する
+
+        未完了のジョブは取り消し状態にして実行対象から外し、完了済みのジョブは行を削除する。
+
+        Args:
+            job_id: ジョブID
+
+        Returns:
+            ジョブが存在した場合True
+        """
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'cancelled', completion_time = ? "
+                "WHERE job_id = ? AND status IN ('pending', 'running')",
+                (_now(), job_id),
+            )
+            if cursor.rowcount:
+                return True
+            return conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,)).rowcount > 0
+
+    def renew(self, owner: str, lease_seconds: float = 60.0) -> int:
+        """
+        プロセスが実行中のジョブのリースを延長する（ハートビート）
+
+        Args:
+            owner: ジョブを取り出したプロセスの識別子
+            lease_seconds: 現在時刻から延長するリースの長さ（秒）
+
+        Returns:
+            延長したジョブ数
+        """
+        with self._transaction() as conn:
+            return conn.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE status = 'running' AND owner = ?",
+                (time.time() + lease_seconds, owner),
+            ).rowcount
+
+    def requeue_expired(self, now: float | None = None) -> int:
+        """
+        リースの期限が切れた実行中のジョブを待機中に戻す（停止したプロセスのジョブの復旧用）
+
+        同じキューを使う他のプロセスがリースを延長しているジョブは戻さない。
+
+        Args:
+            now: 判定に使う現在時刻（UNIX時刻。Noneの場合は現在時刻）
+
+        Returns:
+            待機中に戻したジョブ数
+        """
+        with self._transaction() as conn:
+            return conn.execute(
+                "UPDATE jobs SET status = 'pending', start_time = NULL, owner = NULL, "
+                "lease_expires = NULL WHERE status = 'running' "
+                "AND (lease_expires IS NULL OR lease_expires < ?)",
+                (time.time() if now is None else now,),
+            ).rowcount
+
+    def count(self, status: str) -> int:
+        """指定した状態のジョブ数を返す"""
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (status,)).fetchone()[
+                0
+            ]
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def _get(self, conn: sqlite3.Connection, job_id: str) -> QueuedJob | None:
+        row = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._to_job(row) if row is not None else None
+
+    @staticmethod
+    def _to_job(row: sqlite3.Row) -> QueuedJob:
+        data = dict(row)
+        data["force"] = bool(data["force"])
+        return QueuedJob(**data)
+
+
+def _now() -> str:
+    return datetime.now(UTC).isoformat()
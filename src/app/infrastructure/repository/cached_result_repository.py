@@ -0,0 +1,107 @@
+"""読み込んだ結果をメモリ上に保持するリポジトリ"""
+
+import threading
+import time
+from collections import OrderedDict
+
+import polars as pl
+
+from app.domain.model.analysis_result import AnalysisResult
+from app.domain.value_object.date_range import DateRange
+from app.domain.value_object.target_date import TargetDate
+from app.usecase.ports.output.result_repository import ResultRepository
+
+
+class CachedResultRepository(ResultRepository):
+    """
+    最近読み込んだ結果をバイト数の上限付きLRUで保持するリポジトリ
+
+    同じ日付の結果を繰り返し読むダッシュボード向けに、保存先への取得とParquetの解析を省く。
+    別プロセス（Job）が結果を書き換えた場合に備えて、ttl_secondsを過ぎた結果は読み直す。
+    """
+
+    def __init__(
+        self,
+        inner: ResultRepository,
+        max_bytes: int = 256 * 1024**2,
+        ttl_seconds: float = 300.0,
+    ):
+        """
+        初期化
+
+        Args:
+            inner: 実際に保存・読み込みを行うリポジトリ
+            max_bytes: 保持する結果の合計バイト数の上限（estimated_sizeで数える）
+            ttl_seconds: 保持した結果を再利用する秒数
+        """
+        self.inner = inner
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        self._entries: OrderedDict[str, tuple[pl.DataFrame, int, float]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def save(
+        self, result: AnalysisResult, target_date: TargetDate, partition: str | None = None
+    ) -> str:
+        """結果を保存し、保持している同じ日付・同じ名前の結果を破棄する"""
+        path = self.inner.save(result, target_date, partition)
+        with self._lock:
+            self._remove(self._key(target_date, partition))
+        return path
+
+    def sink(self, plan: pl.LazyFrame, target_date: TargetDate) -> str:
+        """結果を書き出し、保持している同じ日付の結果を破棄する"""
+        path = self.inner.sink(plan, target_date)
+        self.invalidate(target_date)
+        return path
+
+    def load(self, target_date: TargetDate, partition: str | None = None) -> pl.DataFrame | None:
+        """保持している結果があれば返し、無ければ読み込んで保持する"""
+        key = self._key(target_date, partition)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[2] < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        data = self.inner.load(target_date, partition)
+        if data is None:
+            return None
+
+        size = data.estimated_size()
+        with self._lock:
+            self._remove(key)
+            # 上限より大きな結果は保持しない
+            if size <= self.max_bytes:
+                self._entries[key] = (data, size, now)
+                self._bytes += size
+                while self._bytes > self.max_bytes:
+                    self._remove(next(iter(self._entries)))
+        return data
+
+    def scan(
+        self, date_range: DateRange, categories: list[str] | None = None
+    ) -> pl.LazyFrame | None:
+        """日付範囲の読み込みは保持せず、そのまま委譲する"""
+        return self.inner.scan(date_range, categories)
+
+    def invalidate(self, target_date: TargetDate) -> None:
+        """対象日付の保持している結果を破棄する"""
+        with self._lock:
+            self._remove(str(target_date))
+
+    @staticmethod
+    def _key(target_date: TargetDate, partition: str | None) -> str:
+        return f"{target_date}/{partition}" if partition else str(target_date)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
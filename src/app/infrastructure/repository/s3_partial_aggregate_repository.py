@@ -0,0 +1,81 @@
+"""結果の保存先に部分集計を保存する実装"""
+
+import io
+import tempfile
+from pathlib import Path
+
+import polars as pl
+
+from app.domain.value_object.target_date import TargetDate
+from app.infrastructure.config.settings import Settings
+from app.infrastructure.storage.factory import object_store_from_settings
+from app.infrastructure.storage.object_store import ObjectStore
+from app.usecase.ports.output.partial_aggregate_repository import PartialAggregateRepository
+
+
+class S3PartialAggregateRepository(PartialAggregateRepository):
+    """S3ResultRepositoryと同じ場所にpartial.parquetとして保存する実装"""
+
+    FILE_NAME = "partial.parquet"
+
+    def __init__(self, settings: Settings, store: ObjectStore | None = None):
+        """
+        初期化
+
+        Args:
+            settings: アプリケーション設定
+            store: 保存先のオブジェクトストア（Noneの場合は設定から構築する）
+        """
+        self.settings = settings
+        self.store = store or object_store_from_settings(settings)
+
+    def save(self, partial: pl.DataFrame, target_date: TargetDate) -> str:
+        """
+        部分集計を保存する
+
+        Args:
+            partial: 部分集計
+            target_date: 対象日付
+
+        Returns:
+            保存先のパス
+        """
+        buffer = io.BytesIO()
+        partial.write_parquet(buffer)
+        return self.store.put_bytes(self._key(target_date), buffer.getbuffer())
+
+    def sink(self, plan: pl.LazyFrame, target_date: TargetDate) -> str:
+        """
+        部分集計の計画をストリーミングで一時ファイルに書き出してから保存する
+
+        Args:
+            plan: 部分集計の計画
+            target_date: 対象日付
+
+        Returns:
+            保存先のパス
+        """
+        with tempfile.TemporaryDirectory(prefix="odf-partial-") as tmp_dir:
+            path = Path(tmp_dir) / self.FILE_NAME
+            plan.sink_parquet(path)
+            return self.store.put_file(self._key(target_date), path)
+
+    def load(self, target_date: TargetDate) -> pl.LazyFrame | None:
+        """
+        部分集計の読み込み計画を返す
+
+        部分集計は日付数×カテゴリ数の小さなデータのため、まとめて取得してから計画を作る。
+
+        Args:
+            target_date: 対象日付
+
+        Returns:
+            部分集計のLazyFrame（保存されていない場合はNone）
+        """
+        data = self.store.get_bytes(self._key(target_date))
+        if data is None:
+            return None
+        return pl.read_parquet(io.BytesIO(data)).lazy()
+
+    def _key(self, target_date: TargetDate) -> str:
+        return f"{target_date}/{self.FILE_NAME}"
@@ -0,0 +1,47 @@
+"""結果の保存先に分析プロファイルを保存する実装"""
+
+import json
+import uuid
+from dataclasses import asdict
+from datetime import UTC, datetime
+
+from app.domain.value_object.target_date import TargetDate
+from app.infrastructure.config.settings import Settings
+from app.infrastructure.storage.factory import object_store_from_settings
+from app.infrastructure.storage.object_store import ObjectStore
+from app.usecase.dto.analysis_profile import AnalysisProfile
+from app.usecase.ports.output.profile_repository import ProfileRepository
+
+
+class S3ProfileRepository(ProfileRepository):
+    """S3ResultRepositoryと同じ場所の{target_date}/profiles/配下にJSONとして保存する実装"""
+
+    DIR_NAME = "profiles"
+
+    def __init__(self, settings: Settings, store: ObjectStore | None = None):
+        """
+        初期化
+
+        Args:
+            settings: アプリケーション設定
+            store: 保存先のオブジェクトストア（Noneの場合は設定から構築する）
+        """
+        self.settings = settings
+        self.store = store or object_store_from_settings(settings)
+
+    def save(self, profile: AnalysisProfile, target_date: TargetDate) -> str:
+        """
+        分析プロファイルを保存する（同じ日付の過去のプロファイルは上書きしない）
+
+        Args:
+            profile: 分析プロファイル
+            target_date: 対象日付
+
+        Returns:
+            保存先のパス
+        """
+        created_at = datetime.now(UTC)
+        run_id = f"{created_at:%Y%m%dT%H%M%SZ}-{uuid.uuid4().hex[:8]}"
+        body = {"created_at": created_at.isoformat(), **asdict(profile)}
+        key = f"{target_date}/{self.DIR_NAME}/{run_id}.json"
+        return self.store.put_bytes(key, json.dumps(body, indent=2).encode("utf-8"))
@@ -0,0 +1,100 @@
+"""結果の保存先にメモ化情報を記録する実装"""
+
+import json
+
+from app.domain.value_object.target_date import TargetDate
+from app.infrastructure.config.settings import Settings
+from app.infrastructure.repository.s3_result_repository import S3ResultRepository
+from app.infrastructure.storage.factory import object_store_from_settings
+from app.infrastructure.storage.object_store import ObjectStore
+from app.usecase.ports.output.result_memo_store import ResultMemoStore
+
+
+class S3ResultMemoStore(ResultMemoStore):
+    """
+    S3ResultRepositoryと同じ場所に_memo.jsonとして記録する実装
+
+    結果のパスは対象日付とパーティション（集計仕様の結果など）ごとに1つのため、記録もその単位で
+    1つだけ保持する（別の入力で結果が上書きされた場合は記録も置き換わる）。
+    """
+
+    MANIFEST_NAME = "_memo.json"
+
+    def __init__(self, settings: Settings, store: ObjectStore | None = None):
+        """
+        初期化
+
+        Args:
+            settings: アプリケーション設定
+            store: 保存先のオブジェクトストア（Noneの場合は設定から構築する）
+        """
+        self.settings = settings
+        self.store = store or object_store_from_settings(settings)
+
+    def get(self, target_date: TargetDate, key: str, partition: str | None = None) -> str | None:
+        """
+        メモ化キーに一致する保存済み結果のパスを取得する
+
+        Args:
+            target_date: 対象日付
+            key: メモ化キー
+            partition: 結果の保存先を分けるパーティション（Noneの場合は既定の結果）
+
+        Returns:
+            保存済み結果のパス（一致しない、または結果が消えている場合はNone）
+        """
+        data = self.store.get_bytes(self._manifest_key(target_date, partition))
+        if data is None:
+            return None
+        try:
+            manifest = json.loads(data)
+        except json.JSONDecodeError:
+            return None
+
+        if manifest.get("key") != key:
+            return None
+        # 記録した結果本体（パーティションの結果）が削除されている場合は記録を無視する
+        result_key = S3ResultRepository(self.settings, self.store).result_key(
+            target_date, partition
+        )
+        if not self.store.exists(result_key):
+            return None
+        return manifest.get("result_path")
+
+    def put(
+        self, target_date: TargetDate, key: str, result_path: str, partition: str | None = None
+    ) -> None:
+        """
+        メモ化キーと保存済み結果の対応を記録する
+
+        Args:
+            target_date: 対象日付
+            key: メモ化キー
+            result_path: 保存済み結果のパス
+            partition: 結果の保存先を分けるパーティション（Noneの場合は既定の結果）
+        """
+        manifest = json.dumps({"key": key, "result_path": result_path})
+        self.store.put_bytes(self._manifest_key(target_date, partition), manifest.encode("utf-8"))
+
+    def invalidate(self, target_date: TargetDate) -> bool:
+        """
+        対象日付の記録を削除する（全パーティションの記録を削除する）
+
+        Args:
+            target_date: 対象日付
+
+        Returns:
+            記録が存在して削除した場合True
+        """
+        keys = [
+            key
+            for key in self.store.list_keys(f"{target_date}/")
+            if key.rsplit("/", 1)[-1] == self.MANIFEST_NAME
+        ]
+        deleted = [self.store.delete(key) for key in keys]
+        return any(deleted)
+
+    def _manifest_key(self, target_date: TargetDate, partition: str | None = None) -> str:
+        if partition is not None:
+            return f"{target_date}/{partition}/{self.MANIFEST_NAME}"
+        return f"{target_date}/{self.MANIFEST_NAME}"
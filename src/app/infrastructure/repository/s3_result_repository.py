@@ -1,52 +1,337 @@
 """S3に結果を保存する実装"""
 
+import io
+import re
+import tempfile
+import zlib
+from pathlib import Path
+
+import polars as pl
+
 from app.domain.model.analysis_result import AnalysisResult
+from app.domain.service.partial_aggregate import KEY_COLUMN
+from app.domain.value_object.date_range import DateRange
 from app.domain.value_object.target_date import TargetDate
 from app.infrastructure.config.settings import Settings
+from app.infrastructure.storage.factory import object_store_from_settings
+from app.infrastructure.storage.object_store import ObjectStore
 from app.usecase.ports.output.result_repository import ResultRepository
 
+# hive配置のパーティション列
+DATE_PARTITION = "date"
+BUCKET_PARTITION = "category_bucket"
+
+# single配置の結果ファイルのキーと、そのURI・パスから日付を取り出すパターン
+_SINGLE_RESULT_KEY = re.compile(r"(\d{4}-\d{2}-\d{2})/result\.parquet")
+_SINGLE_RESULT_PATH_DATE = r"(\d{4}-\d{2}-\d{2})/result\.parquet$"
+# hive配置の結果ファイルと書き込み完了マーカーのキーのパターン
+_HIVE_RESULT_KEY = re.compile(
+    rf"{DATE_PARTITION}=(\d{{4}}-\d{{2}}-\d{{2}})/{BUCKET_PARTITION}=(\d+)/[^/]+\.parquet"
+)
+_HIVE_MARKER_KEY = re.compile(rf"{DATE_PARTITION}=(\d{{4}}-\d{{2}}-\d{{2}})/_SUCCESS")
+
+
+def _month_prefixes(date_range: DateRange) -> list[str]:
+    """
+    日付範囲に含まれる年月の一覧用の接頭辞（例: 2024-01-）を返す
+
+    範囲全体を1つの接頭辞にまとめると年をまたぐ範囲で空文字になり、保存先全体を一覧してしまうため、
+    年月ごとに一覧する。
+    """
+    prefixes = []
+    year, month = date_range.start.year, date_range.start.month
+    while (year, month) <= (date_range.end.year, date_range.end.month):
+        prefixes.append(f"{year:04d}-{month:02d}-")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return prefixes
+
+
+def category_bucket(category: str | None, buckets: int) -> int:
+    """
+    カテゴリを安定したハッシュ（CRC32）でバケットに振り分ける
+
+    Polarsのhash()はバージョン間で値が変わり得るため、保存済みの配置と読み込み時の
+    枝刈りで同じ値になるようCRC32を使う。
+
+    Args:
+        category: カテゴリ（Noneはバケット0）
+        buckets: バケット数
+
+    Returns:
+        バケット番号
+    """
+    if category is None:
+        return 0
+    return zlib.crc32(category.encode("utf-8")) % buckets
+
 
 class S3ResultRepository(ResultRepository):
     """S3に結果を保存する実装"""
 
-    def __init__(self, settings: Settings):
+    RESULT_NAME = "result.parquet"
+    # hive配置で日付の全パーティションの書き込みが完了したことを示すマーカー
+    SUCCESS_MARKER = "_SUCCESS"
+
+    def __init__(self, settings: Settings, store: ObjectStore | None = None):
         """
         初期化
 
         Args:
             settings: アプリケーション設定
+            store: 保存先のオブジェクトストア（Noneの場合は設定から構築する）
         """
         self.settings = settings
+        self.store = store or object_store_from_settings(settings)
 
-    def save(self, result: AnalysisResult, target_date: TargetDate) -> str:
+    def save(
+        self, result: AnalysisResult, target_date: TargetDate, partition: str | None = None
+    ) -> str:
         """
         分析結果をS3に保存する
 
+        Parquetはメモリ上に書き出し、そのままアップロードする（ローカルディスクを経由しない）。
+
         Args:
             result: 分析結果
             target_date: 対象日付
+            partition: 同じ対象日付の結果を区別する名前（指定した場合は配置によらず
+                {target_date}/{partition}/result.parquetに保存し、日付範囲の読み込みの対象にしない）
 
         Returns:
             保存先のパス
         """
-        # S3パスを構築
-        s3_path = (
-            f"s3://{self.settings.s3_bucket}/{self.settings.s3_prefix}/{target_date}/result.parquet"
+        if partition:
+            return self.store.put_bytes(
+                self._partition_key(target_date, partition), self._to_parquet(result.data)
+            )
+        if self.settings.result_layout == "hive":
+            return self._save_hive(result.data, target_date)
+        return self.store.put_bytes(self.result_key(target_date), self._to_parquet(result.data))
+
+    def sink(self, plan: pl.LazyFrame, target_date: TargetDate) -> str:
+        """
+        結果の計画をストリーミングでParquetの一時ファイルに書き出してから保存する
+
+        hive配置はカテゴリのバケットごとにファイルを分けるため、collectしてsaveと同じ方法で保存する。
+
+        Args:
+            plan: 分析結果の計画
+            target_date: 対象日付
+
+        Returns:
+            保存先のパス
+        """
+        if self.settings.result_layout == "hive":
+            return super().sink(plan, target_date)
+
+        with tempfile.TemporaryDirectory(prefix="odf-result-") as tmp_dir:
+            path = Path(tmp_dir) / self.RESULT_NAME
+            plan.sink_parquet(
+                path,
+                compression=self.settings.parquet_compression,
+                compression_level=self.settings.parquet_compression_level,
+                row_group_size=self.settings.parquet_row_group_size,
+                statistics=True,
+            )
+            return self.store.put_file(self.result_key(target_date), path)
+
+    def load(self, target_date: TargetDate, partition: str | None = None) -> pl.DataFrame | None:
+        """
+        保存済みの分析結果を読み込む
+
+        Args:
+            target_date: 対象日付
+            partition: saveで指定した結果を区別する名前（Noneの場合は日付ごとの結果）
+
+        Returns:
+            分析結果のデータ（保存されていない場合はNone）
+        """
+        if partition:
+            data = self.store.get_bytes(self._partition_key(target_date, partition))
+            return pl.read_parquet(io.BytesIO(data)) if data is not None else None
+
+        if self.settings.result_layout == "hive":
+            date_range = DateRange(start=target_date.value, end=target_date.value)
+            lf = self.scan(date_range=date_range)
+            return lf.drop(DATE_PARTITION).collect() if lf is not None else None
+
+        data = self.store.get_bytes(self.result_key(target_date))
+        if data is None:
+            return None
+        return pl.read_parquet(io.BytesIO(data))
+
+    def result_key(self, target_date: TargetDate, partition: str | None = None) -> str:
+        """
+        対象日付の結果が保存済みかを判定するためのキーを返す
+
+        Args:
+            target_date: 対象日付
+            partition: 結果の保存先を分けるパーティション（Noneの場合は既定の結果）
+
+        Returns:
+            パーティションの結果ファイル、single配置では結果ファイル、
+            hive配置では書き込み完了マーカーのキー
+        """
+        if partition is not None:
+            return self._partition_key(target_date, partition)
+        if self.settings.result_layout == "hive":
+            return f"{self._hive_date_dir(target_date)}/{self.SUCCESS_MARKER}"
+        return f"{target_date}/{self.RESULT_NAME}"
+
+    def scan(
+        self,
+        date_range: DateRange,
+        categories: list[str] | None = None,
+    ) -> pl.LazyFrame | None:
+        """
+        日付範囲の結果をまとめて読み込む計画を返す
+
+        対象ファイルを範囲内の年月ごとの一覧取得で求め、1つのscan_parquetで並列に読み込む。
+        カテゴリの条件は述語として読み込みに渡されるため、行グループの統計情報で読み飛ばされる。
+
+        Args:
+            date_range: 対象日付の範囲
+            categories: 対象カテゴリ（Noneの場合は全カテゴリ）
+
+        Returns:
+            date列を含む結果のLazyFrame（範囲内に結果が無い場合はNone）
+        """
+        if self.settings.result_layout == "hive":
+            lf = self._scan_hive(date_range, categories)
+        else:
+            lf = self._scan_single(date_range)
+        if lf is None:
+            return None
+
+        if categories is not None:
+            lf = lf.filter(pl.col(KEY_COLUMN).is_in(categories))
+        return lf
+
+    def _scan_single(self, date_range: DateRange) -> pl.LazyFrame | None:
+        """{target_date}/result.parquetの配置から範囲内のファイルをまとめて読む"""
+        start, end = date_range.start.isoformat(), date_range.end.isoformat()
+        keys = [
+            key
+            for prefix in _month_prefixes(date_range)
+            for key in self.store.list_keys(prefix)
+            if (match := _SINGLE_RESULT_KEY.fullmatch(key)) and start <= match.group(1) <= end
+        ]
+        if not keys:
+            return None
+
+        lf = pl.scan_parquet(
+            [self.store.uri(key) for key in keys],
+            include_file_paths="__path",
+            storage_options=self.store.storage_options(),
+        )
+        # 日付はファイルのパスから取り出す
+        return lf.with_columns(
+            pl.col("__path")
+            .str.extract(_SINGLE_RESULT_PATH_DATE)
+            .str.to_date()
+            .alias(DATE_PARTITION)
+        ).drop("__path")
+
+    def _scan_hive(
+        self, date_range: DateRange, categories: list[str] | None
+    ) -> pl.LazyFrame | None:
+        """
+        hive配置の結果をまとめて読む
+
+        対象ファイルは書き込み完了マーカーのある範囲内の日付・対象カテゴリのバケットに
+        一覧の段階で絞り込むため、対象外のファイルは開かれない。
+        """
+        start, end = date_range.start.isoformat(), date_range.end.isoformat()
+        buckets = (
+            {category_bucket(c, self.settings.result_category_buckets) for c in categories}
+            if categories is not None
+            else None
+        )
+
+        completed: set[str] = set()
+        candidates: list[tuple[str, str, int]] = []
+        for prefix in _month_prefixes(date_range):
+            for key in self.store.list_keys(f"{DATE_PARTITION}={prefix}"):
+                if match := _HIVE_MARKER_KEY.fullmatch(key):
+                    completed.add(match.group(1))
+                elif match := _HIVE_RESULT_KEY.fullmatch(key):
+                    candidates.append((key, match.group(1), int(match.group(2))))
+
+        keys = [
+            key
+            for key, day, bucket in candidates
+            if start <= day <= end and day in completed and (buckets is None or bucket in buckets)
+        ]
+        if not keys:
+            return None
+
+        lf = pl.scan_parquet(
+            [self.store.uri(key) for key in keys],
+            hive_partitioning=True,
+            hive_schema={DATE_PARTITION: pl.Date, BUCKET_PARTITION: pl.Int64},
+            storage_options=self.store.storage_options(),
+        )
+        return lf.drop(BUCKET_PARTITION)
+
+    def _save_hive(self, data: pl.DataFrame, target_date: TargetDate) -> str:
+        """
+        結果をdate=…/category_bucket=…に分割して保存する
+
+        各ファイルはカテゴリ順に並べて書くため、行グループの最小値・最大値の範囲が狭くなり
+        カテゴリの条件で行グループを読み飛ばせる。書き換えの途中を完了済みとして読ませないよう、
+        完了マーカーは最初に消して最後に書く。
+        """
+        date_dir = self._hive_date_dir(target_date)
+        marker_key = f"{date_dir}/{self.SUCCESS_MARKER}"
+        file_name = "part-0.parquet"
+        buckets = self.settings.result_category_buckets
+
+        if KEY_COLUMN in data.columns:
+            mapping = {
+                c: category_bucket(c, buckets) for c in data[KEY_COLUMN].cast(pl.String).unique()
+            }
+            bucket_expr = (
+                pl.col(KEY_COLUMN).cast(pl.String).replace_strict(mapping, return_dtype=pl.Int64)
+            )
+            data = data.sort(KEY_COLUMN)
+        else:
+            bucket_expr = pl.lit(0, dtype=pl.Int64)
+
+        frames = data.with_columns(bucket_expr.alias(BUCKET_PARTITION)).partition_by(
+            BUCKET_PARTITION, as_dict=True, include_key=False, maintain_order=True
         )
 
-        # Parquet形式で保存
-        # 実際の実装では、boto3やs3fsを使用
-        # ここでは例として、ローカルファイルシステムに保存する想定
-        import os
+        self.store.delete(marker_key)
+        written = set()
+        for (bucket,), frame in frames.items():
+            key = f"{date_dir}/{BUCKET_PARTITION}={bucket}/{file_name}"
+            self.store.put_bytes(key, self._to_parquet(frame))
+            written.add(key)
+
+        # 再実行でカテゴリの構成が変わった場合に、前回の結果の残ったバケットを消す
+        for key in self.store.list_keys(f"{date_dir}/"):
+            if key.endswith(f"/{file_name}") and key not in written:
+                self.store.delete(key)
 
-        local_dir = f"/tmp/{target_date}"
-        os.makedirs(local_dir, exist_ok=True)
-        local_path = f"{local_dir}/result.parquet"
-        result.data.write_parquet(local_path)
+        self.store.put_bytes(marker_key, b"")
+        return self.store.uri(date_dir)
+
+    def _to_parquet(self, data: pl.DataFrame) -> memoryview:
+        """結果を設定の圧縮方式・行グループの行数でParquetに書き出す"""
+        buffer = io.BytesIO()
+        data.write_parquet(
+            buffer,
+            compression=self.settings.parquet_compression,
+            compression_level=self.settings.parquet_compression_level,
+            row_group_size=self.settings.parquet_row_group_size,
+            statistics=True,
+        )
+        return buffer.getbuffer()
 
-        # TODO: 実際のS3へのアップロード処理を実装
-        # import boto3
-        # s3_client = boto3.client('s3')
-        # s3_client.upload_file(local_path, self.settings.s3_bucket, ...)
+    @classmethod
+    def _partition_key(cls, target_date: TargetDate, partition: str) -> str:
+        return f"{target_date}/{partition}/{cls.RESULT_NAME}"
 
-        return s3_path
+    @staticmethod
+    def _hive_date_dir(target_date: TargetDate) -> str:
+        return f"{DATE_PARTITION}={target_date}"
@@ -0,0 +1,76 @@
+"""結果の保存先にスキーマを登録する実装"""
+
+import hashlib
+import json
+
+from app.domain.value_object.dataset_schema import DatasetSchema
+from app.infrastructure.config.settings import Settings
+from app.infrastructure.storage.factory import object_store_from_settings
+from app.infrastructure.storage.object_store import ObjectStore
+from app.usecase.ports.output.schema_registry import SchemaRegistry
+
+
+class S3SchemaRegistry(SchemaRegistry):
+    """
+    S3ResultRepositoryと同じ場所のschemas/配下に、データセットごとのJSONとして登録する実装
+
+    JSONはスキーマキーと{"列名": "型名"}の辞書を持ち、直接編集してもよい。
+    """
+
+    PREFIX = "schemas"
+
+    def __init__(self, settings: Settings, store: ObjectStore | None = None):
+        """
+        初期化
+
+        Args:
+            settings: アプリケーション設定
+            store: 保存先のオブジェクトストア（Noneの場合は設定から構築する）
+        """
+        self.settings = settings
+        self.store = store or object_store_from_settings(settings)
+
+    def get(self, key: str) -> DatasetSchema | None:
+        """
+        スキーマを取得する
+
+        Args:
+            key: データセットのスキーマキー
+
+        Returns:
+            スキーマ（登録されていない場合はNone）
+        """
+        data = self.store.get_bytes(self._key(key))
+        if data is None:
+            return None
+        return DatasetSchema.from_dict(json.loads(data))
+
+    def put(self, key: str, schema: DatasetSchema) -> str:
+        """
+        スキーマを登録する
+
+        Args:
+            key: データセットのスキーマキー
+            schema: スキーマ
+
+        Returns:
+            保存先のパス
+        """
+        document = {"dataset": key, **schema.to_dict()}
+        return self.store.put_bytes(self._key(key), json.dumps(document, indent=2).encode("utf-8"))
+
+    def delete(self, key: str) -> bool:
+        """
+        スキーマの登録を削除する
+
+        Args:
+            key: データセットのスキーマキー
+
+        Returns:
+            削除する登録が存在した場合True
+        """
+        return self.store.delete(self._key(key))
+
+    def _key(self, key: str) -> str:
+        # URLはオブジェクトキーに使えない文字を含むため、ハッシュをファイル名にする
+        return f"{self.PREFIX}/{hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]}.json"
@@ -0,0 +1,89 @@
+"""結果の保存先にシャードごとの部分集計を保存する実装"""
+
+import io
+
+import polars as pl
+
+from app.domain.value_object.shard import Shard
+from app.domain.value_object.target_date import TargetDate
+from app.infrastructure.config.settings import Settings
+from app.infrastructure.storage.factory import object_store_from_settings
+from app.infrastructure.storage.object_store import ObjectStore
+from app.usecase.ports.output.shard_partial_repository import ShardPartialRepository
+
+
+class S3ShardPartialRepository(ShardPartialRepository):
+    """S3ResultRepositoryと同じ場所のshards/{run_id}/配下にシャードごとに保存する実装"""
+
+    def __init__(self, settings: Settings, store: ObjectStore | None = None):
+        """
+        初期化
+
+        Args:
+            settings: アプリケーション設定
+            store: 保存先のオブジェクトストア（Noneの場合は設定から構築する）
+        """
+        self.settings = settings
+        self.store = store or object_store_from_settings(settings)
+
+    def save(
+        self, partial: pl.DataFrame, target_date: TargetDate, run_id: str, shard: Shard
+    ) -> str:
+        """
+        シャードの部分集計を保存する
+
+        Args:
+            partial: シャードの部分集計
+            target_date: 対象日付
+            run_id: 分割実行を識別するID
+            shard: シャード
+
+        Returns:
+            保存先のパス
+        """
+        buffer = io.BytesIO()
+        partial.write_parquet(buffer)
+        return self.store.put_bytes(self._key(target_date, run_id, shard), buffer.getbuffer())
+
+    def load(self, target_date: TargetDate, run_id: str, shard: Shard) -> pl.LazyFrame | None:
+        """
+        シャードの部分集計の読み込み計画を返す
+
+        Args:
+            target_date: 対象日付
+            run_id: 分割実行を識別するID
+            shard: シャード
+
+        Returns:
+            シャードの部分集計のLazyFrame（保存されていない場合はNone）
+        """
+        data = self.store.get_bytes(self._key(target_date, run_id, shard))
+        if data is None:
+            return None
+        return pl.read_parquet(io.BytesIO(data)).lazy()
+
+    def delete(self, target_date: TargetDate, run_id: str) -> int:
+        """
+        分割実行の全シャードの部分集計を削除する
+
+        Args:
+            target_date: 対象日付
+            run_id: 分割実行を識別するID
+
+        Returns:
+            削除したシャードの部分集計の数
+        """
+        keys = self.store.list_keys(self._run_prefix(target_date, run_id))
+        return sum(1 for key in keys if self.store.delete(key))
+
+    @classmethod
+    def _key(cls, target_date: TargetDate, run_id: str, shard: Shard) -> str:
+        # シャード数をキーに含め、分割数を変えて再実行した場合に古いシャードを読まないようにする
+        return (
+            f"{cls._run_prefix(target_date, run_id)}"
+            f"part-{shard.index:05d}-of-{shard.count:05d}.parquet"
+        )
+
+    @staticmethod
+    def _run_prefix(target_date: TargetDate, run_id: str) -> str:
+        return f"{target_date}/shards/{run_id}/"
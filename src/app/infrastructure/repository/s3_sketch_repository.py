@@ -0,0 +1,94 @@
+"""結果の保存先に近似スケッチを保存する実装"""
+
+import io
+
+import polars as pl
+
+from app.domain.model.analysis_sketches import AnalysisSketches
+from app.domain.service.sketch import DISTINCT_HASH_SCHEME
+from app.domain.value_object.sketch_spec import SketchSpec
+from app.domain.value_object.target_date import TargetDate
+from app.infrastructure.config.settings import Settings
+from app.infrastructure.storage.factory import object_store_from_settings
+from app.infrastructure.storage.object_store import ObjectStore
+from app.usecase.ports.output.sketch_repository import SketchRepository
+
+
+class S3SketchRepository(SketchRepository):
+    """
+    S3ResultRepositoryと同じ場所にスケッチの種類ごとのParquetとして保存する実装
+
+    ファイル名にスケッチの精度（異なり数のスケッチはハッシュ方式も）を含めるため、設定や
+    Polarsのバージョンを変えた場合は以前のスケッチを読み込まない。
+    """
+
+    def __init__(self, settings: Settings, store: ObjectStore | None = None):
+        """
+        初期化
+
+        Args:
+            settings: アプリケーション設定
+            store: 保存先のオブジェクトストア（Noneの場合は設定から構築する）
+        """
+        self.settings = settings
+        self.store = store or object_store_from_settings(settings)
+
+    def save(self, sketches: AnalysisSketches, target_date: TargetDate) -> str:
+        """
+        近似スケッチを保存する
+
+        Args:
+            sketches: 近似スケッチ
+            target_date: 対象日付
+
+        Returns:
+            分位数スケッチの保存先のパス
+        """
+        spec = sketches.spec
+        if sketches.distinct is not None:
+            self._put(self._distinct_key(target_date, spec), sketches.distinct)
+        elif spec.distinct_column:
+            # 入力から異なり数の列が無くなった場合に、前回の実行のスケッチが残らないようにする
+            self.store.delete(self._distinct_key(target_date, spec))
+        return self._put(self._quantile_key(target_date, spec), sketches.quantiles)
+
+    def load(self, target_date: TargetDate, spec: SketchSpec) -> AnalysisSketches | None:
+        """
+        設定が一致する近似スケッチを読み込む
+
+        Args:
+            target_date: 対象日付
+            spec: スケッチの設定
+
+        Returns:
+            近似スケッチ（分位数スケッチが保存されていない場合はNone）
+        """
+        quantiles = self._get(self._quantile_key(target_date, spec))
+        if quantiles is None:
+            return None
+        distinct = (
+            self._get(self._distinct_key(target_date, spec)) if spec.distinct_column else None
+        )
+        return AnalysisSketches(spec=spec, distinct=distinct, quantiles=quantiles)
+
+    def _put(self, key: str, data: pl.DataFrame) -> str:
+        buffer = io.BytesIO()
+        data.write_parquet(buffer)
+        return self.store.put_bytes(key, buffer.getbuffer())
+
+    def _get(self, key: str) -> pl.DataFrame | None:
+        data = self.store.get_bytes(key)
+        if data is None:
+            return None
+        return pl.read_parquet(io.BytesIO(data))
+
+    @staticmethod
+    def _distinct_key(target_date: TargetDate, spec: SketchSpec) -> str:
+        return (
+            f"{target_date}/sketches/"
+            f"distinct-{spec.distinct_column}-p{spec.precision}-{DISTINCT_HASH_SCHEME}.parquet"
+        )
+
+    @staticmethod
+    def _quantile_key(target_date: TargetDate, spec: SketchSpec) -> str:
+        return f"{target_date}/sketches/quantile-a{spec.relative_accuracy:g}.parquet"
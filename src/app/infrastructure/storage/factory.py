@@ -0,0 +1,29 @@
+"""設定からオブジェクトストアを構築する処理"""
+
+from app.infrastructure.config.settings import Settings
+from app.infrastructure.storage.local_object_store import LocalObjectStore
+from app.infrastructure.storage.object_store import ObjectStore
+
+
+def object_store_from_settings(settings: Settings) -> ObjectStore:
+    """
+    設定に応じた結果の保存先を構築する
+
+    Args:
+        settings: アプリケーション設定
+
+    Returns:
+        RESULT_STORE=s3の場合はS3、それ以外はLOCAL_RESULT_DIR配下に保存するオブジェクトストア
+    """
+    if settings.result_store == "s3":
+        # boto3は本番の保存先でのみ必要なため、使用時に読み込む
+        from app.infrastructure.storage.s3_object_store import S3ObjectStore
+
+        return S3ObjectStore(
+            bucket=settings.s3_bucket,
+            prefix=settings.s3_prefix,
+            endpoint_url=settings.s3_endpoint_url,
+            part_size=settings.s3_multipart_part_size,
+            max_concurrency=settings.s3_upload_concurrency,
+        )
+    return LocalObjectStore(settings.local_result_dir)
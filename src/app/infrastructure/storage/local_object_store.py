@@ -0,0 +1,92 @@
+"""ローカルファイルシステムをオブジェクトストアとして使う実装"""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from app.infrastructure.storage.object_store import ObjectStore
+
+
+class LocalObjectStore(ObjectStore):
+    """
+    ルートディレクトリ配下にキーをパスとして保存する実装（開発・テスト用）
+
+    書き込みは一意な一時ファイルへ書いてから置き換えるため、同じキーへの並行書き込みでも
+    書きかけのファイルが読まれたり、一時ファイルが衝突したりしない。
+    """
+
+    def __init__(self, root: str | Path):
+        """
+        初期化
+
+        Args:
+            root: 保存先のルートディレクトリ
+        """
+        self.root = Path(root)
+
+    def put_bytes(self, key: str, data: bytes | memoryview) -> str:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        return str(path)
+
+    def put_file(self, key: str, path: str | Path) -> str:
+        target = self._path(key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+        os.close(fd)
+        try:
+            shutil.copyfile(path, tmp_path)
+            os.replace(tmp_path, target)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        return str(target)
+
+    def get_bytes(self, key: str) -> bytes | None:
+        try:
+            return self._path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).is_file()
+
+    def delete(self, key: str) -> bool:
+        path = self._path(key)
+        if not path.is_file():
+            return False
+        path.unlink(missing_ok=True)
+        return True
+
+    def list_keys(self, prefix: str) -> list[str]:
+        # ルートが共有ディレクトリ（/tmpなど）でも全体を走査しないよう、prefixの階層から辿る
+        directory, _, name_prefix = prefix.rpartition("/")
+        base = self.root / directory
+        if not base.is_dir():
+            return []
+
+        keys = []
+        for entry in base.iterdir():
+            if not entry.name.startswith(name_prefix):
+                continue
+            paths = entry.rglob("*") if entry.is_dir() else [entry]
+            for path in paths:
+                # 書き込み中の一時ファイルは除く
+                if path.is_file() and not path.name.startswith("."):
+                    keys.append(path.relative_to(self.root).as_posix())
+        return sorted(keys)
+
+    def uri(self, key: str) -> str:
+        return str(self._path(key))
+
+    def _path(self, key: str) -> Path:
+        return self.root / key
@@ -0,0 +1,91 @@
+"""結果の保存先となるオブジェクトストアのインターフェース"""
+
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+
+class ObjectStore(ABC):
+    """キーとバイト列で結果を保存・取得するオブジェクトストア"""
+
+    @abstractmethod
+    def put_bytes(self, key: str, data: bytes | memoryview) -> str:
+        """
+        バイト列を保存する（同じキーは置き換える）
+
+        Args:
+            key: オブジェクトのキー
+            data: 保存するバイト列
+
+        Returns:
+            保存先のURI
+        """
+        pass
+
+    def put_file(self, key: str, path: str | Path) -> str:
+        """
+        ローカルファイルを保存する（同じキーは置き換える）
+
+        既定の実装はファイルをメモリに読み込んでput_bytesに渡す。大きなファイルを扱う実装は
+        ファイルから直接送信するよう上書きする。
+
+        Args:
+            key: オブジェクトのキー
+            path: 保存するファイルのパス
+
+        Returns:
+            保存先のURI
+        """
+        return self.put_bytes(key, Path(path).read_bytes())
+
+    @abstractmethod
+    def get_bytes(self, key: str) -> bytes | None:
+        """
+        バイト列を取得する
+
+        Args:
+            key: オブジェクトのキー
+
+        Returns:
+            バイト列（存在しない場合はNone）
+        """
+        pass
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        """オブジェクトが存在するかを返す"""
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> bool:
+        """
+        オブジェクトを削除する
+
+        Args:
+            key: オブジェクトのキー
+
+        Returns:
+            オブジェクトが存在して削除した場合True
+        """
+        pass
+
+    @abstractmethod
+    def list_keys(self, prefix: str) -> list[str]:
+        """
+        prefixで始まるキーの一覧を返す
+
+        Args:
+            prefix: キーのprefix
+
+        Returns:
+            キーのリスト（辞書順）
+        """
+        pass
+
+    @abstractmethod
+    def uri(self, key: str) -> str:
+        """キーに対応する保存先のURIを返す（globパターンも指定できる）"""
+        pass
+
+    def storage_options(self) -> dict[str, str] | None:
+        """Polarsのscan_*でURIを読む際に渡すstorage_optionsを返す"""
+        return None
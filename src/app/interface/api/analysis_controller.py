@@ -1,17 +1,31 @@
 """分析APIのコントローラー"""
 
+import uuid
 from datetime import date
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
+from app.domain.value_object.aggregation_spec import AggregationSpec
 from app.domain.value_object.dataset import Dataset
+from app.domain.value_object.dataset_schema import DatasetSchema
+from app.domain.value_object.date_range import DateRange
 from app.domain.value_object.target_date import TargetDate
-from app.infrastructure.k8s.job_launcher import JobLauncher
+from app.infrastructure.queue.job_backend import JobAlreadyExistsError, JobBackend
+from app.interface.api.run_executor import AdmissionRejectedError, BoundedRunExecutor
 from app.interface.presenter.analysis_presenter import AnalysisPresenter
+from app.interface.presenter.result_stream import iter_body, negotiate
+from app.usecase.dto.rollup_analysis_input import RollupAnalysisInput
 from app.usecase.dto.run_analysis_input import RunAnalysisInput
+from app.usecase.dto.run_batch_analysis_input import RunBatchAnalysisInput
+from app.usecase.ports.input.get_result_usecase import GetResultUseCase
+from app.usecase.ports.input.rollup_analysis_usecase import RollupAnalysisUseCase
 from app.usecase.ports.input.run_analysis_usecase import RunAnalysisUseCase
+from app.usecase.ports.input.run_batch_analysis_usecase import RunBatchAnalysisUseCase
+from app.usecase.ports.output.schema_registry import SchemaRegistry
 
 router = APIRouter(prefix="/analysis", tags=["analysis"])
 
@@ -22,16 +36,132 @@ def get_usecase() -> RunAnalysisUseCase:
     raise RuntimeError("UseCase not configured")
 
 
-def get_job_launcher() -> JobLauncher:
+def get_batch_usecase() -> RunBatchAnalysisUseCase:
+    """バッチ分析実行ユースケースを取得する（main_api.pyで上書きされる）"""
+    raise RuntimeError("BatchUseCase not configured")
+
+
+def get_result_usecase() -> GetResultUseCase:
+    """結果取得ユースケースを取得する（main_api.pyで上書きされる）"""
+    raise RuntimeError("ResultUseCase not configured")
+
+
+def get_rollup_usecase() -> RollupAnalysisUseCase:
+    """ロールアップユースケースを取得する（main_api.pyで上書きされる）"""
+    raise RuntimeError("RollupUseCase not configured")
+
+
+def get_job_launcher() -> JobBackend:
     """Job起動器を取得する（main_api.pyで上書きされる）"""
     raise RuntimeError("JobLauncher not configured")
 
 
+def get_run_executor() -> BoundedRunExecutor:
+    """分析実行Executorを取得する（main_api.pyで上書きされる）"""
+    raise RuntimeError("RunExecutor not configured")
+
+
+def get_schema_registry() -> SchemaRegistry:
+    """スキーマレジストリを取得する（main_api.pyで上書きされる）"""
+    raise RuntimeError("SchemaRegistry not configured")
+
+
+class MetricModel(BaseModel):
+    """集計する指標"""
+
+    # sum / mean / min / max / count / len / n_unique / median / std / var
+    function: str
+    column: str | None = None
+    alias: str | None = None
+
+
+class FilterModel(BaseModel):
+    """集計前の絞り込み条件"""
+
+    column: str
+    # eq / ne / lt / le / gt / ge / in / is_null / is_not_null
+    op: str
+    value: Any = None
+
+
+class DerivedColumnModel(BaseModel):
+    """集計前に追加する派生列"""
+
+    name: str
+    # add / sub / mul / div
+    op: str
+    left: str
+    right: str | float
+
+
+class AggregationModel(BaseModel):
+    """集計仕様（全ての指標を1回のスキャンで求める）"""
+
+    group_by: list[str] = []
+    metrics: list[MetricModel]
+    filters: list[FilterModel] = []
+    derived: list[DerivedColumnModel] = []
+
+    def to_spec(self) -> AggregationSpec:
+        """
+        集計仕様の値オブジェクトに変換する
+
+        Raises:
+            ValueError: 仕様が不正な場合
+        """
+        return AggregationSpec.from_dict(self.model_dump())
+
+
 class AnalysisRequest(BaseModel):
     """分析リクエスト"""
 
     dataset_url: str
     target_date: str
+    # Trueの場合は同一入力の保存済み結果があっても再計算する
+    force: bool = False
+    # Trueの場合はプロファイルを取得して結果の横に保存する（/analysis/runのみ。
+    # Jobでは環境変数ANALYSIS_PROFILEを使う）
+    profile: bool = False
+    # 集計仕様（省略時はカテゴリごとの合計値を求める）
+    aggregation: AggregationModel | None = None
+
+
+class BatchAnalysisRequest(BaseModel):
+    """バッチ分析リクエスト"""
+
+    dataset_urls: list[str]
+    target_date: str
+
+
+class BackfillRequest(BaseModel):
+    """バックフィルリクエスト"""
+
+    # データセットURLのテンプレート（{date}や{date:%Y%m%d}を対象日付に置き換える）
+    dataset_url_template: str
+    start_date: str
+    end_date: str
+    # 同時に実行するPod数
+    parallelism: int = 4
+    # Trueの場合は同一入力の保存済み結果があっても再計算する
+    force: bool = False
+
+
+class ShardedAnalysisRequest(BaseModel):
+    """分割実行リクエスト"""
+
+    dataset_url: str
+    target_date: str
+    # シャード数（マッパーPodの数。2以上）
+    shards: int
+    # 同時に実行するPod数（省略時は全シャードを同時に実行する）
+    parallelism: int | None = None
+
+
+class SchemaModel(BaseModel):
+    """データセットのスキーマ"""
+
+    # 列名 → 型名（String / Categorical / Int8〜Int64 / Float64など）
+    columns: dict[str, str]
 
 
 class AnalysisResponse(BaseModel):
@@ -40,12 +170,17 @@ class AnalysisResponse(BaseModel):
     success: bool
     result_path: str | None
     message: str
+    reused: bool = False
+    # ステージごとの計測値（Jobの作成では空）
+    metrics: list[dict[str, Any]] = []
+    # プロファイルを要求した場合の保存先
+    profile_path: str | None = None
 
 
 @router.post("/jobs", response_model=AnalysisResponse)
 async def create_analysis_job(
     request: AnalysisRequest,
-    job_launcher: JobLauncher = Depends(get_job_launcher),
+    job_launcher: JobBackend = Depends(get_job_launcher),
 ) -> AnalysisResponse:
     """
     分析Jobを作成して起動する
@@ -59,11 +194,20 @@ async def create_analysis_job(
         分析レスポンス
     """
     try:
-        # Jobを起動
-        job_id = job_launcher.launch_job(
+        aggregation = request.aggregation.to_spec() if request.aggregation else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    try:
+        # Jobを起動（起動先の判定でデータセットのサイズをHEADで取得するため、イベントループを
+        # 止めないようスレッドプールで実行する）
+        job_id = await run_in_threadpool(
+            job_launcher.launch_job,
             job_name=f"analysis-{request.target_date}",
             dataset_url=request.dataset_url,
             target_date=request.target_date,
+            force=request.force,
+            aggregation=aggregation,
         )
 
         return AnalysisResponse(
@@ -71,13 +215,108 @@ async def create_analysis_job(
             result_path=None,
             message=f"Job {job_id} started",
         )
+    except JobAlreadyExistsError as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+
+@router.post("/backfills", response_model=AnalysisResponse)
+async def create_backfill_job(
+    request: BackfillRequest,
+    job_launcher: JobBackend = Depends(get_job_launcher),
+) -> AnalysisResponse:
+    """
+    日付範囲を分析するIndexed Jobを1つ作成して起動する
+
+    Args:
+        request: バックフィルリクエスト
+        job_launcher: Job起動器
+
+    Returns:
+        分析レスポンス
+    """
+    try:
+        date_range = DateRange(
+            start=date.fromisoformat(request.start_date),
+            end=date.fromisoformat(request.end_date),
+        )
+        # テンプレートの書式誤りをJob起動前に検出する
+        request.dataset_url_template.format(date=date_range.start)
+        if request.parallelism < 1:
+            raise ValueError("parallelism must be at least 1")
+    except (ValueError, KeyError, IndexError) as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    try:
+        job_id = await run_in_threadpool(
+            job_launcher.launch_backfill_job,
+            job_name=f"backfill-{request.start_date}-{request.end_date}",
+            date_range=date_range,
+            dataset_url_template=request.dataset_url_template,
+            parallelism=request.parallelism,
+            force=request.force,
+        )
+
+        return AnalysisResponse(
+            success=True,
+            result_path=None,
+            message=f"Backfill job {job_id} started for {len(date_range)} days",
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+
+@router.post("/sharded-jobs", response_model=AnalysisResponse)
+async def create_sharded_job(
+    request: ShardedAnalysisRequest,
+    job_launcher: JobBackend = Depends(get_job_launcher),
+) -> AnalysisResponse:
+    """
+    1つのデータセットをシャードに分けて集計するIndexed Jobを作成して起動する
+
+    Args:
+        request: 分割実行リクエスト
+        job_launcher: Job起動器
+
+    Returns:
+        分析レスポンス
+    """
+    try:
+        date.fromisoformat(request.target_date)
+        if request.shards < 2:
+            raise ValueError("shards must be at least 2")
+        if request.parallelism is not None and request.parallelism < 1:
+            raise ValueError("parallelism must be at least 1")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    try:
+        # Job名はシャードの保存先を分ける実行IDを兼ねるため、前回の実行のシャードと混ざらないよう
+        # 起動ごとに一意にする
+        job_id = await run_in_threadpool(
+            job_launcher.launch_sharded_job,
+            job_name=f"analysis-{request.target_date}-sharded-{uuid.uuid4().hex[:8]}",
+            dataset_url=request.dataset_url,
+            target_date=request.target_date,
+            shards=request.shards,
+            parallelism=request.parallelism,
+        )
+
+        return AnalysisResponse(
+            success=True,
+            result_path=None,
+            message=f"Sharded job {job_id} started with {request.shards} shards",
+        )
+    except JobAlreadyExistsError as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
 @router.get("/jobs", response_model=list[dict[str, Any]])
 async def list_jobs(
-    job_launcher: JobLauncher = Depends(get_job_launcher),
+    job_launcher: JobBackend = Depends(get_job_launcher),
 ) -> list[dict[str, Any]]:
     """
     Jobの一覧を取得する
@@ -98,7 +337,7 @@ async def list_jobs(
 @router.get("/jobs/{job_id}", response_model=dict[str, Any])
 async def get_job_status(
     job_id: str,
-    job_launcher: JobLauncher = Depends(get_job_launcher),
+    job_launcher: JobBackend = Depends(get_job_launcher),
 ) -> dict[str, Any]:
     """
     Jobの状態を取得する
@@ -121,13 +360,18 @@ async def get_job_status(
 async def run_analysis(
     request: AnalysisRequest,
     usecase: RunAnalysisUseCase = Depends(get_usecase),
+    run_executor: BoundedRunExecutor = Depends(get_run_executor),
 ) -> AnalysisResponse:
     """
     分析を直接実行する（開発・テスト用）
 
+    分析はイベントループを塞がないようスレッドプールで実行する。
+    同時実行数と待ち行列が上限に達している場合は429を返す。
+
     Args:
         request: 分析リクエスト
         usecase: 分析実行ユースケース
+        run_executor: 分析実行Executor
 
     Returns:
         分析レスポンス
@@ -137,15 +381,328 @@ async def run_analysis(
         input_data = RunAnalysisInput(
             dataset=Dataset(url=request.dataset_url),
             target_date=TargetDate(value=date.fromisoformat(request.target_date)),
+            force=request.force,
+            profile=request.profile,
+            aggregation=request.aggregation.to_spec() if request.aggregation else None,
         )
 
         # 分析を実行
-        output = usecase.run(input_data)
+        output = await run_executor.submit(usecase.run, input_data)
 
         # プレゼンターで変換
         response_data = AnalysisPresenter.present(output)
 
         return AnalysisResponse(**response_data)
+    except AdmissionRejectedError as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        ) from e
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+
+@router.post("/batch", response_model=dict[str, Any])
+async def run_batch_analysis(
+    request: BatchAnalysisRequest,
+    usecase: RunBatchAnalysisUseCase = Depends(get_batch_usecase),
+    run_executor: BoundedRunExecutor = Depends(get_run_executor),
+) -> dict[str, Any]:
+    """
+    同じ対象日付の複数データセットをまとめて分析する
+
+    Args:
+        request: バッチ分析リクエスト
+        usecase: バッチ分析実行ユースケース
+        run_executor: 分析実行Executor
+
+    Returns:
+        データセットごとの分析レスポンス
+    """
+    try:
+        input_data = RunBatchAnalysisInput(
+            datasets=tuple(Dataset(url=url) for url in dict.fromkeys(request.dataset_urls)),
+            target_date=TargetDate(value=date.fromisoformat(request.target_date)),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    try:
+        output = await run_executor.submit(usecase.run_batch, input_data)
+    except AdmissionRejectedError as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        ) from e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+    return AnalysisPresenter.present_batch(output)
+
+
+@router.get("/results")
+async def query_results(
+    from_date: str = Query(alias="from"),
+    to_date: str = Query(alias="to"),
+    category: list[str] | None = Query(default=None),
+    daily: bool = False,
+    accept: str | None = Header(default=None),
+    usecase: GetResultUseCase = Depends(get_result_usecase),
+    run_executor: BoundedRunExecutor = Depends(get_run_executor),
+) -> StreamingResponse:
+    """
+    日付範囲の保存済みの分析結果をまとめて集計する
+
+    範囲内の結果ファイルを1回のスキャンで読み込み、カテゴリの絞り込みと集計を読み込み側へ
+    押し下げる。応答形式は/results/{target_date}と同じくAcceptヘッダーで選択する。
+
+    Args:
+        from_date: 開始日（この日を含む）
+        to_date: 終了日（この日を含む）
+        category: 対象カテゴリ（複数指定可、省略時は全カテゴリ）
+        daily: Trueの場合は日付ごとに集計する
+        accept: Acceptヘッダー
+        usecase: 結果取得ユースケース
+        run_executor: 分析実行Executor
+
+    Returns:
+        集計結果のストリーミングレスポンス
+    """
+    try:
+        date_range = DateRange(
+            start=date.fromisoformat(from_date),
+            end=date.fromisoformat(to_date),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    try:
+        data = await run_executor.submit(usecase.query, date_range, category, daily)
+    except AdmissionRejectedError as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        ) from e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+    if data is None:
+        raise HTTPException(status_code=404, detail=f"No results for {date_range}")
+
+    media_type = negotiate(accept)
+    return StreamingResponse(
+        iter_body(data, media_type), media_type=media_type, headers={"Vary": "Accept"}
+    )
+
+
+@router.get("/results/{target_date}")
+async def get_result(
+    target_date: str,
+    dataset_url: str | None = Query(default=None),
+    accept: str | None = Header(default=None),
+    usecase: GetResultUseCase = Depends(get_result_usecase),
+) -> StreamingResponse:
+    """
+    保存済みの分析結果を取得する
+
+    Acceptヘッダーに応じてArrow IPCストリーム・NDJSON・JSONのいずれかで、
+    本文全体を組み立てずに少しずつ返す。
+
+    Args:
+        target_date: 対象日付
+        dataset_url: バッチ実行で保存したデータセットの結果を取得する場合のデータセットURL
+        accept: Acceptヘッダー
+        usecase: 結果取得ユースケース
+
+    Returns:
+        分析結果のストリーミングレスポンス
+    """
+    try:
+        parsed_date = TargetDate(value=date.fromisoformat(target_date))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    try:
+        partition = Dataset(url=dataset_url).result_partition if dataset_url else None
+        data = await run_in_threadpool(usecase.get, parsed_date, partition)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+    if data is None:
+        raise HTTPException(status_code=404, detail=f"No result for {target_date}")
+
+    media_type = negotiate(accept)
+    return StreamingResponse(
+        iter_body(data, media_type), media_type=media_type, headers={"Vary": "Accept"}
+    )
+
+
+@router.get("/rollup", response_model=dict[str, Any])
+async def rollup_analysis(
+    start_date: str,
+    end_date: str,
+    usecase: RollupAnalysisUseCase = Depends(get_rollup_usecase),
+    run_executor: BoundedRunExecutor = Depends(get_run_executor),
+) -> dict[str, Any]:
+    """
+    日付ごとの部分集計をマージして日付範囲の集計を取得する（生データは読まない）
+
+    Args:
+        start_date: 開始日（この日を含む）
+        end_date: 終了日（この日を含む）
+        usecase: ロールアップユースケース
+        run_executor: 分析実行Executor
+
+    Returns:
+        ロールアップ結果
+    """
+    try:
+        input_data = RollupAnalysisInput(
+            date_range=DateRange(
+                start=date.fromisoformat(start_date),
+                end=date.fromisoformat(end_date),
+            )
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    try:
+        output = await run_executor.submit(usecase.rollup, input_data)
+    except AdmissionRejectedError as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        ) from e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+    if not output.success:
+        # 範囲内に部分集計が1つも無い場合は404、それ以外の失敗は500
+        status_code = 404 if output.missing_dates else 500
+        raise HTTPException(status_code=status_code, detail=output.message)
+    return AnalysisPresenter.present_rollup(output)
+
+
+@router.get("/run/stats", response_model=dict[str, Any])
+async def get_run_stats(
+    run_executor: BoundedRunExecutor = Depends(get_run_executor),
+) -> dict[str, Any]:
+    """
+    分析実行の待ち行列の深さと待ち時間の統計を取得する
+
+    Args:
+        run_executor: 分析実行Executor
+
+    Returns:
+        統計情報
+    """
+    return run_executor.stats()
+
+
+@router.delete("/memo/{target_date}", response_model=dict[str, Any])
+async def invalidate_memo(
+    target_date: str,
+    usecase: RunAnalysisUseCase = Depends(get_usecase),
+) -> dict[str, Any]:
+    """
+    対象日付の結果のメモ化を無効化する（次回実行時は必ず再計算する）
+
+    Args:
+        target_date: 対象日付
+        usecase: 分析実行ユースケース
+
+    Returns:
+        無効化の結果
+    """
+    try:
+        invalidated = usecase.invalidate(TargetDate(value=date.fromisoformat(target_date)))
+        return {"target_date": target_date, "invalidated": invalidated}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+
+@router.get("/schemas", response_model=dict[str, Any])
+async def get_schema(
+    dataset_url: str = Query(...),
+    registry: SchemaRegistry = Depends(get_schema_registry),
+) -> dict[str, Any]:
+    """
+    データセットに固定したスキーマを取得する
+
+    Args:
+        dataset_url: データセットURL（URL中の日付は区別しない）
+        registry: スキーマレジストリ
+
+    Returns:
+        スキーマキーとスキーマ
+    """
+    try:
+        key = Dataset(url=dataset_url).schema_key
+        schema = await run_in_threadpool(registry.get, key)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+    if schema is None:
+        raise HTTPException(status_code=404, detail=f"Schema not found: {key}")
+    return {"schema_key": key, **schema.to_dict()}
+
+
+@router.put("/schemas", response_model=dict[str, Any])
+async def put_schema(
+    request: SchemaModel,
+    dataset_url: str = Query(...),
+    registry: SchemaRegistry = Depends(get_schema_registry),
+) -> dict[str, Any]:
+    """
+    データセットのスキーマを登録・編集する（次回の読み込みから使われる）
+
+    Args:
+        request: スキーマ
+        dataset_url: データセットURL（URL中の日付は区別しない）
+        registry: スキーマレジストリ
+
+    Returns:
+        スキーマキーと保存先のパス
+    """
+    try:
+        key = Dataset(url=dataset_url).schema_key
+        schema = DatasetSchema.from_dict(request.model_dump())
+        path = await run_in_threadpool(registry.put, key, schema)
+        return {"schema_key": key, "path": path, **schema.to_dict()}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+
+@router.delete("/schemas", response_model=dict[str, Any])
+async def delete_schema(
+    dataset_url: str = Query(...),
+    registry: SchemaRegistry = Depends(get_schema_registry),
+) -> dict[str, Any]:
+    """
+    データセットのスキーマの登録を削除する（次回の読み込みで学習し直す）
+
+    Args:
+        dataset_url: データセットURL（URL中の日付は区別しない）
+        registry: スキーマレジストリ
+
+    Returns:
+        削除の結果
+    """
+    try:
+        key = Dataset(url=dataset_url).schema_key
+        deleted = await run_in_threadpool(registry.delete, key)
+        return {"schema_key": key, "deleted": deleted}
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
     except Exception as e:
@@ -0,0 +1,27 @@
+"""メトリクスAPIのコントローラー"""
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import Response
+
+from app.infrastructure.metrics.prometheus_metrics import CONTENT_TYPE, PrometheusMetrics
+
+router = APIRouter(tags=["metrics"])
+
+
+def get_metrics() -> PrometheusMetrics:
+    """メトリクスを取得する（main_api.pyで上書きされる）"""
+    raise RuntimeError("Metrics not configured")
+
+
+@router.get("/metrics")
+async def export_metrics(metrics: PrometheusMetrics = Depends(get_metrics)) -> Response:
+    """
+    分析ステージごとの計測値をPrometheusのテキスト形式で返す
+
+    Args:
+        metrics: メトリクス
+
+    Returns:
+        テキスト形式のメトリクス
+    """
+    return Response(content=metrics.render(), media_type=CONTENT_TYPE)
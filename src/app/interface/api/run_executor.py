@@ -0,0 +1,156 @@
+"""同期分析実行をイベントループ外で実行するための有界Executor"""
+
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class AdmissionRejectedError(Exception):
+    """同時実行数と待ち行列が上限に達して受け付けられなかった場合の例外"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Too many concurrent analysis runs. Retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class BoundedRunExecutor:
+    """
+    同期的な分析実行をスレッドプールへ退避し、受け付け数を制限するExecutor
+
+    Polarsの処理はGILを解放するため、スレッドプールでもイベントループを塞がずに
+    並列実行できる。実行中と待機中の合計が上限に達した場合は待ち行列を無制限に
+    伸ばさず、AdmissionRejectedErrorで即座に拒否する。
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 2,
+        max_queue: int = 8,
+        default_retry_after: int = 5,
+        window: int = 1000,
+    ):
+        """
+        初期化
+
+        Args:
+            max_concurrency: 同時に実行する分析の最大数
+            max_queue: 実行待ちで保持する分析の最大数
+            default_retry_after: 実行時間の実績が無い場合のRetry-After秒数
+            window: 待ち時間・実行時間の統計に使う直近の件数
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if max_queue < 0:
+            raise ValueError("max_queue must not be negative")
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.default_retry_after = default_retry_after
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="analysis-run"
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_seconds: deque[float] = deque(maxlen=window)
+        self._run_seconds: deque[float] = deque(maxlen=window)
+
+    async def submit(self, fn: Callable[..., T], *args: Any) -> T:
+        """
+        関数をスレッドプールで実行し、完了を待つ
+
+        Args:
+            fn: 実行する同期関数
+            *args: 関数の引数
+
+        Returns:
+            関数の戻り値
+
+        Raises:
+            AdmissionRejectedError: 同時実行数と待ち行列が上限に達している場合
+        """
+        with self._lock:
+            if self._queued + self._running >= self.max_concurrency + self.max_queue:
+                self._rejected += 1
+                raise AdmissionRejectedError(self._retry_after())
+            self._queued += 1
+
+        enqueued_at = time.monotonic()
+
+        def task() -> T:
+            started_at = time.monotonic()
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self._wait_seconds.append(started_at - enqueued_at)
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+                    self._run_seconds.append(time.monotonic() - started_at)
+
+        def release_if_cancelled(future: Future) -> None:
+            # 開始前にキャンセルされた（クライアントの切断・タイムアウト）場合はtaskが実行されず、
+            # 待機中の枠が解放されないため、ここで解放する
+            if future.cancelled():
+                with self._lock:
+                    self._queued -= 1
+
+        future = self._executor.submit(task)
+        future.add_done_callback(release_if_cancelled)
+        # awaitしているリクエストがキャンセルされると、開始前のfutureもキャンセルされる
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        待ち行列の深さと待ち時間の統計を返す
+
+        Returns:
+            統計情報の辞書
+        """
+        with self._lock:
+            waits = sorted(self._wait_seconds)
+            runs = sorted(self._run_seconds)
+            return {
+                "max_concurrency": self.max_concurrency,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queue_depth": self._queued,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "wait_seconds": self._summarize(waits),
+                "run_seconds": self._summarize(runs),
+            }
+
+    def shutdown(self) -> None:
+        """スレッドプールを停止する（実行中の分析の完了を待つ）"""
+        self._executor.shutdown(wait=True)
+
+    def _retry_after(self) -> int:
+        """直近の平均実行時間と待ち行列の深さからRetry-After秒数を見積もる"""
+        if not self._run_seconds:
+            return self.default_retry_after
+        mean_run = sum(self._run_seconds) / len(self._run_seconds)
+        rounds = (self._queued + self._running) / self.max_concurrency
+        return max(1, math.ceil(mean_run * rounds))
+
+    @staticmethod
+    def _summarize(values: list[float]) -> dict[str, float | None]:
+        if not values:
+            return {"p50": None, "p95": None, "max": None}
+        return {
+            "p50": values[int(0.50 * (len(values) - 1))],
+            "p95": values[int(0.95 * (len(values) - 1))],
+            "max": values[-1],
+        }
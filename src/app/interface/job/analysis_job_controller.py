@@ -1,38 +1,189 @@
 """分析Jobのコントローラー"""
 
+import json
+import resource
+import sys
+from dataclasses import asdict
 from datetime import date
 
+from app.domain.value_object.aggregation_spec import AggregationSpec
 from app.domain.value_object.dataset import Dataset
+from app.domain.value_object.date_range import DateRange
 from app.domain.value_object.target_date import TargetDate
 from app.infrastructure.config.settings import Settings
+from app.infrastructure.k8s.resource_usage_history import ResourceUsageHistory
 from app.usecase.dto.run_analysis_input import RunAnalysisInput
+from app.usecase.dto.run_analysis_output import RunAnalysisOutput
+from app.usecase.dto.sharded_analysis_input import ShardedAnalysisInput
 from app.usecase.ports.input.run_analysis_usecase import RunAnalysisUseCase
+from app.usecase.ports.input.sharded_analysis_usecase import ShardedAnalysisUseCase
 
 
-def run_from_env(usecase: RunAnalysisUseCase) -> None:
+def build_input(settings: Settings) -> RunAnalysisInput:
     """
-    環境変数から入力を受け取り分析を実行する
+    設定から分析の入力を構築する
+
+    BACKFILL_START_DATEが設定されている場合はIndexed Jobの1Podとして扱い、
+    JOB_COMPLETION_INDEXを開始日からの日数として対象日付とデータセットURLを決める。
+    ANALYSIS_AGGREGATIONが設定されている場合は、その集計仕様で集計する。
 
     Args:
-        usecase: 分析実行ユースケース
+        settings: アプリケーション設定
+
+    Returns:
+        分析の入力
     """
-    settings = Settings.from_env()
+    aggregation = (
+        AggregationSpec.from_json(settings.analysis_aggregation)
+        if settings.analysis_aggregation
+        else None
+    )
+
+    if settings.backfill_start_date:
+        if not settings.backfill_end_date:
+            raise ValueError("BACKFILL_END_DATE environment variable is required")
+        if not settings.dataset_url_template:
+            raise ValueError("DATASET_URL_TEMPLATE environment variable is required")
+
+        date_range = DateRange(
+            start=date.fromisoformat(settings.backfill_start_date),
+            end=date.fromisoformat(settings.backfill_end_date),
+        )
+        target_date = date_range.date_at(settings.job_completion_index)
+        return RunAnalysisInput(
+            dataset=Dataset(url=settings.dataset_url_template.format(date=target_date)),
+            target_date=TargetDate(value=target_date),
+            force=settings.force,
+            profile=settings.analysis_profile,
+            aggregation=aggregation,
+        )
 
     if not settings.dataset_url:
         raise ValueError("DATASET_URL environment variable is required")
     if not settings.target_date:
         raise ValueError("TARGET_DATE environment variable is required")
 
-    # 入力データを構築
-    input_data = RunAnalysisInput(
+    return RunAnalysisInput(
+        dataset=Dataset(url=settings.dataset_url),
+        target_date=TargetDate(value=date.fromisoformat(settings.target_date)),
+        force=settings.force,
+        profile=settings.analysis_profile,
+        aggregation=aggregation,
+    )
+
+
+def build_sharded_input(settings: Settings) -> ShardedAnalysisInput:
+    """
+    設定から分割実行の入力を構築する
+
+    分割実行のマッパーはIndexed Jobの1Podとして動き、JOB_COMPLETION_INDEXをシャードの
+    インデックスとして使う。
+
+    Args:
+        settings: アプリケーション設定
+
+    Returns:
+        分割実行の入力
+    """
+    if not settings.dataset_url:
+        raise ValueError("DATASET_URL environment variable is required")
+    if not settings.target_date:
+        raise ValueError("TARGET_DATE environment variable is required")
+    if not settings.analysis_shard_run_id:
+        raise ValueError("ANALYSIS_SHARD_RUN_ID environment variable is required")
+
+    return ShardedAnalysisInput(
         dataset=Dataset(url=settings.dataset_url),
         target_date=TargetDate(value=date.fromisoformat(settings.target_date)),
+        run_id=settings.analysis_shard_run_id,
+        shard_count=settings.analysis_shards,
     )
 
+
+def peak_memory_bytes() -> int:
+    """このプロセスのピークメモリ使用量（RSS）をバイトで返す"""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOSはバイト、Linuxはキロバイト単位
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def format_summary(
+    input_data: RunAnalysisInput | ShardedAnalysisInput, output: RunAnalysisOutput
+) -> str:
+    """
+    分析の結果とステージごとの計測値を1行のJSONにする（ログ基盤で集計しやすくするため）
+
+    Args:
+        input_data: 分析の入力
+        output: 分析の出力
+
+    Returns:
+        JSON文字列
+    """
+    return json.dumps(
+        {
+            "event": "analysis_summary",
+            "dataset_url": input_data.dataset.url,
+            "target_date": str(input_data.target_date),
+            "success": output.success,
+            "reused": output.reused,
+            "result_path": output.result_path,
+            "profile_path": output.profile_path,
+            "peak_rss_bytes": peak_memory_bytes(),
+            "stages": [asdict(stage) for stage in output.metrics],
+        }
+    )
+
+
+def run_from_env(
+    usecase: RunAnalysisUseCase, usage_history: ResourceUsageHistory | None = None
+) -> None:
+    """
+    環境変数から入力を受け取り分析を実行する
+
+    Args:
+        usecase: 分析実行ユースケース
+        usage_history: ピークメモリ使用量の記録先（次回のJobのリソース見積もりに使う）
+    """
+    settings = Settings.from_env()
+
+    # 入力データを構築
+    input_data = build_input(settings)
+
     # 分析を実行
     output = usecase.run(input_data)
 
+    # 成否にかかわらず、どのステージに時間とメモリを使ったかを出力する
+    print(format_summary(input_data, output))
+
     if not output.success:
         raise RuntimeError(f"Analysis failed: {output.message}")
 
-    print(f"Analysis completed successfully. Result saved to: {output.result_path}")
+    # 保存済み結果を再利用した場合は分析のメモリ使用量を表さないため記録しない
+    if usage_history is not None and not output.reused:
+        usage_history.record(input_data.dataset.url, peak_memory_bytes())
+
+    if output.reused:
+        print(f"Analysis skipped. Identical result already exists: {output.result_path}")
+    else:
+        print(f"Analysis completed successfully. Result saved to: {output.result_path}")
+
+
+def run_shard_from_env(usecase: ShardedAnalysisUseCase) -> None:
+    """
+    環境変数から入力を受け取り、分割実行の1シャードを集計する
+
+    全シャードの部分集計が揃っていれば、このPodがそのままマージして結果を保存する。
+
+    Args:
+        usecase: 分割実行ユースケース
+    """
+    settings = Settings.from_env()
+    input_data = build_sharded_input(settings)
+
+    output = usecase.run_shard(input_data, settings.job_completion_index)
+    print(format_summary(input_data, output))
+
+    if not output.success:
+        raise RuntimeError(f"Shard analysis failed: {output.message}")
+    print(f"{output.message}. Saved to: {output.result_path}")
@@ -1,8 +1,11 @@
 """分析結果のプレゼンター"""
 
+from dataclasses import asdict
 from typing import Any
 
+from app.usecase.dto.rollup_analysis_output import RollupAnalysisOutput
 from app.usecase.dto.run_analysis_output import RunAnalysisOutput
+from app.usecase.dto.run_batch_analysis_output import RunBatchAnalysisOutput
 
 
 class AnalysisPresenter:
@@ -23,4 +26,46 @@ class AnalysisPresenter:
             "success": output.success,
             "result_path": output.result_path if output.success else None,
             "message": output.message,
+            "reused": output.reused,
+            "metrics": [asdict(stage) for stage in output.metrics],
+            "profile_path": output.profile_path,
+        }
+
+    @classmethod
+    def present_batch(cls, output: RunBatchAnalysisOutput) -> dict[str, Any]:
+        """
+        バッチ分析結果をAPIレスポンス形式に変換する
+
+        Args:
+            output: バッチ分析実行の出力
+
+        Returns:
+            APIレスポンス形式の辞書
+        """
+        return {
+            "success": output.success,
+            "results": [
+                {"dataset_url": url, **cls.present(result)}
+                for url, result in output.results.items()
+            ],
+        }
+
+    @staticmethod
+    def present_rollup(output: RollupAnalysisOutput) -> dict[str, Any]:
+        """
+        ロールアップ結果をAPIレスポンス形式に変換する
+
+        Args:
+            output: ロールアップの出力
+
+        Returns:
+            APIレスポンス形式の辞書
+        """
+        rows = output.data.sort("category").to_dicts() if output.data is not None else []
+        return {
+            "success": output.success,
+            "message": output.message,
+            "rows": rows,
+            "missing_dates": output.missing_dates,
+            "missing_sketch_dates": output.missing_sketch_dates,
         }
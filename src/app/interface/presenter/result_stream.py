@@ -0,0 +1,123 @@
+"""分析結果をレスポンス本文として少しずつ書き出すプレゼンター"""
+
+import io
+import struct
+from collections.abc import Iterator
+
+import polars as pl
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+NDJSON = "application/x-ndjson"
+JSON = "application/json"
+
+# Accept ヘッダーで受け付けるメディアタイプと、それに対応する出力形式
+_MEDIA_TYPES = {
+    ARROW_STREAM: ARROW_STREAM,
+    NDJSON: NDJSON,
+    "application/ndjson": NDJSON,
+    JSON: JSON,
+    "application/*": JSON,
+    "*/*": JSON,
+}
+
+# Arrow IPCストリームの終端（continuationマーカーと長さ0）
+_ARROW_EOS = b"\xff\xff\xff\xff\x00\x00\x00\x00"
+
+
+def negotiate(accept: str | None) -> str:
+    """
+    Acceptヘッダーから出力形式を選ぶ
+
+    Args:
+        accept: Acceptヘッダーの値
+
+    Returns:
+        出力するメディアタイプ（対応する形式が無い場合はJSON）
+    """
+    best, best_q = JSON, -1.0
+    for item in (accept or "").split(","):
+        media_type, *params = (part.strip() for part in item.split(";"))
+        if media_type.lower() not in _MEDIA_TYPES:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > best_q:
+            best, best_q = _MEDIA_TYPES[media_type.lower()], q
+    return best if best_q != 0.0 else JSON
+
+
+def iter_body(df: pl.DataFrame, media_type: str, batch_rows: int = 10_000) -> Iterator[bytes]:
+    """
+    データフレームを指定した形式でbatch_rows行ずつ書き出す
+
+    本文全体をメモリ上に組み立てず、行のまとまりごとに書き出したバイト列を返す。
+
+    Args:
+        df: 分析結果のデータ
+        media_type: 出力するメディアタイプ
+        batch_rows: 1回に書き出す行数
+
+    Returns:
+        本文のバイト列のイテレーター
+    """
+    if media_type == ARROW_STREAM:
+        return _iter_arrow_stream(df, batch_rows)
+    if media_type == NDJSON:
+        return _iter_ndjson(df, batch_rows)
+    return _iter_json(df, batch_rows)
+
+
+def _iter_arrow_stream(df: pl.DataFrame, batch_rows: int) -> Iterator[bytes]:
+    """
+    Arrow IPCストリームを行のまとまりごとのレコードバッチとして書き出す
+
+    Polarsは1回の書き出しごとにスキーマ・レコードバッチ・終端を含む完全なストリームを
+    作るため、2つ目以降はスキーマのメッセージと終端を取り除いて1つのストリームに繋げる。
+    """
+    for index, frame in enumerate(_slices(df, batch_rows)):
+        buffer = io.BytesIO()
+        frame.write_ipc_stream(buffer)
+        # 終端を除いたメッセージ列（先頭はスキーマのメッセージ）
+        messages = buffer.getbuffer()[: -len(_ARROW_EOS)]
+        if index == 0:
+            yield bytes(messages)
+        else:
+            # スキーマのメッセージ = continuation(4) + メタデータ長(4) + メタデータ（本体は無い）
+            _, metadata_length = struct.unpack_from("<Ii", messages)
+            yield bytes(messages[8 + metadata_length :])
+    yield _ARROW_EOS
+
+
+def _iter_ndjson(df: pl.DataFrame, batch_rows: int) -> Iterator[bytes]:
+    """1行1JSONオブジェクトの形式で書き出す"""
+    for frame in _slices(df, batch_rows):
+        if frame.height:
+            yield frame.write_ndjson().encode("utf-8")
+
+
+def _iter_json(df: pl.DataFrame, batch_rows: int) -> Iterator[bytes]:
+    """行オブジェクトのJSON配列として書き出す"""
+    yield b"["
+    first = True
+    for frame in _slices(df, batch_rows):
+        if not frame.height:
+            continue
+        # write_jsonは"[...]"を返すため、括弧を外して配列の要素として繋げる
+        rows = frame.write_json()[1:-1]
+        yield (rows if first else "," + rows).encode("utf-8")
+        first = False
+    yield b"]"
+
+
+def _slices(df: pl.DataFrame, batch_rows: int) -> Iterator[pl.DataFrame]:
+    """空のデータフレームでもスキーマを書き出せるよう、少なくとも1つのスライスを返す"""
+    if df.height == 0:
+        yield df
+        return
+    yield from df.iter_slices(n_rows=batch_rows)
@@ -1,9 +1,20 @@
 """FastAPIエントリーポイント"""
 
+from typing import Any
+
 from fastapi import FastAPI
 
 from app.infrastructure.config.settings import Settings
-from app.wiring import build_job_launcher, build_usecase
+from app.infrastructure.metrics.prometheus_metrics import PrometheusMetrics
+from app.interface.api.run_executor import BoundedRunExecutor
+from app.wiring import (
+    build_batch_usecase,
+    build_job_launcher,
+    build_result_usecase,
+    build_rollup_usecase,
+    build_schema_registry,
+    build_usecase,
+)
 
 
 def create_app() -> FastAPI:
@@ -19,30 +30,63 @@ def create_app() -> FastAPI:
     settings = Settings.from_env()
 
     # 依存関係を構築
-    usecase = build_usecase(settings)
+    metrics = PrometheusMetrics()
+    usecase = build_usecase(settings, metrics_recorder=metrics)
+    batch_usecase = build_batch_usecase(settings)
+    rollup_usecase = build_rollup_usecase(settings)
+    result_usecase = build_result_usecase(settings)
     job_launcher = build_job_launcher(settings)
+    schema_registry = build_schema_registry(settings)
+    run_executor = BoundedRunExecutor(
+        max_concurrency=settings.run_max_concurrency,
+        max_queue=settings.run_max_queue,
+    )
 
     # ルーターをインポート
     from app.interface.api.analysis_controller import (
+        get_batch_usecase,
         get_job_launcher,
+        get_result_usecase,
+        get_rollup_usecase,
+        get_run_executor,
+        get_schema_registry,
         get_usecase,
         router,
     )
+    from app.interface.api.metrics_controller import get_metrics
+    from app.interface.api.metrics_controller import router as metrics_router
 
     # FastAPIのdependency_overridesを使用して依存関係を設定
     app.dependency_overrides[get_usecase] = lambda: usecase
+    app.dependency_overrides[get_batch_usecase] = lambda: batch_usecase
+    app.dependency_overrides[get_result_usecase] = lambda: result_usecase
+    app.dependency_overrides[get_rollup_usecase] = lambda: rollup_usecase
     app.dependency_overrides[get_job_launcher] = lambda: job_launcher
+    app.dependency_overrides[get_run_executor] = lambda: run_executor
+    app.dependency_overrides[get_schema_registry] = lambda: schema_registry
+    app.dependency_overrides[get_metrics] = lambda: metrics
 
     # ルーターを登録
     app.include_router(router)
+    app.include_router(metrics_router)
 
     return app
 
 
-app = create_app()
+def __getattr__(name: str) -> Any:
+    """
+    `app.main_api:app`が参照された時に初めてアプリケーションを作成する
+
+    モジュールの読み込みだけでは設定の読み込みや依存関係の構築を行わない。
+    """
+    if name == "app":
+        application = create_app()
+        globals()["app"] = application
+        return application
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(create_app(), host="0.0.0.0", port=8000)
@@ -1,16 +1,22 @@
 """K8s Jobエントリーポイント"""
 
-from app.interface.job.analysis_job_controller import run_from_env
-from app.wiring import build_usecase
+from app.infrastructure.config.settings import Settings
+from app.interface.job.analysis_job_controller import run_from_env, run_shard_from_env
+from app.wiring import build_resource_history, build_sharded_usecase, build_usecase
 
 
 def main():
     """Jobのメイン関数"""
+    # 分割実行のマッパーPodの場合は担当するシャードだけを集計する
+    if Settings.from_env().analysis_shards > 1:
+        run_shard_from_env(build_sharded_usecase())
+        return
+
     # ユースケースを構築
     usecase = build_usecase()
 
     # 環境変数から実行
-    run_from_env(usecase)
+    run_from_env(usecase, usage_history=build_resource_history())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,27 @@
+"""分析プロファイルのDTO"""
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.usecase.dto.stage_metrics import StageMetrics
+
+
+@dataclass(frozen=True)
+class AnalysisProfile:
+    """1回の分析実行のプロファイル"""
+
+    dataset_url: str
+    target_date: str
+    # collectに使用したPolarsエンジン
+    engine: str
+    # 最適化後のPolarsの実行計画
+    optimized_plan: str
+    # 計画のノードごとの実行時間（node, start, end。単位はマイクロ秒）
+    node_timings: list[dict[str, Any]]
+    # サンプリングしたPythonスタック（folded形式 -> 回数）
+    stacks: dict[str, int]
+    # サンプリング間隔（秒）と取得したサンプル数
+    sample_interval: float
+    samples: int
+    # 分析までのステージごとの計測値
+    metrics: tuple[StageMetrics, ...] = field(default_factory=tuple)
@@ -0,0 +1,17 @@
+"""チャンク単位の集計結果DTO"""
+
+from dataclasses import dataclass
+
+import polars as pl
+
+
+@dataclass(frozen=True)
+class ChunkedPartial:
+    """チャンク単位に集計してマージした部分集計"""
+
+    # マージ後の部分集計を読み込む計画
+    plan: pl.LazyFrame
+    # 読み込んだ入力の行数
+    rows_in: int
+    # 読み込んだチャンクの数
+    chunks: int
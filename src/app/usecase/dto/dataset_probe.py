@@ -0,0 +1,13 @@
+"""データセットのメタ情報DTO"""
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class DatasetProbe:
+    """データセットの本体を読み込まずに取得したメタ情報"""
+
+    # 内容を識別する指紋（ETag等。取得できない場合はNone）
+    fingerprint: str | None = None
+    # バイト数（取得できない場合はNone）
+    size: int | None = None
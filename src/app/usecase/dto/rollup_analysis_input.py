@@ -0,0 +1,12 @@
+"""ロールアップの入力DTO"""
+
+from dataclasses import dataclass
+
+from app.domain.value_object.date_range import DateRange
+
+
+@dataclass(frozen=True)
+class RollupAnalysisInput:
+    """日付範囲のロールアップの入力データ"""
+
+    date_range: DateRange
@@ -0,0 +1,20 @@
+"""ロールアップの出力DTO"""
+
+from dataclasses import dataclass, field
+
+import polars as pl
+
+
+@dataclass(frozen=True)
+class RollupAnalysisOutput:
+    """日付範囲のロールアップの出力データ"""
+
+    success: bool
+    message: str = ""
+    # category, total, count, min, max, mean列を持つ集計結果
+    # （スケッチがある場合はp50, p95, p99列と、異なり数のdistinct列も持つ）
+    data: pl.DataFrame | None = None
+    # 部分集計が保存されておらず、集計に含まれなかった日付
+    missing_dates: list[str] = field(default_factory=list)
+    # 部分集計はあるがスケッチが保存されておらず、異なり数・分位数の推定に含まれなかった日付
+    missing_sketch_dates: list[str] = field(default_factory=list)
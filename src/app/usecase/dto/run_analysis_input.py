@@ -2,6 +2,7 @@
 
 from dataclasses import dataclass
 
+from app.domain.value_object.aggregation_spec import AggregationSpec
 from app.domain.value_object.dataset import Dataset
 from app.domain.value_object.target_date import TargetDate
 
@@ -12,3 +13,9 @@ class RunAnalysisInput:
 
     dataset: Dataset
     target_date: TargetDate
+    # Trueの場合は同一入力の保存済み結果があっても再計算する
+    force: bool = False
+    # Trueの場合はサンプリングプロファイラーとPolarsの計画のプロファイルを取得して保存する
+    profile: bool = False
+    # 集計仕様（Noneの場合はカテゴリごとの合計値を求める）
+    aggregation: AggregationSpec | None = None
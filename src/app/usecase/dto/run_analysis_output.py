@@ -2,6 +2,8 @@
 
 from dataclasses import dataclass
 
+from app.usecase.dto.stage_metrics import StageMetrics
+
 
 @dataclass(frozen=True)
 class RunAnalysisOutput:
@@ -10,3 +12,9 @@ class RunAnalysisOutput:
     result_path: str
     success: bool
     message: str = ""
+    # 保存済み結果を再利用した（計算を省略した）場合True
+    reused: bool = False
+    # 実行したステージごとの計測値（実行順）
+    metrics: tuple[StageMetrics, ...] = ()
+    # プロファイルを要求した場合の保存先
+    profile_path: str | None = None
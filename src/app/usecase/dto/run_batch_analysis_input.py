@@ -0,0 +1,21 @@
+"""バッチ分析実行の入力DTO"""
+
+from dataclasses import dataclass
+
+from app.domain.value_object.dataset import Dataset
+from app.domain.value_object.target_date import TargetDate
+
+
+@dataclass(frozen=True)
+class RunBatchAnalysisInput:
+    """同じ対象日付の複数データセットをまとめて分析する入力データ"""
+
+    datasets: tuple[Dataset, ...]
+    target_date: TargetDate
+
+    def __post_init__(self):
+        if not self.datasets:
+            raise ValueError("RunBatchAnalysisInput requires at least one dataset")
+        urls = [dataset.url for dataset in self.datasets]
+        if len(set(urls)) != len(urls):
+            raise ValueError("RunBatchAnalysisInput datasets must be unique")
@@ -0,0 +1,18 @@
+"""バッチ分析実行の出力DTO"""
+
+from dataclasses import dataclass, field
+
+from app.usecase.dto.run_analysis_output import RunAnalysisOutput
+
+
+@dataclass(frozen=True)
+class RunBatchAnalysisOutput:
+    """バッチ分析実行の出力データ"""
+
+    # データセットURLごとの実行結果（入力と同じ順序）
+    results: dict[str, RunAnalysisOutput] = field(default_factory=dict)
+
+    @property
+    def success(self) -> bool:
+        """全てのデータセットの分析に成功した場合True"""
+        return all(output.success for output in self.results.values())
@@ -0,0 +1,18 @@
+"""分割実行の入力DTO"""
+
+from dataclasses import dataclass
+
+from app.domain.value_object.dataset import Dataset
+from app.domain.value_object.target_date import TargetDate
+
+
+@dataclass(frozen=True)
+class ShardedAnalysisInput:
+    """1つのデータセットを複数のマッパーに分けて分析する実行の入力データ"""
+
+    dataset: Dataset
+    target_date: TargetDate
+    # 分割実行を識別するID（同じ実行のマッパーとリデューサーで共通。シャードの保存先に使う）
+    run_id: str
+    # シャード数（マッパーの数）
+    shard_count: int
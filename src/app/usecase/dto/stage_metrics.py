@@ -0,0 +1,23 @@
+"""分析ステージの計測値DTO"""
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class StageMetrics:
+    """1つのステージの計測値"""
+
+    # ステージ名（memo_lookup / load / analyze / save）
+    stage: str
+    # 経過時間（秒）
+    wall_seconds: float
+    # プロセス全体のCPU時間（秒。Polarsのワーカースレッドを含む）
+    cpu_seconds: float
+    # ステージ実行中のプロセスのピークRSS（バイト）
+    peak_rss_bytes: int
+    # 入力のバイト数（分からない場合はNone）
+    input_bytes: int | None = None
+    # 入力の行数（分からない場合はNone）
+    rows_in: int | None = None
+    # 出力の行数（分からない場合はNone）
+    rows_out: int | None = None
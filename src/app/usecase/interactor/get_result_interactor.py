@@ -0,0 +1,57 @@
+"""結果取得のインタラクター"""
+
+import polars as pl
+
+from app.domain.service.analyze_service import AnalysisEngine
+from app.domain.service.result_query import build_range_query
+from app.domain.value_object.date_range import DateRange
+from app.domain.value_object.target_date import TargetDate
+from app.usecase.ports.input.get_result_usecase import GetResultUseCase
+from app.usecase.ports.output.result_repository import ResultRepository
+
+
+class GetResultInteractor(GetResultUseCase):
+    """結果リポジトリから保存済みの分析結果を取得するインタラクター実装"""
+
+    def __init__(self, repository: ResultRepository, engine: AnalysisEngine = "streaming"):
+        """
+        初期化
+
+        Args:
+            repository: 結果リポジトリ
+            engine: 範囲集計の計画をcollectするPolarsエンジン
+        """
+        self.repository = repository
+        self.engine = engine
+
+    def get(self, target_date: TargetDate, partition: str | None = None) -> pl.DataFrame | None:
+        """
+        保存済みの分析結果を取得する
+
+        Args:
+            target_date: 対象日付
+            partition: 同じ対象日付の結果を区別する名前（Noneの場合は日付ごとの結果）
+
+        Returns:
+            分析結果のデータ（保存されていない場合はNone）
+        """
+        return self.repository.load(target_date, partition)
+
+    def query(
+        self, date_range: DateRange, categories: list[str] | None = None, daily: bool = False
+    ) -> pl.DataFrame | None:
+        """
+        日付範囲の分析結果をカテゴリごとに集計する
+
+        Args:
+            date_range: 対象日付の範囲
+            categories: 対象カテゴリ（Noneの場合は全カテゴリ）
+            daily: Trueの場合は日付ごと、Falseの場合は範囲全体で集計する
+
+        Returns:
+            集計結果（範囲内に結果が無い場合はNone）
+        """
+        results = self.repository.scan(date_range, categories)
+        if results is None:
+            return None
+        return build_range_query(results, daily=daily).collect(engine=self.engine)
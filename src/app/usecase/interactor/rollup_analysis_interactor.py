@@ -0,0 +1,124 @@
+"""ロールアップのインタラクター"""
+
+import polars as pl
+
+from app.domain.model.analysis_sketches import AnalysisSketches
+from app.domain.service.analyze_service import AnalysisEngine
+from app.domain.service.partial_aggregate import KEY_COLUMN, finalize_partials, merge_partials
+from app.domain.service.sketch import (
+    estimate_distinct,
+    estimate_quantiles,
+    merge_distinct_sketches,
+    merge_quantile_sketches,
+)
+from app.domain.value_object.sketch_spec import SketchSpec
+from app.domain.value_object.target_date import TargetDate
+from app.usecase.dto.rollup_analysis_input import RollupAnalysisInput
+from app.usecase.dto.rollup_analysis_output import RollupAnalysisOutput
+from app.usecase.ports.input.rollup_analysis_usecase import RollupAnalysisUseCase
+from app.usecase.ports.output.partial_aggregate_repository import PartialAggregateRepository
+from app.usecase.ports.output.sketch_repository import SketchRepository
+
+
+class RollupAnalysisInteractor(RollupAnalysisUseCase):
+    """保存済みの部分集計だけを読んで日付範囲を集計するインタラクター実装"""
+
+    def __init__(
+        self,
+        partial_repository: PartialAggregateRepository,
+        engine: AnalysisEngine = "streaming",
+        sketch_repository: SketchRepository | None = None,
+        sketch_spec: SketchSpec | None = None,
+    ):
+        """
+        初期化
+
+        Args:
+            partial_repository: 部分集計リポジトリ
+            engine: 集計計画をcollectするPolarsエンジン
+            sketch_repository: 近似スケッチリポジトリ（Noneの場合は異なり数・分位数を求めない）
+            sketch_spec: 保存時と同じ近似スケッチの設定
+        """
+        self.partial_repository = partial_repository
+        self.engine = engine
+        self.sketch_repository = sketch_repository if sketch_spec is not None else None
+        self.sketch_spec = sketch_spec
+
+    def rollup(self, input: RollupAnalysisInput) -> RollupAnalysisOutput:
+        """
+        日付ごとの部分集計をマージして日付範囲の集計を求める
+
+        Args:
+            input: ロールアップの入力
+
+        Returns:
+            ロールアップの出力
+        """
+        try:
+            partials: list[pl.LazyFrame] = []
+            sketches: list[AnalysisSketches] = []
+            missing_dates: list[str] = []
+            missing_sketch_dates: list[str] = []
+            for index in range(len(input.date_range)):
+                target_date = TargetDate(value=input.date_range.date_at(index))
+                partial = self.partial_repository.load(target_date)
+                if partial is None:
+                    missing_dates.append(str(target_date))
+                    continue
+                partials.append(partial)
+
+                if self.sketch_repository is not None:
+                    sketch = self.sketch_repository.load(target_date, self.sketch_spec)
+                    if sketch is None:
+                        missing_sketch_dates.append(str(target_date))
+                    else:
+                        sketches.append(sketch)
+
+            if not partials:
+                return RollupAnalysisOutput(
+                    success=False,
+                    message=f"No partial aggregates found for {input.date_range}",
+                    missing_dates=missing_dates,
+                )
+
+            plan = finalize_partials(merge_partials(pl.concat(partials, how="vertical_relaxed")))
+            if sketches:
+                plan = self._join_estimates(plan, sketches)
+            data = plan.collect(engine=self.engine)
+
+            return RollupAnalysisOutput(
+                success=True,
+                message=f"Rolled up {len(partials)} of {len(input.date_range)} days",
+                data=data,
+                missing_dates=missing_dates,
+                missing_sketch_dates=missing_sketch_dates,
+            )
+        except Exception as e:
+            return RollupAnalysisOutput(success=False, message=f"Rollup failed: {str(e)}")
+
+    def _join_estimates(self, plan: pl.LazyFrame, sketches: list[AnalysisSketches]) -> pl.LazyFrame:
+        """
+        日付ごとのスケッチをマージし、推定した異なり数・分位数を集計結果に結合する
+
+        スケッチの大きさはカテゴリ数と精度で決まるため、日付範囲が長くてもメモリ使用量は
+        日付数に比例するだけで生データの件数には依存しない。
+
+        Args:
+            plan: 集計結果の計画
+            sketches: 日付ごとの近似スケッチ
+
+        Returns:
+            distinct列（異なり数のスケッチがある場合）とp50, p95, p99列を加えた計画
+        """
+        quantiles = merge_quantile_sketches(
+            pl.concat([sketch.quantiles.lazy() for sketch in sketches])
+        )
+        plan = plan.join(estimate_quantiles(quantiles, self.sketch_spec), on=KEY_COLUMN, how="left")
+
+        distinct = [sketch.distinct.lazy() for sketch in sketches if sketch.distinct is not None]
+        if distinct:
+            registers = merge_distinct_sketches(pl.concat(distinct))
+            plan = plan.join(
+                estimate_distinct(registers, self.sketch_spec), on=KEY_COLUMN, how="left"
+            )
+        return plan
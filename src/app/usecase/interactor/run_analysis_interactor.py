@@ -1,11 +1,35 @@
 """分析実行のインタラクター"""
 
-from app.domain.service.analyze_service import analyze
+import hashlib
+from contextlib import ExitStack, nullcontext
+from dataclasses import replace
+
+import polars as pl
+
+from app.domain.service.analyze_service import (
+    ANALYZER_VERSION,
+    AnalysisEngine,
+    analyze,
+    build_result_plan,
+    profile_analyze,
+)
+from app.domain.service.partial_aggregate import supports_partial
+from app.domain.value_object.sketch_spec import SketchSpec
+from app.domain.value_object.target_date import TargetDate
+from app.usecase.dto.analysis_profile import AnalysisProfile
 from app.usecase.dto.run_analysis_input import RunAnalysisInput
 from app.usecase.dto.run_analysis_output import RunAnalysisOutput
+from app.usecase.interactor.sampling_profiler import SamplingProfiler
+from app.usecase.interactor.stage_timer import StageTimer
 from app.usecase.ports.input.run_analysis_usecase import RunAnalysisUseCase
+from app.usecase.ports.output.chunked_aggregator import ChunkedAggregator
 from app.usecase.ports.output.dataset_loader import DatasetLoader
+from app.usecase.ports.output.metrics_recorder import MetricsRecorder
+from app.usecase.ports.output.partial_aggregate_repository import PartialAggregateRepository
+from app.usecase.ports.output.profile_repository import ProfileRepository
+from app.usecase.ports.output.result_memo_store import ResultMemoStore
 from app.usecase.ports.output.result_repository import ResultRepository
+from app.usecase.ports.output.sketch_repository import SketchRepository
 
 
 class RunAnalysisInteractor(RunAnalysisUseCase):
@@ -15,6 +39,14 @@ class RunAnalysisInteractor(RunAnalysisUseCase):
         self,
         loader: DatasetLoader,
         repository: ResultRepository,
+        engine: AnalysisEngine = "streaming",
+        memo_store: ResultMemoStore | None = None,
+        partial_repository: PartialAggregateRepository | None = None,
+        metrics_recorder: MetricsRecorder | None = None,
+        profile_repository: ProfileRepository | None = None,
+        sketch_spec: SketchSpec | None = None,
+        sketch_repository: SketchRepository | None = None,
+        chunked_aggregator: ChunkedAggregator | None = None,
     ):
         """
         初期化
@@ -22,9 +54,26 @@ class RunAnalysisInteractor(RunAnalysisUseCase):
         Args:
             loader: データセットローダー
             repository: 結果リポジトリ
+            engine: 分析計画をcollectするPolarsエンジン
+            memo_store: 結果メモ化ストア（Noneの場合は常に再計算する）
+            partial_repository: 部分集計リポジトリ（Noneの場合は部分集計を保存しない）
+            metrics_recorder: 計測値の記録先（Noneの場合は出力に含めるのみ）
+            profile_repository: 分析プロファイルの保存先（Noneの場合はプロファイルを取らない）
+            sketch_spec: 近似スケッチの設定（Noneの場合はスケッチを作らない）
+            sketch_repository: 近似スケッチの保存先（Noneの場合はスケッチを作らない）
+            chunked_aggregator: メモリの上限内でチャンク単位に集計する集計器
+                （Noneの場合は1つの計画として集計する。スケッチを作る設定の場合は使わない）
         """
         self.loader = loader
         self.repository = repository
+        self.engine = engine
+        self.memo_store = memo_store
+        self.partial_repository = partial_repository
+        self.metrics_recorder = metrics_recorder
+        self.profile_repository = profile_repository
+        self.sketch_spec = sketch_spec if sketch_repository is not None else None
+        self.sketch_repository = sketch_repository
+        self.chunked_aggregator = chunked_aggregator
 
     def run(self, input: RunAnalysisInput) -> RunAnalysisOutput:
         """
@@ -34,22 +83,203 @@ class RunAnalysisInteractor(RunAnalysisUseCase):
             input: 分析実行の入力
 
         Returns:
-            分析実行の出力
+            分析実行の出力（ステージごとの計測値を含む）
         """
+        timer = StageTimer()
         try:
-            # データセットを読み込む
-            df = self.loader.load(input.dataset)
+            output = self._run(input, timer)
+        except Exception as e:
+            output = RunAnalysisOutput(
+                result_path="", success=False, message=f"Analysis failed: {str(e)}"
+            )
+        output = replace(output, metrics=tuple(timer.stages))
 
-            # 分析を実行
-            result = analyze(df)
+        if self.metrics_recorder is not None:
+            self.metrics_recorder.record(output)
+        return output
 
-            # 結果を保存
-            result_path = self.repository.save(result, input.target_date)
+    def _run(self, input: RunAnalysisInput, timer: StageTimer) -> RunAnalysisOutput:
+        """各ステージを計測しながら分析を実行する"""
+        # 指紋とバイト数は1回の問い合わせ（HTTP(S)の場合はHEAD）でまとめて取得する
+        probe = None
+        # 集計仕様の結果は既定の集計の結果を置き換えないよう別の場所に置く（メモ化の記録も分ける）
+        partition = input.aggregation.result_partition if input.aggregation is not None else None
 
-            return RunAnalysisOutput(
-                result_path=result_path, success=True, message="Analysis completed successfully"
-            )
-        except Exception as e:
-            return RunAnalysisOutput(
-                result_path="", success=False, message=f"Analysis failed: {str(e)}"
+        # 同一入力の保存済み結果があれば、読み込みも計算もせずに返す（プロファイル時は再計算する）
+        memo_key = None
+        if self.memo_store is not None:
+            with timer.stage("memo_lookup"):
+                probe = self.loader.probe(input.dataset)
+                memo_key = self._memo_key(input, probe.fingerprint)
+                result_path = (
+                    self.memo_store.get(input.target_date, memo_key, partition)
+                    if memo_key is not None and not (input.force or input.profile)
+                    else None
+                )
+            if result_path is not None:
+                return RunAnalysisOutput(
+                    result_path=result_path,
+                    success=True,
+                    message="Analysis skipped: identical result already exists",
+                    reused=True,
+                )
+
+        # プロファイルを要求された場合のみサンプリングと計画の取得を行う（要求が無ければ負荷は無い）
+        profiler = (
+            SamplingProfiler() if input.profile and self.profile_repository is not None else None
+        )
+        with profiler or nullcontext():
+            # データセットの読み込み計画を構築する（実データはcollect時に読む）
+            with timer.stage("load") as counts:
+                # 入力のバイト数は読み込みのステージにだけ記録する（ステージ間で重複して数えない）
+                counts.input_bytes = (probe or self.loader.probe(input.dataset)).size
+                lf = self.loader.load(input.dataset)
+
+            # メモリの上限が設定されている場合は、入力をチャンク単位で集計して直接書き出す
+            if profiler is None and self._runs_out_of_core(input, lf):
+                result_path = self._run_out_of_core(input, lf, timer)
+            else:
+                # 分析を実行（CSVの解析と集計は1つの計画としてここで実行される）
+                with timer.stage("analyze") as counts:
+                    if profiler is not None:
+                        result, query_profile = profile_analyze(
+                            lf,
+                            engine=self.engine,
+                            sketch_spec=self.sketch_spec,
+                            aggregation=input.aggregation,
+                        )
+                    else:
+                        result = analyze(
+                            lf,
+                            engine=self.engine,
+                            sketch_spec=self.sketch_spec,
+                            aggregation=input.aggregation,
+                        )
+                    if result.partial is not None:
+                        counts.rows_in = int(result.partial["count"].sum())
+                    counts.rows_out = result.data.height
+
+                with timer.stage("save") as counts:
+                    counts.rows_in = result.data.height
+                    # 結果を保存
+                    result_path = self.repository.save(result, input.target_date, partition)
+
+                    # 日付範囲のロールアップ用に部分集計を結果と並べて保存する
+                    if self.partial_repository is not None and result.partial is not None:
+                        self.partial_repository.save(result.partial, input.target_date)
+
+                    # 日付範囲で異なり数・分位数を推定できるようにスケッチを結果と並べて保存する
+                    if self.sketch_repository is not None and result.sketches is not None:
+                        self.sketch_repository.save(result.sketches, input.target_date)
+
+            if memo_key is not None:
+                self.memo_store.put(input.target_date, memo_key, result_path, partition)
+
+        profile_path = None
+        if profiler is not None:
+            profile = AnalysisProfile(
+                dataset_url=input.dataset.url,
+                target_date=str(input.target_date),
+                engine=self.engine,
+                optimized_plan=query_profile.optimized_plan,
+                node_timings=query_profile.node_timings.to_dicts(),
+                stacks=profiler.folded(),
+                sample_interval=profiler.interval,
+                samples=profiler.samples,
+                metrics=tuple(timer.stages),
             )
+            profile_path = self.profile_repository.save(profile, input.target_date)
+
+        return RunAnalysisOutput(
+            result_path=result_path,
+            success=True,
+            message="Analysis completed successfully",
+            profile_path=profile_path,
+        )
+
+    def _runs_out_of_core(self, input: RunAnalysisInput, lf: pl.LazyFrame) -> bool:
+        """
+        チャンク単位の集計で実行できる（既定の集計で、集計器が設定されている）かを返す
+
+        チャンク単位の集計はスケッチを作らないため、スケッチを作る設定の場合は1つの計画で集計し、
+        スケッチを黙って省かない（メモ化キーにもスケッチの設定を含めている）。
+        """
+        return (
+            self.chunked_aggregator is not None
+            and self.sketch_spec is None
+            and input.aggregation is None
+            and supports_partial(lf)
+        )
+
+    def _run_out_of_core(
+        self,
+        input: RunAnalysisInput,
+        lf: pl.LazyFrame,
+        timer: StageTimer,
+    ) -> str:
+        """
+        入力をチャンク単位で集計し、結果と部分集計をメモリに載せずに書き出す
+
+        Args:
+            input: 分析実行の入力
+            lf: 入力の読み込み計画
+            timer: ステージの計測器
+
+        Returns:
+            結果の保存先のパス
+        """
+        with ExitStack() as stack:
+            # チャンクの読み込み・部分集計・退避はコンテキストに入るときに行われるため、
+            # analyzeステージの中で入る（一時ファイルは保存が終わるまで残す）
+            with timer.stage("analyze") as counts:
+                aggregated = stack.enter_context(self.chunked_aggregator.aggregate(lf))
+                partial = aggregated.plan
+                groups = partial.select(pl.len()).collect().item()
+                counts.rows_in = aggregated.rows_in
+                counts.rows_out = groups
+
+            with timer.stage("save") as counts:
+                counts.rows_in = groups
+                result_path = self.repository.sink(build_result_plan(partial), input.target_date)
+                if self.partial_repository is not None:
+                    self.partial_repository.sink(partial, input.target_date)
+        return result_path
+
+    def invalidate(self, target_date: TargetDate) -> bool:
+        """
+        対象日付の結果のメモ化を無効化する
+
+        Args:
+            target_date: 対象日付
+
+        Returns:
+            無効化する記録が存在した場合True
+        """
+        if self.memo_store is None:
+            return False
+        return self.memo_store.invalidate(target_date)
+
+    def _memo_key(self, input: RunAnalysisInput, fingerprint: str | None) -> str | None:
+        """
+        入力の指紋・対象日付・分析バージョン・集計仕様・スケッチの設定からメモ化キーを作る
+
+        Args:
+            input: 分析実行の入力
+            fingerprint: 入力の指紋
+
+        Returns:
+            メモ化キー（メモ化が無効、または指紋が取得できない場合はNone）
+        """
+        if self.memo_store is None:
+            return None
+
+        if fingerprint is None:
+            return None
+
+        parts = [input.dataset.url, fingerprint, str(input.target_date), ANALYZER_VERSION]
+        if input.aggregation is not None:
+            parts.append(input.aggregation.fingerprint())
+        # スケッチの設定を変えた場合は、新しい設定のスケッチを作るため再計算する
+        if self.sketch_spec is not None:
+            parts.append(repr(self.sketch_spec))
+        return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
@@ -0,0 +1,129 @@
+"""バッチ分析実行のインタラクター"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import polars as pl
+
+from app.domain.model.analysis_result import AnalysisResult
+from app.domain.service.analyze_service import AnalysisEngine, analyze, analyze_many
+from app.usecase.dto.run_analysis_output import RunAnalysisOutput
+from app.usecase.dto.run_batch_analysis_input import RunBatchAnalysisInput
+from app.usecase.dto.run_batch_analysis_output import RunBatchAnalysisOutput
+from app.usecase.ports.input.run_batch_analysis_usecase import RunBatchAnalysisUseCase
+from app.usecase.ports.output.dataset_loader import DatasetLoader
+from app.usecase.ports.output.result_repository import ResultRepository
+
+
+class RunBatchAnalysisInteractor(RunBatchAnalysisUseCase):
+    """
+    複数データセットの読み込み・分析・保存をまとめて行うインタラクター実装
+
+    - 読み込み（ダウンロード・キャッシュ取得）はスレッドプールで並行に行う
+    - 分析は全データセットの計画をcollect_allで一度に実行する
+    - 保存はスレッドプールで並行に行う
+    失敗はデータセットごとに記録し、他のデータセットの処理は続ける。
+    """
+
+    def __init__(
+        self,
+        loader: DatasetLoader,
+        repository: ResultRepository,
+        engine: AnalysisEngine = "streaming",
+        max_workers: int = 8,
+    ):
+        """
+        初期化
+
+        Args:
+            loader: データセットローダー
+            repository: 結果リポジトリ
+            engine: 分析計画をcollectするPolarsエンジン
+            max_workers: 読み込み・保存を並行に行うスレッド数
+        """
+        self.loader = loader
+        self.repository = repository
+        self.engine = engine
+        self.max_workers = max_workers
+
+    def run_batch(self, input: RunBatchAnalysisInput) -> RunBatchAnalysisOutput:
+        """
+        同じ対象日付の複数データセットをまとめて分析する
+
+        Args:
+            input: バッチ分析実行の入力
+
+        Returns:
+            データセットごとの実行結果
+        """
+        datasets = list(input.datasets)
+        partitions = {dataset.url: dataset.result_partition for dataset in datasets}
+        failures: dict[str, RunAnalysisOutput] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # データセットの読み込み計画を並行に構築する
+            loaded: dict[str, pl.LazyFrame] = {}
+            futures = {
+                dataset.url: executor.submit(self.loader.load, dataset) for dataset in datasets
+            }
+            for url, future in futures.items():
+                try:
+                    loaded[url] = future.result()
+                except Exception as e:
+                    failures[url] = self._failure(f"Load failed: {e}")
+
+            # 読み込めたデータセットの計画をまとめて実行する
+            results = self._analyze(loaded)
+            for url, result in results.items():
+                if isinstance(result, Exception):
+                    failures[url] = self._failure(f"Analysis failed: {result}")
+
+            # 結果を並行に保存する
+            save_futures = {
+                url: executor.submit(
+                    self.repository.save, result, input.target_date, partitions[url]
+                )
+                for url, result in results.items()
+                if not isinstance(result, Exception)
+            }
+            outputs: dict[str, RunAnalysisOutput] = {}
+            for url, future in save_futures.items():
+                try:
+                    outputs[url] = RunAnalysisOutput(
+                        result_path=future.result(),
+                        success=True,
+                        message="Analysis completed successfully",
+                    )
+                except Exception as e:
+                    failures[url] = self._failure(f"Save failed: {e}")
+
+        outputs.update(failures)
+        return RunBatchAnalysisOutput(
+            results={dataset.url: outputs[dataset.url] for dataset in datasets}
+        )
+
+    def _analyze(self, loaded: dict[str, pl.LazyFrame]) -> dict[str, AnalysisResult | Exception]:
+        """
+        読み込めたデータセットの計画をcollect_allでまとめて実行する
+
+        1つでも失敗した場合はどのデータセットが原因かを特定するため、個別に実行し直す。
+        """
+        if not loaded:
+            return {}
+        try:
+            results = analyze_many(list(loaded.values()), engine=self.engine)
+            return dict(zip(loaded.keys(), results, strict=True))
+        except Exception:
+            # 失敗したデータセットを特定するため、以下で個別に実行し直す
+            pass
+
+        individual: dict[str, AnalysisResult | Exception] = {}
+        for url, lf in loaded.items():
+            try:
+                individual[url] = analyze(lf, engine=self.engine)
+            except Exception as e:
+                individual[url] = e
+        return individual
+
+    @staticmethod
+    def _failure(message: str) -> RunAnalysisOutput:
+        return RunAnalysisOutput(result_path="", success=False, message=message)
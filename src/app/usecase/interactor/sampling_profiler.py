@@ -0,0 +1,66 @@
+"""スタックのサンプリングによるプロファイラー"""
+
+import sys
+import threading
+from collections import Counter
+from types import FrameType
+
+
+class SamplingProfiler:
+    """
+    対象スレッドのPythonスタックを一定間隔で記録するプロファイラー
+
+    cProfileのように全ての呼び出しをフックしないため、計測対象の実行速度はほぼ変わらない。
+    Polarsのネイティブ処理中はcollect等の呼び出し元のスタックとして記録される。
+    結果はflamegraph.pl・speedscopeで読めるfolded形式（"root;...;leaf" -> 回数）で返す。
+    """
+
+    def __init__(self, interval: float = 0.005, max_depth: int = 64):
+        """
+        初期化
+
+        Args:
+            interval: サンプリング間隔（秒）
+            max_depth: 記録するスタックの深さの上限（葉に近い側を残す）
+        """
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._target: int | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> "SamplingProfiler":
+        # withを実行したスレッドを対象にする
+        self._target = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def folded(self) -> dict[str, int]:
+        """記録したスタックを回数の多い順に返す"""
+        return dict(self.stacks.most_common())
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            if frame is None:
+                continue
+            self.stacks[self._fold(frame)] += 1
+            self.samples += 1
+
+    def _fold(self, frame: FrameType | None) -> str:
+        names = []
+        while frame is not None and len(names) < self.max_depth:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+            frame = frame.f_back
+        return ";".join(reversed(names))
@@ -0,0 +1,196 @@
+"""分割実行のインタラクター"""
+
+from dataclasses import replace
+
+import polars as pl
+
+from app.domain.service.analyze_service import AnalysisEngine, build_result_plan
+from app.domain.service.partial_aggregate import (
+    build_partial_plan,
+    merge_partials,
+    supports_partial,
+)
+from app.domain.value_object.shard import Shard
+from app.usecase.dto.run_analysis_output import RunAnalysisOutput
+from app.usecase.dto.sharded_analysis_input import ShardedAnalysisInput
+from app.usecase.interactor.stage_timer import StageTimer
+from app.usecase.ports.input.sharded_analysis_usecase import ShardedAnalysisUseCase
+from app.usecase.ports.output.partial_aggregate_repository import PartialAggregateRepository
+from app.usecase.ports.output.result_repository import ResultRepository
+from app.usecase.ports.output.shard_loader import ShardLoader
+from app.usecase.ports.output.shard_partial_repository import ShardPartialRepository
+
+
+class ShardedAnalysisInteractor(ShardedAnalysisUseCase):
+    """
+    データセットをシャードごとに部分集計し、部分集計のマージで結果を求めるインタラクター実装
+
+    マッパーはシャードの部分集計だけを保存し、リデューサーは生データを読まずに
+    シャード数×カテゴリ数の行だけをマージする。run_shardでは最後に終わったマッパーが
+    そのままリデューサーを兼ねる（同時に終わった複数のマッパーがマージしても結果は同じ）。
+    """
+
+    def __init__(
+        self,
+        shard_loader: ShardLoader,
+        shard_repository: ShardPartialRepository,
+        repository: ResultRepository,
+        partial_repository: PartialAggregateRepository | None = None,
+        engine: AnalysisEngine = "streaming",
+    ):
+        """
+        初期化
+
+        Args:
+            shard_loader: シャードローダー
+            shard_repository: シャードの部分集計リポジトリ
+            repository: 結果リポジトリ
+            partial_repository: 日付範囲のロールアップ用の部分集計リポジトリ
+            engine: 集計計画をcollectするPolarsエンジン
+        """
+        self.shard_loader = shard_loader
+        self.shard_repository = shard_repository
+        self.repository = repository
+        self.partial_repository = partial_repository
+        self.engine = engine
+
+    def map_shard(self, input: ShardedAnalysisInput, shard_index: int) -> RunAnalysisOutput:
+        """
+        1つのシャードの部分集計を求めて保存する（マッパー）
+
+        Args:
+            input: 分割実行の入力
+            shard_index: シャードのインデックス（0始まり）
+
+        Returns:
+            分析実行の出力（result_pathはシャードの部分集計の保存先）
+        """
+        timer = StageTimer()
+        try:
+            output = self._map_shard(input, Shard(shard_index, input.shard_count), timer)
+        except Exception as e:
+            output = RunAnalysisOutput(
+                result_path="", success=False, message=f"Shard analysis failed: {str(e)}"
+            )
+        return replace(output, metrics=tuple(timer.stages))
+
+    def reduce(self, input: ShardedAnalysisInput) -> RunAnalysisOutput:
+        """
+        全シャードの部分集計をマージして結果を保存する（リデューサー）
+
+        Args:
+            input: 分割実行の入力
+
+        Returns:
+            分析実行の出力（未保存のシャードがある場合は失敗）
+        """
+        timer = StageTimer()
+        try:
+            partials, missing = self._load_shards(input, timer)
+            if missing:
+                output = RunAnalysisOutput(
+                    result_path="",
+                    success=False,
+                    message=f"Missing shards: {', '.join(str(shard) for shard in missing)}",
+                )
+            else:
+                output = self._reduce(input, partials, timer)
+        except Exception as e:
+            output = RunAnalysisOutput(
+                result_path="", success=False, message=f"Reduce failed: {str(e)}"
+            )
+        return replace(output, metrics=tuple(timer.stages))
+
+    def run_shard(self, input: ShardedAnalysisInput, shard_index: int) -> RunAnalysisOutput:
+        """
+        シャードの部分集計を保存し、全シャードが揃っていればそのままマージする
+
+        Args:
+            input: 分割実行の入力
+            shard_index: シャードのインデックス（0始まり）
+
+        Returns:
+            分析実行の出力（マージした場合はresult_pathが結果の保存先）
+        """
+        mapped = self.map_shard(input, shard_index)
+        if not mapped.success:
+            return mapped
+
+        timer = StageTimer()
+        try:
+            partials, missing = self._load_shards(input, timer)
+            if missing:
+                output = replace(
+                    mapped,
+                    message=f"{mapped.message}; waiting for {len(missing)} more shards",
+                )
+            else:
+                output = self._reduce(input, partials, timer)
+        except Exception as e:
+            output = RunAnalysisOutput(
+                result_path="", success=False, message=f"Reduce failed: {str(e)}"
+            )
+        return replace(output, metrics=mapped.metrics + tuple(timer.stages))
+
+    def _map_shard(
+        self, input: ShardedAnalysisInput, shard: Shard, timer: StageTimer
+    ) -> RunAnalysisOutput:
+        """シャードを読み込んで部分集計を求め、保存する"""
+        with self.shard_loader.load_shard(input.dataset, shard) as lf:
+            if not supports_partial(lf):
+                raise ValueError("Sharded analysis requires a category and a numeric value column")
+
+            with timer.stage("analyze") as counts:
+                partial = build_partial_plan(lf).collect(engine=self.engine)
+                counts.rows_in = int(partial["count"].sum())
+                counts.rows_out = partial.height
+
+        with timer.stage("save") as counts:
+            counts.rows_in = partial.height
+            path = self.shard_repository.save(partial, input.target_date, input.run_id, shard)
+
+        return RunAnalysisOutput(
+            result_path=path, success=True, message=f"Shard {shard} mapped successfully"
+        )
+
+    def _load_shards(
+        self, input: ShardedAnalysisInput, timer: StageTimer
+    ) -> tuple[list[pl.LazyFrame], list[Shard]]:
+        """全シャードの部分集計を読み込み、読み込めたものと未保存のシャードを返す"""
+        partials: list[pl.LazyFrame] = []
+        missing: list[Shard] = []
+        with timer.stage("load"):
+            for index in range(input.shard_count):
+                shard = Shard(index, input.shard_count)
+                partial = self.shard_repository.load(input.target_date, input.run_id, shard)
+                if partial is None:
+                    missing.append(shard)
+                else:
+                    partials.append(partial)
+        return partials, missing
+
+    def _reduce(
+        self, input: ShardedAnalysisInput, partials: list[pl.LazyFrame], timer: StageTimer
+    ) -> RunAnalysisOutput:
+        """シャードの部分集計をマージし、結果とロールアップ用の部分集計を保存する"""
+        with timer.stage("analyze") as counts:
+            # シャードごとに型推論した列の型（整数・浮動小数点数など）を上位の型に揃える
+            merged = merge_partials(pl.concat(partials, how="vertical_relaxed")).collect(
+                engine=self.engine
+            )
+            counts.rows_in = int(merged["count"].sum())
+            counts.rows_out = merged.height
+
+        with timer.stage("save") as counts:
+            counts.rows_in = merged.height
+            result_path = self.repository.sink(build_result_plan(merged.lazy()), input.target_date)
+            if self.partial_repository is not None:
+                self.partial_repository.save(merged, input.target_date)
+            # マージ済みのシャードの部分集計は不要になるため、結果を保存した後に消す
+            self.shard_repository.delete(input.target_date, input.run_id)
+
+        return RunAnalysisOutput(
+            result_path=result_path,
+            success=True,
+            message=f"Analysis completed successfully from {input.shard_count} shards",
+        )
@@ -0,0 +1,113 @@
+"""分析ステージの計測"""
+
+import os
+import resource
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from app.usecase.dto.stage_metrics import StageMetrics
+
+
+def current_rss() -> int:
+    """現在のプロセスのRSS（バイト）を返す"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # /procが無い環境ではプロセス開始からの最大値で代用する（macOSはバイト単位）
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+class RssSampler:
+    """
+    バックグラウンドスレッドでRSSを一定間隔で読み、区間内のピークを求める
+
+    Polarsの割り当てはRust側で行われtracemallocでは追えないため、OSから見たRSSを使う。
+    """
+
+    def __init__(self, interval: float = 0.01):
+        """
+        初期化
+
+        Args:
+            interval: RSSを読む間隔（秒）
+        """
+        self.interval = interval
+        self.baseline = 0
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> "RssSampler":
+        self.baseline = self.peak = current_rss()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.peak = max(self.peak, current_rss())
+
+    @property
+    def delta(self) -> int:
+        """開始時からのRSSの最大増加量"""
+        return max(0, self.peak - self.baseline)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, current_rss())
+
+
+@dataclass
+class StageCounts:
+    """ステージの中で分かった入出力の量"""
+
+    input_bytes: int | None = None
+    rows_in: int | None = None
+    rows_out: int | None = None
+
+
+class StageTimer:
+    """ステージごとの経過時間・CPU時間・ピークRSS・入出力の量を記録する"""
+
+    def __init__(self):
+        self.stages: list[StageMetrics] = []
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageCounts]:
+        """
+        ブロックの実行を1つのステージとして計測する（例外で抜けた場合も記録する）
+
+        Args:
+            name: ステージ名
+
+        Yields:
+            ブロック内で入出力の量を設定するオブジェクト
+        """
+        counts = StageCounts()
+        with RssSampler() as sampler:
+            wall_started = time.perf_counter()
+            cpu_started = time.process_time()
+            try:
+                yield counts
+            finally:
+                self.stages.append(
+                    StageMetrics(
+                        stage=name,
+                        wall_seconds=time.perf_counter() - wall_started,
+                        cpu_seconds=time.process_time() - cpu_started,
+                        peak_rss_bytes=max(sampler.peak, current_rss()),
+                        input_bytes=counts.input_bytes,
+                        rows_in=counts.rows_in,
+                        rows_out=counts.rows_out,
+                    )
+                )
@@ -0,0 +1,43 @@
+"""結果取得ユースケースのポート（入力）"""
+
+from abc import ABC, abstractmethod
+
+import polars as pl
+
+from app.domain.value_object.date_range import DateRange
+from app.domain.value_object.target_date import TargetDate
+
+
+class GetResultUseCase(ABC):
+    """保存済みの分析結果を取得するユースケースのポート"""
+
+    @abstractmethod
+    def get(self, target_date: TargetDate, partition: str | None = None) -> pl.DataFrame | None:
+        """
+        保存済みの分析結果を取得する
+
+        Args:
+            target_date: 対象日付
+            partition: 同じ対象日付の結果を区別する名前（Noneの場合は日付ごとの結果）
+
+        Returns:
+            分析結果のデータ（保存されていない場合はNone）
+        """
+        pass
+
+    @abstractmethod
+    def query(
+        self, date_range: DateRange, categories: list[str] | None = None, daily: bool = False
+    ) -> pl.DataFrame | None:
+        """
+        日付範囲の分析結果をカテゴリごとに集計する
+
+        Args:
+            date_range: 対象日付の範囲
+            categories: 対象カテゴリ（Noneの場合は全カテゴリ）
+            daily: Trueの場合は日付ごと、Falseの場合は範囲全体で集計する
+
+        Returns:
+            集計結果（範囲内に結果が無い場合はNone）
+        """
+        pass
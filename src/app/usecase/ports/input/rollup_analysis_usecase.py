@@ -0,0 +1,23 @@
+"""ロールアップユースケースのポート（入力）"""
+
+from abc import ABC, abstractmethod
+
+from app.usecase.dto.rollup_analysis_input import RollupAnalysisInput
+from app.usecase.dto.rollup_analysis_output import RollupAnalysisOutput
+
+
+class RollupAnalysisUseCase(ABC):
+    """日付範囲のロールアップユースケースのポート"""
+
+    @abstractmethod
+    def rollup(self, input: RollupAnalysisInput) -> RollupAnalysisOutput:
+        """
+        日付ごとの部分集計をマージして日付範囲の集計を求める
+
+        Args:
+            input: ロールアップの入力
+
+        Returns:
+            ロールアップの出力
+        """
+        pass
@@ -2,6 +2,7 @@
 
 from abc import ABC, abstractmethod
 
+from app.domain.value_object.target_date import TargetDate
 from app.usecase.dto.run_analysis_input import RunAnalysisInput
 from app.usecase.dto.run_analysis_output import RunAnalysisOutput
 
@@ -21,3 +22,16 @@ class RunAnalysisUseCase(ABC):
             分析実行の出力
         """
         pass
+
+    @abstractmethod
+    def invalidate(self, target_date: TargetDate) -> bool:
+        """
+        対象日付の結果のメモ化を無効化する（次回実行時は必ず再計算する）
+
+        Args:
+            target_date: 対象日付
+
+        Returns:
+            無効化する記録が存在した場合True
+        """
+        pass
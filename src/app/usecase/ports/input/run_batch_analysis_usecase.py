@@ -0,0 +1,23 @@
+"""バッチ分析実行ユースケースのポート（入力）"""
+
+from abc import ABC, abstractmethod
+
+from app.usecase.dto.run_batch_analysis_input import RunBatchAnalysisInput
+from app.usecase.dto.run_batch_analysis_output import RunBatchAnalysisOutput
+
+
+class RunBatchAnalysisUseCase(ABC):
+    """複数データセットのバッチ分析実行ユースケースのポート"""
+
+    @abstractmethod
+    def run_batch(self, input: RunBatchAnalysisInput) -> RunBatchAnalysisOutput:
+        """
+        同じ対象日付の複数データセットをまとめて分析する
+
+        Args:
+            input: バッチ分析実行の入力
+
+        Returns:
+            データセットごとの実行結果
+        """
+        pass
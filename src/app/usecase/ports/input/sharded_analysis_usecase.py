@@ -0,0 +1,51 @@
+"""分割実行ユースケースのポート（入力）"""
+
+from abc import ABC, abstractmethod
+
+from app.usecase.dto.run_analysis_output import RunAnalysisOutput
+from app.usecase.dto.sharded_analysis_input import ShardedAnalysisInput
+
+
+class ShardedAnalysisUseCase(ABC):
+    """1つのデータセットをシャードに分けて集計し、部分集計をマージするユースケースのポート"""
+
+    @abstractmethod
+    def map_shard(self, input: ShardedAnalysisInput, shard_index: int) -> RunAnalysisOutput:
+        """
+        1つのシャードの部分集計を求めて保存する（マッパー）
+
+        Args:
+            input: 分割実行の入力
+            shard_index: シャードのインデックス（0始まり）
+
+        Returns:
+            分析実行の出力（result_pathはシャードの部分集計の保存先）
+        """
+        pass
+
+    @abstractmethod
+    def reduce(self, input: ShardedAnalysisInput) -> RunAnalysisOutput:
+        """
+        全シャードの部分集計をマージして結果を保存する（リデューサー）
+
+        Args:
+            input: 分割実行の入力
+
+        Returns:
+            分析実行の出力（未保存のシャードがある場合は失敗）
+        """
+        pass
+
+    @abstractmethod
+    def run_shard(self, input: ShardedAnalysisInput, shard_index: int) -> RunAnalysisOutput:
+        """
+        シャードの部分集計を保存し、全シャードが揃っていればそのままマージする
+
+        Args:
+            input: 分割実行の入力
+            shard_index: シャードのインデックス（0始まり）
+
+        Returns:
+            分析実行の出力（マージした場合はresult_pathが結果の保存先）
+        """
+        pass
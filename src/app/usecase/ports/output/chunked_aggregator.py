@@ -0,0 +1,26 @@
+"""チャンク単位の集計のポート（出力）"""
+
+from abc import ABC, abstractmethod
+from contextlib import AbstractContextManager
+
+import polars as pl
+
+from app.usecase.dto.chunked_partial import ChunkedPartial
+
+
+class ChunkedAggregator(ABC):
+    """入力をチャンクに分けて部分集計し、メモリの上限内でマージするポート"""
+
+    @abstractmethod
+    def aggregate(self, lf: pl.LazyFrame) -> AbstractContextManager[ChunkedPartial]:
+        """
+        入力の部分集計をメモリの上限内で求める
+
+        Args:
+            lf: 入力LazyFrame（category, value列を持つ）
+
+        Returns:
+            マージ後の部分集計を読み込む計画と入力の行数を返すコンテキストマネージャー
+            （計画が参照する一時ファイルはコンテキストを抜けると削除される）
+        """
+        pass
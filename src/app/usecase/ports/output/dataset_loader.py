@@ -5,13 +5,14 @@ from abc import ABC, abstractmethod
 import polars as pl
 
 from app.domain.value_object.dataset import Dataset
+from app.usecase.dto.dataset_probe import DatasetProbe
 
 
 class DatasetLoader(ABC):
     """データセットを読み込むポート"""
 
     @abstractmethod
-    def load(self, dataset: Dataset) -> pl.DataFrame:
+    def load(self, dataset: Dataset) -> pl.LazyFrame:
         """
         データセットを読み込む
 
@@ -19,6 +20,44 @@ class DatasetLoader(ABC):
             dataset: データセットの値オブジェクト
 
         Returns:
-            読み込んだデータフレーム
+            読み込み計画を表すLazyFrame（collectするまで実データは読まない）
         """
         pass
+
+    def fingerprint(self, dataset: Dataset) -> str | None:
+        """
+        データセットの内容を識別する指紋を、本体を読み込まずに取得する
+
+        Args:
+            dataset: データセットの値オブジェクト
+
+        Returns:
+            ETagやコンテンツハッシュ等の指紋（取得できない場合はNone）
+        """
+        return None
+
+    def size(self, dataset: Dataset) -> int | None:
+        """
+        データセットのバイト数を本体を読み込まずに取得する
+
+        Args:
+            dataset: データセットの値オブジェクト
+
+        Returns:
+            バイト数（取得できない場合はNone）
+        """
+        return None
+
+    def probe(self, dataset: Dataset) -> DatasetProbe:
+        """
+        データセットの指紋とバイト数をまとめて取得する
+
+        HTTP(S)のデータセットを1回のリクエストで調べられる実装はオーバーライドする。
+
+        Args:
+            dataset: データセットの値オブジェクト
+
+        Returns:
+            データセットのメタ情報
+        """
+        return DatasetProbe(fingerprint=self.fingerprint(dataset), size=self.size(dataset))
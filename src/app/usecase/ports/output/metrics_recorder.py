@@ -0,0 +1,19 @@
+"""計測値の記録先のポート（出力）"""
+
+from abc import ABC, abstractmethod
+
+from app.usecase.dto.run_analysis_output import RunAnalysisOutput
+
+
+class MetricsRecorder(ABC):
+    """分析実行の結果とステージごとの計測値を記録するポート"""
+
+    @abstractmethod
+    def record(self, output: RunAnalysisOutput) -> None:
+        """
+        分析実行1回分の結果と計測値を記録する
+
+        Args:
+            output: 分析実行の出力（ステージごとの計測値を含む）
+        """
+        pass
@@ -0,0 +1,51 @@
+"""部分集計リポジトリのポート（出力）"""
+
+from abc import ABC, abstractmethod
+
+import polars as pl
+
+from app.domain.value_object.target_date import TargetDate
+
+
+class PartialAggregateRepository(ABC):
+    """日付ごとの部分集計を保存・読み込みするポート"""
+
+    @abstractmethod
+    def save(self, partial: pl.DataFrame, target_date: TargetDate) -> str:
+        """
+        部分集計を保存する
+
+        Args:
+            partial: 部分集計
+            target_date: 対象日付
+
+        Returns:
+            保存先のパス
+        """
+        pass
+
+    def sink(self, plan: pl.LazyFrame, target_date: TargetDate) -> str:
+        """
+        部分集計の計画を実行しながら保存する（既定の実装はcollectしてsaveに渡す）
+
+        Args:
+            plan: 部分集計の計画
+            target_date: 対象日付
+
+        Returns:
+            保存先のパス
+        """
+        return self.save(plan.collect(), target_date)
+
+    @abstractmethod
+    def load(self, target_date: TargetDate) -> pl.LazyFrame | None:
+        """
+        部分集計の読み込み計画を返す
+
+        Args:
+            target_date: 対象日付
+
+        Returns:
+            部分集計のLazyFrame（保存されていない場合はNone）
+        """
+        pass
@@ -0,0 +1,24 @@
+"""分析プロファイルリポジトリのポート（出力）"""
+
+from abc import ABC, abstractmethod
+
+from app.domain.value_object.target_date import TargetDate
+from app.usecase.dto.analysis_profile import AnalysisProfile
+
+
+class ProfileRepository(ABC):
+    """分析プロファイルを保存するポート"""
+
+    @abstractmethod
+    def save(self, profile: AnalysisProfile, target_date: TargetDate) -> str:
+        """
+        分析プロファイルを保存する
+
+        Args:
+            profile: 分析プロファイル
+            target_date: 対象日付
+
+        Returns:
+            保存先のパス
+        """
+        pass
@@ -0,0 +1,52 @@
+"""結果メモ化ストアのポート（出力）"""
+
+from abc import ABC, abstractmethod
+
+from app.domain.value_object.target_date import TargetDate
+
+
+class ResultMemoStore(ABC):
+    """入力の指紋と保存済み結果の対応を記録するポート"""
+
+    @abstractmethod
+    def get(self, target_date: TargetDate, key: str, partition: str | None = None) -> str | None:
+        """
+        メモ化キーに一致する保存済み結果のパスを取得する
+
+        Args:
+            target_date: 対象日付
+            key: メモ化キー
+            partition: 結果の保存先を分けるパーティション（Noneの場合は既定の結果）
+
+        Returns:
+            保存済み結果のパス（一致する結果が存在しない場合はNone）
+        """
+        pass
+
+    @abstractmethod
+    def put(
+        self, target_date: TargetDate, key: str, result_path: str, partition: str | None = None
+    ) -> None:
+        """
+        メモ化キーと保存済み結果の対応を記録する
+
+        Args:
+            target_date: 対象日付
+            key: メモ化キー
+            result_path: 保存済み結果のパス
+            partition: 結果の保存先を分けるパーティション（Noneの場合は既定の結果）
+        """
+        pass
+
+    @abstractmethod
+    def invalidate(self, target_date: TargetDate) -> bool:
+        """
+        対象日付の記録を削除する（全パーティションの記録を削除する）
+
+        Args:
+            target_date: 対象日付
+
+        Returns:
+            記録が存在して削除した場合True
+        """
+        pass
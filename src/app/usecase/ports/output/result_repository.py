@@ -2,7 +2,10 @@
 
 from abc import ABC, abstractmethod
 
+import polars as pl
+
 from app.domain.model.analysis_result import AnalysisResult
+from app.domain.value_object.date_range import DateRange
 from app.domain.value_object.target_date import TargetDate
 
 
@@ -10,15 +13,66 @@ class ResultRepository(ABC):
     """分析結果を保存するポート"""
 
     @abstractmethod
-    def save(self, result: AnalysisResult, target_date: TargetDate) -> str:
+    def save(
+        self, result: AnalysisResult, target_date: TargetDate, partition: str | None = None
+    ) -> str:
         """
         分析結果を保存する
 
         Args:
             result: 分析結果
             target_date: 対象日付
+            partition: 同じ対象日付の結果を区別する名前（バッチ実行でデータセットごとに指定する。
+                指定した結果は日付ごとの結果とは別の名前空間に保存し、日付範囲の読み込み・
+                ロールアップの対象にしない）
 
         Returns:
             保存先のパス
         """
         pass
+
+    def sink(self, plan: pl.LazyFrame, target_date: TargetDate) -> str:
+        """
+        結果の計画を実行しながら保存する
+
+        既定の実装は計画をcollectしてsaveに渡す。結果をメモリに載せずに書き出せる実装は
+        上書きする。
+
+        Args:
+            plan: 分析結果の計画
+            target_date: 対象日付
+
+        Returns:
+            保存先のパス
+        """
+        return self.save(AnalysisResult(data=plan.collect()), target_date)
+
+    @abstractmethod
+    def load(self, target_date: TargetDate, partition: str | None = None) -> pl.DataFrame | None:
+        """
+        保存済みの分析結果を読み込む
+
+        Args:
+            target_date: 対象日付
+            partition: saveで指定した結果を区別する名前（Noneの場合は日付ごとの結果）
+
+        Returns:
+            分析結果のデータ（保存されていない場合はNone）
+        """
+        pass
+
+    @abstractmethod
+    def scan(
+        self, date_range: DateRange, categories: list[str] | None = None
+    ) -> pl.LazyFrame | None:
+        """
+        日付範囲の保存済みの分析結果をまとめて読み込む計画を返す
+
+        Args:
+            date_range: 対象日付の範囲
+            categories: 対象カテゴリ（Noneの場合は全カテゴリ）
+
+        Returns:
+            date列を含む分析結果のLazyFrame（範囲内に結果が無い場合はNone）
+        """
+        pass
@@ -0,0 +1,49 @@
+"""スキーマレジストリのポート（出力）"""
+
+from abc import ABC, abstractmethod
+
+from app.domain.value_object.dataset_schema import DatasetSchema
+
+
+class SchemaRegistry(ABC):
+    """データセット（フィード）ごとに固定したスキーマを保存・読み込みするポート"""
+
+    @abstractmethod
+    def get(self, key: str) -> DatasetSchema | None:
+        """
+        スキーマを取得する
+
+        Args:
+            key: データセットのスキーマキー（Dataset.schema_key）
+
+        Returns:
+            スキーマ（登録されていない場合はNone）
+        """
+        pass
+
+    @abstractmethod
+    def put(self, key: str, schema: DatasetSchema) -> str:
+        """
+        スキーマを登録する（既に登録されている場合は置き換える）
+
+        Args:
+            key: データセットのスキーマキー
+            schema: スキーマ
+
+        Returns:
+            保存先のパス
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> bool:
+        """
+        スキーマの登録を削除する（次回の読み込みで学習し直す）
+
+        Args:
+            key: データセットのスキーマキー
+
+        Returns:
+            削除する登録が存在した場合True
+        """
+        pass
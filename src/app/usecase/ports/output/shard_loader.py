@@ -0,0 +1,30 @@
+"""シャードローダーのポート（出力）"""
+
+from abc import ABC, abstractmethod
+from contextlib import AbstractContextManager
+
+import polars as pl
+
+from app.domain.value_object.dataset import Dataset
+from app.domain.value_object.shard import Shard
+
+
+class ShardLoader(ABC):
+    """データセットのうち1つのシャードだけを読み込むポート"""
+
+    @abstractmethod
+    def load_shard(self, dataset: Dataset, shard: Shard) -> AbstractContextManager[pl.LazyFrame]:
+        """
+        シャードを読み込む
+
+        全シャードを合わせると、データセットの各行をちょうど1回ずつ含む。
+
+        Args:
+            dataset: データセットの値オブジェクト
+            shard: 読み込むシャード
+
+        Returns:
+            シャードの読み込み計画を返すコンテキストマネージャー
+            （計画が参照する一時ファイルはコンテキストを抜けると削除される）
+        """
+        pass
@@ -0,0 +1,59 @@
+"""シャードの部分集計リポジトリのポート（出力）"""
+
+from abc import ABC, abstractmethod
+
+import polars as pl
+
+from app.domain.value_object.shard import Shard
+from app.domain.value_object.target_date import TargetDate
+
+
+class ShardPartialRepository(ABC):
+    """マッパーが求めたシャードごとの部分集計を保存・読み込みするポート"""
+
+    @abstractmethod
+    def save(
+        self, partial: pl.DataFrame, target_date: TargetDate, run_id: str, shard: Shard
+    ) -> str:
+        """
+        シャードの部分集計を保存する
+
+        Args:
+            partial: シャードの部分集計
+            target_date: 対象日付
+            run_id: 分割実行を識別するID（同じ実行のマッパーとリデューサーで共通）
+            shard: シャード
+
+        Returns:
+            保存先のパス
+        """
+        pass
+
+    @abstractmethod
+    def load(self, target_date: TargetDate, run_id: str, shard: Shard) -> pl.LazyFrame | None:
+        """
+        シャードの部分集計の読み込み計画を返す
+
+        Args:
+            target_date: 対象日付
+            run_id: 分割実行を識別するID
+            shard: シャード
+
+        Returns:
+            シャードの部分集計のLazyFrame（保存されていない場合はNone）
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, target_date: TargetDate, run_id: str) -> int:
+        """
+        分割実行の全シャードの部分集計を削除する
+
+        Args:
+            target_date: 対象日付
+            run_id: 分割実行を識別するID
+
+        Returns:
+            削除したシャードの部分集計の数
+        """
+        pass
@@ -0,0 +1,39 @@
+"""近似スケッチリポジトリのポート（出力）"""
+
+from abc import ABC, abstractmethod
+
+from app.domain.model.analysis_sketches import AnalysisSketches
+from app.domain.value_object.sketch_spec import SketchSpec
+from app.domain.value_object.target_date import TargetDate
+
+
+class SketchRepository(ABC):
+    """日付ごとの近似スケッチを保存・読み込みするポート"""
+
+    @abstractmethod
+    def save(self, sketches: AnalysisSketches, target_date: TargetDate) -> str:
+        """
+        近似スケッチを保存する
+
+        Args:
+            sketches: 近似スケッチ
+            target_date: 対象日付
+
+        Returns:
+            保存先のパス
+        """
+        pass
+
+    @abstractmethod
+    def load(self, target_date: TargetDate, spec: SketchSpec) -> AnalysisSketches | None:
+        """
+        設定が一致する近似スケッチを読み込む
+
+        Args:
+            target_date: 対象日付
+            spec: スケッチの設定（精度が異なるスケッチはマージできないため読み込まない）
+
+        Returns:
+            近似スケッチ（保存されていない場合はNone）
+        """
+        pass
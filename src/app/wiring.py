@@ -1,20 +1,130 @@
 """依存注入（Composition Root）"""
 
+from app.domain.value_object.sketch_spec import SketchSpec
 from app.infrastructure.config.settings import Settings
-from app.infrastructure.k8s.job_launcher import JobLauncher
+from app.infrastructure.executor.local_shard_executor import LocalShardExecutor
+from app.infrastructure.executor.spilling_aggregator import SpillingAggregator
+from app.infrastructure.k8s.resource_usage_history import ResourceUsageHistory
+from app.infrastructure.loader.columnar_store import ColumnarStore
+from app.infrastructure.loader.csv_shard_loader import CsvShardLoader
+from app.infrastructure.loader.dataset_cache import DatasetCache
 from app.infrastructure.loader.http_dataset_loader import HttpDatasetLoader
+from app.infrastructure.loader.ranged_downloader import RangedDownloader
+from app.infrastructure.queue.job_backend import JobBackend
+from app.infrastructure.repository.cached_result_repository import CachedResultRepository
+from app.infrastructure.repository.s3_partial_aggregate_repository import (
+    S3PartialAggregateRepository,
+)
+from app.infrastructure.repository.s3_profile_repository import S3ProfileRepository
+from app.infrastructure.repository.s3_result_memo_store import S3ResultMemoStore
 from app.infrastructure.repository.s3_result_repository import S3ResultRepository
+from app.infrastructure.repository.s3_schema_registry import S3SchemaRegistry
+from app.infrastructure.repository.s3_shard_partial_repository import S3ShardPartialRepository
+from app.infrastructure.repository.s3_sketch_repository import S3SketchRepository
+from app.infrastructure.storage.factory import object_store_from_settings
+from app.usecase.interactor.get_result_interactor import GetResultInteractor
+from app.usecase.interactor.rollup_analysis_interactor import RollupAnalysisInteractor
 from app.usecase.interactor.run_analysis_interactor import RunAnalysisInteractor
+from app.usecase.interactor.run_batch_analysis_interactor import RunBatchAnalysisInteractor
+from app.usecase.interactor.sharded_analysis_interactor import ShardedAnalysisInteractor
 from app.usecase.ports.output.dataset_loader import DatasetLoader
+from app.usecase.ports.output.metrics_recorder import MetricsRecorder
+from app.usecase.ports.output.result_memo_store import ResultMemoStore
 from app.usecase.ports.output.result_repository import ResultRepository
 
 
-def build_usecase(settings: Settings | None = None) -> RunAnalysisInteractor:
+def build_loader(settings: Settings) -> DatasetLoader:
+    """
+    設定に応じたキャッシュ・ダウンロード・列指向変換を組み込んだローダーを構築する
+
+    Args:
+        settings: アプリケーション設定
+
+    Returns:
+        データセットローダー
+    """
+    downloader = (
+        RangedDownloader(
+            max_workers=settings.download_workers,
+            part_size=settings.download_part_size,
+        )
+        if settings.download_workers > 1
+        else None
+    )
+    cache = (
+        DatasetCache(
+            settings.dataset_cache_dir,
+            max_bytes=settings.dataset_cache_max_bytes,
+            downloader=downloader,
+        )
+        if settings.dataset_cache_dir
+        else None
+    )
+    columnar_store = (
+        ColumnarStore(
+            settings.columnar_cache_dir,
+            format=settings.columnar_format,
+            max_bytes=settings.columnar_store_max_bytes or None,
+        )
+        if settings.columnar_cache_dir
+        else None
+    )
+    return HttpDatasetLoader(
+        mode=settings.load_mode,
+        cache=cache,
+        downloader=downloader,
+        download_dir=settings.download_dir or None,
+        columnar_store=columnar_store,
+        schema_registry=build_schema_registry(settings) if settings.schema_registry else None,
+        categorical_columns=[
+            name.strip() for name in settings.schema_categorical_columns.split(",") if name.strip()
+        ],
+    )
+
+
+def build_schema_registry(settings: Settings | None = None) -> S3SchemaRegistry:
+    """
+    スキーマレジストリを構築する
+
+    Args:
+        settings: アプリケーション設定（Noneの場合は環境変数から読み込む）
+
+    Returns:
+        スキーマレジストリ（SCHEMA_REGISTRYが無効でもAPIから登録・編集できるよう常に構築する）
+    """
+    if settings is None:
+        settings = Settings.from_env()
+    return S3SchemaRegistry(settings)
+
+
+def build_sketch_spec(settings: Settings) -> SketchSpec | None:
+    """
+    近似スケッチの設定を構築する
+
+    Args:
+        settings: アプリケーション設定
+
+    Returns:
+        スケッチの設定（ANALYSIS_SKETCHESが無効の場合はNone）
+    """
+    if not settings.analysis_sketches:
+        return None
+    return SketchSpec(
+        distinct_column=settings.sketch_distinct_column or None,
+        precision=settings.sketch_hll_precision,
+        relative_accuracy=settings.sketch_relative_accuracy,
+    )
+
+
+def build_usecase(
+    settings: Settings | None = None, metrics_recorder: MetricsRecorder | None = None
+) -> RunAnalysisInteractor:
     """
     ユースケースを構築する
 
     Args:
         settings: アプリケーション設定（Noneの場合は環境変数から読み込む）
+        metrics_recorder: ステージごとの計測値の記録先
 
     Returns:
         分析実行ユースケース
@@ -22,26 +132,218 @@ def build_usecase(settings: Settings | None = None) -> RunAnalysisInteractor:
     if settings is None:
         settings = Settings.from_env()
 
-    loader: DatasetLoader = HttpDatasetLoader()
-    repository: ResultRepository = S3ResultRepository(settings)
+    loader = build_loader(settings)
+    store = object_store_from_settings(settings)
+    repository: ResultRepository = S3ResultRepository(settings, store)
+    memo_store: ResultMemoStore | None = (
+        S3ResultMemoStore(settings, store) if settings.result_memo else None
+    )
 
     return RunAnalysisInteractor(
         loader=loader,
         repository=repository,
+        engine=settings.analysis_engine,
+        memo_store=memo_store,
+        partial_repository=S3PartialAggregateRepository(settings, store),
+        metrics_recorder=metrics_recorder,
+        profile_repository=S3ProfileRepository(settings, store),
+        sketch_spec=build_sketch_spec(settings),
+        sketch_repository=S3SketchRepository(settings, store),
+        chunked_aggregator=build_chunked_aggregator(settings),
+    )
+
+
+def build_chunked_aggregator(settings: Settings) -> SpillingAggregator | None:
+    """
+    メモリの上限内でチャンク単位に集計する集計器を構築する
+
+    Args:
+        settings: アプリケーション設定
+
+    Returns:
+        集計器（ANALYSIS_MEMORY_BUDGET_BYTESが0の場合はNone）
+    """
+    if settings.analysis_memory_budget_bytes <= 0:
+        return None
+    return SpillingAggregator(
+        memory_budget=settings.analysis_memory_budget_bytes,
+        chunk_rows=settings.analysis_chunk_rows,
+        spill_dir=settings.analysis_spill_dir or None,
     )
 
 
-def build_job_launcher(settings: Settings | None = None) -> JobLauncher:
+def build_sharded_usecase(settings: Settings | None = None) -> ShardedAnalysisInteractor:
+    """
+    分割実行ユースケースを構築する
+
+    Args:
+        settings: アプリケーション設定（Noneの場合は環境変数から読み込む）
+
+    Returns:
+        分割実行ユースケース
+    """
+    if settings is None:
+        settings = Settings.from_env()
+
+    store = object_store_from_settings(settings)
+    return ShardedAnalysisInteractor(
+        shard_loader=CsvShardLoader(
+            work_dir=settings.shard_work_dir or None,
+            schema_registry=build_schema_registry(settings) if settings.schema_registry else None,
+        ),
+        shard_repository=S3ShardPartialRepository(settings, store),
+        repository=S3ResultRepository(settings, store),
+        partial_repository=S3PartialAggregateRepository(settings, store),
+        engine=settings.analysis_engine,
+    )
+
+
+def build_local_shard_executor(settings: Settings | None = None) -> LocalShardExecutor:
+    """
+    分割実行のマッパーをローカルのワーカープロセスで実行する実行器を構築する
+
+    Args:
+        settings: アプリケーション設定（Noneの場合は環境変数から読み込む）
+
+    Returns:
+        ローカルの分割実行器（ワーカー数はLOCAL_JOB_WORKERS）
+    """
+    if settings is None:
+        settings = Settings.from_env()
+    return LocalShardExecutor(
+        build_sharded_usecase(settings), max_workers=settings.local_job_workers
+    )
+
+
+def build_batch_usecase(settings: Settings | None = None) -> RunBatchAnalysisInteractor:
+    """
+    バッチ分析実行ユースケースを構築する
+
+    Args:
+        settings: アプリケーション設定（Noneの場合は環境変数から読み込む）
+
+    Returns:
+        バッチ分析実行ユースケース
+    """
+    if settings is None:
+        settings = Settings.from_env()
+
+    return RunBatchAnalysisInteractor(
+        loader=build_loader(settings),
+        repository=S3ResultRepository(settings),
+        engine=settings.analysis_engine,
+        max_workers=settings.batch_max_workers,
+    )
+
+
+def build_result_usecase(settings: Settings | None = None) -> GetResultInteractor:
+    """
+    結果取得ユースケースを構築する（読み込んだ結果はメモリ上のLRUに保持する）
+
+    Args:
+        settings: アプリケーション設定（Noneの場合は環境変数から読み込む）
+
+    Returns:
+        結果取得ユースケース
+    """
+    if settings is None:
+        settings = Settings.from_env()
+
+    repository = CachedResultRepository(
+        S3ResultRepository(settings),
+        max_bytes=settings.result_cache_max_bytes,
+        ttl_seconds=settings.result_cache_ttl_seconds,
+    )
+    return GetResultInteractor(repository, engine=settings.analysis_engine)
+
+
+def build_rollup_usecase(settings: Settings | None = None) -> RollupAnalysisInteractor:
+    """
+    ロールアップユースケースを構築する
+
+    Args:
+        settings: アプリケーション設定（Noneの場合は環境変数から読み込む）
+
+    Returns:
+        ロールアップユースケース
+    """
+    if settings is None:
+        settings = Settings.from_env()
+
+    store = object_store_from_settings(settings)
+    return RollupAnalysisInteractor(
+        partial_repository=S3PartialAggregateRepository(settings, store),
+        engine=settings.analysis_engine,
+        sketch_repository=S3SketchRepository(settings, store),
+        sketch_spec=build_sketch_spec(settings),
+    )
+
+
+def build_resource_history(settings: Settings | None = None) -> ResourceUsageHistory | None:
+    """
+    Jobのピークメモリ使用量の履歴を構築する
+
+    Args:
+        settings: アプリケーション設定（Noneの場合は環境変数から読み込む）
+
+    Returns:
+        ピークメモリ使用量の履歴（JOB_RESOURCE_HISTORYが無効の場合はNone）
+    """
+    if settings is None:
+        settings = Settings.from_env()
+    if not settings.job_resource_history:
+        return None
+    return ResourceUsageHistory(settings)
+
+
+def build_job_launcher(settings: Settings | None = None) -> JobBackend:
     """
     Job起動器を構築する
 
+    LOCAL_JOB_DBが設定されている場合は、小さなデータセットをローカルのワーカープロセスへ、
+    大きなデータセットをK8s Jobへ振り分ける起動器を返す。
+
     Args:
         settings: アプリケーション設定（Noneの場合は環境変数から読み込む）
 
     Returns:
         Job起動器
     """
+    # Job起動器はAPIでしか使わないため、Jobの起動時間に影響しないようここで読み込む
+    from app.infrastructure.k8s.job_launcher import JobLauncher
+    from app.infrastructure.k8s.resource_estimator import ResourceEstimator
+    from app.infrastructure.queue.job_dispatcher import JobDispatcher
+    from app.infrastructure.queue.local_job_launcher import LocalJobLauncher
+
     if settings is None:
         settings = Settings.from_env()
 
-    return JobLauncher(settings)
+    resource_estimator = (
+        ResourceEstimator(
+            history=build_resource_history(settings),
+            headroom=settings.job_memory_headroom,
+            max_memory=settings.job_memory_max_bytes,
+            max_cpu_millis=settings.job_cpu_max_millis,
+        )
+        if settings.job_adaptive_resources
+        else None
+    )
+    k8s_launcher = JobLauncher(
+        settings,
+        use_informer=settings.job_informer,
+        resync_period=settings.job_informer_resync_seconds,
+        resource_estimator=resource_estimator,
+    )
+    if not settings.local_job_db:
+        return k8s_launcher
+
+    local_launcher = LocalJobLauncher(
+        settings.local_job_db,
+        max_workers=settings.local_job_workers,
+        lease_seconds=settings.local_job_lease_seconds,
+    ).start()
+    return JobDispatcher(
+        k8s_launcher=k8s_launcher,
+        local_launcher=local_launcher,
+        local_max_bytes=settings.local_job_max_bytes,
+    )
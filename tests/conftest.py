@@ -0,0 +1,96 @@
+"""テスト共通のフィクスチャ"""
+
+import hashlib
+import re
+import threading
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class StaticHttpServer:
+    """テスト用のローカルHTTPサーバー（ETag/Last-Modified/Rangeに対応）"""
+
+    def __init__(self):
+        self.files: dict[str, bytes] = {}
+        self.accept_ranges = True
+        self.requests: list[tuple[str, str, dict[str, str]]] = []
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, path: str) -> str:
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def count(self, method: str, path: str) -> int:
+        return sum(1 for m, p, _ in self.requests if m == method and p == f"/{path.lstrip('/')}")
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_HEAD(self):
+                self._serve(send_body=False)
+
+            def do_GET(self):
+                self._serve(send_body=True)
+
+            def _serve(self, send_body: bool):
+                server.requests.append((self.command, self.path, dict(self.headers)))
+                body = server.files.get(self.path)
+                if body is None:
+                    self.send_error(404)
+                    return
+
+                etag = f'"{hashlib.md5(body).hexdigest()}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+
+                status, start, end = 200, 0, len(body) - 1
+                match = re.fullmatch(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+                if match and server.accept_ranges:
+                    status = 206
+                    start = int(match.group(1))
+                    end = min(int(match.group(2) or end), end)
+
+                payload = body[start : end + 1]
+                self.send_response(status)
+                self.send_header("ETag", etag)
+                self.send_header("Last-Modified", formatdate(0, usegmt=True))
+                self.send_header("Content-Length", str(len(payload)))
+                if server.accept_ranges:
+                    self.send_header("Accept-Ranges", "bytes")
+                if status == 206:
+                    self.send_header("Content-Range", f"bytes {start}-{end}/{len(body)}")
+                self.end_headers()
+                if send_body:
+                    self.wfile.write(payload)
+
+        return Handler
+
+
+@pytest.fixture
+def http_server():
+    """ローカルHTTPサーバーを起動する"""
+    server = StaticHttpServer()
+    server.start()
+    yield server
+    server.stop()
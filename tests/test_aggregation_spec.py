@@ -0,0 +1,244 @@
+"""集計仕様のコンパイルと受け渡しのテスト"""
+
+import sqlite3
+from datetime import date
+
+import polars as pl
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.domain.service.aggregation_compiler import compile_aggregation
+from app.domain.service.analyze_service import analyze
+from app.domain.value_object.aggregation_spec import AggregationSpec
+from app.domain.value_object.dataset import Dataset
+from app.domain.value_object.date_range import DateRange
+from app.domain.value_object.target_date import TargetDate
+from app.infrastructure.config.settings import Settings
+from app.infrastructure.k8s.job_launcher import JobLauncher
+from app.infrastructure.loader.http_dataset_loader import HttpDatasetLoader
+from app.infrastructure.queue.sqlite_job_queue import SqliteJobQueue
+from app.infrastructure.repository.s3_partial_aggregate_repository import (
+    S3PartialAggregateRepository,
+)
+from app.infrastructure.repository.s3_result_repository import S3ResultRepository
+from app.interface.api.analysis_controller import get_run_executor, get_usecase, router
+from app.interface.api.run_executor import BoundedRunExecutor
+from app.interface.job.analysis_job_controller import build_input
+from app.usecase.dto.rollup_analysis_input import RollupAnalysisInput
+from app.usecase.dto.run_analysis_input import RunAnalysisInput
+from app.usecase.interactor.rollup_analysis_interactor import RollupAnalysisInteractor
+from app.usecase.interactor.run_analysis_interactor import RunAnalysisInteractor
+
+DATA = pl.DataFrame(
+    {
+        "category": ["a", "b", "a", "b", "a"],
+        "region": ["x", "x", "y", "y", "y"],
+        "price": [10.0, 20.0, 30.0, None, 50.0],
+        "quantity": [1, 2, 3, 4, 5],
+        "unused": ["u"] * 5,
+    }
+)
+
+SPEC = {
+    "group_by": ["category"],
+    "metrics": [
+        {"function": "sum", "column": "revenue"},
+        {"function": "mean", "column": "price"},
+        {"function": "max", "column": "quantity", "alias": "max_quantity"},
+        {"function": "n_unique", "column": "region"},
+        {"function": "len"},
+    ],
+    "filters": [{"column": "quantity", "op": "le", "value": 4}],
+    "derived": [{"name": "revenue", "op": "mul", "left": "price", "right": "quantity"}],
+}
+
+
+def test_metrics_match_separate_passes():
+    """仕様の各指標は指標ごとに別々に求めた値と一致する"""
+    result = analyze(DATA, aggregation=AggregationSpec.from_dict(SPEC))
+
+    filtered = DATA.filter(pl.col("quantity") <= 4).with_columns(
+        (pl.col("price") * pl.col("quantity")).alias("revenue")
+    )
+    expected = (
+        filtered.group_by("category")
+        .agg(
+            pl.col("revenue").sum().alias("revenue_sum"),
+            pl.col("price").mean().alias("price_mean"),
+            pl.col("quantity").max().alias("max_quantity"),
+            pl.col("region").n_unique().alias("region_n_unique"),
+            pl.len(),
+        )
+        .sort("category")
+    )
+    assert result.data.equals(expected)
+    assert result.partial is None
+
+
+def test_all_metrics_share_one_scan(tmp_path):
+    """全ての指標を1回の読み込みで求め、参照する列だけを読み込む"""
+    path = tmp_path / "data.csv"
+    DATA.write_csv(path)
+    compiled = compile_aggregation(AggregationSpec.from_dict(SPEC))
+
+    plan = compiled.apply(pl.scan_csv(path)).explain()
+
+    assert plan.count("SCAN") == 1
+    # 参照しない列は読み込まない
+    assert "unused" not in plan
+
+
+def test_identical_specs_share_compiled_plan():
+    """同じ仕様はコンパイル済みの計画を共有し、異なる仕様は共有しない"""
+    first = AggregationSpec.from_dict(SPEC)
+    second = AggregationSpec.from_json(first.to_json())
+
+    assert first == second
+    assert first.fingerprint() == second.fingerprint()
+    assert compile_aggregation(first) is compile_aggregation(second)
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        {"metrics": []},
+        {"metrics": [{"function": "mode", "column": "price"}]},
+        {"metrics": [{"function": "sum"}]},
+        {"metrics": [{"function": "len"}], "filters": [{"column": "price", "op": "like"}]},
+        {
+            "metrics": [{"function": "len"}],
+            "filters": [{"column": "price", "op": "in", "value": 1}],
+        },
+        {
+            "metrics": [{"function": "sum", "column": "price", "alias": "category"}],
+            "group_by": ["category"],
+        },
+        {"metrics": [{"function": "len", "unknown": 1}]},
+    ],
+)
+def test_invalid_spec_is_rejected(spec):
+    """不正な仕様はエラーになる"""
+    with pytest.raises(ValueError):
+        AggregationSpec.from_dict(spec)
+
+
+def test_missing_column_is_rejected():
+    """入力に無い列を参照する仕様は列名を含むエラーになる"""
+    spec = AggregationSpec.from_dict({"metrics": [{"function": "sum", "column": "missing"}]})
+
+    with pytest.raises(ValueError, match="missing"):
+        analyze(DATA, aggregation=spec)
+
+
+def test_run_endpoint_accepts_aggregation(tmp_path):
+    """/analysis/runは仕様を受け付け、仕様の結果を既定の集計の結果とは別の場所に保存する"""
+    csv_path = tmp_path / "data.csv"
+    DATA.write_csv(csv_path)
+    settings = Settings(s3_bucket="bucket", local_result_dir=str(tmp_path / "results"))
+    repository = S3ResultRepository(settings)
+    usecase = RunAnalysisInteractor(loader=HttpDatasetLoader(), repository=repository)
+    executor = BoundedRunExecutor(max_concurrency=1)
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_usecase] = lambda: usecase
+    app.dependency_overrides[get_run_executor] = lambda: executor
+    client = TestClient(app)
+    request = {"dataset_url": str(csv_path), "target_date": "2024-01-01"}
+
+    target_date = TargetDate(value=date(2024, 1, 1))
+    assert client.post("/analysis/run", json=request).status_code == 200
+    default = repository.load(target_date)
+
+    response = client.post("/analysis/run", json={**request, "aggregation": SPEC})
+    assert response.status_code == 200, response.text
+    # 仕様の結果は既定の集計の結果を置き換えず、仕様ごとの場所に保存される
+    assert repository.load(target_date).equals(default)
+    partition = AggregationSpec.from_dict(SPEC).result_partition
+    assert response.json()["result_path"].endswith(f"2024-01-01/{partition}/result.parquet")
+    stored = repository.load(target_date, partition)
+    assert stored.columns == [
+        "category",
+        "revenue_sum",
+        "price_mean",
+        "max_quantity",
+        "region_n_unique",
+        "len",
+    ]
+
+    invalid = {**request, "aggregation": {"metrics": [{"function": "mode", "column": "price"}]}}
+    assert client.post("/analysis/run", json=invalid).status_code == 400
+    executor.shutdown()
+
+
+def test_job_env_round_trips_spec():
+    """Jobに環境変数で渡した仕様はJob側で同じ仕様に戻る"""
+    spec = AggregationSpec.from_dict(SPEC)
+    manifest = JobLauncher()._create_job_manifest(
+        job_name="analysis-2024-01-01",
+        dataset_url="data.csv",
+        target_date="2024-01-01",
+        image="polars-service:latest",
+        aggregation=spec,
+    )
+    env = {
+        var["name"]: var["value"]
+        for var in manifest["spec"]["template"]["spec"]["containers"][0]["env"]
+    }
+
+    settings = Settings(
+        s3_bucket="bucket",
+        dataset_url=env["DATASET_URL"],
+        target_date=env["TARGET_DATE"],
+        analysis_aggregation=env["ANALYSIS_AGGREGATION"],
+    )
+    assert build_input(settings).aggregation == spec
+
+
+def test_local_queue_keeps_spec_and_migrates_old_files(tmp_path):
+    """ローカルのキューは仕様を保持し、仕様の列が無い既存のファイルも移行して読める"""
+    db_path = tmp_path / "jobs.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "CREATE TABLE jobs (job_id TEXT PRIMARY KEY, dataset_url TEXT NOT NULL, "
+            "target_date TEXT NOT NULL, force INTEGER NOT NULL DEFAULT 0, status TEXT NOT NULL, "
+            "creation_timestamp TEXT NOT NULL, start_time TEXT, completion_time TEXT, "
+            "result_path TEXT, message TEXT, attempts INTEGER NOT NULL DEFAULT 0)"
+        )
+    conn.close()
+
+    queue = SqliteJobQueue(db_path)
+    queue.enqueue(
+        "job-1", "data.csv", "2024-01-01", aggregation=AggregationSpec.from_dict(SPEC).to_json()
+    )
+
+    assert AggregationSpec.from_json(queue.claim().aggregation) == AggregationSpec.from_dict(SPEC)
+
+
+def test_spec_run_keeps_default_result_and_rollup(tmp_path):
+    """仕様の実行は既定の集計の結果・部分集計を置き換えず、範囲の読み込みとロールアップを壊さない"""
+    csv_path = tmp_path / "data.csv"
+    pl.DataFrame({"category": ["a", "b", "a"], "value": [1, 2, 3]}).write_csv(csv_path)
+    settings = Settings(s3_bucket="bucket", local_result_dir=str(tmp_path / "results"))
+    repository = S3ResultRepository(settings)
+    partials = S3PartialAggregateRepository(settings)
+    interactor = RunAnalysisInteractor(
+        loader=HttpDatasetLoader(), repository=repository, partial_repository=partials
+    )
+    target_date = TargetDate(value=date(2024, 1, 1))
+    spec = AggregationSpec.from_dict({"metrics": [{"function": "len"}]})
+
+    interactor.run(RunAnalysisInput(dataset=Dataset(url=str(csv_path)), target_date=target_date))
+    output = interactor.run(
+        RunAnalysisInput(
+            dataset=Dataset(url=str(csv_path)), target_date=target_date, aggregation=spec
+        )
+    )
+
+    assert output.success, output.message
+    assert repository.load(target_date, spec.result_partition)["len"].to_list() == [3]
+    day = DateRange(target_date.value, target_date.value)
+    totals = repository.scan(day).select("category", "total").sort("category").collect()
+    assert totals.rows() == [("a", 4), ("b", 2)]
+    rollup = RollupAnalysisInteractor(partials).rollup(RollupAnalysisInput(date_range=day))
+    assert rollup.success and rollup.data.sort("category")["total"].to_list() == [4, 2]
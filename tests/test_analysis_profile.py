@@ -0,0 +1,106 @@
+"""分析プロファイルのテスト"""
+
+import json
+import time
+from datetime import date
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from app.domain.service.analyze_service import analyze, profile_analyze
+from app.domain.value_object.dataset import Dataset
+from app.domain.value_object.target_date import TargetDate
+from app.infrastructure.config.settings import Settings
+from app.infrastructure.loader.http_dataset_loader import HttpDatasetLoader
+from app.infrastructure.repository.s3_profile_repository import S3ProfileRepository
+from app.infrastructure.repository.s3_result_memo_store import S3ResultMemoStore
+from app.infrastructure.repository.s3_result_repository import S3ResultRepository
+from app.usecase.dto.run_analysis_input import RunAnalysisInput
+from app.usecase.interactor import run_analysis_interactor
+from app.usecase.interactor.run_analysis_interactor import RunAnalysisInteractor
+from app.usecase.interactor.sampling_profiler import SamplingProfiler
+
+
+@pytest.fixture
+def settings(tmp_path):
+    return Settings(s3_bucket="bucket", local_result_dir=str(tmp_path / "results"))
+
+
+@pytest.fixture
+def interactor(settings):
+    return RunAnalysisInteractor(
+        loader=HttpDatasetLoader(),
+        repository=S3ResultRepository(settings),
+        memo_store=S3ResultMemoStore(settings),
+        profile_repository=S3ProfileRepository(settings),
+    )
+
+
+def make_input(tmp_path, profile: bool) -> RunAnalysisInput:
+    csv_path = tmp_path / "data.csv"
+    if not csv_path.exists():
+        pl.DataFrame({"category": ["a", "b", "a"], "value": [1, 2, 3]}).write_csv(csv_path)
+    return RunAnalysisInput(
+        dataset=Dataset(url=str(csv_path)),
+        target_date=TargetDate(value=date(2024, 1, 1)),
+        profile=profile,
+    )
+
+
+def test_profile_analyze_matches_analyze():
+    """プロファイル付きの分析は通常の分析と同じ結果を返し、最適化後の計画とノードごとの時間を記録する"""
+    df = pl.DataFrame({"category": ["a", "b", "a"], "value": [1, 2, 3]})
+
+    result, profile = profile_analyze(df)
+
+    assert result.data.sort("category").equals(analyze(df).data.sort("category"))
+    assert "AGGREGATE" in profile.optimized_plan.upper()
+    assert {"node", "start", "end"} <= set(profile.node_timings.columns)
+
+
+def test_sampling_profiler_records_stacks():
+    """サンプリングプロファイラーは実行中の関数のスタックを記録する"""
+
+    def busy_wait():
+        deadline = time.perf_counter() + 0.1
+        while time.perf_counter() < deadline:
+            pass
+
+    with SamplingProfiler(interval=0.002) as profiler:
+        busy_wait()
+
+    assert profiler.samples > 0
+    assert any("busy_wait" in stack for stack in profiler.folded())
+
+
+def test_profiled_run_stores_artifact_beside_result(interactor, tmp_path):
+    """プロファイルを要求した実行は結果と並べてプロファイルを保存する"""
+    interactor.run(make_input(tmp_path, profile=False))
+    output = interactor.run(make_input(tmp_path, profile=True))
+
+    # プロファイル時はメモ化された結果を再利用せずに分析を実行する
+    assert output.success and not output.reused
+    profile_path = Path(output.profile_path)
+    assert profile_path.parent == Path(output.result_path).parent / "profiles"
+
+    artifact = json.loads(profile_path.read_text())
+    assert artifact["dataset_url"].endswith("data.csv")
+    assert artifact["optimized_plan"]
+    assert artifact["node_timings"]
+    assert [m["stage"] for m in artifact["metrics"]] == ["memo_lookup", "load", "analyze", "save"]
+
+
+def test_no_profiling_without_flag(interactor, tmp_path, monkeypatch):
+    """プロファイルを要求しない実行ではプロファイラーを使わない"""
+
+    def fail(*args, **kwargs):
+        raise AssertionError("profiler must not be used")
+
+    monkeypatch.setattr(run_analysis_interactor, "SamplingProfiler", fail)
+    monkeypatch.setattr(run_analysis_interactor, "profile_analyze", fail)
+
+    output = interactor.run(make_input(tmp_path, profile=False))
+
+    assert output.success
+    assert output.profile_path is None
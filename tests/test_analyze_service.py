@@ -0,0 +1,38 @@
+"""analyze_serviceのテスト"""
+
+import polars as pl
+import pytest
+
+from app.domain.service.analyze_service import analyze
+from app.domain.value_object.dataset import Dataset
+from app.infrastructure.loader.http_dataset_loader import HttpDatasetLoader
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "data.csv"
+    pl.DataFrame(
+        {
+            "category": ["a", "b", "a", "c"],
+            "value": [1, 2, 3, 4],
+            "unused": ["x", "y", "z", "w"],
+        }
+    ).write_csv(path)
+    return str(path)
+
+
+@pytest.mark.parametrize("engine", ["streaming", "in-memory"])
+def test_analyze_lazy_and_eager_agree(csv_path, engine):
+    """lazy/eagerどちらの経路でも同じ集計結果になる"""
+    lazy = analyze(HttpDatasetLoader(mode="lazy").load(Dataset(url=csv_path)), engine=engine)
+    eager = analyze(HttpDatasetLoader(mode="eager").load(Dataset(url=csv_path)), engine=engine)
+
+    expected = {"a": 4, "b": 2, "c": 4}
+    for result in (lazy, eager):
+        assert dict(result.data.sort("category").iter_rows()) == expected
+
+
+def test_analyze_passes_through_without_required_columns():
+    """category/valueが無い場合は入力をそのまま返す"""
+    df = pl.DataFrame({"x": [1, 2]})
+    assert analyze(df).data.equals(df)
@@ -0,0 +1,64 @@
+"""バックフィル（Indexed Job）のテスト"""
+
+from datetime import date
+
+import pytest
+
+from app.domain.value_object.date_range import DateRange
+from app.infrastructure.config.settings import Settings
+from app.infrastructure.k8s.job_launcher import JobLauncher
+from app.interface.job.analysis_job_controller import build_input
+
+
+def test_date_range_maps_index_to_date():
+    """完了インデックスは開始日からの日数に対応し、範囲外のインデックスは拒否する"""
+    date_range = DateRange(start=date(2024, 1, 30), end=date(2024, 2, 2))
+
+    assert len(date_range) == 4
+    assert date_range.date_at(0) == date(2024, 1, 30)
+    assert date_range.date_at(3) == date(2024, 2, 2)
+    with pytest.raises(IndexError):
+        date_range.date_at(4)
+    with pytest.raises(ValueError):
+        DateRange(start=date(2024, 2, 2), end=date(2024, 1, 30))
+
+
+def test_backfill_manifest_is_indexed_job():
+    """バックフィルは日数分の完了数を持つ1つのIndexed Jobになる"""
+    launcher = JobLauncher(Settings(s3_bucket="bucket"))
+
+    manifest = launcher._create_backfill_job_manifest(
+        job_name="backfill-2024-01",
+        date_range=DateRange(start=date(2024, 1, 1), end=date(2024, 1, 31)),
+        dataset_url_template="https://example.com/{date:%Y%m%d}.csv",
+        parallelism=64,
+        image="polars-service:latest",
+    )
+
+    spec = manifest["spec"]
+    assert spec["completionMode"] == "Indexed"
+    assert spec["completions"] == 31
+    # 並列数は日数を超えない
+    assert spec["parallelism"] == 31
+    assert manifest["metadata"]["labels"]["app"] == "polars-analysis"
+    env = {e["name"]: e["value"] for e in spec["template"]["spec"]["containers"][0]["env"]}
+    assert env["BACKFILL_START_DATE"] == "2024-01-01"
+    assert env["BACKFILL_END_DATE"] == "2024-01-31"
+    assert env["DATASET_URL_TEMPLATE"] == "https://example.com/{date:%Y%m%d}.csv"
+    assert env["S3_BUCKET"] == "bucket"
+
+
+def test_build_input_uses_completion_index():
+    """Podは完了インデックスの日付でデータセットURLのテンプレートを展開する"""
+    settings = Settings(
+        s3_bucket="bucket",
+        dataset_url_template="https://example.com/{date:%Y%m%d}.csv",
+        backfill_start_date="2024-01-30",
+        backfill_end_date="2024-02-05",
+        job_completion_index=2,
+    )
+
+    input_data = build_input(settings)
+
+    assert str(input_data.target_date) == "2024-02-01"
+    assert input_data.dataset.url == "https://example.com/20240201.csv"
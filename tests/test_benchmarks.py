@@ -0,0 +1,105 @@
+"""ベンチマークハーネスのテスト"""
+
+import hashlib
+import json
+
+import pytest
+
+from benchmarks.__main__ import main
+from benchmarks.compare import compare_reports
+from benchmarks.runner import STAGES, build_report, run_benchmark
+from benchmarks.synthetic import SyntheticSpec, synthetic_frame, write_dataset
+
+
+def test_synthetic_dataset_is_deterministic(tmp_path):
+    """同じ設定からは生成単位によらず同じデータセットが生成される"""
+    spec = SyntheticSpec(rows=2_500, cardinality=7, width=2, seed=3, chunk_rows=1_000)
+
+    first = write_dataset(spec, tmp_path / "a.csv")
+    second = write_dataset(spec, tmp_path / "b.csv")
+
+    digest = [hashlib.sha256(path.read_bytes()).hexdigest() for path in (first, second)]
+    assert digest[0] == digest[1]
+
+    df = synthetic_frame(spec).collect()
+    assert df.columns == ["category", "value", "x0", "x1"]
+    assert df.height == 2_500
+    assert df["category"].n_unique() == 7
+    # 生成単位をまたいでも同じ値になる
+    assert (
+        synthetic_frame(SyntheticSpec(rows=2_500, cardinality=7, width=2, seed=3))
+        .collect()
+        .equals(df)
+    )
+
+
+def test_synthetic_spec_validation():
+    """行数・カテゴリ数が0の設定はエラーになる"""
+    with pytest.raises(ValueError):
+        SyntheticSpec(rows=0)
+    with pytest.raises(ValueError):
+        SyntheticSpec(cardinality=0)
+
+
+def test_run_benchmark_measures_each_stage(tmp_path):
+    """各ステージを指定回数計測し、最短の時間とピークメモリを記録する"""
+    run = run_benchmark(SyntheticSpec(rows=1_000, cardinality=5), tmp_path, repeat=2)
+
+    assert set(run["stages"]) == set(STAGES)
+    for stats in run["stages"].values():
+        assert len(stats["samples"]) == 2
+        assert stats["seconds"] == min(stats["samples"])
+        assert stats["peak_rss_bytes"] > 0
+
+
+def _report(seconds: float, rss: int) -> dict:
+    stats = {"seconds": seconds, "rss_delta_bytes": rss}
+    dataset = {"name": "d", "format": "csv", "engine": "streaming", "transport": "file"}
+    return build_report([{"dataset": dataset, "stages": {"analyze": stats}}])
+
+
+def test_compare_detects_regressions():
+    """しきい値を超えて遅くなった・メモリが増えた指標だけを劣化と判定する"""
+    baseline = _report(seconds=1.0, rss=100 * 1024**2)
+
+    assert not any(c.regressed for c in compare_reports(baseline, _report(1.05, 100 * 1024**2)))
+
+    slower = compare_reports(baseline, _report(1.5, 100 * 1024**2), threshold=0.1)
+    assert [(c.metric, c.regressed) for c in slower] == [
+        ("seconds", True),
+        ("rss_delta_bytes", False),
+    ]
+
+    bigger = compare_reports(baseline, _report(1.0, 200 * 1024**2), threshold=0.1)
+    assert [c.metric for c in bigger if c.regressed] == ["rss_delta_bytes"]
+
+
+def test_compare_ignores_noise_below_floor():
+    """計測誤差の範囲の小さな差は劣化と判定しない"""
+    baseline = _report(seconds=0.001, rss=1024)
+
+    assert not any(c.regressed for c in compare_reports(baseline, _report(0.005, 4096)))
+
+
+def test_compare_command_exit_code(tmp_path):
+    """compareコマンドは劣化があれば終了コード1を返す"""
+    (tmp_path / "base.json").write_text(json.dumps(_report(1.0, 0)))
+    (tmp_path / "slow.json").write_text(json.dumps(_report(2.0, 0)))
+
+    assert main(["compare", str(tmp_path / "base.json"), str(tmp_path / "base.json")]) == 0
+    assert main(["compare", str(tmp_path / "base.json"), str(tmp_path / "slow.json")]) == 1
+
+
+def test_schema_report_measures_inferred_and_pinned(tmp_path, capsys):
+    """schema-reportは型推論とスキーマ固定の両方を計測して結果を書き出す"""
+    output = tmp_path / "schema.json"
+
+    code = main(
+        ["schema-report", "--rows", "1000", "--cardinality", "5", "--repeat", "1"]
+        + ["--work-dir", str(tmp_path / "work"), "--output", str(output)]
+    )
+
+    assert code == 0
+    runs = json.loads(output.read_text())["runs"]
+    assert [run["dataset"]["schema"] for run in runs] == ["inferred", "pinned"]
+    assert "rss_delta_bytes" in capsys.readouterr().out
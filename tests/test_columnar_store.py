@@ -0,0 +1,98 @@
+"""ColumnarStoreのテスト"""
+
+import os
+
+import polars as pl
+import pytest
+
+from app.domain.service.analyze_service import analyze
+from app.domain.value_object.dataset import Dataset
+from app.infrastructure.config.settings import Settings
+from app.infrastructure.loader.columnar_store import ColumnarStore
+from app.infrastructure.loader.dataset_cache import DatasetCache
+from app.infrastructure.loader.http_dataset_loader import HttpDatasetLoader
+from app.wiring import build_loader
+
+CSV = b"category,value,note\na,1,x\nb,2.5,y\na,3,z\n"
+
+
+@pytest.mark.parametrize("format", ["parquet", "ipc"])
+def test_converts_once_and_reuses(tmp_path, format):
+    """同じキーの2回目以降は変換済みファイルをscanする"""
+    csv_path = tmp_path / "data.csv"
+    csv_path.write_bytes(CSV)
+    store = ColumnarStore(tmp_path / "columnar", format=format)
+
+    first = store.scan(csv_path, "k1").collect()
+    converted_at = store.path_for("k1").stat().st_mtime_ns
+    csv_path.unlink()  # 2回目はCSVを読まない
+    second = store.scan(csv_path, "k1").collect()
+
+    assert first.equals(pl.read_csv(CSV))
+    assert second.equals(first)
+    assert store.path_for("k1").stat().st_mtime_ns >= converted_at
+    assert store.schema_for("k1") == {"category": "String", "value": "Float64", "note": "String"}
+
+
+def test_loader_scans_columnar_copy_of_cached_dataset(http_server, tmp_path):
+    """キャッシュしたデータセットはコンテンツハッシュをキーに変換される"""
+    http_server.files["/data.csv"] = CSV
+    store = ColumnarStore(tmp_path / "columnar")
+    loader = HttpDatasetLoader(
+        cache=DatasetCache(tmp_path / "cache", max_bytes=1024), columnar_store=store
+    )
+
+    result = analyze(loader.load(Dataset(url=http_server.url("data.csv"))))
+
+    assert dict(result.data.sort("category").iter_rows()) == {"a": 4.0, "b": 2.5}
+    assert len(list((tmp_path / "columnar").glob("*.parquet"))) == 1
+
+
+def test_reinfers_schema_when_late_row_does_not_fit(tmp_path):
+    """推論に使った行より後ろにだけ小数がある列は、全行から推論し直して変換する"""
+    csv_path = tmp_path / "data.csv"
+    csv_path.write_text("category,value\n" + "a,1\n" * 50 + "b,2.5\n")
+    store = ColumnarStore(tmp_path / "columnar", infer_schema_length=10)
+
+    df = store.scan(csv_path, "k1").collect()
+
+    assert store.schema_for("k1") == {"category": "String", "value": "Float64"}
+    assert df["value"].sum() == 52.5
+    assert not list((tmp_path / "columnar").glob("*.tmp"))
+
+
+def test_build_loader_passes_store_budget(tmp_path):
+    """COLUMNAR_STORE_MAX_BYTESが列指向ストアの上限になる（0は無制限）"""
+    settings = Settings(
+        s3_bucket="bucket", columnar_cache_dir=str(tmp_path), columnar_store_max_bytes=1024
+    )
+    assert build_loader(settings).columnar_store.max_bytes == 1024
+
+    settings.columnar_store_max_bytes = 0
+    assert build_loader(settings).columnar_store.max_bytes is None
+
+
+def test_eviction_keeps_recently_used_files_and_locks(tmp_path):
+    """猶予時間内に使われた変換済みファイルは上限を超えても削除せず、ロックファイルは常に残す"""
+    csv_path = tmp_path / "data.csv"
+    csv_path.write_bytes(CSV)
+    store = ColumnarStore(tmp_path / "columnar", max_bytes=1, min_retention_seconds=300)
+
+    pending = store.scan(csv_path, "k1")
+    store.scan(csv_path, "k2")
+
+    # scanが返した未実行の計画は、後のscanによる退避の後も実行できる
+    assert pending.collect().equals(pl.read_csv(CSV))
+
+    old = store.path_for("k1").stat().st_mtime - 600
+    os.utime(store.path_for("k1"), (old, old))
+    store.scan(csv_path, "k3")
+
+    assert not store.path_for("k1").exists()
+    assert store.schema_for("k1") is None
+    assert store.path_for("k2").exists()
+    assert sorted(p.name for p in (tmp_path / "columnar").glob("*.lock")) == [
+        "k1.lock",
+        "k2.lock",
+        "k3.lock",
+    ]
@@ -0,0 +1,64 @@
+"""DatasetCacheのテスト"""
+
+import polars as pl
+
+from app.domain.value_object.dataset import Dataset
+from app.infrastructure.loader.dataset_cache import DatasetCache
+from app.infrastructure.loader.http_dataset_loader import HttpDatasetLoader
+
+CSV = b"category,value\na,1\nb,2\na,3\n"
+
+
+def test_fetch_revalidates_with_etag(http_server, tmp_path):
+    """2回目以降は条件付きリクエストの304でローカルコピーを再利用する"""
+    http_server.files["/data.csv"] = CSV
+    cache = DatasetCache(tmp_path, max_bytes=1024)
+
+    first = cache.fetch(http_server.url("data.csv"))
+    second = cache.fetch(http_server.url("data.csv"))
+
+    assert first.path.read_bytes() == CSV
+    assert second == first
+    headers = http_server.requests[-1][2]
+    assert headers["If-None-Match"] == first.etag
+
+
+def test_fetch_replaces_changed_content(http_server, tmp_path):
+    """上流の内容が変わった場合は新しい内容で置き換える"""
+    http_server.files["/data.csv"] = CSV
+    cache = DatasetCache(tmp_path, max_bytes=1024)
+    first = cache.fetch(http_server.url("data.csv"))
+
+    http_server.files["/data.csv"] = CSV + b"c,4\n"
+    second = cache.fetch(http_server.url("data.csv"))
+
+    assert second.digest != first.digest
+    assert not first.path.exists()
+    assert cache.total_bytes() == len(CSV) + 4
+
+
+def test_lru_eviction_respects_budget(http_server, tmp_path):
+    """上限を超えると最終アクセスが古いエントリから退避する"""
+    for name in ("a", "b", "c"):
+        http_server.files[f"/{name}.csv"] = name.encode() * 100
+    cache = DatasetCache(tmp_path, max_bytes=250, min_retention_seconds=0)
+
+    cache.fetch(http_server.url("a.csv"))
+    cache.fetch(http_server.url("b.csv"))
+    cache.fetch(http_server.url("a.csv"))  # aを最近使用にする
+    cache.fetch(http_server.url("c.csv"))
+
+    assert cache.get(http_server.url("a.csv")) is not None
+    assert cache.get(http_server.url("b.csv")) is None
+    assert cache.get(http_server.url("c.csv")) is not None
+    assert cache.total_bytes() <= 250
+
+
+def test_loader_reads_from_cache(http_server, tmp_path):
+    """キャッシュ有効時はローカルファイルからscanする"""
+    http_server.files["/data.csv"] = CSV
+    loader = HttpDatasetLoader(cache=DatasetCache(tmp_path, max_bytes=1024))
+
+    df = loader.load(Dataset(url=http_server.url("data.csv"))).collect()
+
+    assert df.equals(pl.read_csv(CSV))
@@ -0,0 +1,115 @@
+"""hive配置の結果の保存と枝刈り付き読み込みのテスト"""
+
+from datetime import date
+
+import polars as pl
+import pytest
+
+from app.domain.model.analysis_result import AnalysisResult
+from app.domain.value_object.date_range import DateRange
+from app.domain.value_object.target_date import TargetDate
+from app.infrastructure.config.settings import Settings
+from app.infrastructure.k8s.job_launcher import JobLauncher
+from app.infrastructure.k8s.resource_estimator import DEFAULT_JOB_RESOURCES
+from app.infrastructure.repository.s3_result_repository import (
+    S3ResultRepository,
+    category_bucket,
+)
+
+CATEGORIES = [f"c{i}" for i in range(20)]
+
+
+@pytest.fixture
+def repository(tmp_path):
+    settings = Settings(
+        s3_bucket="bucket",
+        local_result_dir=str(tmp_path),
+        result_layout="hive",
+        result_category_buckets=4,
+    )
+    repository = S3ResultRepository(settings)
+    for day in range(1, 4):
+        data = pl.DataFrame({"category": CATEGORIES, "total": [day * 100 + i for i in range(20)]})
+        repository.save(AnalysisResult(data=data), TargetDate(value=date(2024, 1, day)))
+    return repository
+
+
+def test_scan_filters_by_date_and_category(repository):
+    """日付範囲とカテゴリの条件に合う行だけを読み込む"""
+    lf = repository.scan(
+        date_range=DateRange(date(2024, 1, 2), date(2024, 1, 3)), categories=["c1", "c7"]
+    )
+
+    rows = lf.select("date", "category", "total").sort("date", "category").collect().rows()
+    assert rows == [
+        (date(2024, 1, 2), "c1", 201),
+        (date(2024, 1, 2), "c7", 207),
+        (date(2024, 1, 3), "c1", 301),
+        (date(2024, 1, 3), "c7", 307),
+    ]
+
+
+def test_scan_prunes_unmatched_partitions(repository, tmp_path):
+    """条件に合わないパーティションのファイルは開かない"""
+    wanted = category_bucket("c1", 4)
+    # スキーマは先頭のファイルから読むため、先頭以外の対象外ファイルを壊す
+    others = sorted(tmp_path.glob("date=*/category_bucket=*/*.parquet"))[1:]
+    for path in others:
+        if "date=2024-01-01" in str(path) or f"category_bucket={wanted}" not in str(path):
+            path.write_bytes(b"not parquet")
+
+    lf = repository.scan(
+        date_range=DateRange(date(2024, 1, 2), date(2024, 1, 3)), categories=["c1"]
+    )
+
+    assert lf.select("total").collect()["total"].sort().to_list() == [201, 301]
+
+
+def test_rewrite_removes_stale_buckets(repository, tmp_path):
+    """再実行でカテゴリが減った場合、前回の結果の残ったバケットを消す"""
+    target_date = TargetDate(value=date(2024, 1, 1))
+    repository.save(
+        AnalysisResult(data=pl.DataFrame({"category": ["c0"], "total": [1]})), target_date
+    )
+
+    files = list(tmp_path.glob("date=2024-01-01/category_bucket=*/*.parquet"))
+    assert len(files) == 1
+    assert repository.store.exists(repository.result_key(target_date))
+
+
+def test_rewrite_hides_success_marker_until_done(repository):
+    """書き換えの途中は完了マーカーが見えず、全バケットを書いた後に現れる"""
+    target_date = TargetDate(value=date(2024, 1, 1))
+    marker_key = repository.result_key(target_date)
+    store = repository.store
+    put_bytes = store.put_bytes
+    seen = []
+
+    def recording_put(key, data):
+        seen.append((key, store.exists(marker_key)))
+        return put_bytes(key, data)
+
+    store.put_bytes = recording_put
+    data = pl.DataFrame({"category": CATEGORIES, "total": range(20)})
+    repository.save(AnalysisResult(data=data), target_date)
+
+    assert not any(visible for _, visible in seen)
+    assert seen[-1][0] == marker_key
+    assert store.exists(marker_key)
+
+
+def test_job_manifest_forwards_result_layout():
+    """hive配置の設定はJob Podにも渡し、Jobも同じ配置で結果を保存する"""
+    settings = Settings(s3_bucket="bucket", result_layout="hive", result_category_buckets=8)
+
+    manifest = JobLauncher(settings)._create_job_manifest(
+        job_name="analysis-2024-01-01",
+        dataset_url="data.csv",
+        target_date="2024-01-01",
+        image="polars-service:latest",
+        resources=DEFAULT_JOB_RESOURCES,
+    )
+
+    env = manifest["spec"]["template"]["spec"]["containers"][0]["env"]
+    assert {"name": "RESULT_LAYOUT", "value": "hive"} in env
+    assert {"name": "RESULT_CATEGORY_BUCKETS", "value": "8"} in env
@@ -0,0 +1,107 @@
+"""JobInformerのテスト（Watchは偽のイベントソースで代替する）"""
+
+import queue
+import time
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
+from app.infrastructure.k8s.job_informer import JobInformer
+from app.infrastructure.k8s.job_launcher import JobLauncher
+
+
+def make_job(name, resource_version, active=0, succeeded=0, created_minute=0):
+    return SimpleNamespace(
+        metadata=SimpleNamespace(
+            name=name,
+            labels={"app": "polars-analysis"},
+            resource_version=str(resource_version),
+            creation_timestamp=datetime(2024, 1, 1, 0, created_minute, tzinfo=UTC),
+        ),
+        status=SimpleNamespace(
+            succeeded=succeeded,
+            failed=0,
+            active=active,
+            conditions=None,
+            completion_time=None,
+        ),
+    )
+
+
+class FakeSource:
+    """一覧取得とWatchの偽実装"""
+
+    def __init__(self, jobs, resource_version):
+        self.jobs = jobs
+        self.resource_version = resource_version
+        self.events: queue.Queue = queue.Queue()
+        self.list_calls = 0
+        self.watch_versions: list[str] = []
+
+    def list(self):
+        self.list_calls += 1
+        return SimpleNamespace(
+            items=list(self.jobs),
+            metadata=SimpleNamespace(resource_version=str(self.resource_version)),
+        )
+
+    def watch(self, resource_version, timeout_seconds):
+        self.watch_versions.append(resource_version)
+        while True:
+            try:
+                event = self.events.get(timeout=0.05)
+            except queue.Empty:
+                return
+            yield event
+
+
+def test_index_follows_watch_events():
+    """一覧取得後はWatchイベントでインデックスを更新する"""
+    source = FakeSource([make_job("job-a", 1, active=1)], resource_version=1)
+    informer = JobInformer(source.list, source.watch, retry_interval=0.01)
+
+    informer.relist()
+    informer.handle_event({"type": "ADDED", "object": make_job("job-b", 2, active=1)})
+    informer.handle_event({"type": "MODIFIED", "object": make_job("job-a", 3, succeeded=1)})
+    informer.handle_event({"type": "DELETED", "object": make_job("job-b", 4)})
+
+    assert [job.metadata.name for job in informer.list()] == ["job-a"]
+    assert informer.get("job-a").status.succeeded == 1
+    assert informer.resource_version == "4"
+
+
+def test_resumes_from_resource_version_and_relists_on_410():
+    """Watchは最後のresourceVersionから再開し、410の場合は一覧を取り直す"""
+    source = FakeSource([make_job("job-a", 5)], resource_version=5)
+    informer = JobInformer(source.list, source.watch, retry_interval=0.01).start()
+    assert informer.wait_for_sync(timeout=5)
+
+    source.events.put({"type": "ADDED", "object": make_job("job-b", 6)})
+    source.events.put({"type": "ERROR", "object": {"code": 410, "reason": "Expired"}})
+
+    deadline = time.monotonic() + 5
+    while source.list_calls < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    informer.stop()
+
+    assert source.list_calls >= 2
+    assert source.watch_versions[0] == "5"
+
+
+def test_launcher_serves_from_index_without_api_calls():
+    """同期済みのインデックスがあれば一覧・状態照会はAPIを呼ばない"""
+    source = FakeSource(
+        [make_job("job-old", 1, succeeded=1), make_job("job-new", 2, active=1, created_minute=5)],
+        resource_version=2,
+    )
+    informer = JobInformer(source.list, source.watch)
+    informer.relist()
+
+    launcher = JobLauncher()
+    launcher._informer = informer
+
+    jobs = launcher.list_jobs()
+    assert [job["job_id"] for job in jobs] == ["job-new", "job-old"]
+    assert launcher.get_job_status("job-new")["status"] == "running"
+    assert launcher.get_job_status("missing")["status"] == "not_found"
+    assert launcher.list_jobs("app in (polars-analysis)") == []  # インデックスで評価できない
+    assert source.list_calls == 1
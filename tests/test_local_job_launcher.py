@@ -0,0 +1,192 @@
+"""LocalJobLauncherとJobDispatcherのテスト"""
+
+import time
+
+import polars as pl
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.infrastructure.queue.job_backend import JobAlreadyExistsError
+from app.infrastructure.queue.job_dispatcher import JobDispatcher
+from app.infrastructure.queue.local_job_launcher import LocalJobLauncher
+from app.infrastructure.queue.sqlite_job_queue import SqliteJobQueue
+from app.interface.api.analysis_controller import get_job_launcher, router
+
+
+def wait_for(launcher, job_id, timeout=60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = launcher.get_job_status(job_id)
+        if status["status"] in ("completed", "failed"):
+            return status
+        time.sleep(0.1)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_runs_job_in_worker_process(tmp_path, monkeypatch):
+    """投入したジョブがワーカープロセスで実行され、結果が記録される"""
+    monkeypatch.setenv("LOCAL_RESULT_DIR", str(tmp_path / "results"))
+    csv_path = tmp_path / "data.csv"
+    pl.DataFrame({"category": ["a", "b", "a"], "value": [1, 2, 3]}).write_csv(csv_path)
+
+    launcher = LocalJobLauncher(tmp_path / "jobs.db", max_workers=1, poll_interval=0.05).start()
+    try:
+        launcher.launch_job("analysis-2024-01-01", str(csv_path), "2024-01-01")
+        status = wait_for(launcher, "analysis-2024-01-01")
+    finally:
+        launcher.stop()
+
+    assert status["status"] == "completed", status["message"]
+    assert status["backend"] == "local"
+    result = pl.read_parquet(tmp_path / "results" / "2024-01-01" / "result.parquet")
+    assert dict(result.sort("category").iter_rows()) == {"a": 4, "b": 2}
+    assert [job["job_id"] for job in launcher.list_jobs()] == ["analysis-2024-01-01"]
+
+
+def test_queue_survives_restart(tmp_path):
+    """リースが切れた実行中のジョブ（停止したプロセスのジョブ）は待機中へ戻る"""
+    queue = SqliteJobQueue(tmp_path / "jobs.db")
+    queue.enqueue("job-1", "data.csv", "2024-01-01")
+    assert queue.claim(owner="crashed", lease_seconds=30).status == "running"
+    assert queue.claim() is None
+
+    restarted = SqliteJobQueue(tmp_path / "jobs.db")
+    assert restarted.requeue_expired() == 0
+    assert restarted.requeue_expired(now=time.time() + 60) == 1
+    assert restarted.claim().job_id == "job-1"
+
+
+def test_start_does_not_requeue_jobs_of_live_process(tmp_path):
+    """他のプロセスがリースを延長しているジョブは、別のランチャーの起動時に再投入しない"""
+    queue = SqliteJobQueue(tmp_path / "jobs.db")
+    queue.enqueue("job-1", "data.csv", "2024-01-01")
+    queue.claim(owner="other-worker", lease_seconds=30)
+
+    launcher = LocalJobLauncher(tmp_path / "jobs.db", max_workers=1, poll_interval=0.05).start()
+    try:
+        time.sleep(0.2)
+        job = queue.get("job-1")
+    finally:
+        launcher.stop()
+
+    assert (job.status, job.owner, job.attempts) == ("running", "other-worker", 1)
+    assert queue.renew("other-worker", lease_seconds=30) == 1
+
+
+def test_runs_sharded_job_in_worker_process(tmp_path, monkeypatch):
+    """分割実行のジョブはワーカープロセス内でマップとマージを行い、シャードの部分集計を残さない"""
+    monkeypatch.setenv("LOCAL_RESULT_DIR", str(tmp_path / "results"))
+    csv_path = tmp_path / "data.csv"
+    pl.DataFrame({"category": ["a", "b", "a"] * 50, "value": list(range(150))}).write_csv(csv_path)
+
+    launcher = LocalJobLauncher(tmp_path / "jobs.db", max_workers=1, poll_interval=0.05).start()
+    try:
+        launcher.launch_sharded_job("analysis-2024-01-01-sharded", str(csv_path), "2024-01-01", 3)
+        status = wait_for(launcher, "analysis-2024-01-01-sharded")
+    finally:
+        launcher.stop()
+
+    assert status["status"] == "completed", status["message"]
+    result = pl.read_parquet(tmp_path / "results" / "2024-01-01" / "result.parquet")
+    expected = pl.read_csv(csv_path).group_by("category").agg(pl.sum("value"))
+    assert dict(result.iter_rows()) == dict(expected.iter_rows())
+    assert not list((tmp_path / "results" / "2024-01-01").rglob("part-*.parquet"))
+
+
+class RecordingLauncher:
+    """launch_job・launch_sharded_jobの呼び出しを記録する起動器"""
+
+    def __init__(self):
+        self.launched = []
+        self.probes = []
+
+    def launch_job(
+        self,
+        job_name,
+        dataset_url,
+        target_date,
+        image="",
+        force=False,
+        aggregation=None,
+        probe=None,
+    ):
+        self.launched.append(job_name)
+        self.probes.append(probe)
+        return job_name
+
+    def launch_sharded_job(
+        self, job_name, dataset_url, target_date, shards, parallelism=None, image=""
+    ):
+        self.launched.append(f"{job_name}/{shards}")
+        return job_name
+
+    def has_job(self, job_id):
+        return job_id in self.launched
+
+
+def test_dispatcher_routes_by_dataset_size():
+    """小さいデータセットはローカル、大きい・不明なデータセットはK8sへ振り分ける"""
+    sizes = {"small.csv": 10, "large.csv": 10_000, "unknown.csv": None}
+    k8s, local = RecordingLauncher(), RecordingLauncher()
+    dispatcher = JobDispatcher(k8s, local, local_max_bytes=1_000, size_probe=sizes.get)
+
+    for name in sizes:
+        dispatcher.launch_job(name, name, "2024-01-01")
+
+    assert local.launched == ["small.csv"]
+    assert k8s.launched == ["large.csv", "unknown.csv"]
+    # 判定に使ったサイズをK8s側のリソースの見積もりへ渡す（取得できなかった場合もHEADし直さない）
+    assert [probe.size for probe in k8s.probes] == [10_000, None]
+
+
+def test_dispatcher_routes_sharded_jobs_by_dataset_size():
+    """分割実行も小さいデータセットはローカル、大きい・不明なデータセットはK8sへ振り分ける"""
+    sizes = {"small.csv": 10, "large.csv": 10_000, "unknown.csv": None}
+    k8s, local = RecordingLauncher(), RecordingLauncher()
+    dispatcher = JobDispatcher(k8s, local, local_max_bytes=1_000, size_probe=sizes.get)
+
+    for name in sizes:
+        dispatcher.launch_sharded_job(name, name, "2024-01-01", shards=4)
+
+    assert local.launched == ["small.csv/4"]
+    assert k8s.launched == ["large.csv/4", "unknown.csv/4"]
+
+
+def test_complete_ignores_worker_that_lost_its_lease(tmp_path):
+    """リースが切れた後に終わった古い実行は、取り出し直した新しい実行の状態を上書きしない"""
+    queue = SqliteJobQueue(tmp_path / "jobs.db")
+    queue.enqueue("job-1", "data.csv", "2024-01-01")
+    queue.claim(owner="stale", lease_seconds=30)
+    queue.requeue_expired(now=time.time() + 60)
+    queue.claim(owner="current", lease_seconds=30)
+
+    assert not queue.complete("job-1", False, message="stale result", owner="stale")
+    assert queue.get("job-1").status == "running"
+
+    assert queue.complete("job-1", True, result_path="result.parquet", owner="current")
+    job = queue.get("job-1")
+    assert (job.status, job.result_path) == ("completed", "result.parquet")
+
+
+def test_launcher_rejects_duplicates_and_reports_deletes(tmp_path):
+    """未完了の同名ジョブは起動せずに409を返し、削除は存在したジョブだけTrueを返す"""
+    launcher = LocalJobLauncher(tmp_path / "jobs.db", max_workers=1)
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_job_launcher] = lambda: launcher
+    client = TestClient(app)
+    body = {"dataset_url": "data.csv", "target_date": "2024-01-01"}
+
+    assert client.post("/analysis/jobs", json=body).status_code == 200
+    duplicate = client.post("/analysis/jobs", json=body)
+    assert duplicate.status_code == 409
+    with pytest.raises(JobAlreadyExistsError):
+        launcher.launch_job("analysis-2024-01-01", "data.csv", "2024-01-01")
+
+    # K8sのIndexed Jobと同じシャード数の検証を行う
+    with pytest.raises(ValueError):
+        launcher.launch_sharded_job("sharded-1", "data.csv", "2024-01-01", shards=1)
+
+    assert launcher.delete_job("analysis-2024-01-01")
+    assert not launcher.delete_job("missing")
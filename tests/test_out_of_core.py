@@ -0,0 +1,226 @@
+"""チャンク単位の集計（メモリの上限と退避）のテスト"""
+
+import logging
+import time
+from contextlib import contextmanager
+from datetime import date
+
+import polars as pl
+import pytest
+
+from app.domain.service.partial_aggregate import build_partial_plan
+from app.domain.value_object.aggregation_spec import AggregationSpec
+from app.domain.value_object.dataset import Dataset
+from app.domain.value_object.sketch_spec import SketchSpec
+from app.domain.value_object.target_date import TargetDate
+from app.infrastructure.config.settings import Settings
+from app.infrastructure.executor.spilling_aggregator import SpillingAggregator
+from app.infrastructure.k8s.job_launcher import JobLauncher
+from app.infrastructure.k8s.resource_estimator import DEFAULT_JOB_RESOURCES
+from app.infrastructure.loader.http_dataset_loader import HttpDatasetLoader
+from app.infrastructure.repository.s3_partial_aggregate_repository import (
+    S3PartialAggregateRepository,
+)
+from app.infrastructure.repository.s3_result_repository import S3ResultRepository
+from app.infrastructure.repository.s3_sketch_repository import S3SketchRepository
+from app.usecase.dto.run_analysis_input import RunAnalysisInput
+from app.usecase.interactor.run_analysis_interactor import RunAnalysisInteractor
+from app.wiring import build_chunked_aggregator
+
+TARGET_DATE = TargetDate(value=date(2024, 1, 1))
+
+
+class FailingAggregator(SpillingAggregator):
+    """チャンク単位の集計が使われた場合に失敗する集計器"""
+
+    def aggregate(self, lf):
+        raise AssertionError("this run must use the single-plan path")
+
+
+class SlowAggregator(SpillingAggregator):
+    """チャンク単位の集計に時間がかかる集計器"""
+
+    @contextmanager
+    def aggregate(self, lf):
+        time.sleep(0.3)
+        with super().aggregate(lf) as aggregated:
+            yield aggregated
+
+
+def _frame(rows: int, categories: int) -> pl.DataFrame:
+    index = pl.int_range(rows, dtype=pl.Int64)
+    return pl.select(
+        (index * 7 % categories).cast(pl.String).alias("category"),
+        (index % 101 - 50).alias("value"),
+        pl.lit("unused").alias("note"),
+    )
+
+
+def test_spilled_partials_match_single_pass(tmp_path, caplog):
+    """退避しながらチャンク単位で求めた部分集計は1回で求めた部分集計と一致し、退避ファイルは後で消える"""
+    df = _frame(50_000, categories=2_000)
+    aggregator = SpillingAggregator(memory_budget=64 * 1024, chunk_rows=5_000, spill_dir=tmp_path)
+
+    with caplog.at_level(logging.INFO), aggregator.aggregate(df.lazy()) as aggregated:
+        merged = aggregated.plan.sort("category").collect()
+
+    assert merged.equals(build_partial_plan(df.lazy()).sort("category").collect())
+    assert (aggregated.rows_in, aggregated.chunks) == (50_000, 10)
+    assert "Aggregated 10 chunks" in caplog.text
+    assert "into 1 spill files" not in caplog.text
+    # 退避したファイルはコンテキストを抜けると削除される
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_empty_input_yields_empty_partial():
+    """空の入力からは列のそろった空の部分集計を返す"""
+    with SpillingAggregator(memory_budget=1024).aggregate(_frame(0, 1).lazy()) as aggregated:
+        merged = aggregated.plan.collect()
+
+    assert aggregated.rows_in == 0
+    assert merged.height == 0
+    assert merged.columns == ["category", "sum", "count", "min", "max"]
+
+
+@pytest.mark.parametrize("layout", ["single", "hive"])
+def test_interactor_results_match_in_memory_run(tmp_path, layout):
+    """チャンク単位の実行はメモリ上の実行と同じ結果・部分集計を保存し、行数を記録する"""
+    csv_path = tmp_path / "data.csv"
+    _frame(30_000, categories=500).write_csv(csv_path)
+    request = RunAnalysisInput(dataset=Dataset(url=str(csv_path)), target_date=TARGET_DATE)
+
+    outputs = {}
+    for mode, aggregator in [
+        ("in_memory", None),
+        ("out_of_core", SpillingAggregator(memory_budget=16 * 1024, chunk_rows=4_000)),
+    ]:
+        settings = Settings(
+            s3_bucket="bucket", local_result_dir=str(tmp_path / mode), result_layout=layout
+        )
+        interactor = RunAnalysisInteractor(
+            loader=HttpDatasetLoader(),
+            repository=S3ResultRepository(settings),
+            partial_repository=S3PartialAggregateRepository(settings),
+            chunked_aggregator=aggregator,
+        )
+        output = interactor.run(request)
+        assert output.success, output.message
+        outputs[mode] = (
+            S3ResultRepository(settings).load(TARGET_DATE).sort("category"),
+            S3PartialAggregateRepository(settings).load(TARGET_DATE).sort("category").collect(),
+            {metrics.stage: metrics for metrics in output.metrics},
+        )
+
+    in_memory, out_of_core = outputs["in_memory"], outputs["out_of_core"]
+    assert out_of_core[0].equals(in_memory[0])
+    assert out_of_core[1].equals(in_memory[1])
+    assert out_of_core[2]["analyze"].rows_in == 30_000
+    assert out_of_core[2]["analyze"].rows_out == 500
+
+
+def test_analyze_stage_times_chunked_aggregation(tmp_path):
+    """チャンクの読み込み・部分集計・退避にかかった時間はanalyzeステージに計上する"""
+    csv_path = tmp_path / "data.csv"
+    _frame(1_000, categories=10).write_csv(csv_path)
+    interactor = RunAnalysisInteractor(
+        loader=HttpDatasetLoader(),
+        repository=S3ResultRepository(
+            Settings(s3_bucket="bucket", local_result_dir=str(tmp_path / "results"))
+        ),
+        chunked_aggregator=SlowAggregator(memory_budget=16 * 1024),
+    )
+
+    output = interactor.run(
+        RunAnalysisInput(dataset=Dataset(url=str(csv_path)), target_date=TARGET_DATE)
+    )
+
+    assert output.success, output.message
+    stages = {metrics.stage: metrics for metrics in output.metrics}
+    assert stages["analyze"].wall_seconds >= 0.3
+    assert stages["analyze"].rows_in == 1_000
+
+
+def test_custom_aggregation_uses_single_plan(tmp_path):
+    """集計仕様のある実行はチャンク単位の集計を使わない"""
+    csv_path = tmp_path / "data.csv"
+    _frame(1_000, categories=10).write_csv(csv_path)
+
+    settings = Settings(s3_bucket="bucket", local_result_dir=str(tmp_path / "results"))
+    interactor = RunAnalysisInteractor(
+        loader=HttpDatasetLoader(),
+        repository=S3ResultRepository(settings),
+        chunked_aggregator=FailingAggregator(memory_budget=1024),
+    )
+    spec = AggregationSpec.from_dict({"metrics": [{"function": "len"}]})
+    output = interactor.run(
+        RunAnalysisInput(
+            dataset=Dataset(url=str(csv_path)), target_date=TARGET_DATE, aggregation=spec
+        )
+    )
+
+    assert output.success, output.message
+
+
+def test_job_manifest_sets_budget_and_does_not_retry_oom():
+    """割合を設定した場合、Jobにメモリの上限を渡し、メモリ不足で終了したPodは再試行しない"""
+    launcher = JobLauncher(Settings(s3_bucket="bucket", job_memory_budget_fraction=0.5))
+
+    manifest = launcher._create_job_manifest(
+        job_name="analysis-2024-01-01",
+        dataset_url="data.csv",
+        target_date="2024-01-01",
+        image="polars-service:latest",
+    )
+
+    env = {
+        var["name"]: var["value"]
+        for var in manifest["spec"]["template"]["spec"]["containers"][0]["env"]
+    }
+    assert int(env["ANALYSIS_MEMORY_BUDGET_BYTES"]) == DEFAULT_JOB_RESOURCES.memory_limit // 2
+    [rule] = manifest["spec"]["podFailurePolicy"]["rules"]
+    assert rule["action"] == "FailJob"
+    assert rule["onExitCodes"]["values"] == [137]
+
+    settings = Settings(
+        s3_bucket="bucket", analysis_memory_budget_bytes=int(env["ANALYSIS_MEMORY_BUDGET_BYTES"])
+    )
+    assert (
+        build_chunked_aggregator(settings).memory_budget == DEFAULT_JOB_RESOURCES.memory_limit // 2
+    )
+    assert build_chunked_aggregator(Settings(s3_bucket="bucket")) is None
+
+
+def test_job_budget_is_opt_in():
+    """割合を設定しない場合、JobにはANALYSIS_MEMORY_BUDGET_BYTESを渡さない"""
+    manifest = JobLauncher(Settings(s3_bucket="bucket"))._create_job_manifest(
+        job_name="analysis-2024-01-01",
+        dataset_url="data.csv",
+        target_date="2024-01-01",
+        image="polars-service:latest",
+    )
+
+    env = manifest["spec"]["template"]["spec"]["containers"][0]["env"]
+    assert "ANALYSIS_MEMORY_BUDGET_BYTES" not in {var["name"] for var in env}
+
+
+def test_sketches_use_single_plan_even_with_budget(tmp_path):
+    """スケッチを作る設定の場合は、メモリの上限があっても1つの計画で集計してスケッチを保存する"""
+    csv_path = tmp_path / "data.csv"
+    _frame(1_000, categories=10).write_csv(csv_path)
+    settings = Settings(s3_bucket="bucket", local_result_dir=str(tmp_path / "results"))
+    sketch_spec = SketchSpec()
+    sketches = S3SketchRepository(settings)
+    interactor = RunAnalysisInteractor(
+        loader=HttpDatasetLoader(),
+        repository=S3ResultRepository(settings),
+        sketch_spec=sketch_spec,
+        sketch_repository=sketches,
+        chunked_aggregator=FailingAggregator(memory_budget=1024),
+    )
+
+    output = interactor.run(
+        RunAnalysisInput(dataset=Dataset(url=str(csv_path)), target_date=TARGET_DATE)
+    )
+
+    assert output.success, output.message
+    assert sketches.load(TARGET_DATE, sketch_spec) is not None
@@ -0,0 +1,98 @@
+"""RangedDownloaderのテスト"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import polars as pl
+
+from app.domain.value_object.dataset import Dataset
+from app.infrastructure.loader.dataset_cache import DatasetCache
+from app.infrastructure.loader.http_dataset_loader import HttpDatasetLoader
+from app.infrastructure.loader.ranged_downloader import RangedDownloader
+
+CSV = b"category,value\n" + b"".join(f"c{i % 7},{i}\n".encode() for i in range(2000))
+
+
+def test_parallel_ranged_download(http_server, tmp_path):
+    """Range対応サーバーからはパートに分割して並列取得する"""
+    http_server.files["/data.csv"] = CSV
+    downloader = RangedDownloader(max_workers=4, part_size=1000)
+
+    result = downloader.download(http_server.url("data.csv"), tmp_path / "out.csv")
+
+    assert result.ranged
+    assert (tmp_path / "out.csv").read_bytes() == CSV
+    ranged_gets = [h for m, _, h in http_server.requests if m == "GET" and "Range" in h]
+    assert len(ranged_gets) == -(-len(CSV) // 1000)
+
+
+def test_falls_back_to_single_stream_without_ranges(http_server, tmp_path):
+    """Range非対応のサーバーでは単一ストリームで取得する"""
+    http_server.files["/data.csv"] = CSV
+    http_server.accept_ranges = False
+    downloader = RangedDownloader(max_workers=4, part_size=1000)
+
+    result = downloader.download(http_server.url("data.csv"), tmp_path / "out.csv")
+
+    assert not result.ranged
+    assert (tmp_path / "out.csv").read_bytes() == CSV
+    assert http_server.count("GET", "data.csv") == 1
+
+
+def test_cache_uses_ranged_downloader_and_revalidates(http_server, tmp_path):
+    """キャッシュ経由でも並列取得し、2回目はHEADの304で再利用する"""
+    http_server.files["/data.csv"] = CSV
+    cache = DatasetCache(
+        tmp_path, max_bytes=len(CSV) * 2, downloader=RangedDownloader(4, part_size=1000)
+    )
+    loader = HttpDatasetLoader(cache=cache)
+    dataset = Dataset(url=http_server.url("data.csv"))
+
+    first = loader.load(dataset).collect()
+    gets = http_server.count("GET", "data.csv")
+    second = loader.load(dataset).collect()
+
+    assert first.equals(pl.read_csv(CSV))
+    assert second.equals(first)
+    assert http_server.count("GET", "data.csv") == gets
+
+
+def test_loader_downloads_without_cache(http_server, tmp_path):
+    """キャッシュ無しでもダウンロード先ディレクトリ経由で読み込める"""
+    http_server.files["/data.csv"] = CSV
+    loader = HttpDatasetLoader(
+        downloader=RangedDownloader(max_workers=2, part_size=4096), download_dir=tmp_path
+    )
+
+    df = loader.load(Dataset(url=http_server.url("data.csv"))).collect()
+
+    assert df.equals(pl.read_csv(CSV))
+
+
+def test_concurrent_downloads_of_same_url_do_not_collide(http_server, tmp_path):
+    """同じURLを複数のスレッドで同時に取得しても、一時ファイルを共有しない"""
+    http_server.files["/data.csv"] = CSV
+    loader = HttpDatasetLoader(
+        downloader=RangedDownloader(max_workers=2, part_size=4096), download_dir=tmp_path
+    )
+    dataset = Dataset(url=http_server.url("data.csv"))
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        frames = list(pool.map(lambda _: loader.load(dataset).collect(), range(4)))
+
+    assert all(df.equals(pl.read_csv(CSV)) for df in frames)
+    assert not list(tmp_path.glob("*.part"))
+
+
+def test_eager_load_removes_download(http_server, tmp_path):
+    """eagerモードでは読み込み後にダウンロードしたファイルを削除する"""
+    http_server.files["/data.csv"] = CSV
+    loader = HttpDatasetLoader(
+        mode="eager",
+        downloader=RangedDownloader(max_workers=2, part_size=4096),
+        download_dir=tmp_path,
+    )
+
+    df = loader.load(Dataset(url=http_server.url("data.csv"))).collect()
+
+    assert df.equals(pl.read_csv(CSV))
+    assert not list(tmp_path.iterdir())
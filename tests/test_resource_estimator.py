@@ -0,0 +1,108 @@
+"""ResourceEstimatorのテスト"""
+
+from app.infrastructure.config.settings import Settings
+from app.infrastructure.k8s.job_launcher import JobLauncher
+from app.infrastructure.k8s.resource_estimator import (
+    DEFAULT_JOB_RESOURCES,
+    GiB,
+    MiB,
+    ResourceEstimator,
+)
+from app.infrastructure.k8s.resource_usage_history import ResourceUsageHistory
+from app.usecase.dto.dataset_probe import DatasetProbe
+
+
+def test_estimate_scales_with_dataset_size():
+    """履歴が無い場合はデータセットのサイズに比例して見積もり、下限で切り上げる"""
+    sizes = {"small.csv": 10 * MiB, "large.csv": 4 * GiB}
+    estimator = ResourceEstimator(size_probe=sizes.get, headroom=1.5, max_memory=64 * GiB)
+
+    small = estimator.estimate("small.csv")
+    large = estimator.estimate("large.csv")
+
+    assert small.memory_request == 256 * MiB  # 下限で切り上げ
+    assert large.memory_request == int(4 * GiB * 2.0 * 1.5)
+    assert large.memory_limit > large.memory_request
+    assert large.cpu_request_millis > small.cpu_request_millis
+
+
+def test_estimate_prefers_recorded_peak_and_respects_ceiling(tmp_path):
+    """記録済みのピークメモリをサイズより優先し、上限値で頭打ちにする"""
+    history = ResourceUsageHistory(Settings(s3_bucket="bucket", local_result_dir=str(tmp_path)))
+    history.record("data.csv", 1 * GiB)
+    estimator = ResourceEstimator(
+        size_probe=lambda url: 100 * GiB, history=history, headroom=2.0, max_memory=3 * GiB
+    )
+
+    resources = estimator.estimate("data.csv")
+
+    assert resources.memory_request == 2 * GiB
+    # 上限はmax_memoryで頭打ち
+    assert resources.memory_limit == 3 * GiB
+    assert resources.cpu_limit_millis == 4000
+
+
+def test_estimate_falls_back_to_defaults_without_information():
+    """サイズも履歴も無い場合は既定のリソースを使う"""
+    estimator = ResourceEstimator(size_probe=lambda url: None)
+
+    assert estimator.estimate("unknown.csv") == DEFAULT_JOB_RESOURCES
+
+
+def test_estimate_uses_probed_size_without_probing_again():
+    """取得済みのメタ情報がある場合はそのサイズで見積もり、データセットをHEADし直さない"""
+    probed = []
+    estimator = ResourceEstimator(size_probe=probed.append, headroom=1.0, max_memory=64 * GiB)
+
+    resources = estimator.estimate("data.csv", DatasetProbe(size=4 * GiB))
+
+    assert resources.memory_request == 8 * GiB
+    assert estimator.estimate("data.csv", DatasetProbe()) == DEFAULT_JOB_RESOURCES
+    assert probed == []
+
+
+def test_manifest_uses_estimated_resources():
+    """見積もったリソースがJobマニフェストのrequests・limitsになる"""
+    launcher = JobLauncher(
+        resource_estimator=ResourceEstimator(size_probe=lambda url: 1 * GiB, headroom=1.0)
+    )
+
+    manifest = launcher._create_job_manifest(
+        job_name="analysis-2024-01-01",
+        dataset_url="data.csv",
+        target_date="2024-01-01",
+        image="polars-service:latest",
+        resources=launcher._estimate_resources("data.csv"),
+    )
+
+    container = manifest["spec"]["template"]["spec"]["containers"][0]
+    assert container["resources"]["requests"] == {"memory": "2048Mi", "cpu": "500m"}
+    assert container["resources"]["limits"] == {"memory": "2048Mi", "cpu": "1000m"}
+
+
+def test_history_recorded_by_job_is_shared_through_result_store(tmp_path):
+    """Job Podが記録した履歴を、同じ結果の保存先を使うAPI側の別インスタンスが読める"""
+    settings = Settings(s3_bucket="bucket", local_result_dir=str(tmp_path))
+    ResourceUsageHistory(settings).record("https://example.com/data.csv", 3 * GiB)
+
+    api_side = ResourceUsageHistory(settings)
+
+    assert api_side.peak_bytes("https://example.com/data.csv") == 3 * GiB
+    assert api_side.peak_bytes("https://example.com/other.csv") is None
+    assert [p.parent.name for p in tmp_path.rglob("*.json")] == ["resource-history"]
+
+
+def test_manifest_enables_history_in_job_pods():
+    """履歴を有効にした場合、Job Podにも記録させる"""
+    launcher = JobLauncher(Settings(s3_bucket="bucket", job_resource_history=True))
+
+    manifest = launcher._create_job_manifest(
+        job_name="analysis-2024-01-01",
+        dataset_url="data.csv",
+        target_date="2024-01-01",
+        image="polars-service:latest",
+        resources=DEFAULT_JOB_RESOURCES,
+    )
+
+    env = manifest["spec"]["template"]["spec"]["containers"][0]["env"]
+    assert {"name": "JOB_RESOURCE_HISTORY", "value": "true"} in env
@@ -0,0 +1,102 @@
+"""結果取得APIと結果キャッシュのテスト"""
+
+import io
+import json
+from datetime import date
+
+import polars as pl
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.domain.model.analysis_result import AnalysisResult
+from app.domain.value_object.target_date import TargetDate
+from app.infrastructure.config.settings import Settings
+from app.infrastructure.repository.cached_result_repository import CachedResultRepository
+from app.infrastructure.repository.s3_result_repository import S3ResultRepository
+from app.interface.api.analysis_controller import get_result_usecase, router
+from app.interface.presenter.result_stream import (
+    ARROW_STREAM,
+    JSON,
+    NDJSON,
+    iter_body,
+    negotiate,
+)
+from app.usecase.interactor.get_result_interactor import GetResultInteractor
+
+DATA = pl.DataFrame(
+    {"category": [f"c{i}" for i in range(25)], "total": list(range(25))},
+    schema_overrides={"category": pl.Categorical},
+)
+
+
+@pytest.fixture
+def repository(tmp_path):
+    settings = Settings(s3_bucket="bucket", local_result_dir=str(tmp_path))
+    repository = S3ResultRepository(settings)
+    repository.save(AnalysisResult(data=DATA), TargetDate(value=date(2024, 1, 1)))
+    return repository
+
+
+@pytest.fixture
+def client(repository, monkeypatch):
+    # 複数のレコードバッチに分かれることを確認するため、1回に書き出す行数を小さくする
+    monkeypatch.setattr(
+        "app.interface.api.analysis_controller.iter_body",
+        lambda df, media_type: iter_body(df, media_type, batch_rows=10),
+    )
+    app = FastAPI()
+    app.include_router(router)
+    usecase = GetResultInteractor(CachedResultRepository(repository))
+    app.dependency_overrides[get_result_usecase] = lambda: usecase
+    return TestClient(app)
+
+
+def test_negotiate():
+    """Acceptヘッダーから返す形式を選び、対応していない形式ではJSONにする"""
+    assert negotiate(None) == JSON
+    assert negotiate("application/vnd.apache.arrow.stream") == ARROW_STREAM
+    assert negotiate("application/json;q=0.5, application/x-ndjson") == NDJSON
+    assert negotiate("text/html") == JSON
+
+
+@pytest.mark.parametrize("accept", [ARROW_STREAM, NDJSON, JSON])
+def test_result_formats_round_trip(client, accept):
+    """どの形式で返しても保存済みの結果と同じ内容に戻せる"""
+    response = client.get("/analysis/results/2024-01-01", headers={"Accept": accept})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith(accept)
+    if accept == ARROW_STREAM:
+        assert pl.read_ipc_stream(io.BytesIO(response.content)).equals(DATA)
+    elif accept == NDJSON:
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert rows == DATA.cast({"category": pl.String}).to_dicts()
+    else:
+        assert response.json() == DATA.cast({"category": pl.String}).to_dicts()
+
+
+def test_missing_result_is_404(client):
+    """保存されていない日付の結果は404になる"""
+    assert client.get("/analysis/results/2024-02-01").status_code == 404
+
+
+def test_cache_is_bounded_and_invalidated_on_save(repository):
+    """キャッシュは上限を超えると古い結果から破棄し、保存すると同じ日付の結果を破棄する"""
+    cached = CachedResultRepository(repository, max_bytes=DATA.estimated_size())
+    target_date = TargetDate(value=date(2024, 1, 1))
+    other_date = TargetDate(value=date(2024, 1, 2))
+    repository.save(AnalysisResult(data=DATA), other_date)
+
+    cached.load(target_date)
+    cached.load(target_date)
+    assert (cached.hits, cached.misses) == (1, 1)
+
+    # 上限を超えると古い結果から破棄される
+    cached.load(other_date)
+    cached.load(target_date)
+    assert cached.misses == 3
+
+    updated = DATA.with_columns(pl.col("total") * 2)
+    cached.save(AnalysisResult(data=updated), target_date)
+    assert cached.load(target_date).equals(updated)
@@ -0,0 +1,120 @@
+"""日付範囲の結果集計APIのテスト"""
+
+import json
+from datetime import date
+
+import polars as pl
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.domain.model.analysis_result import AnalysisResult
+from app.domain.value_object.date_range import DateRange
+from app.domain.value_object.target_date import TargetDate
+from app.infrastructure.config.settings import Settings
+from app.infrastructure.repository.cached_result_repository import CachedResultRepository
+from app.infrastructure.repository.s3_result_repository import S3ResultRepository
+from app.interface.api.analysis_controller import (
+    get_result_usecase,
+    get_run_executor,
+    router,
+)
+from app.interface.api.run_executor import BoundedRunExecutor
+from app.usecase.interactor.get_result_interactor import GetResultInteractor
+
+
+@pytest.fixture(params=["single", "hive"])
+def repository(request, tmp_path):
+    settings = Settings(
+        s3_bucket="bucket",
+        local_result_dir=str(tmp_path),
+        result_layout=request.param,
+        result_category_buckets=4,
+    )
+    repository = S3ResultRepository(settings)
+    for day in (1, 2, 3, 5):
+        data = pl.DataFrame({"category": ["a", "b", "c"], "total": [day, day * 10, day * 100]})
+        repository.save(AnalysisResult(data=data), TargetDate(value=date(2024, 1, day)))
+    return repository
+
+
+@pytest.fixture
+def client(repository):
+    app = FastAPI()
+    app.include_router(router)
+    usecase = GetResultInteractor(CachedResultRepository(repository))
+    executor = BoundedRunExecutor(max_concurrency=1, max_queue=1)
+    app.dependency_overrides[get_result_usecase] = lambda: usecase
+    app.dependency_overrides[get_run_executor] = lambda: executor
+    return TestClient(app)
+
+
+def test_scan_reads_only_dates_in_range(repository):
+    """範囲内の日付・指定したカテゴリの結果だけを読み込む"""
+    lf = repository.scan(DateRange(date(2024, 1, 2), date(2024, 1, 4)), categories=["b"])
+
+    rows = lf.select("date", "category", "total").sort("date").collect().rows()
+    assert rows == [(date(2024, 1, 2), "b", 20), (date(2024, 1, 3), "b", 30)]
+
+
+def test_scan_returns_none_without_results(repository):
+    """範囲内に結果が無い場合はNoneを返す"""
+    assert repository.scan(DateRange(date(2023, 1, 1), date(2023, 12, 31))) is None
+
+
+def test_query_totals_over_range(client):
+    """範囲内の結果をカテゴリごとに合計して返す"""
+    response = client.get(
+        "/analysis/results",
+        params={"from": "2024-01-01", "to": "2024-01-31", "category": ["a", "c"]},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == [
+        {"category": "a", "total": 11},
+        {"category": "c", "total": 1100},
+    ]
+
+
+def test_query_daily(client):
+    """dailyを指定すると日付ごとの結果を返す"""
+    response = client.get(
+        "/analysis/results",
+        params={"from": "2024-01-02", "to": "2024-01-03", "category": "a", "daily": "true"},
+        headers={"Accept": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines == [
+        {"date": "2024-01-02", "category": "a", "total": 2},
+        {"date": "2024-01-03", "category": "a", "total": 3},
+    ]
+
+
+def test_query_missing_range_and_bad_dates(client):
+    """結果の無い範囲は404、不正な日付や逆順の範囲は400になる"""
+    assert client.get("/analysis/results?from=2023-01-01&to=2023-01-31").status_code == 404
+    assert client.get("/analysis/results?from=2024-01-31&to=2024-01-01").status_code == 400
+    assert client.get("/analysis/results?from=bad&to=2024-01-01").status_code == 400
+
+
+def test_scan_across_years_lists_only_months_in_range(repository):
+    """年をまたぐ範囲でも保存先全体ではなく範囲内の年月だけを一覧する"""
+    repository.save(
+        AnalysisResult(data=pl.DataFrame({"category": ["a"], "total": [7]})),
+        TargetDate(value=date(2023, 12, 31)),
+    )
+    store = repository.store
+    list_keys = store.list_keys
+    prefixes = []
+
+    def recording_list_keys(prefix):
+        prefixes.append(prefix)
+        return list_keys(prefix)
+
+    store.list_keys = recording_list_keys
+    lf = repository.scan(DateRange(date(2023, 12, 31), date(2024, 1, 2)), categories=["a"])
+
+    assert lf.select("total").collect()["total"].sort().to_list() == [1, 2, 7]
+    assert [p.removeprefix("date=") for p in prefixes] == ["2023-12-", "2024-01-"]
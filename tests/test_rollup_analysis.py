@@ -0,0 +1,97 @@
+"""部分集計とロールアップのテスト"""
+
+from datetime import date
+
+import polars as pl
+import pytest
+
+from app.domain.service.analyze_service import analyze
+from app.domain.value_object.dataset import Dataset
+from app.domain.value_object.date_range import DateRange
+from app.domain.value_object.target_date import TargetDate
+from app.infrastructure.config.settings import Settings
+from app.infrastructure.loader.http_dataset_loader import HttpDatasetLoader
+from app.infrastructure.repository.s3_partial_aggregate_repository import (
+    S3PartialAggregateRepository,
+)
+from app.infrastructure.repository.s3_result_repository import S3ResultRepository
+from app.usecase.dto.rollup_analysis_input import RollupAnalysisInput
+from app.usecase.dto.run_analysis_input import RunAnalysisInput
+from app.usecase.interactor.rollup_analysis_interactor import RollupAnalysisInteractor
+from app.usecase.interactor.run_analysis_interactor import RunAnalysisInteractor
+
+DAILY = {
+    date(2024, 1, 1): {"category": ["a", "b", "a"], "value": [1, 10, 5]},
+    date(2024, 1, 2): {"category": ["a", "c"], "value": [-2, 7]},
+    date(2024, 1, 3): {"category": ["b", "b"], "value": [3, None]},
+}
+
+
+@pytest.fixture
+def settings(tmp_path):
+    return Settings(s3_bucket="bucket", local_result_dir=str(tmp_path / "results"))
+
+
+@pytest.fixture
+def analyzed(settings, tmp_path):
+    """日付ごとに分析を実行して部分集計を保存する"""
+    partials = S3PartialAggregateRepository(settings)
+    interactor = RunAnalysisInteractor(
+        loader=HttpDatasetLoader(),
+        repository=S3ResultRepository(settings),
+        partial_repository=partials,
+    )
+    for day, columns in DAILY.items():
+        csv_path = tmp_path / f"{day}.csv"
+        pl.DataFrame(columns).write_csv(csv_path)
+        output = interactor.run(
+            RunAnalysisInput(dataset=Dataset(url=str(csv_path)), target_date=TargetDate(day))
+        )
+        assert output.success, output.message
+    return partials
+
+
+def test_analyze_keeps_partial_consistent_with_total():
+    """部分集計の合計は保存する集計結果と一致する"""
+    result = analyze(pl.DataFrame(DAILY[date(2024, 1, 1)]))
+
+    partial = result.partial.sort("category")
+    assert partial.to_dicts() == [
+        {"category": "a", "sum": 6, "count": 2, "min": 1, "max": 5},
+        {"category": "b", "sum": 10, "count": 1, "min": 10, "max": 10},
+    ]
+    assert dict(result.data.sort("category").iter_rows()) == {"a": 6, "b": 10}
+
+
+def test_rollup_matches_recomputation_from_raw_rows(analyzed):
+    """部分集計のマージは期間内の生データを再集計した結果と一致する"""
+    output = RollupAnalysisInteractor(analyzed).rollup(
+        RollupAnalysisInput(date_range=DateRange(date(2024, 1, 1), date(2024, 1, 3)))
+    )
+
+    assert output.success, output.message
+    raw = pl.concat([pl.DataFrame(columns) for columns in DAILY.values()])
+    expected = (
+        raw.group_by("category")
+        .agg(
+            pl.col("value").sum().alias("total"),
+            pl.col("value").count().alias("count"),
+            pl.col("value").min().alias("min"),
+            pl.col("value").max().alias("max"),
+            pl.col("value").mean().alias("mean"),
+        )
+        .sort("category")
+    )
+    assert output.data.sort("category").equals(expected)
+    assert output.missing_dates == []
+
+
+def test_rollup_reports_missing_dates(analyzed):
+    """部分集計が無い日付を欠損として報告し、ある日付だけでロールアップする"""
+    output = RollupAnalysisInteractor(analyzed).rollup(
+        RollupAnalysisInput(date_range=DateRange(date(2024, 1, 3), date(2024, 1, 5)))
+    )
+
+    assert output.success
+    assert output.missing_dates == ["2024-01-04", "2024-01-05"]
+    assert dict(output.data.select("category", "total").iter_rows()) == {"b": 3}
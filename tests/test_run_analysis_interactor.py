@@ -0,0 +1,98 @@
+"""RunAnalysisInteractorのテスト"""
+
+from datetime import date
+
+import polars as pl
+import pytest
+
+from app.domain.value_object.dataset import Dataset
+from app.domain.value_object.target_date import TargetDate
+from app.infrastructure.config.settings import Settings
+from app.infrastructure.loader.http_dataset_loader import HttpDatasetLoader
+from app.infrastructure.repository.s3_result_memo_store import S3ResultMemoStore
+from app.infrastructure.repository.s3_result_repository import S3ResultRepository
+from app.usecase.dto.run_analysis_input import RunAnalysisInput
+from app.usecase.interactor.run_analysis_interactor import RunAnalysisInteractor
+
+
+class CountingLoader(HttpDatasetLoader):
+    """loadの呼び出し回数を数えるローダー"""
+
+    def __init__(self):
+        super().__init__()
+        self.loads = 0
+
+    def load(self, dataset):
+        self.loads += 1
+        return super().load(dataset)
+
+
+@pytest.fixture
+def settings(tmp_path):
+    return Settings(s3_bucket="bucket", local_result_dir=str(tmp_path / "results"))
+
+
+@pytest.fixture
+def input_data(tmp_path):
+    csv_path = tmp_path / "data.csv"
+    pl.DataFrame({"category": ["a", "b"], "value": [1, 2]}).write_csv(csv_path)
+    return RunAnalysisInput(
+        dataset=Dataset(url=str(csv_path)), target_date=TargetDate(value=date(2024, 1, 1))
+    )
+
+
+def build(settings):
+    loader = CountingLoader()
+    interactor = RunAnalysisInteractor(
+        loader=loader,
+        repository=S3ResultRepository(settings),
+        memo_store=S3ResultMemoStore(settings),
+    )
+    return interactor, loader
+
+
+def test_reuses_identical_result(settings, input_data):
+    """同一入力・同一日付の2回目は読み込みも計算もしない"""
+    interactor, loader = build(settings)
+
+    first = interactor.run(input_data)
+    second = interactor.run(input_data)
+
+    assert first.success and not first.reused
+    assert second.success and second.reused
+    assert second.result_path == first.result_path
+    assert loader.loads == 1
+
+
+def test_force_and_invalidate_recompute(settings, input_data):
+    """forceフラグと明示的な無効化で再計算する"""
+    interactor, loader = build(settings)
+    interactor.run(input_data)
+
+    forced = interactor.run(
+        RunAnalysisInput(dataset=input_data.dataset, target_date=input_data.target_date, force=True)
+    )
+    assert not forced.reused
+
+    assert interactor.invalidate(input_data.target_date)
+    assert not interactor.run(input_data).reused
+    assert loader.loads == 3
+
+
+def test_changed_input_is_recomputed(settings, input_data):
+    """入力内容が変わった場合は再計算する"""
+    interactor, loader = build(settings)
+    interactor.run(input_data)
+
+    pl.DataFrame({"category": ["a"], "value": [10]}).write_csv(input_data.dataset.url)
+
+    assert not interactor.run(input_data).reused
+    assert loader.loads == 2
+
+
+def test_fingerprint_is_none_when_head_fails(http_server):
+    """HEADが失敗するサーバーでは指紋をNoneにし、メモ化せずに分析を続ける"""
+    loader = HttpDatasetLoader()
+
+    assert loader.fingerprint(Dataset(url=http_server.url("missing.csv"))) is None
+    assert loader.fingerprint(Dataset(url="http://127.0.0.1:9/data.csv")) is None
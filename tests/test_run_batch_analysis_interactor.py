@@ -0,0 +1,102 @@
+"""RunBatchAnalysisInteractorのテスト"""
+
+from datetime import date
+from pathlib import Path
+
+import polars as pl
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.domain.value_object.dataset import Dataset
+from app.domain.value_object.date_range import DateRange
+from app.domain.value_object.target_date import TargetDate
+from app.infrastructure.config.settings import Settings
+from app.infrastructure.loader.http_dataset_loader import HttpDatasetLoader
+from app.infrastructure.repository.s3_result_repository import S3ResultRepository
+from app.interface.api.analysis_controller import get_result_usecase, router
+from app.usecase.dto.run_batch_analysis_input import RunBatchAnalysisInput
+from app.usecase.interactor.get_result_interactor import GetResultInteractor
+from app.usecase.interactor.run_batch_analysis_interactor import RunBatchAnalysisInteractor
+
+TARGET_DATE = TargetDate(value=date(2024, 1, 1))
+
+
+@pytest.fixture
+def settings(tmp_path):
+    return Settings(s3_bucket="bucket", local_result_dir=str(tmp_path / "results"))
+
+
+def write_region(tmp_path, name, values):
+    path = tmp_path / f"{name}.csv"
+    pl.DataFrame({"category": ["a"] * len(values), "value": values}).write_csv(path)
+    return str(path)
+
+
+def test_batch_reports_results_per_dataset(settings, tmp_path):
+    """失敗したデータセットがあっても他のデータセットの結果はそれぞれ別の保存先に書かれる"""
+    urls = [write_region(tmp_path, f"region-{i}", [i, i * 10]) for i in range(1, 4)]
+    missing = str(tmp_path / "missing.csv")
+    interactor = RunBatchAnalysisInteractor(
+        loader=HttpDatasetLoader(), repository=S3ResultRepository(settings)
+    )
+
+    output = interactor.run_batch(
+        RunBatchAnalysisInput(
+            datasets=tuple(Dataset(url=url) for url in [*urls, missing]),
+            target_date=TargetDate(value=date(2024, 1, 1)),
+        )
+    )
+
+    assert list(output.results) == [*urls, missing]
+    assert not output.success
+    assert not output.results[missing].success
+
+    result_paths = {output.results[url].result_path for url in urls}
+    assert all(output.results[url].success for url in urls)
+    # データセットごとに別の保存先になる
+    assert len(result_paths) == 3
+
+    totals = sorted(
+        pl.read_parquet(path)["total"][0]
+        for path in Path(settings.local_result_dir, "2024-01-01").glob("*/result.parquet")
+    )
+    assert totals == [11, 22, 33]
+
+
+def test_batch_input_rejects_duplicates():
+    """同じデータセットを重複して指定するとエラーになる"""
+    dataset = Dataset(url="https://example.com/a.csv")
+    with pytest.raises(ValueError):
+        RunBatchAnalysisInput(
+            datasets=(dataset, dataset), target_date=TargetDate(value=date(2024, 1, 1))
+        )
+
+
+@pytest.mark.parametrize("layout", ["single", "hive"])
+def test_batch_results_are_separate_from_date_results(settings, tmp_path, layout):
+    """バッチ実行の結果は日付ごとの結果や範囲の読み込みに混ざらず、URLを指定して取得できる"""
+    settings.result_layout = layout
+    repository = S3ResultRepository(settings)
+    urls = [write_region(tmp_path, f"region-{i}", [i, i * 10]) for i in range(1, 3)]
+    RunBatchAnalysisInteractor(loader=HttpDatasetLoader(), repository=repository).run_batch(
+        RunBatchAnalysisInput(
+            datasets=tuple(Dataset(url=url) for url in urls), target_date=TARGET_DATE
+        )
+    )
+
+    assert repository.load(TARGET_DATE) is None
+    assert repository.scan(DateRange(start=TARGET_DATE.value, end=TARGET_DATE.value)) is None
+
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_result_usecase] = lambda: GetResultInteractor(repository)
+    client = TestClient(app)
+    response = client.get(
+        "/analysis/results/2024-01-01",
+        params={"dataset_url": urls[1]},
+        headers={"Accept": "application/json"},
+    )
+    assert response.status_code == 200
+    assert [row["total"] for row in response.json()] == [22]
+    assert client.get("/analysis/results/2024-01-01").status_code == 404
@@ -0,0 +1,159 @@
+"""BoundedRunExecutorと/analysis/runのアドミッション制御のテスト"""
+
+import asyncio
+import threading
+
+import httpx
+from fastapi import FastAPI
+
+from app.interface.api.analysis_controller import (
+    get_job_launcher,
+    get_run_executor,
+    get_usecase,
+    router,
+)
+from app.interface.api.run_executor import AdmissionRejectedError, BoundedRunExecutor
+from app.usecase.dto.run_analysis_output import RunAnalysisOutput
+
+
+class BlockingUseCase:
+    """releaseされるまで完了しないユースケース"""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def run(self, input):
+        self.started.set()
+        self.release.wait(timeout=5)
+        return RunAnalysisOutput(result_path="s3://bucket/result.parquet", success=True)
+
+
+class BlockingLauncher:
+    """releaseされるまでJobの起動が完了しない起動器（遅いサーバーへのHEADを模す）"""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def launch_job(self, job_name, dataset_url, target_date, force=False, aggregation=None):
+        self.started.set()
+        # イベントループを止めていると、releaseされないままタイムアウトする
+        if not self.release.wait(timeout=2):
+            raise TimeoutError("launch_job blocked the event loop")
+        return job_name
+
+    def list_jobs(self):
+        return []
+
+
+def test_rejects_when_capacity_is_exhausted():
+    """実行中と待機中の合計が上限に達すると即座に拒否する"""
+
+    async def scenario():
+        executor = BoundedRunExecutor(max_concurrency=1, max_queue=1)
+        release = threading.Event()
+        running = asyncio.ensure_future(executor.submit(release.wait, 5))
+        queued = asyncio.ensure_future(executor.submit(lambda: "done"))
+        await asyncio.sleep(0.05)
+
+        try:
+            await executor.submit(lambda: "rejected")
+        except AdmissionRejectedError as e:
+            assert e.retry_after >= 1
+        else:
+            raise AssertionError("expected AdmissionRejectedError")
+
+        stats = executor.stats()
+        assert (stats["running"], stats["queue_depth"], stats["rejected"]) == (1, 1, 1)
+
+        release.set()
+        assert await queued == "done"
+        await running
+        assert executor.stats()["completed"] == 2
+        executor.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_queued_run_releases_its_slot():
+    """開始前にキャンセルされた実行は待機中の枠を解放し、以降の受け付けを塞がない"""
+
+    async def scenario():
+        executor = BoundedRunExecutor(max_concurrency=1, max_queue=1)
+        release = threading.Event()
+        running = asyncio.ensure_future(executor.submit(release.wait, 5))
+        queued = asyncio.ensure_future(executor.submit(lambda: "never"))
+        await asyncio.sleep(0.05)
+
+        queued.cancel()
+        await asyncio.sleep(0.05)
+        assert executor.stats()["queue_depth"] == 0
+
+        release.set()
+        await running
+        assert await executor.submit(lambda: "accepted") == "accepted"
+        stats = executor.stats()
+        assert (stats["running"], stats["queue_depth"], stats["rejected"]) == (0, 0, 0)
+        executor.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_run_endpoint_does_not_block_event_loop_and_returns_429():
+    """分析実行中も他のリクエストに応答し、上限超過時は429とRetry-Afterを返す"""
+    usecase = BlockingUseCase()
+    executor = BoundedRunExecutor(max_concurrency=1, max_queue=0)
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_usecase] = lambda: usecase
+    app.dependency_overrides[get_run_executor] = lambda: executor
+    body = {"dataset_url": "https://example.com/data.csv", "target_date": "2024-01-01"}
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            first = asyncio.ensure_future(client.post("/analysis/run", json=body))
+            while not usecase.started.is_set():
+                await asyncio.sleep(0.01)
+
+            stats = await client.get("/analysis/run/stats")
+            rejected = await client.post("/analysis/run", json=body)
+
+            usecase.release.set()
+            return await first, stats, rejected
+
+    first, stats, rejected = asyncio.run(scenario())
+    executor.shutdown()
+
+    assert first.status_code == 200
+    assert stats.json()["running"] == 1
+    assert rejected.status_code == 429
+    assert int(rejected.headers["Retry-After"]) >= 1
+
+
+def test_job_creation_does_not_block_event_loop():
+    """Jobの起動先の判定（データセットのHEAD）が遅くても、Jobの一覧には応答する"""
+    launcher = BlockingLauncher()
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_job_launcher] = lambda: launcher
+    body = {"dataset_url": "https://example.com/data.csv", "target_date": "2024-01-01"}
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            created = asyncio.ensure_future(client.post("/analysis/jobs", json=body))
+            while not launcher.started.is_set():
+                await asyncio.sleep(0.01)
+
+            jobs = await asyncio.wait_for(client.get("/analysis/jobs"), timeout=2)
+
+            launcher.release.set()
+            return await created, jobs
+
+    created, jobs = asyncio.run(scenario())
+
+    assert jobs.status_code == 200
+    assert created.status_code == 200
+    assert created.json()["message"] == "Job analysis-2024-01-01 started"
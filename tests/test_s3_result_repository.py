@@ -0,0 +1,149 @@
+"""S3ResultRepositoryのテスト（S3はmotoで代替する）"""
+
+import io
+from datetime import date
+
+import boto3
+import polars as pl
+import pytest
+from moto import mock_aws
+
+from app.domain.model.analysis_result import AnalysisResult
+from app.domain.value_object.target_date import TargetDate
+from app.infrastructure.config.settings import Settings
+from app.infrastructure.k8s.job_launcher import JobLauncher
+from app.infrastructure.k8s.resource_estimator import DEFAULT_JOB_RESOURCES
+from app.infrastructure.repository.s3_result_memo_store import S3ResultMemoStore
+from app.infrastructure.repository.s3_result_repository import S3ResultRepository
+from app.infrastructure.storage.s3_object_store import S3ObjectStore
+
+MiB = 1024**2
+
+
+@pytest.fixture
+def s3_client(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket="bucket")
+        yield client
+
+
+def test_save_uploads_parquet_with_multipart(s3_client, tmp_path):
+    """大きな結果はローカルディスクを経由せずマルチパートでS3へアップロードされる"""
+    settings = Settings(
+        s3_bucket="bucket",
+        s3_prefix="results/daily",
+        local_result_dir=str(tmp_path),
+        parquet_compression="uncompressed",
+        parquet_row_group_size=50_000,
+    )
+    store = S3ObjectStore("bucket", prefix=settings.s3_prefix, client=s3_client, part_size=5 * MiB)
+    # 非圧縮で5MiBを超え、マルチパートアップロードになる大きさの結果
+    data = pl.DataFrame({"category": [f"c{i}" for i in range(400_000)], "total": range(400_000)})
+
+    path = S3ResultRepository(settings, store).save(
+        AnalysisResult(data=data), TargetDate(value=date(2024, 1, 1))
+    )
+
+    assert path == "s3://bucket/results/daily/2024-01-01/result.parquet"
+    obj = s3_client.get_object(Bucket="bucket", Key="results/daily/2024-01-01/result.parquet")
+    # マルチパートアップロードのETagは"<md5>-<パート数>"の形式になる
+    assert "-" in obj["ETag"]
+    body = obj["Body"].read()
+    assert pl.read_parquet(io.BytesIO(body)).equals(data)
+    # ローカルディスクには書き出さない
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_memo_store_round_trip(s3_client):
+    """S3上のメモは保存・取得・破棄ができ、破棄後は見つからない"""
+    settings = Settings(s3_bucket="bucket")
+    store = S3ObjectStore("bucket", prefix="results", client=s3_client)
+    target_date = TargetDate(value=date(2024, 1, 1))
+    memo = S3ResultMemoStore(settings, store)
+
+    path = S3ResultRepository(settings, store).save(
+        AnalysisResult(data=pl.DataFrame({"category": ["a"], "total": [1]})), target_date
+    )
+    memo.put(target_date, "key", path)
+
+    assert memo.get(target_date, "key") == path
+    assert memo.get(target_date, "other") is None
+    assert memo.invalidate(target_date)
+    assert memo.get(target_date, "key") is None
+    assert not memo.invalidate(target_date)
+
+
+def test_memo_store_keeps_partitions_apart(s3_client):
+    """パーティションごとに記録し、記録したパーティションの結果が消えた場合は見つからない"""
+    settings = Settings(s3_bucket="bucket")
+    store = S3ObjectStore("bucket", prefix="results", client=s3_client)
+    target_date = TargetDate(value=date(2024, 1, 1))
+    memo = S3ResultMemoStore(settings, store)
+    repository = S3ResultRepository(settings, store)
+    result = AnalysisResult(data=pl.DataFrame({"category": ["a"], "total": [1]}))
+
+    default_path = repository.save(result, target_date)
+    spec_path = repository.save(result, target_date, "specs/abc")
+    memo.put(target_date, "default-key", default_path)
+    memo.put(target_date, "spec-key", spec_path, "specs/abc")
+
+    # 既定の結果と集計仕様の結果の記録は互いに上書きしない
+    assert memo.get(target_date, "default-key") == default_path
+    assert memo.get(target_date, "spec-key", "specs/abc") == spec_path
+    assert memo.get(target_date, "spec-key") is None
+
+    # 既定の結果が残っていても、集計仕様の結果が消えていれば記録を使わない
+    store.delete("2024-01-01/specs/abc/result.parquet")
+    assert memo.get(target_date, "spec-key", "specs/abc") is None
+    assert memo.get(target_date, "default-key") == default_path
+
+    assert memo.invalidate(target_date)
+    assert memo.get(target_date, "default-key") is None
+    assert store.list_keys("2024-01-01/") == ["2024-01-01/result.parquet"]
+
+
+@pytest.mark.parametrize(
+    ("settings", "expected", "absent"),
+    [
+        (
+            Settings(
+                s3_bucket="bucket",
+                result_store="s3",
+                parquet_compression="lz4",
+                parquet_compression_level=3,
+                parquet_row_group_size=100_000,
+            ),
+            {
+                "RESULT_STORE": "s3",
+                "PARQUET_COMPRESSION": "lz4",
+                "PARQUET_COMPRESSION_LEVEL": "3",
+                "PARQUET_ROW_GROUP_SIZE": "100000",
+            },
+            "LOCAL_RESULT_DIR",
+        ),
+        (
+            Settings(s3_bucket="bucket", local_result_dir="/mnt/results"),
+            {"LOCAL_RESULT_DIR": "/mnt/results", "PARQUET_COMPRESSION": "zstd"},
+            "PARQUET_ROW_GROUP_SIZE",
+        ),
+    ],
+)
+def test_job_manifest_forwards_result_settings(settings, expected, absent):
+    """結果の保存先とParquetの書き出し設定はJob Podにも渡し、Jobも同じ形式で結果を保存する"""
+    manifest = JobLauncher(settings)._create_job_manifest(
+        job_name="analysis-2024-01-01",
+        dataset_url="data.csv",
+        target_date="2024-01-01",
+        image="polars-service:latest",
+        resources=DEFAULT_JOB_RESOURCES,
+    )
+
+    env = {
+        e["name"]: e["value"] for e in manifest["spec"]["template"]["spec"]["containers"][0]["env"]
+    }
+    assert {name: env.get(name) for name in expected} == expected
+    assert absent not in env
@@ -0,0 +1,263 @@
+"""スキーマレジストリ（型の学習・固定）のテスト"""
+
+import json
+from datetime import date
+
+import polars as pl
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.domain.service.column_types import learn_schema
+from app.domain.value_object.dataset import Dataset
+from app.domain.value_object.dataset_schema import DatasetSchema
+from app.domain.value_object.shard import Shard
+from app.domain.value_object.target_date import TargetDate
+from app.infrastructure.config.settings import Settings
+from app.infrastructure.k8s.job_launcher import JobLauncher
+from app.infrastructure.k8s.resource_estimator import DEFAULT_JOB_RESOURCES
+from app.infrastructure.loader.csv_shard_loader import CsvShardLoader
+from app.infrastructure.repository.s3_schema_registry import S3SchemaRegistry
+from app.interface.api.analysis_controller import get_schema_registry, router
+from app.usecase.dto.run_analysis_input import RunAnalysisInput
+from app.wiring import build_loader, build_usecase
+
+TARGET_DATE = TargetDate(value=date(2024, 1, 1))
+
+
+def _write_csv(path, rows: int = 3_000) -> None:
+    lines = ["category,value,ratio,flag"]
+    # valueは整数、ratioは最後の行だけが小数
+    lines += [f"c{i % 11},{30_000 - i % 3},{i},x{i % 2}" for i in range(rows - 1)]
+    lines.append(f"c{(rows - 1) % 11},30000,0.5,x0")
+    path.write_text("\n".join(lines) + "\n")
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "feed-2024-01-01.csv"
+    _write_csv(path)
+    return path
+
+
+@pytest.fixture
+def settings(tmp_path):
+    return Settings(
+        s3_bucket="bucket",
+        local_result_dir=str(tmp_path / "results"),
+        schema_registry=True,
+        schema_categorical_columns="category",
+    )
+
+
+def test_learn_schema_picks_safe_dtypes_from_all_rows(csv_path):
+    """全行から型を学習し、整数列はInt64、後ろの行にだけ小数がある列はFloat64にする"""
+    schema = learn_schema(
+        pl.scan_csv(csv_path, infer_schema=False), categorical_columns=["category"]
+    )
+
+    assert dict(schema.columns) == {
+        "category": "Categorical",
+        # 1日分の値の範囲から縮小しない
+        "value": "Int64",
+        # 先頭の行だけでは整数に見えるが、最後の行に小数がある
+        "ratio": "Float64",
+        "flag": "String",
+    }
+
+
+def test_dataset_schema_validation_and_json_round_trip():
+    """スキーマはJSONと相互変換でき、未対応の型・空の列・不正な形式は拒否する"""
+    schema = DatasetSchema.from_dict({"columns": {"category": "Categorical", "value": "Int8"}})
+
+    assert DatasetSchema.from_json(schema.to_json()) == schema
+    assert schema.polars_schema() == {"category": pl.Categorical(), "value": pl.Int8()}
+    with pytest.raises(ValueError):
+        DatasetSchema.from_dict({"columns": {"value": "Decimal"}})
+    with pytest.raises(ValueError):
+        DatasetSchema.from_dict({"columns": {}})
+    with pytest.raises(ValueError):
+        DatasetSchema.from_dict({"value": "Int8"})
+
+
+def test_schema_key_ignores_dates_and_query():
+    """スキーマのキーは日付を{date}に置き換えてクエリ文字列を除くため、同じフィードの各日付で共有される"""
+    keys = {
+        Dataset(url=url).schema_key
+        for url in (
+            "https://example.com/feed/2024-01-01/data.csv?sig=a",
+            "https://example.com/feed/2024-01-02/data.csv?sig=b",
+        )
+    }
+
+    assert keys == {"https://example.com/feed/{date}/data.csv"}
+    assert Dataset(url="/data/feed_20240101.csv").schema_key == "/data/feed_{date}.csv"
+
+
+def test_loader_learns_once_and_reads_with_pinned_dtypes(settings, csv_path, tmp_path):
+    """初回の読み込みで学習したスキーマを保存し、編集したスキーマを以降の読み込みで使う"""
+    loader = build_loader(settings)
+    dataset = Dataset(url=str(csv_path))
+
+    df = loader.load(dataset).collect()
+
+    assert df.schema["category"] == pl.Categorical
+    assert df.schema["value"] == pl.Int64
+    assert df.schema["ratio"] == pl.Float64
+    # 学習したスキーマは編集できるJSONとして保存される
+    (path,) = (tmp_path / "results" / "schemas").iterdir()
+    stored = json.loads(path.read_text())
+    assert stored["dataset"] == dataset.schema_key
+    assert stored["columns"]["value"] == "Int64"
+
+    # 編集したスキーマは次回の読み込みから使われる（同じフィードの別の日付にも適用される）
+    stored["columns"]["value"] = "Int32"
+    path.write_text(json.dumps(stored))
+    next_day = tmp_path / "feed-2024-01-02.csv"
+    _write_csv(next_day)
+    assert loader.load(Dataset(url=str(next_day))).collect().schema["value"] == pl.Int32
+    assert len(list((tmp_path / "results" / "schemas").iterdir())) == 1
+
+
+def test_learned_schema_accepts_larger_values_on_later_days(settings, tmp_path):
+    """学習した整数列は後の日付に大きな値が来ても読み込める（1日目の範囲に縮小しない）"""
+    loader = build_loader(settings)
+    first_day = tmp_path / "feed-2024-01-01.csv"
+    first_day.write_text("category,value\na,1\nb,2\n")
+    next_day = tmp_path / "feed-2024-01-02.csv"
+    next_day.write_text("category,value\na,1\nb,3000000000\n")
+
+    assert loader.load(Dataset(url=str(first_day))).collect()["value"].to_list() == [1, 2]
+    df = loader.load(Dataset(url=str(next_day))).collect()
+
+    assert df.schema["value"] == pl.Int64
+    assert df["value"].to_list() == [1, 3_000_000_000]
+
+
+def test_http_dataset_is_fetched_once_when_learning(settings, csv_path, http_server):
+    """スキーマの学習はローカルへ取得したファイルから行い、HTTPのデータセットを2回取得しない"""
+    http_server.files["/2024-01-01/data.csv"] = csv_path.read_bytes()
+    settings.download_dir = str(csv_path.parent / "downloads")
+    loader = build_loader(settings)
+
+    df = loader.load(Dataset(url=http_server.url("2024-01-01/data.csv"))).collect()
+
+    assert df.height == 3_000
+    assert df.schema["value"] == pl.Int64
+    assert [m for m, _, _ in http_server.requests if m == "GET"] == ["GET"]
+
+
+def test_out_of_range_value_fails_instead_of_wrapping(settings, csv_path):
+    """PUTで明示的に縮小した型に収まらない値は桁あふれさせずに読み込みを失敗させる"""
+    registry = S3SchemaRegistry(settings)
+    dataset = Dataset(url=str(csv_path))
+    registry.put(dataset.schema_key, DatasetSchema(columns=(("value", "Int8"),)))
+
+    with pytest.raises(pl.exceptions.ComputeError):
+        build_loader(settings).load(dataset).collect()
+
+
+def test_pinned_results_match_inferred_results(settings, csv_path, tmp_path):
+    """縮小した整数列の合計は桁あふれせず、保存する結果の型は固定しない場合と同じ"""
+    input_data = RunAnalysisInput(dataset=Dataset(url=str(csv_path)), target_date=TARGET_DATE)
+    inferred = Settings(s3_bucket="bucket", local_result_dir=str(tmp_path / "inferred"))
+    S3SchemaRegistry(settings).put(
+        input_data.dataset.schema_key,
+        DatasetSchema(columns=(("category", "Categorical"), ("value", "Int16"))),
+    )
+
+    pinned_output = build_usecase(settings).run(input_data)
+    inferred_output = build_usecase(inferred).run(input_data)
+
+    assert pinned_output.success and inferred_output.success
+    pinned = pl.read_parquet(pinned_output.result_path).sort("category")
+    expected = pl.read_parquet(inferred_output.result_path).sort("category")
+    assert pinned.schema == expected.schema
+    assert pinned.schema["category"] == pl.String
+    assert pinned.equals(expected)
+    # 1カテゴリあたり約270行×約30000はInt16の範囲を超える
+    assert pinned["total"].max() > 2**15
+
+
+def test_schema_api_gets_edits_and_deletes(settings):
+    """スキーマAPIで取得・編集・削除でき、不正な型の編集は400を返す"""
+    registry = S3SchemaRegistry(settings)
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_schema_registry] = lambda: registry
+    client = TestClient(app)
+    params = {"dataset_url": "https://example.com/2024-01-01/data.csv"}
+
+    assert client.get("/analysis/schemas", params=params).status_code == 404
+
+    body = {"columns": {"category": "Categorical", "value": "Int16"}}
+    response = client.put("/analysis/schemas", params=params, json=body)
+    assert response.status_code == 200
+    assert response.json()["schema_key"] == "https://example.com/{date}/data.csv"
+
+    other_day = {"dataset_url": "https://example.com/2024-01-02/data.csv"}
+    assert client.get("/analysis/schemas", params=other_day).json()["columns"] == body["columns"]
+
+    invalid = {"columns": {"value": "Int128"}}
+    assert client.put("/analysis/schemas", params=params, json=invalid).status_code == 400
+
+    assert client.delete("/analysis/schemas", params=params).json()["deleted"] is True
+    assert client.delete("/analysis/schemas", params=params).json()["deleted"] is False
+
+
+def test_shard_loader_uses_registered_schema(settings, csv_path, tmp_path):
+    """シャードの読み込みは登録済みのスキーマの型を使う"""
+    registry = S3SchemaRegistry(settings)
+    dataset = Dataset(url=str(csv_path))
+    registry.put(dataset.schema_key, DatasetSchema(columns=(("value", "Int16"),)))
+    loader = CsvShardLoader(work_dir=tmp_path / "work", schema_registry=registry)
+
+    dtypes = set()
+    for index in range(3):
+        with loader.load_shard(dataset, Shard(index, 3)) as lf:
+            dtypes.add(lf.collect_schema()["value"])
+
+    assert dtypes == {pl.Int16}
+
+
+def test_columnar_store_is_rebuilt_when_schema_is_edited(settings, csv_path, tmp_path):
+    """スキーマを編集すると列指向ストアの変換済みファイルを作り直す"""
+    settings.columnar_cache_dir = str(tmp_path / "columnar")
+    loader = build_loader(settings)
+    dataset = Dataset(url=str(csv_path))
+    assert loader.load(dataset).collect_schema()["value"] == pl.Int64
+
+    S3SchemaRegistry(settings).put(
+        dataset.schema_key, DatasetSchema(columns=(("category", "String"), ("value", "Int32")))
+    )
+
+    df = loader.load(dataset).collect()
+    assert df.schema["category"] == pl.String
+    assert df.schema["value"] == pl.Int32
+
+
+def test_job_manifests_forward_schema_settings(settings):
+    """スキーマレジストリの設定は分割実行のマッパーを含むJob Podにも渡す"""
+    launcher = JobLauncher(settings)
+    manifests = [
+        launcher._create_job_manifest(
+            job_name="analysis-2024-01-01",
+            dataset_url="data.csv",
+            target_date="2024-01-01",
+            image="polars-service:latest",
+            resources=DEFAULT_JOB_RESOURCES,
+        ),
+        launcher._create_sharded_job_manifest(
+            job_name="analysis-2024-01-01-sharded",
+            dataset_url="data.csv",
+            target_date="2024-01-01",
+            shards=4,
+            parallelism=2,
+            image="polars-service:latest",
+        ),
+    ]
+
+    for manifest in manifests:
+        env = manifest["spec"]["template"]["spec"]["containers"][0]["env"]
+        assert {"name": "SCHEMA_REGISTRY", "value": "true"} in env
+        assert {"name": "SCHEMA_CATEGORICAL_COLUMNS", "value": "category"} in env
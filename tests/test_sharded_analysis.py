@@ -0,0 +1,196 @@
+"""分割実行（シャードごとのマップとマージ）のテスト"""
+
+from datetime import date
+
+import polars as pl
+import pytest
+
+from app.domain.service.partial_aggregate import supports_partial
+from app.domain.value_object.dataset import Dataset
+from app.domain.value_object.shard import Shard
+from app.domain.value_object.target_date import TargetDate
+from app.infrastructure.config.settings import Settings
+from app.infrastructure.executor.local_shard_executor import LocalShardExecutor
+from app.infrastructure.k8s.job_launcher import JobLauncher
+from app.infrastructure.loader.csv_shard_loader import CsvShardLoader
+from app.interface.job.analysis_job_controller import build_sharded_input
+from app.usecase.dto.sharded_analysis_input import ShardedAnalysisInput
+from app.wiring import build_sharded_usecase
+
+TARGET_DATE = TargetDate(value=date(2024, 1, 1))
+CSV = b"category,value\n" + b"".join(f"c{i % 7},{i}\n".encode() for i in range(500))
+
+
+def _expected(csv_path) -> dict[str, int]:
+    df = pl.read_csv(csv_path)
+    return dict(df.group_by("category").agg(pl.sum("value")).iter_rows())
+
+
+def test_shard_byte_ranges_cover_input():
+    """シャードのバイト範囲は入力全体を重なりなく覆い、不正な番号・シャード数は拒否する"""
+    ranges = [Shard(index, 3).byte_range(10) for index in range(3)]
+
+    assert ranges == [(0, 3), (3, 6), (6, 10)]
+    assert str(Shard(0, 3)) == "1/3"
+    with pytest.raises(ValueError):
+        Shard(3, 3)
+    with pytest.raises(ValueError):
+        Shard(0, 0)
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 7, 600])
+def test_local_shards_contain_each_row_once(tmp_path, count):
+    """各行は開始位置を含むシャードにだけ含まれる（行数より多いシャードは空になる）"""
+    csv_path = tmp_path / "data.csv"
+    csv_path.write_bytes(CSV)
+    loader = CsvShardLoader(work_dir=tmp_path / "work")
+
+    frames = []
+    for index in range(count):
+        with loader.load_shard(Dataset(url=str(csv_path)), Shard(index, count)) as lf:
+            frames.append(lf.collect())
+
+    combined = pl.concat(frames, how="vertical_relaxed")
+    assert combined.columns == ["category", "value"]
+    assert combined["value"].sort().to_list() == list(range(500))
+    assert not list((tmp_path / "work").iterdir())
+
+
+def test_http_shards_use_range_requests(http_server, tmp_path):
+    """HTTPのデータセットはシャードごとにRangeリクエストで必要な範囲だけを取得する"""
+    http_server.files["/data.csv"] = CSV
+    loader = CsvShardLoader()
+
+    values = []
+    for index in range(4):
+        with loader.load_shard(Dataset(url=http_server.url("data.csv")), Shard(index, 4)) as lf:
+            values.extend(lf.collect()["value"].to_list())
+
+    assert sorted(values) == list(range(500))
+    gets = [h for m, _, h in http_server.requests if m == "GET"]
+    assert gets and all("Range" in h for h in gets)
+
+
+def test_last_mapper_reduces(tmp_path):
+    """全シャードが揃うまではマージせず、最後のマッパーが結果を保存する"""
+    csv_path = tmp_path / "data.csv"
+    csv_path.write_bytes(CSV)
+    usecase = build_sharded_usecase(Settings(s3_bucket="bucket", local_result_dir=str(tmp_path)))
+    input_data = ShardedAnalysisInput(
+        dataset=Dataset(url=str(csv_path)), target_date=TARGET_DATE, run_id="run-1", shard_count=3
+    )
+
+    first = usecase.run_shard(input_data, 2)
+    assert first.success
+    assert "waiting for 2 more shards" in first.message
+    missing = usecase.reduce(input_data)
+    assert not missing.success
+    assert missing.message == "Missing shards: 1/3, 2/3"
+
+    assert usecase.run_shard(input_data, 0).success
+    last = usecase.run_shard(input_data, 1)
+
+    assert last.success, last.message
+    assert last.result_path.endswith("2024-01-01/result.parquet")
+    assert [stage.stage for stage in last.metrics] == ["analyze", "save", "load", "analyze", "save"]
+    result = pl.read_parquet(tmp_path / "2024-01-01" / "result.parquet")
+    assert dict(result.iter_rows()) == _expected(csv_path)
+    partial = pl.read_parquet(tmp_path / "2024-01-01" / "partial.parquet")
+    assert partial["count"].sum() == 500
+    assert not list((tmp_path / "2024-01-01" / "shards").rglob("*.parquet"))
+
+
+def test_supports_partial_requires_numeric_value_column():
+    """部分集計は数値（またはシャードが空のときのNull）のvalue列だけを対象にする"""
+
+    def frame(schema):
+        return pl.LazyFrame(schema=schema)
+
+    assert supports_partial(frame({"category": pl.String, "value": pl.Int16}))
+    assert supports_partial(frame({"category": pl.Null, "value": pl.Null}))
+    assert not supports_partial(frame({"category": pl.String, "value": pl.String}))
+    assert not supports_partial(frame({"category": pl.String}))
+
+
+def test_local_executor_runs_map_reduce_in_worker_processes(tmp_path, monkeypatch):
+    """LocalShardExecutorはワーカープロセスでマップしてマージし、部分集計を削除する"""
+    monkeypatch.setenv("LOCAL_RESULT_DIR", str(tmp_path / "results"))
+    csv_path = tmp_path / "data.csv"
+    csv_path.write_bytes(CSV)
+    settings = Settings.from_env()
+    executor = LocalShardExecutor(build_sharded_usecase(settings), max_workers=2)
+
+    output = executor.run(
+        ShardedAnalysisInput(
+            dataset=Dataset(url=str(csv_path)),
+            target_date=TARGET_DATE,
+            run_id="local-1",
+            shard_count=4,
+        )
+    )
+
+    assert output.success, output.message
+    result = pl.read_parquet(tmp_path / "results" / "2024-01-01" / "result.parquet")
+    assert dict(result.iter_rows()) == _expected(csv_path)
+    # マージ後はシャードの部分集計を削除する
+    assert not list((tmp_path / "results" / "2024-01-01").rglob("part-*.parquet"))
+
+
+def test_local_executor_reports_failed_shards(tmp_path, monkeypatch):
+    """失敗したシャードは番号付きでメッセージに含める"""
+    monkeypatch.setenv("LOCAL_RESULT_DIR", str(tmp_path))
+    executor = LocalShardExecutor(build_sharded_usecase(Settings.from_env()), max_workers=1)
+
+    output = executor.run(
+        ShardedAnalysisInput(
+            dataset=Dataset(url=str(tmp_path / "missing.csv")),
+            target_date=TARGET_DATE,
+            run_id="local-2",
+            shard_count=2,
+        )
+    )
+
+    assert not output.success
+    assert "shard 1/2" in output.message and "shard 2/2" in output.message
+
+
+def test_sharded_manifest_is_indexed_job():
+    """分割実行のマニフェストはシャードごとに再試行するIndexed Jobになる"""
+    launcher = JobLauncher(Settings(s3_bucket="bucket"))
+
+    manifest = launcher._create_sharded_job_manifest(
+        job_name="analysis-2024-01-01-sharded-abc",
+        dataset_url="https://example.com/data.csv",
+        target_date="2024-01-01",
+        shards=8,
+        parallelism=4,
+        image="polars-service:latest",
+    )
+
+    spec = manifest["spec"]
+    assert spec["completionMode"] == "Indexed"
+    assert spec["completions"] == 8
+    assert spec["parallelism"] == 4
+    assert spec["podFailurePolicy"]["rules"][0]["action"] == "FailIndex"
+    env = {e["name"]: e["value"] for e in spec["template"]["spec"]["containers"][0]["env"]}
+    assert env["ANALYSIS_SHARDS"] == "8"
+    assert env["ANALYSIS_SHARD_RUN_ID"] == "analysis-2024-01-01-sharded-abc"
+    assert env["DATASET_URL"] == "https://example.com/data.csv"
+
+
+def test_build_sharded_input_reads_run_id():
+    """分割実行の入力は環境変数のシャード数と実行IDから作り、必須の環境変数が無い場合は拒否する"""
+    settings = Settings(
+        s3_bucket="bucket",
+        dataset_url="https://example.com/data.csv",
+        target_date="2024-01-01",
+        analysis_shards=8,
+        analysis_shard_run_id="run-1",
+    )
+
+    input_data = build_sharded_input(settings)
+
+    assert input_data.shard_count == 8
+    assert input_data.run_id == "run-1"
+    with pytest.raises(ValueError):
+        build_sharded_input(Settings(s3_bucket="bucket", analysis_shards=8))
@@ -0,0 +1,237 @@
+"""近似スケッチ（異なり数・分位数）のテスト"""
+
+import math
+from datetime import date, timedelta
+
+import polars as pl
+import pytest
+
+from app.domain.service.analyze_service import analyze
+from app.domain.service.sketch import (
+    build_distinct_sketch_plan,
+    build_quantile_sketch_plan,
+    estimate_distinct,
+    estimate_quantiles,
+    merge_distinct_sketches,
+    merge_quantile_sketches,
+)
+from app.domain.value_object.dataset import Dataset
+from app.domain.value_object.date_range import DateRange
+from app.domain.value_object.sketch_spec import SketchSpec
+from app.domain.value_object.target_date import TargetDate
+from app.infrastructure.config.settings import Settings
+from app.infrastructure.k8s.job_launcher import JobLauncher
+from app.infrastructure.k8s.resource_estimator import DEFAULT_JOB_RESOURCES
+from app.infrastructure.loader.http_dataset_loader import HttpDatasetLoader
+from app.infrastructure.repository import s3_sketch_repository
+from app.infrastructure.repository.s3_partial_aggregate_repository import (
+    S3PartialAggregateRepository,
+)
+from app.infrastructure.repository.s3_result_repository import S3ResultRepository
+from app.infrastructure.repository.s3_sketch_repository import S3SketchRepository
+from app.usecase.dto.rollup_analysis_input import RollupAnalysisInput
+from app.usecase.dto.run_analysis_input import RunAnalysisInput
+from app.usecase.interactor.rollup_analysis_interactor import RollupAnalysisInteractor
+from app.usecase.interactor.run_analysis_interactor import RunAnalysisInteractor
+
+SPEC = SketchSpec(distinct_column="user")
+SPEC_GAMMA = (1 + SPEC.relative_accuracy) / (1 - SPEC.relative_accuracy)
+
+
+def _frame(rows: int, offset: int = 0) -> pl.DataFrame:
+    """カテゴリごとに値の分布と利用者の範囲が異なる決定的なデータ"""
+    index = pl.int_range(offset, offset + rows, dtype=pl.Int64)
+    return pl.select(
+        pl.when(index % 3 == 0).then(pl.lit("a")).otherwise(pl.lit("b")).alias("category"),
+        ((index * 7919 % 10007) / 10.0 + 1.0).alias("value"),
+        (index * 31 % (rows // 2)).alias("user"),
+        (index * 31 % (rows // 2)).cast(pl.String).alias("user_name"),
+    )
+
+
+@pytest.mark.parametrize("column", ["user", "user_name"])
+def test_distinct_estimate_is_within_error_bound(column):
+    """異なり数の推定値は整数・文字列の列のどちらでもHyperLogLogの誤差の範囲に収まる"""
+    df = _frame(200_000)
+    spec = SketchSpec(distinct_column=column)
+
+    estimated = estimate_distinct(build_distinct_sketch_plan(df.lazy(), spec), spec).collect()
+    exact = df.group_by("category").agg(pl.col(column).n_unique().alias("exact"))
+
+    joined = estimated.join(exact, on="category")
+    # 標準誤差（精度12で約1.6%）の3倍以内
+    for row in joined.iter_rows(named=True):
+        assert row["distinct"] == pytest.approx(row["exact"], rel=0.05)
+
+
+def test_quantile_estimate_is_within_relative_accuracy():
+    """分位数の推定値は設定した相対誤差の範囲に収まる"""
+    df = _frame(50_000)
+    quantiles = (0.1, 0.5, 0.9, 0.99)
+
+    estimated = estimate_quantiles(build_quantile_sketch_plan(df.lazy(), SPEC), SPEC, quantiles)
+    exact = df.group_by("category").agg(
+        pl.col("value").quantile(q, interpolation="lower").alias(f"exact{q}") for q in quantiles
+    )
+
+    joined = estimated.collect().join(exact, on="category")
+    for row in joined.iter_rows(named=True):
+        for q in quantiles:
+            assert row[f"p{q * 100:g}"] == pytest.approx(
+                row[f"exact{q}"], rel=SPEC.relative_accuracy
+            )
+
+
+def test_merged_sketches_equal_sketch_of_union():
+    """日付ごとのスケッチをマージした結果は、全日付をまとめて作ったスケッチと一致する"""
+    first, second = _frame(10_000), _frame(10_000, offset=5_000)
+    union = pl.concat([first, second])
+
+    distinct = merge_distinct_sketches(
+        pl.concat([build_distinct_sketch_plan(df.lazy(), SPEC) for df in (first, second)])
+    )
+    quantiles = merge_quantile_sketches(
+        pl.concat([build_quantile_sketch_plan(df.lazy(), SPEC) for df in (first, second)])
+    )
+
+    assert (
+        estimate_distinct(distinct, SPEC)
+        .sort("category")
+        .collect()
+        .equals(
+            estimate_distinct(build_distinct_sketch_plan(union.lazy(), SPEC), SPEC)
+            .sort("category")
+            .collect()
+        )
+    )
+    assert (
+        estimate_quantiles(quantiles, SPEC)
+        .sort("category")
+        .collect()
+        .equals(
+            estimate_quantiles(build_quantile_sketch_plan(union.lazy(), SPEC), SPEC)
+            .sort("category")
+            .collect()
+        )
+    )
+
+
+def test_sketch_size_does_not_grow_with_rows():
+    """スケッチの大きさは入力の行数によらず、カテゴリ数と精度で決まる上限に収まる"""
+    small = analyze(_frame(10_000), sketch_spec=SPEC).sketches
+    large = analyze(_frame(200_000), sketch_spec=SPEC).sketches
+
+    # レジスタ数はカテゴリ数×2**精度、バケット数は値の範囲（1〜約1000）の対数で上限が決まる
+    registers = 2 * 2**SPEC.precision
+    buckets = 2 * (math.ceil(math.log(1001.7) / math.log(SPEC_GAMMA)) + 1)
+    assert small.distinct.height <= large.distinct.height <= registers
+    assert small.quantiles.height <= large.quantiles.height <= buckets
+
+
+def test_analyze_without_spec_or_distinct_column():
+    """設定が無ければスケッチを作らず、異なり数の列が無ければ分位数スケッチだけを作る"""
+    df = _frame(1_000)
+
+    assert analyze(df).sketches is None
+    sketches = analyze(df.drop("user"), sketch_spec=SPEC).sketches
+    assert sketches.distinct is None
+    assert sketches.quantiles.columns == ["category", "sign", "bucket", "count"]
+
+
+def test_rollup_adds_distinct_and_quantiles(tmp_path):
+    """ロールアップは日付ごとのスケッチをマージして異なり数と分位数の列を加える"""
+    settings = Settings(s3_bucket="bucket", local_result_dir=str(tmp_path / "results"))
+    partials = S3PartialAggregateRepository(settings)
+    sketches = S3SketchRepository(settings)
+    interactor = RunAnalysisInteractor(
+        loader=HttpDatasetLoader(),
+        repository=S3ResultRepository(settings),
+        partial_repository=partials,
+        sketch_spec=SPEC,
+        sketch_repository=sketches,
+    )
+    start = date(2024, 1, 1)
+    frames = [_frame(6_000, offset=day * 3_000) for day in range(3)]
+    for day, df in enumerate(frames):
+        csv_path = tmp_path / f"{day}.csv"
+        df.write_csv(csv_path)
+        output = interactor.run(
+            RunAnalysisInput(
+                dataset=Dataset(url=str(csv_path)),
+                target_date=TargetDate(start + timedelta(days=day)),
+            )
+        )
+        assert output.success, output.message
+
+    output = RollupAnalysisInteractor(
+        partials, sketch_repository=sketches, sketch_spec=SPEC
+    ).rollup(RollupAnalysisInput(date_range=DateRange(start, start + timedelta(days=3))))
+
+    assert output.success, output.message
+    assert output.missing_dates == ["2024-01-04"]
+    assert output.missing_sketch_dates == []
+    assert {"distinct", "p50", "p95", "p99"} <= set(output.data.columns)
+
+    exact = (
+        pl.concat(frames)
+        .group_by("category")
+        .agg(
+            pl.col("user").n_unique().alias("exact_distinct"),
+            pl.col("value").quantile(0.5, interpolation="lower").alias("exact_p50"),
+        )
+    )
+    for row in output.data.join(exact, on="category").iter_rows(named=True):
+        assert row["distinct"] == pytest.approx(row["exact_distinct"], rel=0.05)
+        assert row["p50"] == pytest.approx(row["exact_p50"], rel=SPEC.relative_accuracy)
+
+
+def test_sketches_with_different_spec_are_not_loaded(tmp_path):
+    """設定の異なるスケッチは読み込まない"""
+    settings = Settings(s3_bucket="bucket", local_result_dir=str(tmp_path))
+    repository = S3SketchRepository(settings)
+    target_date = TargetDate(date(2024, 1, 1))
+    repository.save(analyze(_frame(1_000), sketch_spec=SPEC).sketches, target_date)
+
+    assert repository.load(target_date, SPEC).distinct is not None
+    # 分位数スケッチはそのまま使えるが、精度の異なるレジスタは読み込まない
+    other_precision = repository.load(target_date, SketchSpec(distinct_column="user", precision=10))
+    assert other_precision.distinct is None
+    assert repository.load(target_date, SketchSpec(relative_accuracy=0.02)) is None
+
+
+def test_distinct_sketch_key_includes_hash_scheme(tmp_path, monkeypatch):
+    """異なり数のスケッチはハッシュ方式ごとに保存し、別のPolarsのバージョンのレジスタは読み込まない"""
+    settings = Settings(s3_bucket="bucket", local_result_dir=str(tmp_path))
+    repository = S3SketchRepository(settings)
+    target_date = TargetDate(date(2024, 1, 1))
+    repository.save(analyze(_frame(1_000), sketch_spec=SPEC).sketches, target_date)
+
+    monkeypatch.setattr(s3_sketch_repository, "DISTINCT_HASH_SCHEME", "polars0.0.0")
+
+    loaded = repository.load(target_date, SPEC)
+    assert loaded is not None
+    assert loaded.distinct is None
+
+
+def test_job_manifest_forwards_sketch_settings():
+    """スケッチの設定はJob Podにも渡し、Jobの実行でもスケッチを保存する"""
+    settings = Settings(
+        s3_bucket="bucket",
+        analysis_sketches=True,
+        sketch_distinct_column="user",
+        sketch_hll_precision=14,
+    )
+
+    manifest = JobLauncher(settings)._create_job_manifest(
+        job_name="analysis-2024-01-01",
+        dataset_url="data.csv",
+        target_date="2024-01-01",
+        image="polars-service:latest",
+        resources=DEFAULT_JOB_RESOURCES,
+    )
+
+    env = manifest["spec"]["template"]["spec"]["containers"][0]["env"]
+    assert {"name": "ANALYSIS_SKETCHES", "value": "true"} in env
+    assert {"name": "SKETCH_DISTINCT_COLUMN", "value": "user"} in env
+    assert {"name": "SKETCH_HLL_PRECISION", "value": "14"} in env
+    assert {"name": "SKETCH_RELATIVE_ACCURACY", "value": "0.01"} in env
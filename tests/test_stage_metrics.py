@@ -0,0 +1,164 @@
+"""分析ステージの計測とメトリクス公開のテスト"""
+
+import json
+import urllib.request
+from datetime import date
+
+import polars as pl
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.domain.value_object.dataset import Dataset
+from app.domain.value_object.target_date import TargetDate
+from app.infrastructure.config.settings import Settings
+from app.infrastructure.loader.http_dataset_loader import HttpDatasetLoader
+from app.infrastructure.metrics.prometheus_metrics import PrometheusMetrics
+from app.infrastructure.repository.s3_result_memo_store import S3ResultMemoStore
+from app.infrastructure.repository.s3_result_repository import S3ResultRepository
+from app.interface.api.metrics_controller import get_metrics, router
+from app.interface.job.analysis_job_controller import format_summary
+from app.usecase.dto.run_analysis_input import RunAnalysisInput
+from app.usecase.interactor.run_analysis_interactor import RunAnalysisInteractor
+
+
+@pytest.fixture
+def input_data(tmp_path):
+    csv_path = tmp_path / "data.csv"
+    pl.DataFrame({"category": ["a", "b", "a"], "value": [1, 2, 3]}).write_csv(csv_path)
+    return RunAnalysisInput(
+        dataset=Dataset(url=str(csv_path)), target_date=TargetDate(value=date(2024, 1, 1))
+    )
+
+
+@pytest.fixture
+def metrics():
+    return PrometheusMetrics()
+
+
+@pytest.fixture
+def interactor(tmp_path, metrics):
+    settings = Settings(s3_bucket="bucket", local_result_dir=str(tmp_path / "results"))
+    return RunAnalysisInteractor(
+        loader=HttpDatasetLoader(),
+        repository=S3ResultRepository(settings),
+        memo_store=S3ResultMemoStore(settings),
+        metrics_recorder=metrics,
+    )
+
+
+def test_run_reports_each_stage(interactor, input_data, tmp_path):
+    """各ステージの時間・メモリ・入出力の行数とバイト数を記録する"""
+    output = interactor.run(input_data)
+
+    assert output.success
+    stages = {m.stage: m for m in output.metrics}
+    assert list(stages) == ["memo_lookup", "load", "analyze", "save"]
+    assert stages["load"].input_bytes == (tmp_path / "data.csv").stat().st_size
+    assert stages["analyze"].rows_in == 3
+    assert stages["analyze"].rows_out == 2
+    assert stages["save"].rows_in == 2
+    for m in output.metrics:
+        assert m.wall_seconds >= 0
+        assert m.cpu_seconds >= 0
+        assert m.peak_rss_bytes > 0
+
+
+def test_reused_run_only_reports_memo_lookup(interactor, input_data):
+    """保存済みの結果を再利用した場合はメモの参照だけを記録する"""
+    interactor.run(input_data)
+    output = interactor.run(input_data)
+
+    assert output.reused
+    assert [m.stage for m in output.metrics] == ["memo_lookup"]
+
+
+def test_failed_run_keeps_metrics_of_executed_stages(interactor, tmp_path):
+    """失敗した場合も実行したステージまでの計測値を残す"""
+    output = interactor.run(
+        RunAnalysisInput(
+            dataset=Dataset(url=str(tmp_path / "missing.csv")),
+            target_date=TargetDate(value=date(2024, 1, 1)),
+        )
+    )
+
+    assert not output.success
+    assert [m.stage for m in output.metrics][-1] in ("load", "analyze")
+
+
+def test_metrics_endpoint(interactor, input_data, metrics):
+    """/metricsは実行結果・ステージごとの計測値をPrometheus形式で公開する"""
+    interactor.run(input_data)
+    interactor.run(input_data)
+
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_metrics] = lambda: metrics
+    response = TestClient(app).get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert 'odf_analysis_runs_total{outcome="success"} 1' in body
+    assert 'odf_analysis_runs_total{outcome="reused"} 1' in body
+    assert 'odf_analysis_stage_duration_seconds_count{stage="memo_lookup"} 2' in body
+    assert 'odf_analysis_stage_duration_seconds_bucket{stage="analyze",le="+Inf"} 1' in body
+    assert 'odf_analysis_rows_in_total{stage="analyze"} 3' in body
+    assert 'odf_analysis_rows_out_total{stage="analyze"} 2' in body
+
+
+def test_job_summary_is_one_json_line(interactor, input_data):
+    """Jobの実行結果は1行のJSONとして出力する"""
+    output = interactor.run(input_data)
+
+    summary = format_summary(input_data, output)
+
+    assert "\n" not in summary
+    data = json.loads(summary)
+    assert data["event"] == "analysis_summary"
+    assert data["target_date"] == "2024-01-01"
+    assert [stage["stage"] for stage in data["stages"]] == [
+        "memo_lookup",
+        "load",
+        "analyze",
+        "save",
+    ]
+
+
+def test_http_run_probes_once_and_counts_input_bytes_once(
+    http_server, tmp_path, metrics, monkeypatch
+):
+    """HTTPのデータセットは1回のHEADで指紋とバイト数を取得し、入力のバイト数は1度だけ数える"""
+    body = b"category,value\na,1\nb,2\na,3\n"
+    http_server.files["/data.csv"] = body
+    settings = Settings(s3_bucket="bucket", local_result_dir=str(tmp_path / "results"))
+    interactor = RunAnalysisInteractor(
+        loader=HttpDatasetLoader(),
+        repository=S3ResultRepository(settings),
+        memo_store=S3ResultMemoStore(settings),
+        metrics_recorder=metrics,
+    )
+    # Polarsの読み込み自体のリクエストと区別するため、アプリケーションのHEADだけを数える
+    urlopen = urllib.request.urlopen
+    heads = []
+
+    def counting_urlopen(request, *args, **kwargs):
+        if getattr(request, "method", None) == "HEAD":
+            heads.append(request.full_url)
+        return urlopen(request, *args, **kwargs)
+
+    monkeypatch.setattr(urllib.request, "urlopen", counting_urlopen)
+
+    output = interactor.run(
+        RunAnalysisInput(
+            dataset=Dataset(url=http_server.url("data.csv")),
+            target_date=TargetDate(value=date(2024, 1, 1)),
+        )
+    )
+
+    assert output.success
+    assert heads == [http_server.url("data.csv")]
+    assert [(m.stage, m.input_bytes) for m in output.metrics if m.input_bytes is not None] == [
+        ("load", len(body))
+    ]
+    assert f'odf_analysis_input_bytes_total{{stage="load"}} {len(body)}' in metrics.render()
@@ -0,0 +1,39 @@
+"""起動時間の短縮（遅延読み込み）のテスト"""
+
+import kubernetes.config
+
+from app.infrastructure.config.settings import Settings
+from app.infrastructure.k8s.job_launcher import JobLauncher
+from benchmarks.startup import STARTUP_TARGETS, measure_startup
+
+
+def test_entry_points_do_not_import_kubernetes():
+    """エントリーポイントの読み込みではkubernetesパッケージを読み込まない"""
+    run = measure_startup(repeat=1)
+
+    assert set(run["stages"]) == set(STARTUP_TARGETS)
+    for stats in run["stages"].values():
+        assert stats["kubernetes_imported"] is False
+        assert stats["seconds"] > 0
+
+
+def test_job_launcher_loads_config_on_first_use(monkeypatch):
+    """JobLauncherはクラスターの設定を生成時ではなく初回の使用時に1度だけ読み込む"""
+    calls = []
+
+    def fail(*args, **kwargs):
+        calls.append(args)
+        raise kubernetes.config.ConfigException("no cluster")
+
+    monkeypatch.setattr(kubernetes.config, "load_incluster_config", fail)
+    monkeypatch.setattr(kubernetes.config, "load_kube_config", fail)
+
+    launcher = JobLauncher(Settings(s3_bucket="bucket"))
+    assert calls == []
+
+    # 設定が読めない場合はモックモードとしてJob名をそのまま返す
+    assert launcher.launch_job("job-1", "https://example.com/a.csv", "2024-01-01") == "job-1"
+    assert len(calls) == 2
+
+    launcher.list_jobs()
+    assert len(calls) == 2